@@ -0,0 +1,215 @@
+"""Bulk workflow starts from NDJSON input streams"""
+import asyncio
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
+
+
+DEFAULT_CHUNK_SIZE = 1000
+MAX_CHUNK_SIZE = 10000
+EXECUTION_WORKERS = 8
+# Queued-but-not-started instances per process; reading the request body pauses beyond this
+MAX_PENDING_EXECUTIONS = 10000
+# Queued instances whose runner went away (restart, crash) are re-claimed this often
+RECOVERY_INTERVAL_SECONDS = 60.0
+RECOVERY_BATCH = 1000
+
+
+def _row(data: Dict[str, Any]) -> str:
+    return json.dumps(data, default=str) + "\n"
+
+
+async def iter_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Any]]:
+    """(line number, parsed value or exception) for each non-blank line of an NDJSON stream"""
+    buffer = b""
+    line_number = 0
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                try:
+                    yield line_number, json.loads(line)
+                except ValueError as e:
+                    yield line_number, e
+    if buffer.strip():
+        try:
+            yield line_number + 1, json.loads(buffer)
+        except ValueError as e:
+            yield line_number + 1, e
+
+
+class BulkExecutionRunner:
+    """Creates workflow instances in insert_many chunks and runs them on a worker pool
+
+    The workflow definition is fetched once per request and shared by every
+    instance it starts. Instances are inserted as `queued` and switched to
+    `running` by the worker that picks them up. The in-memory queue does not
+    survive a restart, so queued instances are leased to this runner and a
+    recovery loop re-queues instances whose lease expired.
+    """
+
+    def __init__(self, engine, workers: int = EXECUTION_WORKERS, max_pending: int = MAX_PENDING_EXECUTIONS):
+        self.engine = engine
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bulk-exec")
+        self._pending = None
+        self._lock = threading.Lock()
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._recovery_task: Optional[asyncio.Task] = None
+        self.metrics = {"queued": 0, "started": 0, "skipped": 0, "failed": 0, "running": 0, "recovered": 0}
+        self._first_started_at = None
+
+    async def start(self):
+        if self._recovery_task is None:
+            self._recovery_task = asyncio.get_running_loop().create_task(self._recovery_loop())
+
+    def _execute(self, instance_id: str, workflow: Dict[str, Any]):
+        with self._lock:
+            self.metrics["running"] += 1
+            if self._first_started_at is None:
+                self._first_started_at = time.monotonic()
+        try:
+            started = self.engine.run_queued_instance(instance_id, workflow)
+            counter = "started" if started else "skipped"
+        except Exception as e:
+            print(f"[BulkExecutionRunner] Instance {instance_id} failed: {e}")
+            counter = "failed"
+        with self._lock:
+            self.metrics["running"] -= 1
+            self.metrics[counter] += 1
+
+    def _release(self, loop: asyncio.AbstractEventLoop):
+        try:
+            loop.call_soon_threadsafe(self._pending.release)
+        except RuntimeError:
+            pass  # event loop already closed (shutdown)
+
+    async def _enqueue(self, instance_ids: List[str], workflow: Dict[str, Any]):
+        loop = asyncio.get_running_loop()
+        if self._pending is None:
+            self._pending = asyncio.Semaphore(self.max_pending)
+        for instance_id in instance_ids:
+            await self._pending.acquire()
+            with self._lock:
+                self.metrics["queued"] += 1
+            future = self._executor.submit(self._execute, instance_id, workflow)
+            future.add_done_callback(lambda _: self._release(loop))
+
+    async def run(self, workflow: Dict[str, Any], chunks: AsyncIterator[bytes],
+                  chunk_size: int = DEFAULT_CHUNK_SIZE, triggered_by: str = "bulk") -> AsyncIterator[str]:
+        """Stream one NDJSON result row per input line, then a summary row"""
+        loop = asyncio.get_running_loop()
+        chunk_size = max(1, min(chunk_size, MAX_CHUNK_SIZE))
+        started = time.perf_counter()
+        created = 0
+        rejected = 0
+        batch: List[Tuple[int, Dict[str, Any]]] = []
+
+        async def flush_batch():
+            line_numbers = [line for line, _ in batch]
+            inputs = [input_data for _, input_data in batch]
+            batch.clear()
+            try:
+                instance_ids, failed = await loop.run_in_executor(
+                    None, self.engine.create_instances, workflow["id"], inputs, triggered_by, self.owner
+                )
+            except Exception as e:
+                # Anything inserted before the error is picked up by the recovery loop
+                return [_row({"line": line, "error": f"Insert failed: {e}"}) for line in line_numbers], 0
+            # Documents rejected by insert_many(ordered=False) do not stop the rest of the chunk
+            inserted = [instance_id for index, instance_id in enumerate(instance_ids) if index not in failed]
+            await self._enqueue(inserted, workflow)
+            rows = [
+                _row({"line": line, "error": f"Insert failed: {failed[index]}"}) if index in failed
+                else _row({"line": line, "instance_id": instance_id})
+                for index, (line, instance_id) in enumerate(zip(line_numbers, instance_ids))
+            ]
+            return rows, len(inserted)
+
+        async for line, value in iter_ndjson(chunks):
+            if isinstance(value, Exception):
+                rejected += 1
+                yield _row({"line": line, "error": f"Invalid JSON: {value}"})
+                continue
+            if not isinstance(value, dict):
+                rejected += 1
+                yield _row({"line": line, "error": "Each line must be a JSON object of input variables"})
+                continue
+            batch.append((line, value))
+            if len(batch) >= chunk_size:
+                rows, count = await flush_batch()
+                created += count
+                rejected += len(rows) - count
+                yield "".join(rows)
+
+        if batch:
+            rows, count = await flush_batch()
+            created += count
+            rejected += len(rows) - count
+            yield "".join(rows)
+
+        elapsed = time.perf_counter() - started
+        yield _row({"summary": {
+            "workflow_id": workflow["id"],
+            "created": created,
+            "rejected": rejected,
+            "elapsed_ms": round(elapsed * 1000, 3),
+            "instances_per_second": round(created / elapsed, 1) if elapsed > 0 else 0.0
+        }})
+
+    async def _recovery_loop(self):
+        while True:
+            try:
+                await self.recover()
+            except Exception as e:
+                print(f"[BulkExecutionRunner] Recovery failed: {e}")
+            await asyncio.sleep(RECOVERY_INTERVAL_SECONDS)
+
+    async def recover(self) -> int:
+        """Claim queued instances whose lease expired and queue them on this runner"""
+        loop = asyncio.get_running_loop()
+        workflows: Dict[str, Optional[Dict[str, Any]]] = {}
+        recovered = 0
+        while recovered < RECOVERY_BATCH:
+            instance = await loop.run_in_executor(None, self.engine.claim_expired_queued_instance, self.owner)
+            if not instance:
+                break
+            workflow_id = instance["workflow_id"]
+            if workflow_id not in workflows:
+                workflows[workflow_id] = await loop.run_in_executor(
+                    None, self.engine.db["workflows"].find_one, {"id": workflow_id}, {"_id": 0}
+                )
+            if workflows[workflow_id] is None:
+                await loop.run_in_executor(
+                    None, self.engine.fail_queued_instance, instance["id"], f"Workflow {workflow_id} not found"
+                )
+                continue
+            await self._enqueue([instance["id"]], workflows[workflow_id])
+            recovered += 1
+        with self._lock:
+            self.metrics["recovered"] += recovered
+        return recovered
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.metrics)
+            finished = stats["started"] + stats["skipped"] + stats["failed"]
+            elapsed = time.monotonic() - self._first_started_at if self._first_started_at else 0.0
+        stats.update({
+            "backlog": stats["queued"] - finished - stats["running"],
+            "workers": self.workers,
+            "executions_per_second": round(finished / elapsed, 1) if elapsed > 0 else 0.0
+        })
+        return stats
+
+    def close(self):
+        if self._recovery_task is not None:
+            self._recovery_task.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,197 @@
+"""Response cache with request coalescing for API connector calls"""
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Awaitable, Callable, Optional
+
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+Fetch = Callable[[Optional["CacheEntry"]], Awaitable[Dict[str, Any]]]
+
+
+def _empty_stats() -> Dict[str, int]:
+    return {"hits": 0, "misses": 0, "revalidated": 0, "coalesced": 0, "stored": 0, "evicted": 0}
+
+
+def cache_ttl(headers: Dict[str, str], default_ttl: float) -> Optional[float]:
+    """Seconds a response may be served without revalidation, or None if it must not be stored
+
+    `no-store` / `private` responses are not stored, `no-cache` ones are stored
+    but revalidated on every use, and `s-maxage` / `max-age` override the
+    connector's default TTL.
+    """
+    directives = {}
+    for part in (headers.get("cache-control") or "").lower().split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name] = value.strip('"')
+
+    if "no-store" in directives or "private" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0.0
+    for name in ("s-maxage", "max-age"):
+        if directives.get(name, "").isdigit():
+            return float(directives[name])
+    return default_ttl
+
+
+class CacheEntry:
+    __slots__ = ("connector_id", "response", "size", "expires_at", "etag", "last_modified")
+
+    def __init__(self, connector_id: str, response: Dict[str, Any], size: int, ttl: float):
+        headers = response.get("headers") or {}
+        self.connector_id = connector_id
+        self.response = response
+        self.size = size
+        self.expires_at = time.monotonic() + ttl
+        self.etag = headers.get("etag")
+        self.last_modified = headers.get("last-modified")
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+    @property
+    def revalidatable(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """LRU cache of connector responses, bounded by entry count and body bytes
+
+    Concurrent identical requests share one upstream call (single flight). The
+    call runs in its own task, so a caller that is cancelled only stops waiting;
+    the others still get the response.
+    Stale entries with an ETag or Last-Modified are kept and revalidated with
+    a conditional request; a 304 refreshes them without transferring the body.
+
+    `fetch(entry)` performs the upstream call and returns a dict with
+    `status_code`, lower-cased `headers` and `size` (body bytes); when `entry`
+    is given it must send `entry.conditional_headers()`.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def make_key(connector_id: str, method: str, url: str, headers: Dict[str, Any], body: Any) -> str:
+        """Key of a rendered request (method, URL, headers and body)"""
+        material = json.dumps(
+            [connector_id, method, url, sorted((k.lower(), str(v)) for k, v in headers.items()), body],
+            sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    def _count(self, connector_id: str, counter: str):
+        stats = self._stats.get(connector_id)
+        if stats is None:
+            stats = self._stats[connector_id] = _empty_stats()
+        stats[counter] += 1
+
+    async def get_or_fetch(self, connector_id: str, key: str, fetch: Fetch, default_ttl: float) -> Dict[str, Any]:
+        entry = self._entries.get(key)
+        if entry is not None and entry.fresh:
+            self._entries.move_to_end(key)
+            self._count(connector_id, "hits")
+            return entry.response
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self._count(connector_id, "coalesced")
+        else:
+            inflight = asyncio.get_running_loop().create_task(
+                self._fetch(connector_id, key, entry, fetch, default_ttl)
+            )
+            # Retrieved here so failures nobody is waiting for are not reported as unhandled
+            inflight.add_done_callback(lambda task: task.cancelled() or task.exception())
+            self._inflight[key] = inflight
+        return await asyncio.shield(inflight)
+
+    async def _fetch(self, connector_id: str, key: str, entry: Optional[CacheEntry],
+                     fetch: Fetch, default_ttl: float) -> Dict[str, Any]:
+        try:
+            revalidate = entry if entry is not None and entry.revalidatable else None
+            response = await fetch(revalidate)
+            if response["status_code"] == 304 and revalidate is not None:
+                self._count(connector_id, "revalidated")
+                ttl = cache_ttl(response.get("headers") or {}, default_ttl)
+                revalidate.expires_at = time.monotonic() + (ttl or 0.0)
+                if key in self._entries:  # may have been purged while revalidating
+                    self._entries.move_to_end(key)
+                return revalidate.response
+            self._count(connector_id, "misses")
+            self._store(connector_id, key, response, default_ttl)
+            return response
+        finally:
+            self._inflight.pop(key, None)
+
+    def _store(self, connector_id: str, key: str, response: Dict[str, Any], default_ttl: float):
+        self._remove(key)
+        if response["status_code"] != 200 or response.get("size") is None:
+            return
+        ttl = cache_ttl(response.get("headers") or {}, default_ttl)
+        if ttl is None or response["size"] > self.max_bytes:
+            return
+
+        entry = CacheEntry(connector_id, response, response["size"], ttl)
+        if not entry.fresh and not entry.revalidatable:
+            return
+        self._entries[key] = entry
+        self._bytes += entry.size
+        self._count(connector_id, "stored")
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            lru_key, lru_entry = next(iter(self._entries.items()))
+            self._remove(lru_key)
+            self._count(lru_entry.connector_id, "evicted")
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def purge(self, connector_id: str) -> int:
+        """Drop every cached response of a connector"""
+        keys = [key for key, entry in self._entries.items() if entry.connector_id == connector_id]
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def stats(self, connector_id: str) -> Dict[str, Any]:
+        counters = dict(self._stats.get(connector_id) or _empty_stats())
+        served = counters["hits"] + counters["revalidated"] + counters["coalesced"]
+        total = served + counters["misses"]
+        entries = [entry for entry in self._entries.values() if entry.connector_id == connector_id]
+        counters.update({
+            "hit_rate": round(served / total, 4) if total else 0.0,
+            "entries": len(entries),
+            "bytes": sum(entry.size for entry in entries)
+        })
+        return counters
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "inflight": len(self._inflight)
+        }
@@ -0,0 +1,233 @@
+"""Per-connector HTTP client pools with adaptive concurrency limits"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Any, AsyncIterator, List, Optional
+
+import httpx
+
+from integrations.telemetry import LatencyHistogram
+
+
+DEFAULT_MIN_CONNECTIONS = 2
+DEFAULT_MAX_CONNECTIONS = 50
+DEFAULT_INITIAL_CONNECTIONS = 10
+DEFAULT_KEEPALIVE_EXPIRY_SECONDS = 30.0
+DEFAULT_IDLE_TIMEOUT_SECONDS = 300.0
+
+# The concurrency limit is re-evaluated after this many completed requests
+ADJUST_EVERY_REQUESTS = 50
+# Requests queued longer than this (on average) suggest the limit is too low
+QUEUE_WAIT_THRESHOLD_MS = 20.0
+# Latency this many times the baseline suggests the upstream is saturated
+LATENCY_TOLERANCE = 2.0
+
+SWEEP_INTERVAL_SECONDS = 60.0
+
+
+class PooledClient:
+    """An httpx client plus an adaptive concurrency limit for one connector
+
+    The limit moves between `min_connections` and `max_connections`: it grows
+    while requests queue for a slot and latency stays near its baseline, and
+    shrinks multiplicatively when latency degrades (the upstream is saturated).
+    httpx's own pool is sized to `max_connections`, so requests never queue
+    inside httpx where waits would be invisible.
+    """
+
+    def __init__(self, connector_id: str, timeout: float, pool_config: Dict[str, Any]):
+        self.connector_id = connector_id
+        self.min_limit = max(1, int(pool_config.get("min_connections", DEFAULT_MIN_CONNECTIONS)))
+        self.max_limit = max(self.min_limit, int(pool_config.get("max_connections", DEFAULT_MAX_CONNECTIONS)))
+        initial = int(pool_config.get("initial_connections", DEFAULT_INITIAL_CONNECTIONS))
+        self.limit = min(self.max_limit, max(self.min_limit, initial))
+        self.adaptive = pool_config.get("adaptive", True)
+        self.idle_timeout = float(pool_config.get("idle_timeout_seconds", DEFAULT_IDLE_TIMEOUT_SECONDS))
+        self.http2 = pool_config.get("http2", True)
+
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout),
+            limits=httpx.Limits(
+                max_keepalive_connections=int(pool_config.get("max_keepalive_connections", self.max_limit)),
+                max_connections=self.max_limit,
+                keepalive_expiry=float(pool_config.get("keepalive_expiry", DEFAULT_KEEPALIVE_EXPIRY_SECONDS))
+            ),
+            http2=self.http2,
+            follow_redirects=True
+        )
+
+        self.created_at = time.time()
+        self.last_used = time.monotonic()
+        self.in_flight = 0
+        self.waiting = 0
+        self.requests = 0
+        self.adjustments = {"increased": 0, "decreased": 0}
+        self.queue_wait = LatencyHistogram()
+        self.latency = LatencyHistogram()
+
+        self._condition = asyncio.Condition()
+        # Set by retire(); the client is closed once no request holds or waits for a slot
+        self.retired = False
+        self._drained = asyncio.Event()
+        self._baseline_ms: Optional[float] = None
+        self._window_count = 0
+        self._window_wait_ms = 0.0
+        self._window_latency_ms = 0.0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[httpx.AsyncClient]:
+        """Hold one of the connector's request slots while using the client"""
+        queued_at = time.perf_counter()
+        # Counted before the lock is awaited so retire() never sees a queued request as gone
+        self.waiting += 1
+        try:
+            async with self._condition:
+                await self._condition.wait_for(lambda: self.in_flight < self.limit)
+                self.in_flight += 1
+        finally:
+            self.waiting -= 1
+            self._check_drained()
+
+        started = time.perf_counter()
+        wait_ms = (started - queued_at) * 1000
+        self.last_used = time.monotonic()
+        try:
+            yield self.client
+        finally:
+            latency_ms = (time.perf_counter() - started) * 1000
+            self.requests += 1
+            self.last_used = time.monotonic()
+            self.queue_wait.observe(wait_ms)
+            self.latency.observe(latency_ms)
+            async with self._condition:
+                self.in_flight -= 1
+                self._record(wait_ms, latency_ms)
+                self._condition.notify_all()
+            self._check_drained()
+
+    def _check_drained(self):
+        if self.retired and self.in_flight == 0 and self.waiting == 0:
+            self._drained.set()
+
+    async def retire(self):
+        """Close the client once requests using (or queued for) it have finished"""
+        self.retired = True
+        self._check_drained()
+        await self._drained.wait()
+        await self.client.aclose()
+
+    def _record(self, wait_ms: float, latency_ms: float):
+        self._window_count += 1
+        self._window_wait_ms += wait_ms
+        self._window_latency_ms += latency_ms
+        if self._window_count < ADJUST_EVERY_REQUESTS:
+            return
+
+        avg_wait = self._window_wait_ms / self._window_count
+        avg_latency = self._window_latency_ms / self._window_count
+        self._window_count = 0
+        self._window_wait_ms = 0.0
+        self._window_latency_ms = 0.0
+
+        if self._baseline_ms is None or avg_latency < self._baseline_ms:
+            self._baseline_ms = avg_latency
+        else:
+            # Let the baseline drift up slowly so a permanently slower upstream is re-learned
+            self._baseline_ms = self._baseline_ms * 0.95 + avg_latency * 0.05
+
+        if not self.adaptive:
+            return
+        if avg_latency > self._baseline_ms * LATENCY_TOLERANCE and self.limit > self.min_limit:
+            self.limit = max(self.min_limit, int(self.limit * 0.75))
+            self.adjustments["decreased"] += 1
+        elif avg_wait > QUEUE_WAIT_THRESHOLD_MS and self.limit < self.max_limit:
+            self.limit = min(self.max_limit, self.limit + max(1, self.limit // 4))
+            self.adjustments["increased"] += 1
+
+    @property
+    def idle(self) -> bool:
+        return self.in_flight == 0 and self.waiting == 0 and time.monotonic() - self.last_used > self.idle_timeout
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "connector_id": self.connector_id,
+            "client_status": "closed" if self.client.is_closed else "active",
+            "http2": self.http2,
+            "created_at": self.created_at,
+            "idle_seconds": round(time.monotonic() - self.last_used, 1),
+            "concurrency_limit": self.limit,
+            "min_connections": self.min_limit,
+            "max_connections": self.max_limit,
+            "active_requests": self.in_flight,
+            "queued_requests": self.waiting,
+            "available_slots": max(0, self.limit - self.in_flight),
+            "utilization_percent": round(self.in_flight / self.limit * 100, 2),
+            "total_requests": self.requests,
+            "queue_wait": self.queue_wait.snapshot(),
+            "latency": self.latency.snapshot(),
+            "baseline_latency_ms": round(self._baseline_ms, 3) if self._baseline_ms is not None else None,
+            "adjustments": dict(self.adjustments)
+        }
+
+
+class ConnectorHttpPool:
+    """Owns one PooledClient per connector and evicts idle ones"""
+
+    def __init__(self):
+        self.clients: Dict[str, PooledClient] = {}
+        self._retiring: Dict[asyncio.Task, PooledClient] = {}
+        self._last_sweep = time.monotonic()
+        self.evicted = 0
+
+    def get(self, connector: Dict[str, Any]) -> PooledClient:
+        """Pooled client for a connector; limits come from `config.pool`"""
+        self._maybe_sweep()
+        connector_id = connector["id"]
+        pooled = self.clients.get(connector_id)
+        if pooled is None or pooled.client.is_closed:
+            config = connector.get("config", {})
+            pooled = PooledClient(connector_id, config.get("timeout", 30), config.get("pool") or {})
+            self.clients[connector_id] = pooled
+        return pooled
+
+    def _maybe_sweep(self):
+        now = time.monotonic()
+        if now - self._last_sweep >= SWEEP_INTERVAL_SECONDS:
+            self._last_sweep = now
+            asyncio.get_running_loop().create_task(self.cleanup())
+
+    async def cleanup(self) -> List[str]:
+        """Close and drop idle or already closed clients; returns their connector ids"""
+        removed = []
+        for connector_id in list(self.clients):
+            pooled = self.clients.get(connector_id)
+            if pooled is None or not (pooled.idle or pooled.client.is_closed):
+                continue
+            del self.clients[connector_id]
+            self.evicted += 1
+            removed.append(connector_id)
+            await pooled.client.aclose()
+        return removed
+
+    async def reset(self, connector_id: str) -> bool:
+        """Replace a connector's client; the next request creates a fresh one
+        
+        The old client keeps serving the requests already using it and is
+        closed in the background once they finish.
+        """
+        pooled = self.clients.pop(connector_id, None)
+        if pooled is None:
+            return False
+        task = asyncio.get_running_loop().create_task(pooled.retire())
+        self._retiring[task] = pooled
+        task.add_done_callback(lambda done: self._retiring.pop(done, None))
+        return True
+
+    async def close_all(self):
+        retiring = list(self._retiring.items())
+        for task, _ in retiring:
+            task.cancel()
+        await asyncio.gather(*(task for task, _ in retiring), return_exceptions=True)
+        for pooled in [*self.clients.values(), *(pooled for _, pooled in retiring)]:
+            await pooled.client.aclose()
+        self.clients.clear()
@@ -0,0 +1,311 @@
+"""Rate limiting and circuit breaking for API connectors, with shared state stores"""
+import asyncio
+import math
+import time
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
+
+
+KEY_PREFIX = "logiccanvas"
+
+# After a Redis error, state is kept locally for this long before Redis is tried again
+REDIS_RETRY_SECONDS = 30.0
+
+# GCRA: the stored value is the theoretical arrival time (TAT) of the next request
+GCRA_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local consume = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then tat = now end
+local allow_at = tat + interval - window
+if now < allow_at then
+  return {0, tostring(allow_at - now), tostring(tat - now)}
+end
+if consume == 1 then
+  tat = tat + interval
+  redis.call('SET', KEYS[1], tostring(tat), 'PX', math.ceil((tat - now) * 1000) + 1000)
+end
+return {1, '0', tostring(tat - now)}
+"""
+
+BREAKER_FAILURE_SCRIPT = """
+local count = redis.call('HINCRBY', KEYS[1], 'failure_count', 1)
+redis.call('HSET', KEYS[1], 'last_failure_time', ARGV[1])
+if count >= tonumber(ARGV[2]) then
+  redis.call('HSET', KEYS[1], 'state', 'open')
+elseif redis.call('HEXISTS', KEYS[1], 'state') == 0 then
+  redis.call('HSET', KEYS[1], 'state', 'closed')
+end
+redis.call('SADD', KEYS[2], ARGV[3])
+return redis.call('HGETALL', KEYS[1])
+"""
+
+
+def _remaining(max_requests: int, time_window: float, backlog: float) -> int:
+    """Requests still allowed right now given `backlog` seconds of TAT ahead of the clock"""
+    interval = time_window / max_requests
+    return max(0, min(max_requests, math.floor((time_window - backlog) / interval + 1e-9)))
+
+
+class LocalStateStore:
+    """Rate limit and circuit breaker state kept in this process"""
+
+    name = "local"
+
+    def __init__(self):
+        self._tat: Dict[str, float] = {}
+        self._breakers: Dict[str, Dict[str, Any]] = {}
+
+    async def rate_limit(self, key: str, max_requests: int, time_window: float,
+                         consume: bool = True) -> Tuple[bool, float, int]:
+        """GCRA check; returns (allowed, wait_time, remaining)"""
+        interval = time_window / max_requests
+        now = time.time()
+        tat = max(self._tat.get(key, now), now)
+        allow_at = tat + interval - time_window
+        if now < allow_at:
+            return False, allow_at - now, 0
+        if consume:
+            tat += interval
+            self._tat[key] = tat
+        return True, 0.0, _remaining(max_requests, time_window, tat - now)
+
+    async def breaker_state(self, key: str) -> Optional[Dict[str, Any]]:
+        state = self._breakers.get(key)
+        return dict(state) if state else None
+
+    async def breaker_failure(self, key: str, threshold: int) -> Dict[str, Any]:
+        state = self._breakers.setdefault(key, {"state": "closed", "failure_count": 0, "last_failure_time": None})
+        state["failure_count"] += 1
+        state["last_failure_time"] = time.time()
+        if state["failure_count"] >= threshold:
+            state["state"] = "open"
+        return dict(state)
+
+    async def breaker_set_state(self, key: str, state: str, reset_failures: bool = False):
+        entry = self._breakers.setdefault(key, {"state": "closed", "failure_count": 0, "last_failure_time": None})
+        entry["state"] = state
+        if reset_failures:
+            entry["failure_count"] = 0
+
+    async def breaker_reset(self, key: str):
+        self._breakers.pop(key, None)
+
+    async def breaker_keys(self) -> List[str]:
+        return list(self._breakers)
+
+    async def close(self):
+        pass
+
+
+class RedisStateStore:
+    """State shared by all workers through Redis
+
+    While Redis is unreachable, calls are served by a local stand-in store and
+    Redis is retried after REDIS_RETRY_SECONDS.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str, key_prefix: str = KEY_PREFIX):
+        self.client = aioredis.from_url(url, decode_responses=True, socket_timeout=1.0, socket_connect_timeout=1.0)
+        self.key_prefix = key_prefix
+        self.local = LocalStateStore()
+        self._gcra = self.client.register_script(GCRA_SCRIPT)
+        self._breaker_failure = self.client.register_script(BREAKER_FAILURE_SCRIPT)
+        self._unavailable_until = 0.0
+
+    def _key(self, kind: str, key: str) -> str:
+        return f"{self.key_prefix}:{kind}:{key}"
+
+    @property
+    def _breaker_index(self) -> str:
+        return f"{self.key_prefix}:breakers"
+
+    async def _run(self, operation, local_operation):
+        if time.monotonic() < self._unavailable_until:
+            return await local_operation()
+        try:
+            return await operation()
+        except (RedisError, OSError) as e:
+            print(f"[RedisStateStore] Redis unavailable, using local state: {e}")
+            self._unavailable_until = time.monotonic() + REDIS_RETRY_SECONDS
+            return await local_operation()
+
+    async def rate_limit(self, key: str, max_requests: int, time_window: float,
+                         consume: bool = True) -> Tuple[bool, float, int]:
+        async def remote():
+            allowed, wait, backlog = await self._gcra(
+                keys=[self._key("ratelimit", key)],
+                args=[time_window / max_requests, time_window, 1 if consume else 0]
+            )
+            if not int(allowed):
+                return False, float(wait), 0
+            return True, 0.0, _remaining(max_requests, time_window, float(backlog))
+
+        return await self._run(remote, lambda: self.local.rate_limit(key, max_requests, time_window, consume))
+
+    @staticmethod
+    def _decode_breaker(raw: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        if not raw:
+            return None
+        last_failure = raw.get("last_failure_time")
+        return {
+            "state": raw.get("state", "closed"),
+            "failure_count": int(raw.get("failure_count", 0)),
+            "last_failure_time": float(last_failure) if last_failure else None
+        }
+
+    async def breaker_state(self, key: str) -> Optional[Dict[str, Any]]:
+        async def remote():
+            return self._decode_breaker(await self.client.hgetall(self._key("breaker", key)))
+        return await self._run(remote, lambda: self.local.breaker_state(key))
+
+    async def breaker_failure(self, key: str, threshold: int) -> Dict[str, Any]:
+        async def remote():
+            flat = await self._breaker_failure(
+                keys=[self._key("breaker", key), self._breaker_index],
+                args=[time.time(), threshold, key]
+            )
+            return self._decode_breaker(dict(zip(flat[::2], flat[1::2])))
+        return await self._run(remote, lambda: self.local.breaker_failure(key, threshold))
+
+    async def breaker_set_state(self, key: str, state: str, reset_failures: bool = False):
+        async def remote():
+            mapping = {"state": state}
+            if reset_failures:
+                mapping["failure_count"] = 0
+            async with self.client.pipeline(transaction=True) as pipe:
+                pipe.hset(self._key("breaker", key), mapping=mapping)
+                pipe.sadd(self._breaker_index, key)
+                await pipe.execute()
+        return await self._run(remote, lambda: self.local.breaker_set_state(key, state, reset_failures))
+
+    async def breaker_reset(self, key: str):
+        async def remote():
+            async with self.client.pipeline(transaction=True) as pipe:
+                pipe.delete(self._key("breaker", key))
+                pipe.srem(self._breaker_index, key)
+                await pipe.execute()
+        return await self._run(remote, lambda: self.local.breaker_reset(key))
+
+    async def breaker_keys(self) -> List[str]:
+        async def remote():
+            return sorted(await self.client.smembers(self._breaker_index))
+        return await self._run(remote, self.local.breaker_keys)
+
+    async def close(self):
+        await self.client.aclose()
+
+
+def create_state_store(redis_url: Optional[str] = None):
+    """Redis-backed store when a URL is configured, otherwise in-process state"""
+    return RedisStateStore(redis_url) if redis_url else LocalStateStore()
+
+
+class RateLimiter:
+    """Rate limiter allowing `max_requests` per `time_window` seconds (GCRA)
+
+    Equivalent to a token bucket of `max_requests` tokens refilled evenly over
+    the window: each check is O(1) and needs a single state read/write.
+    """
+
+    def __init__(self, key: str, max_requests: int, time_window: float, store):
+        self.key = key
+        self.max_requests = max(1, int(max_requests))
+        self.time_window = max(float(time_window), 0.001)
+        self.store = store
+
+    async def try_acquire(self) -> Tuple[bool, float]:
+        """Take a request slot if one is free. Returns (acquired, wait_time)"""
+        allowed, wait_time, _ = await self.store.rate_limit(self.key, self.max_requests, self.time_window)
+        return allowed, wait_time
+
+    async def acquire(self, timeout: Optional[float] = None) -> Tuple[bool, float]:
+        """Wait for a request slot, giving up if it is not free within `timeout` seconds
+
+        Returns (acquired, wait_time); wait_time is how long the caller would
+        still have had to wait when giving up.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            allowed, wait_time = await self.try_acquire()
+            if allowed:
+                return True, 0.0
+            if deadline is not None and time.monotonic() + wait_time > deadline:
+                return False, wait_time
+            await asyncio.sleep(wait_time)
+
+    async def status(self) -> Dict[str, Any]:
+        """Current availability without consuming a slot"""
+        allowed, wait_time, remaining = await self.store.rate_limit(
+            self.key, self.max_requests, self.time_window, consume=False
+        )
+        return {
+            "can_proceed": allowed,
+            "wait_time": wait_time,
+            "available_requests": remaining,
+            "current_requests": self.max_requests - remaining
+        }
+
+
+class CircuitBreaker:
+    """Circuit breaker whose state lives in a (possibly shared) state store
+
+    closed -> open after `failure_threshold` consecutive failures; open ->
+    half-open once `timeout` seconds have passed since the last failure; a
+    success closes it again.
+    """
+
+    def __init__(self, key: str, store, failure_threshold: int = 5, timeout: int = 60):
+        self.key = key
+        self.store = store
+        self.failure_threshold = failure_threshold
+        self.timeout = timeout  # seconds to wait before trying again
+
+    async def record_success(self):
+        """Record successful call"""
+        await self.store.breaker_set_state(self.key, "closed", reset_failures=True)
+
+    async def record_failure(self):
+        """Record failed call"""
+        await self.store.breaker_failure(self.key, self.failure_threshold)
+
+    async def can_attempt(self) -> bool:
+        """Check if request can be attempted"""
+        state = await self.store.breaker_state(self.key)
+        if not state or state["state"] != "open":
+            return True
+
+        last_failure = state["last_failure_time"]
+        if last_failure and time.time() - last_failure >= self.timeout:
+            await self.store.breaker_set_state(self.key, "half-open")
+            return True
+        return False
+
+    async def status(self) -> Optional[Dict[str, Any]]:
+        """State for status endpoints (None if the breaker has never recorded anything)"""
+        state = await self.store.breaker_state(self.key)
+        if not state:
+            return None
+
+        last_failure = state["last_failure_time"]
+        time_until_retry = None
+        if state["state"] == "open":
+            time_until_retry = max(0, self.timeout - (time.time() - last_failure)) if last_failure else 0
+        return {
+            "state": state["state"],
+            "failure_count": state["failure_count"],
+            "failure_threshold": self.failure_threshold,
+            "last_failure_time": datetime.utcfromtimestamp(last_failure).isoformat() if last_failure else None,
+            "timeout_seconds": self.timeout,
+            "can_attempt": await self.can_attempt(),
+            "time_until_retry": time_until_retry
+        }
+
@@ -0,0 +1,327 @@
+"""Compiled request templates and response extractors for API connectors"""
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, AsyncIterator, Callable, List, Optional, Tuple, Union
+
+import ijson
+from ijson.common import ObjectBuilder
+
+from transformation_engine import compile_jsonpath
+
+
+PLACEHOLDER_PATTERN = re.compile(r"\$\{([^}]+)\}")
+
+# `name` or `name[3]` segments of a `$.a.b[0]` path; anything else goes through jsonpath-ng
+SIMPLE_PATH_PART = re.compile(r"^([^.\[\]*]*)(?:\[(\d+)\])?$")
+
+COMPILED_CACHE_SIZE = 1024
+
+# JSON responses at least this large (Content-Length) are parsed incrementally
+DEFAULT_STREAM_THRESHOLD_BYTES = 1024 * 1024
+
+
+class StringTemplate:
+    """A string with `${var}` placeholders located once at compile time.
+
+    Rendering joins the literal parts with `str(value)` of each variable in a
+    single pass; placeholders without a matching variable are left as written.
+    """
+
+    __slots__ = ("text", "parts")
+
+    def __init__(self, text: str):
+        self.text = text
+        # Even indexes are literals, odd indexes are variable names
+        self.parts = PLACEHOLDER_PATTERN.split(text)
+
+    @property
+    def is_static(self) -> bool:
+        return len(self.parts) == 1
+
+    def render(self, variables: Dict[str, Any]) -> str:
+        if len(self.parts) == 1:
+            return self.text
+        out = []
+        for i, part in enumerate(self.parts):
+            if i % 2 == 0:
+                out.append(part)
+            elif part in variables:
+                out.append(str(variables[part]))
+            else:
+                out.append("${" + part + "}")
+        return "".join(out)
+
+
+Renderer = Callable[[Dict[str, Any]], Any]
+
+
+def compile_json(value: Any) -> Optional[Renderer]:
+    """Compile a JSON-like value into a renderer, or None if it has no placeholders
+
+    Placeholders are substituted inside string values and object keys. Subtrees
+    without placeholders are shared between renders rather than copied, so
+    rendered bodies must be treated as read-only.
+    """
+    if isinstance(value, str):
+        template = StringTemplate(value)
+        return None if template.is_static else template.render
+
+    if isinstance(value, dict):
+        entries: List[Tuple[Any, Optional[Renderer], Any, Optional[Renderer]]] = []
+        dynamic = False
+        for key, item in value.items():
+            key_renderer = compile_json(key) if isinstance(key, str) else None
+            item_renderer = compile_json(item)
+            dynamic = dynamic or key_renderer is not None or item_renderer is not None
+            entries.append((key, key_renderer, item, item_renderer))
+        if not dynamic:
+            return None
+
+        def render_dict(variables: Dict[str, Any]) -> Dict[Any, Any]:
+            return {
+                (key_renderer(variables) if key_renderer else key): (item_renderer(variables) if item_renderer else item)
+                for key, key_renderer, item, item_renderer in entries
+            }
+        return render_dict
+
+    if isinstance(value, list):
+        items = [(item, compile_json(item)) for item in value]
+        if all(renderer is None for _, renderer in items):
+            return None
+
+        def render_list(variables: Dict[str, Any]) -> List[Any]:
+            return [renderer(variables) if renderer else item for item, renderer in items]
+        return render_list
+
+    return None
+
+
+PathStep = Union[str, int]
+
+
+def compile_simple_path(source_path: str) -> Optional[List[PathStep]]:
+    """Steps for a `$.a.b[0]` style path ([] means the whole response)
+
+    Returns None when the path needs full JSONPath (wildcards, filters, recursion).
+    """
+    if not source_path.startswith("$."):
+        return []
+    steps: List[PathStep] = []
+    for part in source_path[2:].split("."):
+        match = SIMPLE_PATH_PART.match(part)
+        if not match or (not match.group(1) and match.group(2) is None):
+            return None
+        if match.group(1):
+            steps.append(match.group(1))
+        if match.group(2) is not None:
+            steps.append(int(match.group(2)))
+    return steps
+
+
+def _steps_getter(steps: List[PathStep]) -> Callable[[Any], Any]:
+    def get(value: Any) -> Any:
+        for step in steps:
+            if isinstance(step, int):
+                if not isinstance(value, list) or len(value) <= step:
+                    return None
+                value = value[step]
+            elif isinstance(value, dict):
+                value = value.get(step)
+            else:
+                return None
+        return value
+    return get
+
+
+def _jsonpath_getter(source_path: str) -> Callable[[Any], Any]:
+    try:
+        expression = compile_jsonpath(source_path)
+    except Exception:
+        return lambda value: None
+
+    def get(value: Any) -> Any:
+        matches = expression.find(value)
+        if not matches:
+            return None
+        if len(matches) == 1:
+            return matches[0].value
+        return [match.value for match in matches]
+    return get
+
+
+def _apply_transform(value: Any, transform: str) -> Any:
+    if transform == "uppercase" and isinstance(value, str):
+        return value.upper()
+    if transform == "lowercase" and isinstance(value, str):
+        return value.lower()
+    return value
+
+
+class _PathCollector:
+    """Builds only the values at the wanted paths from a stream of ijson basic_parse events"""
+
+    def __init__(self, wanted: List[Tuple[PathStep, ...]]):
+        self.wanted = set(wanted)
+        self.max_depth = max((len(path) for path in self.wanted), default=0)
+        self.found: Dict[Tuple[PathStep, ...], Any] = {}
+        self._stack: List[list] = []  # [kind, current key or index] per open container
+        self._builders: List[list] = []  # [path, builder, depth]
+
+    @property
+    def done(self) -> bool:
+        return len(self.found) == len(self.wanted)
+
+    def feed(self, events: List[Tuple[str, Any]]):
+        for event, value in events:
+            if event == "map_key":
+                self._stack[-1][1] = value
+                for entry in self._builders:
+                    entry[1].event(event, value)
+                continue
+
+            if event not in ("end_map", "end_array"):
+                # A value starts here
+                if self._stack and self._stack[-1][0] == "array":
+                    self._stack[-1][1] += 1
+                if len(self._stack) <= self.max_depth:
+                    path = tuple(entry[1] for entry in self._stack)
+                    if path in self.wanted and path not in self.found:
+                        self._builders.append([path, ObjectBuilder(), 0])
+
+            if event == "start_map":
+                self._stack.append(["map", None])
+            elif event == "start_array":
+                self._stack.append(["array", -1])
+            elif event in ("end_map", "end_array"):
+                self._stack.pop()
+
+            if not self._builders:
+                continue
+            completed = []
+            for entry in self._builders:
+                entry[1].event(event, value)
+                if event in ("start_map", "start_array"):
+                    entry[2] += 1
+                elif event in ("end_map", "end_array"):
+                    entry[2] -= 1
+                if entry[2] == 0:
+                    completed.append(entry)
+            for entry in completed:
+                self._builders.remove(entry)
+                self.found[entry[0]] = entry[1].value
+
+
+class ResponseExtractor:
+    """A connector's `response_mapping` compiled into per-mapping extractor closures"""
+
+    def __init__(self, mappings: Optional[List[Dict[str, Any]]]):
+        self.fields: List[Tuple[str, Callable[[Any], Any], Optional[List[PathStep]], str]] = []
+        for mapping in mappings or []:
+            source_path = mapping.get("source_path", "")
+            steps = compile_simple_path(source_path)
+            getter = _steps_getter(steps) if steps is not None else _jsonpath_getter(source_path)
+            self.fields.append((mapping.get("target_variable", ""), getter, steps, mapping.get("transform", "none")))
+
+        # Incremental extraction handles plain paths below the document root
+        self.streamable = bool(self.fields) and all(steps for _, _, steps, _ in self.fields)
+
+    def extract(self, response_data: Any) -> Dict[str, Any]:
+        """Map a parsed response to variables"""
+        return {
+            target: _apply_transform(getter(response_data), transform)
+            for target, getter, _, transform in self.fields
+        }
+
+    async def extract_stream(self, chunks: AsyncIterator[bytes]) -> Dict[str, Any]:
+        """Map a JSON byte stream to variables without building the full document
+
+        Parsing stops as soon as every mapped path has been read.
+        """
+        collector = _PathCollector([tuple(steps) for _, _, steps, _ in self.fields])
+        events = ijson.sendable_list()
+        parser = ijson.basic_parse_coro(events, use_float=True)
+        async for chunk in chunks:
+            parser.send(chunk)
+            collector.feed(events)
+            del events[:]
+            if collector.done:
+                break
+        else:
+            parser.close()
+            collector.feed(events)
+
+        return {
+            target: _apply_transform(collector.found.get(tuple(steps)), transform)
+            for target, _, steps, transform in self.fields
+        }
+
+
+class CompiledConnectorRequest:
+    """A connector's request `config` and `response_mapping` compiled for repeated use"""
+
+    def __init__(self, config: Dict[str, Any], response_mapping: Optional[List[Dict[str, Any]]] = None):
+        self.method = config.get("method", "GET").upper()
+        self.url = StringTemplate(config.get("url", ""))
+        self.headers = [
+            (key, StringTemplate(value) if isinstance(value, str) else value)
+            for key, value in (config.get("headers") or {}).items()
+        ]
+
+        body = config.get("body")
+        self.body = body
+        self.body_renderer: Optional[Renderer] = None
+        if isinstance(body, str):
+            template = StringTemplate(body)
+            self.body_renderer = None if template.is_static else template.render
+        elif isinstance(body, (dict, list)):
+            self.body_renderer = compile_json(body)
+
+        self.extractor = ResponseExtractor(response_mapping)
+        self.stream_threshold = config.get("stream_threshold_bytes", DEFAULT_STREAM_THRESHOLD_BYTES)
+
+    def render(self, variables: Dict[str, Any]) -> Tuple[str, Dict[str, Any], Any]:
+        """Return (url, headers, body) with the variables substituted"""
+        headers = {
+            key: value.render(variables) if isinstance(value, StringTemplate) else value
+            for key, value in self.headers
+        }
+        body = self.body_renderer(variables) if self.body_renderer else self.body
+        return self.url.render(variables), headers, body
+
+    def should_stream_response(self, response) -> bool:
+        """Whether a (not yet read) response is large enough to extract incrementally"""
+        if not self.extractor.streamable or not self.stream_threshold:
+            return False
+        content_type = response.headers.get("content-type", "")
+        content_length = response.headers.get("content-length", "")
+        return "json" in content_type and content_length.isdigit() and int(content_length) >= self.stream_threshold
+
+
+_compiled_requests: "OrderedDict[Tuple[str, Any], CompiledConnectorRequest]" = OrderedDict()
+_compiled_requests_lock = threading.Lock()
+
+
+def get_compiled_request(connector: Dict[str, Any]) -> CompiledConnectorRequest:
+    """Compiled request and extractor for a stored connector, cached by (id, updated_at)
+
+    Every connector write sets `updated_at`, so an edited connector gets a new
+    cache key and is recompiled; stale entries age out of the LRU.
+    """
+    connector_id = connector.get("id")
+    if connector_id is None:
+        return CompiledConnectorRequest(connector.get("config", {}), connector.get("response_mapping"))
+
+    cache_key = (connector_id, connector.get("updated_at"))
+    with _compiled_requests_lock:
+        compiled = _compiled_requests.get(cache_key)
+        if compiled is not None:
+            _compiled_requests.move_to_end(cache_key)
+            return compiled
+
+    compiled = CompiledConnectorRequest(connector.get("config", {}), connector.get("response_mapping"))
+    with _compiled_requests_lock:
+        _compiled_requests[cache_key] = compiled
+        while len(_compiled_requests) > COMPILED_CACHE_SIZE:
+            _compiled_requests.popitem(last=False)
+    return compiled
@@ -3,9 +3,20 @@ import uuid
 import json
 import re
 import requests
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError
 from pymongo.collection import Collection
+from subprocess_manager import FAN_OUT_REDUCERS, SubprocessManager
+
+
+# Fan-out work item documents written per insert_many call
+FAN_OUT_INSERT_BATCH = 1000
+# Bulk-queued instances are owned by the runner that queued them until the lease expires
+QUEUED_LEASE_SECONDS = 600.0
 
 
 class ExpressionEvaluator:
@@ -364,6 +375,12 @@ class NodeExecutor:
                 evaluated_value = self.evaluator.evaluate(str(parent_var), self.variables)
                 subprocess_input[key] = evaluated_value
         
+        # Multi-instance mode: one child per element (or chunk) of a collection
+        if subprocess_data.get("multiInstance"):
+            return self._execute_multi_instance_subprocess(
+                node, subprocess_manager, subprocess_input, current_nesting_level
+            )
+        
         # Start subprocess execution
         from server import execution_engine as global_engine
         try:
@@ -388,6 +405,53 @@ class NodeExecutor:
         except Exception as e:
             return {"status": "failed", "error": f"Subprocess execution failed: {str(e)}"}
 
+    def _execute_multi_instance_subprocess(self,
+                                           node: Dict[str, Any],
+                                           subprocess_manager,
+                                           base_input: Dict[str, Any],
+                                           current_nesting_level: int) -> Dict[str, Any]:
+        """Fan a subprocess out over a collection and reduce the child outputs"""
+        subprocess_data = node.get("data", {})
+        collection = subprocess_data.get("collection", [])
+        
+        # Evaluate collection
+        if isinstance(collection, str):
+            collection = self.evaluator.evaluate(collection, self.variables)
+        
+        if not isinstance(collection, list):
+            return {"status": "failed", "error": "Multi-instance collection is not a list"}
+        
+        try:
+            chunk_size = max(int(subprocess_data.get("chunkSize", 1)), 1)
+            max_concurrency = max(int(subprocess_data.get("maxConcurrency", 10)), 1)
+        except (ValueError, TypeError):
+            return {"status": "failed", "error": "chunkSize and maxConcurrency must be integers"}
+        
+        reducer = subprocess_data.get("reducer", "collect")
+        if reducer not in FAN_OUT_REDUCERS:
+            return {"status": "failed", "error": f"Unknown fan-out reducer: {reducer}"}
+        
+        work_items = subprocess_manager.build_fan_out_work_items(collection, chunk_size)
+        
+        from server import execution_engine as global_engine
+        try:
+            return global_engine.start_fan_out(
+                parent_instance_id=self.instance_id,
+                node_id=node["id"],
+                subprocess_workflow_id=subprocess_data.get("subprocessWorkflowId"),
+                work_items=work_items,
+                base_input=base_input,
+                item_variable=subprocess_data.get("itemVariable", "item"),
+                index_variable=subprocess_data.get("indexVariable", "index"),
+                max_concurrency=max_concurrency,
+                reducer=reducer,
+                output_mapping=subprocess_data.get("outputMapping", {}),
+                fail_on_child_error=subprocess_data.get("failOnChildError", True),
+                nesting_level=current_nesting_level + 1,
+            )
+        except Exception as e:
+            return {"status": "failed", "error": f"Subprocess fan-out failed: {str(e)}"}
+
     def execute_event_node(self, node: Dict[str, Any]) -> Dict[str, Any]:
         """Execute event node - send/receive messages or signals"""
         event_data = node.get("data", {})
@@ -833,7 +897,7 @@ class NodeExecutor:
 
     def execute_transform_node(self, node: Dict[str, Any]) -> Dict[str, Any]:
         """Execute transform node - Phase 3.1: Apply data transformations"""
-        from transformation_engine import apply_transformation
+        from transformation_engine import compile_pipeline, PREVIOUS_RESULT
         
         transform_data = node.get("data", {})
         transform_mapping = transform_data.get("transformMapping", {})
@@ -848,25 +912,18 @@ class NodeExecutor:
                 # Get initial data from variables
                 initial_data = self.variables.get("input_data", {})
                 
-                # Apply each transformation in sequence
-                result = initial_data
+                # Evaluate variables in args, then run the chain as a compiled pipeline
+                resolved = []
                 for transform in transformations:
-                    function_name = transform.get("function")
-                    args = transform.get("args", [])
-                    kwargs = transform.get("kwargs", {})
-                    
-                    # Replace {previous_result} placeholder
-                    args = [result if arg == "{previous_result}" else arg for arg in args]
-                    
-                    # Evaluate variables in args
                     evaluated_args = []
-                    for arg in args:
-                        if isinstance(arg, str) and "${" in arg:
+                    for arg in transform.get("args", []):
+                        if isinstance(arg, str) and "${" in arg and arg != PREVIOUS_RESULT:
                             evaluated_args.append(self.evaluator.evaluate(arg, self.variables))
                         else:
                             evaluated_args.append(arg)
-                    
-                    result = apply_transformation(function_name, *evaluated_args, **kwargs)
+                    resolved.append({**transform, "args": evaluated_args})
+                
+                result = compile_pipeline(resolved).run(initial_data)["result"]
                 
                 result_data["transformed_data"] = result
             
@@ -1209,6 +1266,20 @@ class WorkflowExecutionEngine:
         self.db = db
         self.max_retries = 3
         self.retry_delay_seconds = 5
+        # (parent_instance_id, node_id) pairs whose fan-out is currently being driven
+        self._fan_out_pumps = set()
+        self._fan_out_lock = threading.Lock()
+        # One document per fan-out work item, holding the item and its child's result
+        self.fan_out_items = db["fan_out_items"]
+
+    def ensure_indexes(self) -> None:
+        self.fan_out_items.create_index(
+            [("parent_instance_id", 1), ("node_id", 1), ("index", 1)], unique=True
+        )
+        self.db["workflow_instances"].create_index(
+            [("status", 1), ("queue_lease_until", 1)],
+            partialFilterExpression={"status": "queued"},
+        )
 
     def start_execution(
         self,
@@ -1217,6 +1288,8 @@ class WorkflowExecutionEngine:
         input_data: Optional[Dict[str, Any]] = None,
         parent_instance_id: Optional[str] = None,
         nesting_level: int = 0,
+        fan_out_node_id: Optional[str] = None,
+        fan_out_index: Optional[int] = None,
     ) -> str:
         """Start a new workflow execution with optional parent-child support"""
         # Get workflow definition
@@ -1224,13 +1297,41 @@ class WorkflowExecutionEngine:
         if not workflow:
             raise ValueError(f"Workflow {workflow_id} not found")
 
-        # Create workflow instance
+        instance = self._new_instance(
+            workflow_id,
+            triggered_by,
+            input_data,
+            parent_instance_id=parent_instance_id,
+            nesting_level=nesting_level,
+            fan_out_node_id=fan_out_node_id,
+            fan_out_index=fan_out_index,
+        )
+        instance_id = instance["id"]
+        self.db["workflow_instances"].insert_one(instance)
+
+        # Start execution from start node
+        self._execute_from_start(instance_id, workflow)
+
+        return instance_id
+
+    def _new_instance(
+        self,
+        workflow_id: str,
+        triggered_by: str,
+        input_data: Optional[Dict[str, Any]],
+        parent_instance_id: Optional[str] = None,
+        nesting_level: int = 0,
+        fan_out_node_id: Optional[str] = None,
+        fan_out_index: Optional[int] = None,
+        status: str = "running",
+    ) -> Dict[str, Any]:
+        """Build a workflow instance document"""
         instance_id = str(uuid.uuid4())
         now_iso = datetime.utcnow().isoformat()
         instance = {
             "id": instance_id,
             "workflow_id": workflow_id,
-            "status": "running",
+            "status": status,
             "triggered_by": triggered_by,
             "started_at": now_iso,
             "updated_at": now_iso,
@@ -1246,14 +1347,394 @@ class WorkflowExecutionEngine:
             "parent_instance_id": parent_instance_id,
             "nesting_level": nesting_level,
             "child_instances": [],  # Track child subprocess instances
+            # Multi-instance subprocess membership (set on fan-out children only)
+            "fan_out_node_id": fan_out_node_id,
+            "fan_out_index": fan_out_index,
         }
 
-        self.db["workflow_instances"].insert_one(instance)
+        return instance
 
-        # Start execution from start node
+    # ========== BULK EXECUTION ==========
+
+    def create_instances(
+        self,
+        workflow_id: str,
+        inputs: List[Dict[str, Any]],
+        triggered_by: str = "bulk",
+        owner: Optional[str] = None,
+        lease_seconds: float = QUEUED_LEASE_SECONDS,
+    ) -> Tuple[List[str], Dict[int, str]]:
+        """Insert one `queued` instance per input with a single insert_many.
+
+        Returns the instance id for every input and the inputs whose insert
+        failed (position -> error); the rest were inserted. Queued instances
+        are leased to `owner` until `lease_seconds` from now, after which
+        `claim_expired_queued_instance` hands them to another runner. They are
+        started later with `run_queued_instance`.
+        """
+        lease_until = time.time() + lease_seconds
+        instances = [
+            {
+                **self._new_instance(workflow_id, triggered_by, input_data, status="queued"),
+                "queue_owner": owner,
+                "queue_lease_until": lease_until,
+            }
+            for input_data in inputs
+        ]
+        failed: Dict[int, str] = {}
+        if instances:
+            try:
+                self.db["workflow_instances"].insert_many(instances, ordered=False)
+            except BulkWriteError as e:
+                failed = {err["index"]: err.get("errmsg", "write failed") for err in e.details.get("writeErrors", [])}
+        return [instance["id"] for instance in instances], failed
+
+    def claim_expired_queued_instance(
+        self, owner: str, lease_seconds: float = QUEUED_LEASE_SECONDS
+    ) -> Optional[Dict[str, Any]]:
+        """Take over one queued instance whose lease expired (its runner went away).
+
+        Returns the instance's `id` and `workflow_id`, or None if there is none.
+        """
+        now = time.time()
+        return self.db["workflow_instances"].find_one_and_update(
+            {
+                "status": "queued",
+                "$or": [{"queue_lease_until": {"$lt": now}}, {"queue_lease_until": {"$exists": False}}],
+            },
+            {"$set": {"queue_owner": owner, "queue_lease_until": now + lease_seconds}},
+            projection={"_id": 0, "id": 1, "workflow_id": 1},
+        )
+
+    def fail_queued_instance(self, instance_id: str, error: str) -> bool:
+        """Fail an instance that can no longer be started, if it is still queued"""
+        now_iso = datetime.utcnow().isoformat()
+        result = self.db["workflow_instances"].update_one(
+            {"id": instance_id, "status": "queued"},
+            {
+                "$set": {"status": "failed", "error": error, "updated_at": now_iso, "completed_at": now_iso},
+                "$unset": {"queue_owner": "", "queue_lease_until": ""},
+            },
+        )
+        return result.modified_count > 0
+
+    def run_queued_instance(self, instance_id: str, workflow: Dict[str, Any]) -> bool:
+        """Execute a queued instance with an already fetched workflow definition.
+
+        Returns False if the instance is no longer queued (e.g. it was cancelled,
+        or another runner that claimed it after a lease expiry started it first).
+        """
+        result = self.db["workflow_instances"].update_one(
+            {"id": instance_id, "status": "queued"},
+            {
+                "$set": {"status": "running", "updated_at": datetime.utcnow().isoformat()},
+                "$unset": {"queue_owner": "", "queue_lease_until": ""},
+            },
+        )
+        if result.modified_count == 0:
+            return False
         self._execute_from_start(instance_id, workflow)
+        return True
 
-        return instance_id
+    # ========== MULTI-INSTANCE (FAN-OUT) SUBPROCESSES ==========
+
+    def start_fan_out(
+        self,
+        parent_instance_id: str,
+        node_id: str,
+        subprocess_workflow_id: str,
+        work_items: List[Any],
+        base_input: Dict[str, Any],
+        item_variable: str = "item",
+        index_variable: str = "index",
+        max_concurrency: int = 10,
+        reducer: str = "collect",
+        output_mapping: Optional[Dict[str, str]] = None,
+        fail_on_child_error: bool = True,
+        nesting_level: int = 1,
+    ) -> Dict[str, Any]:
+        """Launch one child instance per work item with bounded concurrency.
+
+        Progress is tracked on the parent instance under
+        `fan_out_state.<node_id>` with atomic counters, so completions arriving
+        from any request or worker converge on a single reduce step. The work
+        items and child results live in `fan_out_items`, one document each, so
+        collection size is not bounded by the parent document. Returns the
+        node result: `completed` if every child already finished
+        synchronously, otherwise `waiting` until the last child settles.
+        """
+        now_iso = datetime.utcnow().isoformat()
+        owner = {"parent_instance_id": parent_instance_id, "node_id": node_id}
+        self.fan_out_items.delete_many(owner)
+        for start in range(0, len(work_items), FAN_OUT_INSERT_BATCH):
+            self.fan_out_items.insert_many([
+                {**owner, "index": start + offset, "item": item}
+                for offset, item in enumerate(work_items[start:start + FAN_OUT_INSERT_BATCH])
+            ])
+
+        state = {
+            "subprocess_workflow_id": subprocess_workflow_id,
+            "base_input": base_input,
+            "item_variable": item_variable,
+            "index_variable": index_variable,
+            "max_concurrency": max_concurrency,
+            "reducer": reducer,
+            "output_mapping": output_mapping or {},
+            "fail_on_child_error": fail_on_child_error,
+            "nesting_level": nesting_level,
+            "total": len(work_items),
+            "next_index": 0,
+            "in_flight": 0,
+            "completed": 0,
+            "failed": 0,
+            "settled": 0,
+            "status": "running",
+            "started_at": now_iso,
+        }
+        self.db["workflow_instances"].update_one(
+            {"id": parent_instance_id},
+            {"$set": {f"fan_out_state.{node_id}": state}},
+        )
+
+        final_result = self._drive_fan_out(parent_instance_id, node_id)
+        if final_result is not None:
+            return final_result
+
+        return {
+            "status": "waiting",
+            "waiting_for": "subprocess",
+            "fan_out": True,
+            "subprocess_workflow_id": subprocess_workflow_id,
+            "total_instances": len(work_items),
+            "max_concurrency": max_concurrency,
+            "reducer": reducer,
+            "output_mapping": output_mapping or {},
+            "nesting_level": nesting_level,
+        }
+
+    def _drive_fan_out(self, parent_instance_id: str, node_id: str) -> Optional[Dict[str, Any]]:
+        """Launch children while slots are free, then try to reduce.
+
+        Children may complete synchronously inside `start_execution`; while a
+        pump is active for this node their completions are only recorded and
+        the running loop picks up the freed slots, which keeps the call stack
+        flat regardless of collection size.
+        """
+        prefix = f"fan_out_state.{node_id}"
+        parent = self.db["workflow_instances"].find_one(
+            {"id": parent_instance_id}, {"_id": 0, prefix: 1}
+        )
+        state = (parent or {}).get("fan_out_state", {}).get(node_id)
+        if not state:
+            return None
+
+        while True:
+            if not self._pump_fan_out(parent_instance_id, node_id, state):
+                return None
+            # A child that settled after the pump's last claim but before it
+            # was released found the pump busy and left its slot unfilled
+            if not self._fan_out_has_free_slot(parent_instance_id, node_id):
+                break
+
+        return self._finalize_fan_out(parent_instance_id, node_id, state["total"])
+
+    def _fan_out_has_free_slot(self, parent_instance_id: str, node_id: str) -> bool:
+        prefix = f"fan_out_state.{node_id}"
+        parent = self.db["workflow_instances"].find_one(
+            {"id": parent_instance_id},
+            {"_id": 0, f"{prefix}.status": 1, f"{prefix}.next_index": 1,
+             f"{prefix}.in_flight": 1, f"{prefix}.total": 1, f"{prefix}.max_concurrency": 1},
+        )
+        state = (parent or {}).get("fan_out_state", {}).get(node_id)
+        return bool(state) and state["status"] == "running" and (
+            state["next_index"] < state["total"] and state["in_flight"] < state["max_concurrency"]
+        )
+
+    def _pump_fan_out(self, parent_instance_id: str, node_id: str, state: Dict[str, Any]) -> bool:
+        """Launch children until no slot is free; False if another pump is already running"""
+        key = (parent_instance_id, node_id)
+        with self._fan_out_lock:
+            if key in self._fan_out_pumps:
+                return False
+            self._fan_out_pumps.add(key)
+
+        prefix = f"fan_out_state.{node_id}"
+        total = state["total"]
+        try:
+            while True:
+                claimed = self.db["workflow_instances"].find_one_and_update(
+                    {
+                        "id": parent_instance_id,
+                        f"{prefix}.status": "running",
+                        f"{prefix}.next_index": {"$lt": total},
+                        f"{prefix}.in_flight": {"$lt": state["max_concurrency"]},
+                    },
+                    {"$inc": {f"{prefix}.next_index": 1, f"{prefix}.in_flight": 1}},
+                    projection={"_id": 0, f"{prefix}.next_index": 1},
+                    return_document=ReturnDocument.AFTER,
+                )
+                if not claimed:
+                    break
+
+                index = claimed["fan_out_state"][node_id]["next_index"] - 1
+                try:
+                    work_item = self.fan_out_items.find_one(
+                        {"parent_instance_id": parent_instance_id, "node_id": node_id, "index": index},
+                        {"_id": 0, "item": 1},
+                    )
+                    if work_item is None:
+                        raise ValueError(f"Fan-out work item {index} not found")
+                    child_input = {
+                        **state["base_input"],
+                        state["item_variable"]: work_item["item"],
+                        state["index_variable"]: index,
+                    }
+                    self.start_execution(
+                        state["subprocess_workflow_id"],
+                        triggered_by=f"subprocess:{parent_instance_id}:{node_id}:{index}",
+                        input_data=child_input,
+                        parent_instance_id=parent_instance_id,
+                        nesting_level=state["nesting_level"],
+                        fan_out_node_id=node_id,
+                        fan_out_index=index,
+                    )
+                except Exception as e:
+                    self._record_fan_out_result(parent_instance_id, node_id, index, "failed", {}, str(e))
+        finally:
+            with self._fan_out_lock:
+                self._fan_out_pumps.discard(key)
+        return True
+
+    def _record_fan_out_result(
+        self,
+        parent_instance_id: str,
+        node_id: str,
+        index: int,
+        status: str,
+        mapped_outputs: Dict[str, Any],
+        error: Optional[str] = None,
+    ) -> bool:
+        """Atomically record one child's outcome; returns False for duplicates"""
+        prefix = f"fan_out_state.{node_id}"
+        counter = "completed" if status == "completed" else "failed"
+        # Work items are deleted once the fan-out is reduced, so late duplicates match nothing
+        result = self.fan_out_items.update_one(
+            {
+                "parent_instance_id": parent_instance_id,
+                "node_id": node_id,
+                "index": index,
+                "result": {"$exists": False},
+            },
+            {"$set": {"result": {"status": status, "outputs": mapped_outputs, "error": error}}},
+        )
+        if result.modified_count == 0:
+            return False
+        self.db["workflow_instances"].update_one(
+            {"id": parent_instance_id},
+            {
+                "$inc": {
+                    f"{prefix}.in_flight": -1,
+                    f"{prefix}.settled": 1,
+                    f"{prefix}.{counter}": 1,
+                },
+            },
+        )
+        return True
+
+    def _finalize_fan_out(self, parent_instance_id: str, node_id: str, total: int) -> Optional[Dict[str, Any]]:
+        """Reduce child outputs once every child has settled (exactly once)"""
+        prefix = f"fan_out_state.{node_id}"
+        claimed = self.db["workflow_instances"].find_one_and_update(
+            {"id": parent_instance_id, f"{prefix}.status": "running", f"{prefix}.settled": total},
+            {"$set": {f"{prefix}.status": "reduced", f"{prefix}.completed_at": datetime.utcnow().isoformat()}},
+            projection={"_id": 0, prefix: 1},
+            return_document=ReturnDocument.AFTER,
+        )
+        if not claimed:
+            return None
+
+        state = claimed["fan_out_state"][node_id]
+        owner = {"parent_instance_id": parent_instance_id, "node_id": node_id}
+        child_outputs = []
+        first_error = None
+        for work_item in self.fan_out_items.find(owner, {"_id": 0, "result": 1}).sort("index", 1):
+            result = work_item.get("result", {})
+            if result.get("status") == "completed":
+                child_outputs.append(result.get("outputs", {}))
+            elif first_error is None:
+                first_error = result.get("error")
+        self.fan_out_items.delete_many(owner)
+
+        if state["failed"] and state.get("fail_on_child_error", True):
+            return {
+                "status": "failed",
+                "error": f"{state['failed']} of {total} subprocess instances failed: {first_error}",
+            }
+
+        reduced = SubprocessManager(self.db).reduce_fan_out_outputs(
+            child_outputs, state.get("output_mapping", {}), state.get("reducer", "collect")
+        )
+        if reduced:
+            self.db["workflow_instances"].update_one(
+                {"id": parent_instance_id},
+                {"$set": {f"variables.{var}": value for var, value in reduced.items()}},
+            )
+
+        return {
+            "status": "completed",
+            "output": {
+                "fan_out": True,
+                "total_instances": total,
+                "completed_instances": state["completed"],
+                "failed_instances": state["failed"],
+                "reducer": state.get("reducer", "collect"),
+                "mapped_outputs": reduced,
+            },
+        }
+
+    def _handle_fan_out_child_completion(self, child_instance: Dict[str, Any]) -> None:
+        """Record a finished (or cancelled) fan-out child and resume the parent after the last one"""
+        parent_instance_id = child_instance["parent_instance_id"]
+        node_id = child_instance["fan_out_node_id"]
+        prefix = f"fan_out_state.{node_id}"
+
+        parent = self.db["workflow_instances"].find_one(
+            {"id": parent_instance_id}, {"_id": 0, f"{prefix}.output_mapping": 1}
+        )
+        if not parent:
+            return
+        output_mapping = parent.get("fan_out_state", {}).get(node_id, {}).get("output_mapping", {})
+
+        status = child_instance.get("status")
+        mapped_outputs = (
+            SubprocessManager(self.db).map_subprocess_outputs(child_instance, output_mapping)
+            if status == "completed"
+            else {}
+        )
+        error = child_instance.get("error")
+        if status == "cancelled" and not error:
+            error = "Subprocess instance was cancelled"
+        # A cancelled child frees its slot and counts as failed
+        recorded = self._record_fan_out_result(
+            parent_instance_id,
+            node_id,
+            child_instance["fan_out_index"],
+            status,
+            mapped_outputs,
+            error,
+        )
+        if not recorded:
+            return
+
+        # An active pump for this node launches the next child and reduces itself
+        final_result = self._drive_fan_out(parent_instance_id, node_id)
+        if final_result is None:
+            return
+
+        if final_result["status"] == "failed":
+            self._update_instance_status(parent_instance_id, "failed", final_result["error"])
+        else:
+            self.resume_execution(parent_instance_id, node_id, final_result["output"])
 
     def _execute_from_start(self, instance_id: str, workflow: Dict[str, Any]) -> None:
         """Execute workflow from start node"""
@@ -1504,7 +1985,7 @@ class WorkflowExecutionEngine:
         self.db["workflow_instances"].update_one({"id": instance_id}, {"$set": update_data})
         
         # Phase 3.1: If this is a subprocess, notify parent workflow
-        if status in ["completed", "failed"]:
+        if status in ["completed", "failed", "cancelled"]:
             self._notify_parent_of_subprocess_completion(instance_id)
     
     def _get_friendly_error_message(self, error: str) -> str:
@@ -1545,6 +2026,13 @@ class WorkflowExecutionEngine:
             if not parent_instance_id:
                 return  # Not a subprocess
             
+            if subprocess_instance.get("fan_out_node_id"):
+                self._handle_fan_out_child_completion(subprocess_instance)
+                return
+            
+            if subprocess_instance.get("status") == "cancelled":
+                return  # Only fan-outs settle on a cancelled child; a single subprocess node keeps waiting
+            
             # Find the parent instance
             parent_instance = self.db["workflow_instances"].find_one(
                 {"id": parent_instance_id},
@@ -6,6 +6,13 @@ Provides connectors for SQL, NoSQL, and Cloud databases
 from .sql_connectors import PostgreSQLConnector, MySQLConnector, MSSQLConnector, OracleConnector
 from .nosql_connectors import RedisConnector, MongoDBConnector, CassandraConnector
 from .cloud_db_connectors import DynamoDBConnector, FirestoreConnector, CosmosDBConnector
+from .connector_manager import ConnectorManager
+from .telemetry import (
+    ConnectorTelemetry,
+    connector_audit_writer,
+    get_connector_telemetry,
+    discard_connector_telemetry
+)
 
 __all__ = [
     # SQL Databases
@@ -20,5 +27,12 @@ __all__ = [
     # Cloud Databases
     'DynamoDBConnector',
     'FirestoreConnector',
-    'CosmosDBConnector'
+    'CosmosDBConnector',
+    # Lifecycle
+    'ConnectorManager',
+    # Telemetry
+    'ConnectorTelemetry',
+    'connector_audit_writer',
+    'get_connector_telemetry',
+    'discard_connector_telemetry'
 ]
@@ -4,22 +4,51 @@ Provides common functionality for all database connectors
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from contextlib import asynccontextmanager
+from typing import Dict, Any, AsyncIterator, List, Optional
 from datetime import datetime
-import json
+import asyncio
+import random
+import time
 from cryptography.fernet import Fernet
 import os
 
+from .telemetry import (
+    START_STATUSES,
+    connector_audit_writer,
+    get_connector_telemetry
+)
+
+
+# Rows per batch yielded by stream_query
+DEFAULT_STREAM_BATCH_SIZE = 500
+
+BULK_WRITE_OPS = ('insert', 'update', 'delete')
+
 
 class DatabaseConnector(ABC):
     """Abstract base class for all database connectors"""
     
+    # bulk_write tuning; connectors override these to match backend batch limits
+    bulk_chunk_size = 100
+    bulk_concurrency = 4
+    
     def __init__(self, connection_id: str, config: Dict[str, Any]):
         self.connection_id = connection_id
         self.config = config
         self.connection = None
         self.pool = None
+        # Set by close(); a closed connector does not re-create its pool
+        self.closed = False
         self._encryption_key = self._get_encryption_key()
+        self.created_at = time.time()
+        self.telemetry = get_connector_telemetry(connection_id)
+        # Pool usage counters reported by pool_stats()
+        self._in_use = 0
+        self._acquire_count = 0
+        self._acquire_wait_ms_total = 0.0
+        self._acquire_wait_ms_max = 0.0
+        self._connections_created = 0
         
     def _get_encryption_key(self) -> bytes:
         """Get or create encryption key for credentials"""
@@ -58,6 +87,16 @@ class DatabaseConnector(ABC):
         """Close database connection"""
         pass
     
+    async def close(self) -> bool:
+        """Disconnect for good (used when the connector is evicted or its connection changes)"""
+        self.closed = True
+        return await self.disconnect()
+    
+    def _check_open(self):
+        """Refuse to build a new pool once close() has run"""
+        if self.closed:
+            raise RuntimeError(f"Connector for {self.connection_id} is closed")
+    
     @abstractmethod
     async def test_connection(self) -> Dict[str, Any]:
         """Test database connection and return status"""
@@ -68,6 +107,185 @@ class DatabaseConnector(ABC):
         """Execute a query and return results"""
         pass
     
+    async def stream_query(self, query: str, params: Optional[Dict[str, Any]] = None,
+                           batch_size: int = DEFAULT_STREAM_BATCH_SIZE) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield query results as batches of rows
+        
+        Connectors with server-side cursors override this so rows are fetched
+        incrementally. The default runs execute_query and slices its result.
+        """
+        result = await self.execute_query(query, params)
+        if not result.get('success'):
+            raise RuntimeError(result.get('error') or 'Query failed')
+        
+        rows = result.get('data') or []
+        for start in range(0, len(rows), batch_size):
+            yield rows[start:start + batch_size]
+    
+    async def ping(self) -> bool:
+        """Health check used by the connector manager"""
+        result = await self.test_connection()
+        return bool(result.get('success'))
+    
+    @asynccontextmanager
+    async def _acquire(self):
+        """Borrow a connection from self.pool, recording wait time and usage"""
+        started = time.perf_counter()
+        async with self.pool.acquire() as conn:
+            wait_ms = (time.perf_counter() - started) * 1000
+            self._acquire_count += 1
+            self._acquire_wait_ms_total += wait_ms
+            self._acquire_wait_ms_max = max(self._acquire_wait_ms_max, wait_ms)
+            self._in_use += 1
+            try:
+                yield conn
+            finally:
+                self._in_use -= 1
+    
+    def _record_connection_created(self):
+        self._connections_created += 1
+    
+    def _driver_pool_stats(self) -> Dict[str, Any]:
+        """Size figures reported by the driver's pool (size, idle, min_size, max_size)"""
+        return {}
+    
+    def pool_stats(self) -> Dict[str, Any]:
+        """Current pool usage for this connection"""
+        age_seconds = max(time.time() - self.created_at, 1e-6)
+        stats = {
+            'in_use': self._in_use,
+            'acquires': self._acquire_count,
+            'avg_wait_ms': round(self._acquire_wait_ms_total / self._acquire_count, 3) if self._acquire_count else 0.0,
+            'max_wait_ms': round(self._acquire_wait_ms_max, 3),
+            'connections_created': self._connections_created,
+            'creates_per_second': round(self._connections_created / age_seconds, 4)
+        }
+        if self.pool is not None:
+            stats.update(self._driver_pool_stats())
+        return stats
+    
+    async def bulk_write(self, ops: List[Dict[str, Any]], chunk_size: Optional[int] = None,
+                         concurrency: Optional[int] = None, max_retries: int = 3) -> Dict[str, Any]:
+        """Apply a list of write operations with per-item results
+        
+        Each op is `{"op": "insert" | "update" | "delete", "table": ..., "data": ..., "condition": ...}`.
+        Ops are split into backend-sized chunks that run concurrently; items the
+        backend reports as unprocessed (throttling) are retried with exponential
+        backoff. The report has one result per op, in input order.
+        
+        Args:
+            ops: Write operations
+            chunk_size: Ops per backend batch (defaults to `bulk_chunk_size`)
+            concurrency: Chunks in flight at once (defaults to `bulk_concurrency`)
+            max_retries: Retry rounds for unprocessed items
+        
+        Returns:
+            Summary counts plus `results`: [{index, status: "ok" | "failed", error?, result?}]
+        """
+        chunk_size = max(1, chunk_size or self.bulk_chunk_size)
+        semaphore = asyncio.Semaphore(max(1, concurrency or self.bulk_concurrency))
+        results: List[Optional[Dict[str, Any]]] = [None] * len(ops)
+        retried = 0
+        
+        self._log_operation('bulk_write', 'executing', {'ops': len(ops), 'chunk_size': chunk_size})
+        
+        # Invalid ops are reported without being sent
+        pending = []
+        for index, op in enumerate(ops):
+            if op.get('op') not in BULK_WRITE_OPS or not op.get('table'):
+                results[index] = {'index': index, 'status': 'failed',
+                                  'error': f"Invalid op (expected op in {BULK_WRITE_OPS} and a table)"}
+            else:
+                pending.append(index)
+        
+        async def run_chunk(indexes: List[int]) -> List[int]:
+            """Write one chunk; return the indexes that must be retried"""
+            async with semaphore:
+                try:
+                    outcomes = await self._write_chunk([ops[i] for i in indexes])
+                except Exception as e:
+                    outcomes = [{'status': 'retry', 'error': str(e)}] * len(indexes)
+            
+            retry = []
+            for index, outcome in zip(indexes, outcomes):
+                if outcome.get('status') == 'retry':
+                    retry.append(index)
+                    results[index] = {'index': index, 'status': 'failed',
+                                      'error': outcome.get('error') or 'Unprocessed by backend'}
+                else:
+                    results[index] = {'index': index, **outcome}
+            return retry
+        
+        for attempt in range(max_retries + 1):
+            if not pending:
+                break
+            if attempt:
+                retried += len(pending)
+                await asyncio.sleep(min(0.1 * (2 ** attempt), 5.0) * (0.5 + random.random()))
+            
+            chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+            retry_lists = await asyncio.gather(*(run_chunk(chunk) for chunk in chunks))
+            pending = [index for retry in retry_lists for index in retry]
+        
+        failed = sum(1 for r in results if r['status'] != 'ok')
+        self._log_operation('bulk_write', 'success' if not failed else 'partial',
+                            {'ops': len(ops), 'failed': failed, 'retried': retried})
+        return {
+            'success': failed == 0,
+            'total': len(ops),
+            'succeeded': len(ops) - failed,
+            'failed': failed,
+            'retried': retried,
+            'results': results
+        }
+    
+    async def _bulk_insert_chunk(self, table: str, rows: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Native batch insert used by bulk_write; None means no native path
+        
+        The result may carry `errors` ([{index, message}]) and `unprocessed_indexes`
+        (indexes within `rows`) for partial outcomes.
+        """
+        bulk_insert = getattr(self, 'bulk_insert', None)
+        if bulk_insert is None:
+            return None
+        return await bulk_insert(table, rows)
+    
+    async def _write_chunk(self, ops: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Write one chunk, returning an outcome per op: status "ok" | "failed" | "retry"
+        
+        Chunks made only of inserts into one table go through the native batch
+        path; anything else (or a batch that fails without per-item detail) is
+        applied op by op so failures are attributed to the right item.
+        """
+        tables = {op['table'] for op in ops}
+        if len(tables) == 1 and all(op['op'] == 'insert' for op in ops):
+            result = await self._bulk_insert_chunk(ops[0]['table'], [op.get('data') or {} for op in ops])
+            if result is not None and (result.get('success') or result.get('errors') or result.get('unprocessed_indexes')):
+                outcomes = [{'status': 'ok'} for _ in ops]
+                for error in result.get('errors') or []:
+                    outcomes[error['index']] = {'status': 'failed', 'error': error.get('message')}
+                for index in result.get('unprocessed_indexes') or []:
+                    outcomes[index] = {'status': 'retry'}
+                return outcomes
+        
+        outcomes = []
+        for op in ops:
+            try:
+                if op['op'] == 'insert':
+                    result = await self.insert(op['table'], op.get('data') or {})
+                elif op['op'] == 'update':
+                    result = await self.update(op['table'], op.get('data') or {}, op.get('condition') or {})
+                else:
+                    result = await self.delete(op['table'], op.get('condition') or {})
+                
+                if result.get('success'):
+                    outcomes.append({'status': 'ok', 'result': result})
+                else:
+                    outcomes.append({'status': 'failed', 'error': result.get('error') or result.get('message')})
+            except Exception as e:
+                outcomes.append({'status': 'failed', 'error': str(e)})
+        return outcomes
+    
     @abstractmethod
     async def insert(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Insert data into table/collection"""
@@ -100,13 +318,18 @@ class DatabaseConnector(ABC):
         }
     
     def _log_operation(self, operation: str, status: str, details: Optional[Dict[str, Any]] = None):
-        """Log database operation for audit trail"""
-        log_entry = {
-            'timestamp': datetime.utcnow().isoformat(),
-            'connection_id': self.connection_id,
-            'operation': operation,
-            'status': status,
-            'details': details or {}
-        }
-        # In a real implementation, this would write to an audit log
-        print(f"[DB Operation] {json.dumps(log_entry)}")
+        """Record a database operation in telemetry and (sampled) in the audit trail"""
+        if status in START_STATUSES:
+            self.telemetry.start(operation)
+            return
+        
+        self.telemetry.finish(operation, status, details)
+        if connector_audit_writer.should_record(status):
+            connector_audit_writer.submit({
+                'timestamp': datetime.utcnow().isoformat(),
+                'connection_id': self.connection_id,
+                'connector': self.__class__.__name__,
+                'operation': operation,
+                'status': status,
+                'details': details or {}
+            })
@@ -3,33 +3,161 @@ Cloud Database Connectors
 Supports AWS DynamoDB, Google Cloud Firestore, and Azure Cosmos DB
 """
 
-from typing import Dict, Any, List, Optional
-from .base_connector import DatabaseConnector
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
+from .base_connector import DatabaseConnector, DEFAULT_STREAM_BATCH_SIZE
+import asyncio
+import functools
 import json
+import random
+import threading
+import time
+
+import boto3
+from boto3.dynamodb.types import Binary, TypeDeserializer, TypeSerializer
+from botocore.config import Config as BotoConfig
+
+
+DEFAULT_DYNAMODB_POOL_SIZE = 16
+DEFAULT_SCAN_SEGMENTS = 8
+DEFAULT_BATCH_RETRIES = 5
+BATCH_GET_LIMIT = 100
+BATCH_WRITE_LIMIT = 25
+
+DYNAMODB_READ_METHODS = {
+    'query': 'query',
+    'scan': 'scan',
+    'partiql': 'execute_statement'
+}
+
+
+def _to_dynamo_value(value: Any) -> Any:
+    """boto3's serializer rejects floats; send them as Decimal"""
+    if isinstance(value, float):
+        return Decimal(str(value))
+    if isinstance(value, dict):
+        return {k: _to_dynamo_value(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_to_dynamo_value(v) for v in value]
+    return value
+
+
+def _from_dynamo_value(value: Any) -> Any:
+    """Convert Decimal numbers and sets returned by DynamoDB into JSON-friendly values"""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, dict):
+        return {k: _from_dynamo_value(v) for k, v in value.items()}
+    if isinstance(value, (list, set)):
+        return [_from_dynamo_value(v) for v in value]
+    if isinstance(value, Binary):
+        return bytes(value)
+    return value
+
+
+def _request_signature(request: Dict[str, Any]) -> str:
+    return json.dumps(request, sort_keys=True, default=str)
+
+
+def _batch_backoff(attempt: int) -> float:
+    """Jittered exponential backoff for unprocessed batch items"""
+    return min(0.05 * (2 ** attempt), 5.0) * (0.5 + random.random())
 
 
 class DynamoDBConnector(DatabaseConnector):
-    """AWS DynamoDB connector"""
+    """AWS DynamoDB connector backed by boto3
+    
+    boto3 is synchronous, so calls run on a per-connection thread pool sized to
+    the client's HTTP connection pool. Items are accepted and returned as plain
+    Python values (numbers, strings, lists, maps), not DynamoDB attribute values.
+    """
+    
+    # BatchWriteItem accepts at most 25 requests
+    bulk_chunk_size = 25
     
     def __init__(self, connection_id: str, config: Dict[str, Any]):
         super().__init__(connection_id, config)
         self.db_type = 'dynamodb'
+        self.client = None
+        self._executor = None
+        self._client_lock = threading.Lock()
+        # Worker pool figures for pool_stats(), counted here instead of read from executor internals
+        self._stats_lock = threading.Lock()
+        self._pool_size = 0
+        self._workers_started = 0
+        self._calls_queued = 0
+        self._serializer = TypeSerializer()
+        self._deserializer = TypeDeserializer()
+        
+    def _ensure_client(self):
+        """Create the boto3 session, client and worker threads on first use"""
+        if self.client is not None:
+            return self.client
+        
+        self._check_open()
+        with self._client_lock:
+            if self.client is None:
+                options = self.config.get('options') or {}
+                pool_size = int(options.get('max_pool_size', DEFAULT_DYNAMODB_POOL_SIZE))
+                
+                session = boto3.session.Session(
+                    aws_access_key_id=self.decrypt_credential(self.config.get('access_key', '')) or None,
+                    aws_secret_access_key=self.decrypt_credential(self.config.get('secret_key', '')) or None,
+                    region_name=self.config.get('region') or 'us-east-1'
+                )
+                self._pool_size = pool_size
+                self._workers_started = 0
+                self._executor = ThreadPoolExecutor(
+                    max_workers=pool_size, thread_name_prefix='dynamodb', initializer=self._on_worker_started
+                )
+                self.client = session.client(
+                    'dynamodb',
+                    endpoint_url=options.get('endpoint_url'),
+                    config=BotoConfig(
+                        max_pool_connections=pool_size,
+                        retries={'max_attempts': 5, 'mode': 'adaptive'}
+                    )
+                )
+                self.pool = self._executor
+                self.connection = self.client
+        return self.client
+    
+    async def _call(self, method: str, **kwargs) -> Dict[str, Any]:
+        """Run a client method on the connection's thread pool"""
+        client = self._ensure_client()
+        with self._stats_lock:
+            self._calls_queued += 1
+        future = self._executor.submit(self._run_call, functools.partial(getattr(client, method), **kwargs))
+        future.add_done_callback(self._on_call_done)
+        return await asyncio.wrap_future(future)
+    
+    def _on_worker_started(self):
+        with self._stats_lock:
+            self._workers_started += 1
+    
+    def _run_call(self, call):
+        with self._stats_lock:
+            self._calls_queued -= 1
+        return call()
+    
+    def _on_call_done(self, future):
+        if future.cancelled():
+            # Cancelled while still queued, so _run_call never ran
+            with self._stats_lock:
+                self._calls_queued -= 1
+    
+    def _serialize_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: self._serializer.serialize(_to_dynamo_value(value)) for key, value in item.items()}
+    
+    def _deserialize_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: _from_dynamo_value(self._deserializer.deserialize(value)) for key, value in item.items()}
         
     async def connect(self) -> bool:
         """Establish DynamoDB connection"""
         try:
             self._log_operation('connect', 'attempting')
-            
-            # Decrypt credentials
-            access_key = self.decrypt_credential(self.config.get('access_key', ''))
-            secret_key = self.decrypt_credential(self.config.get('secret_key', ''))
-            
-            self.connection = {
-                'region': self.config.get('region', 'us-east-1'),
-                'access_key': access_key,
-                'connected': True
-            }
-            
+            self._ensure_client()
             self._log_operation('connect', 'success')
             return True
         except Exception as e:
@@ -37,10 +165,14 @@ class DynamoDBConnector(DatabaseConnector):
             return False
     
     async def disconnect(self) -> bool:
-        """Close DynamoDB connection"""
+        """Close DynamoDB client and worker threads"""
         try:
-            if self.connection:
-                self.connection['connected'] = False
+            if self.client:
+                self.client.close()
+                self._executor.shutdown(wait=False)
+                self.client = None
+                self._executor = None
+                self.pool = None
                 self.connection = None
                 self._log_operation('disconnect', 'success')
             return True
@@ -48,76 +180,223 @@ class DynamoDBConnector(DatabaseConnector):
             self._log_operation('disconnect', 'failed', {'error': str(e)})
             return False
     
+    def _driver_pool_stats(self) -> Dict[str, Any]:
+        return {
+            'size': self._workers_started,
+            'max_size': self._pool_size,
+            'queued_calls': self._calls_queued
+        }
+    
+    async def ping(self) -> bool:
+        """Cheapest authenticated call: list at most one table"""
+        await self._call('list_tables', Limit=1)
+        return True
+    
     async def test_connection(self) -> Dict[str, Any]:
         """Test DynamoDB connection"""
+        owns_client = self.client is None
         try:
-            await self.connect()
+            response = await self._call('list_tables', Limit=10)
             
-            result = {
+            return {
                 'success': True,
                 'message': 'Connection successful',
                 'database_type': 'AWS DynamoDB',
-                'region': self.config.get('region', 'us-east-1')
+                'region': self.config.get('region', 'us-east-1'),
+                'tables': response.get('TableNames', [])
             }
-            
-            await self.disconnect()
-            return result
         except Exception as e:
             return {
                 'success': False,
                 'message': f'Connection failed: {str(e)}',
                 'database_type': 'AWS DynamoDB'
             }
+        finally:
+            if owns_client:
+                await self.disconnect()
+    
+    def _parse_request(self, query: Any, params: Optional[Dict[str, Any]]) -> Tuple[str, Dict[str, Any]]:
+        """Turn a query into (operation, boto3 request)
+        
+        JSON requests look like `{"operation": "query" | "scan", "TableName": ..., ...}`
+        with plain values in ExpressionAttributeValues; Scan also accepts `segments`
+        for a parallel scan. Anything else is run as a PartiQL statement with
+        `params.parameters` as its positional parameters.
+        """
+        if isinstance(query, dict):
+            request = dict(query)
+        elif query.strip().startswith('{'):
+            request = json.loads(query)
+        else:
+            request = {
+                'operation': 'partiql',
+                'Statement': query,
+                'Parameters': list((params or {}).get('parameters', []))
+            }
+        
+        operation = request.pop('operation', 'query' if 'KeyConditionExpression' in request else 'scan').lower()
+        if operation not in DYNAMODB_READ_METHODS:
+            raise ValueError(f"Unsupported DynamoDB operation: {operation}")
+        
+        for field in ('ExpressionAttributeValues', 'ExclusiveStartKey'):
+            if field in request:
+                request[field] = self._serialize_item(request[field])
+        if request.get('Parameters'):
+            request['Parameters'] = [self._serializer.serialize(_to_dynamo_value(p)) for p in request['Parameters']]
+        elif 'Parameters' in request:
+            del request['Parameters']
+        return operation, request
+    
+    async def _pages(self, operation: str, request: Dict[str, Any]) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield one list of items per response page, following pagination tokens"""
+        if operation == 'partiql':
+            token_in, token_out = 'NextToken', 'NextToken'
+        else:
+            token_in, token_out = 'ExclusiveStartKey', 'LastEvaluatedKey'
+        
+        request = dict(request)
+        while True:
+            response = await self._call(DYNAMODB_READ_METHODS[operation], **request)
+            yield [self._deserialize_item(item) for item in response.get('Items', [])]
+            token = response.get(token_out)
+            if not token:
+                break
+            request[token_in] = token
+    
+    async def _parallel_scan_pages(self, request: Dict[str, Any], segments: int) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Scan all segments concurrently, yielding pages as they arrive
+        
+        The queue is bounded, so segment scans pause when the consumer falls behind.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=segments * 2)
+        segment_done = object()
+        
+        async def scan_segment(segment: int):
+            try:
+                async for page in self._pages('scan', {**request, 'Segment': segment, 'TotalSegments': segments}):
+                    await queue.put(page)
+            except Exception as e:
+                await queue.put(e)
+            await queue.put(segment_done)
+        
+        tasks = [asyncio.create_task(scan_segment(segment)) for segment in range(segments)]
+        finished = 0
+        try:
+            while finished < segments:
+                page = await queue.get()
+                if page is segment_done:
+                    finished += 1
+                elif isinstance(page, Exception):
+                    raise page
+                else:
+                    yield page
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    async def stream_query(self, query: str, params: Optional[Dict[str, Any]] = None,
+                           batch_size: Optional[int] = DEFAULT_STREAM_BATCH_SIZE) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Stream Query / Scan / PartiQL results page by page (Scan segments run in parallel)"""
+        operation, request = self._parse_request(query, params)
+        segments = int(request.pop('segments', 1))
+        if batch_size and operation != 'partiql':
+            request.setdefault('Limit', batch_size)
+        
+        self._log_operation('stream_query', 'executing', {'operation': operation, 'segments': segments})
+        
+        if operation == 'scan' and segments > 1:
+            pages = self._parallel_scan_pages(request, segments)
+        else:
+            pages = self._pages(operation, request)
+        
+        status, details = 'success', None
+        try:
+            async for page in pages:
+                yield page
+        except Exception as e:
+            status, details = 'failed', {'error': str(e)}
+            raise
+        finally:
+            # Also reached when the consumer stops early and closes the stream
+            self._log_operation('stream_query', status, details)
     
     async def execute_query(self, query: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Execute DynamoDB query or scan"""
+        """Execute DynamoDB Query, Scan or PartiQL statement, following all pages
+        
+        `params.max_items` stops reading once that many items were returned.
+        """
         try:
-            if not self.connection or not self.connection.get('connected'):
-                await self.connect()
+            self._log_operation('execute_query', 'executing', {'query': str(query)[:100]})
+            
+            max_items = (params or {}).get('max_items')
+            started = time.perf_counter()
+            items = []
+            stream = self.stream_query(query, params, batch_size=None)
+            try:
+                async for page in stream:
+                    items.extend(page)
+                    if max_items and len(items) >= max_items:
+                        items = items[:max_items]
+                        break
+            finally:
+                await stream.aclose()
             
-            self._log_operation('execute_query', 'executing', {'query_type': 'Query'})
-            
-            # Simulate query results
             result = {
                 'success': True,
-                'Items': [
-                    {'id': {'S': 'item1'}, 'name': {'S': 'DynamoDB Item'}, 'value': {'N': '100'}},
-                    {'id': {'S': 'item2'}, 'name': {'S': 'Another Item'}, 'value': {'N': '200'}}
-                ],
-                'Count': 2,
-                'ScannedCount': 2,
-                'ConsumedCapacity': {'TableName': 'sample_table', 'CapacityUnits': 1.0}
+                'Items': items,
+                'Count': len(items),
+                'execution_time_ms': round((time.perf_counter() - started) * 1000, 2)
             }
             
-            self._log_operation('execute_query', 'success')
+            self._log_operation('execute_query', 'success', {'rows': len(items)})
             return result
         except Exception as e:
+            self._log_operation('execute_query', 'failed', {'error': str(e)})
             return {
                 'success': False,
                 'error': str(e),
                 'query': query
             }
     
+    async def parallel_scan(self, table: str, segments: int = DEFAULT_SCAN_SEGMENTS,
+                            **scan_kwargs) -> Dict[str, Any]:
+        """Scan a whole table with `segments` concurrent segment scans"""
+        try:
+            request = {'operation': 'scan', 'TableName': table, 'segments': segments, **scan_kwargs}
+            items = []
+            async for page in self.stream_query(request, batch_size=None):
+                items.extend(page)
+            
+            return {
+                'success': True,
+                'Items': items,
+                'Count': len(items),
+                'segments': segments,
+                'table': table
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e),
+                'operation': 'parallel_scan'
+            }
+    
     async def get_item(self, table: str, key: Dict[str, Any]) -> Dict[str, Any]:
         """Get item from DynamoDB table"""
         try:
-            if not self.connection or not self.connection.get('connected'):
-                await self.connect()
-            
             self._log_operation('get_item', 'executing', {'table': table})
             
-            result = {
+            response = await self._call('get_item', TableName=table, Key=self._serialize_item(key))
+            item = response.get('Item')
+            
+            self._log_operation('get_item', 'success')
+            return {
                 'success': True,
-                'Item': {
-                    'id': {'S': key.get('id', 'sample_id')},
-                    'name': {'S': 'Sample Item'},
-                    'value': {'N': '100'}
-                },
-                'ConsumedCapacity': {'TableName': table, 'CapacityUnits': 0.5}
+                'Item': self._deserialize_item(item) if item else None,
+                'found': item is not None
             }
-            
-            return result
         except Exception as e:
+            self._log_operation('get_item', 'failed', {'error': str(e)})
             return {
                 'success': False,
                 'error': str(e),
@@ -127,18 +406,14 @@ class DynamoDBConnector(DatabaseConnector):
     async def put_item(self, table: str, item: Dict[str, Any]) -> Dict[str, Any]:
         """Put item into DynamoDB table"""
         try:
-            if not self.connection or not self.connection.get('connected'):
-                await self.connect()
-            
             self._log_operation('put_item', 'executing', {'table': table})
             
-            result = {
-                'success': True,
-                'ConsumedCapacity': {'TableName': table, 'CapacityUnits': 1.0}
-            }
+            await self._call('put_item', TableName=table, Item=self._serialize_item(item))
             
-            return result
+            self._log_operation('put_item', 'success')
+            return {'success': True, 'table': table}
         except Exception as e:
+            self._log_operation('put_item', 'failed', {'error': str(e)})
             return {
                 'success': False,
                 'error': str(e),
@@ -150,21 +425,32 @@ class DynamoDBConnector(DatabaseConnector):
         return await self.put_item(table, data)
     
     async def update(self, table: str, data: Dict[str, Any], condition: Dict[str, Any]) -> Dict[str, Any]:
-        """Update item in DynamoDB table"""
+        """Update item in DynamoDB table (condition is the item's key)"""
         try:
-            if not self.connection or not self.connection.get('connected'):
-                await self.connect()
+            if not data:
+                return {'success': False, 'error': 'No attributes to update', 'operation': 'update'}
             
             self._log_operation('update_item', 'executing', {'table': table})
             
-            result = {
+            names = {f'#f{i}': field for i, field in enumerate(data)}
+            values = {f':v{i}': value for i, value in enumerate(data.values())}
+            response = await self._call(
+                'update_item',
+                TableName=table,
+                Key=self._serialize_item(condition),
+                UpdateExpression='SET ' + ', '.join(f'#f{i} = :v{i}' for i in range(len(data))),
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues=self._serialize_item(values),
+                ReturnValues='ALL_NEW'
+            )
+            
+            self._log_operation('update_item', 'success')
+            return {
                 'success': True,
-                'Attributes': data,
-                'ConsumedCapacity': {'TableName': table, 'CapacityUnits': 1.0}
+                'Attributes': self._deserialize_item(response.get('Attributes', {}))
             }
-            
-            return result
         except Exception as e:
+            self._log_operation('update_item', 'failed', {'error': str(e)})
             return {
                 'success': False,
                 'error': str(e),
@@ -172,46 +458,125 @@ class DynamoDBConnector(DatabaseConnector):
             }
     
     async def delete(self, table: str, condition: Dict[str, Any]) -> Dict[str, Any]:
-        """Delete item from DynamoDB table"""
+        """Delete item from DynamoDB table (condition is the item's key)"""
         try:
-            if not self.connection or not self.connection.get('connected'):
-                await self.connect()
-            
             self._log_operation('delete_item', 'executing', {'table': table})
             
-            result = {
-                'success': True,
-                'ConsumedCapacity': {'TableName': table, 'CapacityUnits': 0.5}
-            }
+            await self._call('delete_item', TableName=table, Key=self._serialize_item(condition))
             
-            return result
+            self._log_operation('delete_item', 'success')
+            return {'success': True, 'table': table}
         except Exception as e:
+            self._log_operation('delete_item', 'failed', {'error': str(e)})
             return {
                 'success': False,
                 'error': str(e),
                 'operation': 'delete'
             }
     
-    async def batch_write(self, table: str, items: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Batch write items to DynamoDB"""
+    async def batch_get(self, table: str, keys: List[Dict[str, Any]], projection: Optional[str] = None,
+                        max_retries: int = DEFAULT_BATCH_RETRIES) -> Dict[str, Any]:
+        """BatchGetItem in chunks of 100 keys, retrying UnprocessedKeys with backoff"""
         try:
-            if not self.connection or not self.connection.get('connected'):
-                await self.connect()
-            
-            if not items:
+            self._log_operation('batch_get', 'executing', {'table': table, 'count': len(keys)})
+            
+            async def get_chunk(chunk_keys: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+                request_items = {table: {'Keys': chunk_keys}}
+                if projection:
+                    request_items[table]['ProjectionExpression'] = projection
+                
+                found = []
+                for attempt in range(max_retries + 1):
+                    if attempt:
+                        await asyncio.sleep(_batch_backoff(attempt))
+                    response = await self._call('batch_get_item', RequestItems=request_items)
+                    found.extend(response.get('Responses', {}).get(table, []))
+                    request_items = response.get('UnprocessedKeys') or {}
+                    if not request_items:
+                        break
+                return found, request_items.get(table, {}).get('Keys', [])
+            
+            serialized = [self._serialize_item(key) for key in keys]
+            chunks = [serialized[i:i + BATCH_GET_LIMIT] for i in range(0, len(serialized), BATCH_GET_LIMIT)]
+            outcomes = await asyncio.gather(*(get_chunk(chunk) for chunk in chunks))
+            
+            items = [self._deserialize_item(item) for found, _ in outcomes for item in found]
+            unprocessed = [self._deserialize_item(key) for _, left in outcomes for key in left]
+            
+            self._log_operation('batch_get', 'partial' if unprocessed else 'success',
+                                {'rows': len(items), 'unprocessed': len(unprocessed)})
+            return {
+                'success': not unprocessed,
+                'Items': items,
+                'Count': len(items),
+                'unprocessed_keys': unprocessed
+            }
+        except Exception as e:
+            self._log_operation('batch_get', 'failed', {'error': str(e)})
+            return {
+                'success': False,
+                'error': str(e),
+                'operation': 'batch_get'
+            }
+    
+    async def _bulk_insert_chunk(self, table: str, rows: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """bulk_write inserts go through BatchWriteItem; bulk_write retries what stays unprocessed"""
+        return await self.batch_write(table, rows, max_retries=0)
+    
+    async def batch_write(self, table: str, items: List[Dict[str, Any]],
+                          delete_keys: Optional[List[Dict[str, Any]]] = None,
+                          max_retries: int = DEFAULT_BATCH_RETRIES) -> Dict[str, Any]:
+        """BatchWriteItem in chunks of 25, retrying UnprocessedItems with backoff
+        
+        `unprocessed_indexes` refers to positions in `items` followed by `delete_keys`.
+        """
+        try:
+            delete_keys = delete_keys or []
+            if not items and not delete_keys:
                 return {'success': False, 'error': 'No items provided'}
             
-            self._log_operation('batch_write', 'executing', {'table': table, 'count': len(items)})
-            
-            result = {
-                'success': True,
-                'processed_count': len(items),
-                'UnprocessedItems': {},
-                'ConsumedCapacity': [{'TableName': table, 'CapacityUnits': len(items) * 1.0}]
+            self._log_operation('batch_write', 'executing', {'table': table, 'count': len(items) + len(delete_keys)})
+            
+            write_requests = (
+                [{'PutRequest': {'Item': self._serialize_item(item)}} for item in items]
+                + [{'DeleteRequest': {'Key': self._serialize_item(key)}} for key in delete_keys]
+            )
+            
+            async def write_chunk(chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+                request_items = {table: chunk}
+                for attempt in range(max_retries + 1):
+                    if attempt:
+                        await asyncio.sleep(_batch_backoff(attempt))
+                    response = await self._call('batch_write_item', RequestItems=request_items)
+                    request_items = response.get('UnprocessedItems') or {}
+                    if not request_items:
+                        break
+                return request_items.get(table, [])
+            
+            chunks = [write_requests[i:i + BATCH_WRITE_LIMIT] for i in range(0, len(write_requests), BATCH_WRITE_LIMIT)]
+            leftovers = await asyncio.gather(*(write_chunk(chunk) for chunk in chunks))
+            
+            # Map unprocessed requests back to their input positions
+            positions: Dict[str, List[int]] = {}
+            for index, request in enumerate(write_requests):
+                positions.setdefault(_request_signature(request), []).append(index)
+            unprocessed_indexes = sorted(
+                positions[_request_signature(request)].pop(0)
+                for leftover in leftovers for request in leftover
+            )
+            
+            self._log_operation('batch_write', 'partial' if unprocessed_indexes else 'success',
+                                {'rows': len(write_requests) - len(unprocessed_indexes),
+                                 'unprocessed': len(unprocessed_indexes)})
+            return {
+                'success': not unprocessed_indexes,
+                'processed_count': len(write_requests) - len(unprocessed_indexes),
+                'unprocessed_count': len(unprocessed_indexes),
+                'unprocessed_indexes': unprocessed_indexes,
+                'table': table
             }
-            
-            return result
         except Exception as e:
+            self._log_operation('batch_write', 'failed', {'error': str(e)})
             return {
                 'success': False,
                 'error': str(e),
@@ -222,6 +587,9 @@ class DynamoDBConnector(DatabaseConnector):
 class FirestoreConnector(DatabaseConnector):
     """Google Cloud Firestore connector"""
     
+    # A write batch holds at most 500 writes
+    bulk_chunk_size = 500
+    
     def __init__(self, connection_id: str, config: Dict[str, Any]):
         super().__init__(connection_id, config)
         self.db_type = 'firestore'
@@ -293,8 +661,10 @@ class FirestoreConnector(DatabaseConnector):
                 'count': 2
             }
             
+            self._log_operation('execute_query', 'success')
             return result
         except Exception as e:
+            self._log_operation('execute_query', 'failed', {'error': str(e)})
             return {
                 'success': False,
                 'error': str(e),
@@ -341,8 +711,10 @@ class FirestoreConnector(DatabaseConnector):
                 'created_at': '2024-01-01T00:00:00Z'
             }
             
+            self._log_operation('create_document', 'success')
             return result
         except Exception as e:
+            self._log_operation('create_document', 'failed', {'error': str(e)})
             return {
                 'success': False,
                 'error': str(e),
@@ -364,8 +736,10 @@ class FirestoreConnector(DatabaseConnector):
                 'updated_at': '2024-01-01T00:00:00Z'
             }
             
+            self._log_operation('update_document', 'success')
             return result
         except Exception as e:
+            self._log_operation('update_document', 'failed', {'error': str(e)})
             return {
                 'success': False,
                 'error': str(e),
@@ -387,14 +761,20 @@ class FirestoreConnector(DatabaseConnector):
                 'deleted_at': '2024-01-01T00:00:00Z'
             }
             
+            self._log_operation('delete_document', 'success')
             return result
         except Exception as e:
+            self._log_operation('delete_document', 'failed', {'error': str(e)})
             return {
                 'success': False,
                 'error': str(e),
                 'operation': 'delete'
             }
     
+    async def _bulk_insert_chunk(self, table: str, rows: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """bulk_write inserts go through a write batch"""
+        return await self.batch_create(table, rows)
+    
     async def batch_create(self, collection: str, documents: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Batch create documents in Firestore"""
         try:
@@ -413,8 +793,10 @@ class FirestoreConnector(DatabaseConnector):
                 'collection': collection
             }
             
+            self._log_operation('batch_create', 'success')
             return result
         except Exception as e:
+            self._log_operation('batch_create', 'failed', {'error': str(e)})
             return {
                 'success': False,
                 'error': str(e),
@@ -425,6 +807,9 @@ class FirestoreConnector(DatabaseConnector):
 class CosmosDBConnector(DatabaseConnector):
     """Azure Cosmos DB connector (supports SQL API and MongoDB API)"""
     
+    # Transactional batches hold at most 100 operations
+    bulk_chunk_size = 100
+    
     def __init__(self, connection_id: str, config: Dict[str, Any]):
         super().__init__(connection_id, config)
         self.db_type = 'cosmosdb'
@@ -510,6 +895,7 @@ class CosmosDBConnector(DatabaseConnector):
             self._log_operation('execute_query', 'success')
             return result
         except Exception as e:
+            self._log_operation('execute_query', 'failed', {'error': str(e)})
             return {
                 'success': False,
                 'error': str(e),
@@ -537,6 +923,7 @@ class CosmosDBConnector(DatabaseConnector):
             self._log_operation('create_document', 'success')
             return result
         except Exception as e:
+            self._log_operation('create_document', 'failed', {'error': str(e)})
             return {
                 'success': False,
                 'error': str(e),
@@ -564,8 +951,10 @@ class CosmosDBConnector(DatabaseConnector):
                 'request_charge': 1.0
             }
             
+            self._log_operation('read_document', 'success')
             return result
         except Exception as e:
+            self._log_operation('read_document', 'failed', {'error': str(e)})
             return {
                 'success': False,
                 'error': str(e),
@@ -595,8 +984,10 @@ class CosmosDBConnector(DatabaseConnector):
                 'updated_at': '2024-01-01T00:00:00Z'
             }
             
+            self._log_operation('update_document', 'success')
             return result
         except Exception as e:
+            self._log_operation('update_document', 'failed', {'error': str(e)})
             return {
                 'success': False,
                 'error': str(e),
@@ -620,8 +1011,10 @@ class CosmosDBConnector(DatabaseConnector):
                 'deleted_at': '2024-01-01T00:00:00Z'
             }
             
+            self._log_operation('delete_document', 'success')
             return result
         except Exception as e:
+            self._log_operation('delete_document', 'failed', {'error': str(e)})
             return {
                 'success': False,
                 'error': str(e),
@@ -646,14 +1039,21 @@ class CosmosDBConnector(DatabaseConnector):
                 'operation': 'upserted'
             }
             
+            self._log_operation('upsert_document', 'success')
             return result
         except Exception as e:
+            self._log_operation('upsert_document', 'failed', {'error': str(e)})
             return {
                 'success': False,
                 'error': str(e),
                 'operation': 'upsert_document'
             }
     
+    async def _bulk_insert_chunk(self, table: str, rows: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """bulk_write inserts go through a transactional batch"""
+        operations = [{'operationType': 'Create', 'resourceBody': row} for row in rows]
+        return await self.batch_operations(table, operations)
+    
     async def batch_operations(self, container: str, operations: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Execute batch operations in Cosmos DB"""
         try:
@@ -673,8 +1073,10 @@ class CosmosDBConnector(DatabaseConnector):
                 'message': 'Batch operations completed successfully'
             }
             
+            self._log_operation('batch_operations', 'success')
             return result
         except Exception as e:
+            self._log_operation('batch_operations', 'failed', {'error': str(e)})
             return {
                 'success': False,
                 'error': str(e),
@@ -0,0 +1,210 @@
+"""
+Database Connector Manager
+Owns the live connector instances (and their pools) keyed by connection_id
+"""
+
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Dict, Any, AsyncIterator, Optional, Type
+import asyncio
+import time
+
+from .base_connector import DatabaseConnector
+
+
+DEFAULT_IDLE_TIMEOUT_SECONDS = 300
+DEFAULT_MAX_LIFETIME_SECONDS = 3600
+DEFAULT_HEALTH_CHECK_INTERVAL_SECONDS = 60
+DEFAULT_MAX_CONNECTORS = 100
+
+
+class ConnectorManager:
+    """Caches connectors per connection_id and manages their lifecycle
+
+    - idle eviction: connectors unused for `idle_timeout` seconds are closed
+    - max lifetime: connectors older than `max_lifetime` are closed and rebuilt on next use
+    - health checks: connectors are pinged every `health_check_interval` seconds and
+      closed if the ping fails
+    - bounded size: the least recently used idle connector is closed beyond
+      `max_connectors`; leased connectors are never evicted, so the cap can be
+      exceeded until their leases are released
+
+    Callers borrow a connector with `async with manager.lease(...)` and keep the
+    lease for the whole use (including a streamed response), so eviction cannot
+    close a connector between lookup and its first operation. Only an explicit
+    close() shuts down a leased connector, after which it refuses to reopen.
+
+    Idle timeout and max lifetime can be overridden per connection through
+    `options.idle_timeout_seconds` / `options.max_lifetime_seconds`; pool sizing
+    comes from `options.min_pool_size` / `options.max_pool_size`.
+    """
+
+    def __init__(self, idle_timeout: float = DEFAULT_IDLE_TIMEOUT_SECONDS,
+                 max_lifetime: float = DEFAULT_MAX_LIFETIME_SECONDS,
+                 health_check_interval: float = DEFAULT_HEALTH_CHECK_INTERVAL_SECONDS,
+                 max_connectors: int = DEFAULT_MAX_CONNECTORS):
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+        self.health_check_interval = health_check_interval
+        self.max_connectors = max_connectors
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._maintenance_task: Optional[asyncio.Task] = None
+        self._evictions: Dict[str, int] = {}
+
+    def __contains__(self, connection_id: str) -> bool:
+        return connection_id in self._entries
+
+    @asynccontextmanager
+    async def lease(self, connection_id: str, connection: Dict[str, Any],
+                    connector_class: Type[DatabaseConnector]) -> AsyncIterator[DatabaseConnector]:
+        """Borrow the cached connector for a connection, creating it on first use
+        
+        The connector is not evicted while the lease is held.
+        """
+        self._ensure_maintenance_task()
+
+        entry = self._entries.get(connection_id)
+        created = entry is None
+        if created:
+            entry = {
+                'connector': connector_class(connection_id, connection),
+                'created_at': time.monotonic(),
+                'last_used': time.monotonic(),
+                'last_health_check': None,
+                'healthy': None,
+                'leases': 0
+            }
+            self._entries[connection_id] = entry
+
+        # Taken before any await so a concurrent sweep cannot evict the entry
+        entry['leases'] += 1
+        entry['last_used'] = time.monotonic()
+        self._entries.move_to_end(connection_id)
+        try:
+            if created:
+                await self._enforce_max_connectors()
+            yield entry['connector']
+        finally:
+            entry['leases'] -= 1
+            entry['last_used'] = time.monotonic()
+
+    @staticmethod
+    def _busy(entry: Dict[str, Any]) -> bool:
+        return bool(entry['leases'] or entry['connector']._in_use)
+
+    async def close(self, connection_id: str, reason: str = 'closed') -> bool:
+        """Close and forget a connection's connector"""
+        entry = self._entries.pop(connection_id, None)
+        if entry is None:
+            return False
+
+        self._evictions[reason] = self._evictions.get(reason, 0) + 1
+        try:
+            await entry['connector'].close()
+        except Exception as e:
+            print(f"[ConnectorManager] Failed to close {connection_id}: {e}")
+        return True
+
+    async def close_all(self):
+        """Stop maintenance and close every connector (application shutdown)"""
+        if self._maintenance_task:
+            self._maintenance_task.cancel()
+            try:
+                await self._maintenance_task
+            except asyncio.CancelledError:
+                pass
+            self._maintenance_task = None
+
+        await asyncio.gather(
+            *(self.close(connection_id, 'shutdown') for connection_id in list(self._entries)),
+            return_exceptions=True
+        )
+
+    async def sweep(self):
+        """Evict idle or expired connectors and health-check the rest"""
+        now = time.monotonic()
+        for connection_id, entry in list(self._entries.items()):
+            if self._busy(entry):
+                continue
+
+            connector = entry['connector']
+
+            options = connector.config.get('options') or {}
+            idle_timeout = options.get('idle_timeout_seconds', self.idle_timeout)
+            max_lifetime = options.get('max_lifetime_seconds', self.max_lifetime)
+
+            if now - entry['last_used'] > idle_timeout:
+                await self.close(connection_id, 'idle')
+            elif now - entry['created_at'] > max_lifetime:
+                await self.close(connection_id, 'max_lifetime')
+            elif connector.pool is not None and (
+                entry['last_health_check'] is None
+                or now - entry['last_health_check'] >= self.health_check_interval
+            ):
+                await self._health_check(connection_id, entry)
+
+        # Connectors that were busy when the cap was last enforced
+        await self._enforce_max_connectors()
+
+    async def _health_check(self, connection_id: str, entry: Dict[str, Any]):
+        try:
+            healthy = await asyncio.wait_for(entry['connector'].ping(), timeout=10)
+        except Exception:
+            healthy = False
+
+        entry['last_health_check'] = time.monotonic()
+        entry['healthy'] = healthy
+        if not healthy:
+            await self.close(connection_id, 'health_check_failed')
+
+    async def _enforce_max_connectors(self):
+        """Close least recently used idle connectors until at most max_connectors remain"""
+        excess = len(self._entries) - self.max_connectors
+        if excess <= 0:
+            return
+        evictable = [
+            connection_id for connection_id, entry in self._entries.items()
+            if not self._busy(entry)
+        ]
+        for connection_id in evictable[:excess]:
+            await self.close(connection_id, 'capacity')
+
+    def _ensure_maintenance_task(self):
+        if self._maintenance_task is None or self._maintenance_task.done():
+            self._maintenance_task = asyncio.get_running_loop().create_task(self._maintenance_loop())
+
+    async def _maintenance_loop(self):
+        interval = max(1, min(self.health_check_interval, self.idle_timeout) / 2)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.sweep()
+            except Exception as e:
+                print(f"[ConnectorManager] Maintenance sweep failed: {e}")
+
+    def metrics(self, connection_id: Optional[str] = None) -> Dict[str, Any]:
+        """Pool metrics per connection_id (or for a single connection)"""
+        now = time.monotonic()
+
+        def entry_metrics(entry: Dict[str, Any]) -> Dict[str, Any]:
+            connector = entry['connector']
+            return {
+                'type': connector.__class__.__name__,
+                'connected': connector.connection is not None,
+                'age_seconds': round(now - entry['created_at'], 1),
+                'idle_seconds': round(now - entry['last_used'], 1),
+                'healthy': entry['healthy'],
+                'leases': entry['leases'],
+                'pool': connector.pool_stats()
+            }
+
+        if connection_id is not None:
+            entry = self._entries.get(connection_id)
+            return entry_metrics(entry) if entry else {}
+
+        return {
+            'connections': {cid: entry_metrics(entry) for cid, entry in self._entries.items()},
+            'active_connectors': len(self._entries),
+            'max_connectors': self.max_connectors,
+            'evictions': dict(self._evictions)
+        }
@@ -3,34 +3,130 @@ NoSQL Database Connectors
 Supports MongoDB (enhanced), Redis, and Apache Cassandra
 """
 
-from typing import Dict, Any, List, Optional
-from .base_connector import DatabaseConnector
+from typing import Dict, Any, AsyncIterator, List, Optional
+from .base_connector import DatabaseConnector, DEFAULT_STREAM_BATCH_SIZE
+from .telemetry import LatencyHistogram
 import json
+import shlex
+import time
+
+import redis.asyncio as aioredis
+from bson import Decimal128, ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReadPreference, WriteConcern
+from pymongo.errors import BulkWriteError
+from redis.exceptions import NoScriptError
+
+
+DEFAULT_BULK_CHUNK_SIZE = 1000
+MAX_REPORTED_WRITE_ERRORS = 100
+# Commands sent per Redis pipeline round trip
+DEFAULT_PIPELINE_CHUNK_SIZE = 5000
+
+_READ_PREFERENCES = {
+    'primary': ReadPreference.PRIMARY,
+    'primarypreferred': ReadPreference.PRIMARY_PREFERRED,
+    'secondary': ReadPreference.SECONDARY,
+    'secondarypreferred': ReadPreference.SECONDARY_PREFERRED,
+    'nearest': ReadPreference.NEAREST
+}
+
+
+def _read_preference(name: str):
+    """Map a read preference name (e.g. 'secondaryPreferred') to a pymongo read preference"""
+    try:
+        return _READ_PREFERENCES[name.replace('_', '').lower()]
+    except KeyError:
+        raise ValueError(f"Unknown read preference: {name}")
+
+
+def _write_concern_kwargs(write_concern: Any) -> Dict[str, Any]:
+    """Accept 'majority', an int, or a {w, j, wtimeout} dict"""
+    if isinstance(write_concern, dict):
+        return {k: v for k, v in write_concern.items() if k in ('w', 'j', 'wtimeout')}
+    return {'w': write_concern}
+
+
+def _redis_value(value: Any) -> Any:
+    """Redis stores strings and numbers; structured values are stored as JSON"""
+    if isinstance(value, (dict, list, bool)) or value is None:
+        return json.dumps(value)
+    return value
+
+
+def _to_jsonable(value: Any) -> Any:
+    """Convert BSON-only types (ObjectId, Decimal128) so results can be JSON encoded"""
+    if isinstance(value, dict):
+        return {k: _to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_to_jsonable(v) for v in value]
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, Decimal128):
+        return str(value.to_decimal())
+    return value
 
 
 class MongoDBConnector(DatabaseConnector):
-    """Enhanced MongoDB connector with aggregation and bulk operations"""
+    """MongoDB connector backed by a Motor client, with bulk and aggregation streaming"""
+    
+    bulk_chunk_size = DEFAULT_BULK_CHUNK_SIZE
     
     def __init__(self, connection_id: str, config: Dict[str, Any]):
         super().__init__(connection_id, config)
         self.db_type = 'mongodb'
+        self.client = None
+        
+    def _ensure_client(self):
+        """Create the Motor client (and its connection pool) on first use"""
+        if self.client is not None:
+            return self.client
+        
+        self._check_open()
+        options = self.config.get('options') or {}
+        client_kwargs = {
+            'maxPoolSize': int(options.get('max_pool_size', 100)),
+            'minPoolSize': int(options.get('min_pool_size', 0)),
+            'tz_aware': True
+        }
+        if self.config.get('ssl'):
+            client_kwargs['tls'] = True
+        if options.get('read_preference'):
+            client_kwargs['readPreference'] = options['read_preference']
+        if options.get('write_concern'):
+            client_kwargs.update(_write_concern_kwargs(options['write_concern']))
+        
+        if options.get('uri'):
+            self.client = AsyncIOMotorClient(options['uri'], **client_kwargs)
+        else:
+            self.client = AsyncIOMotorClient(
+                host=self.config.get('host') or 'localhost',
+                port=self.config.get('port') or 27017,
+                username=self.config.get('username') or None,
+                password=self.decrypt_credential(self.config.get('password', '')) or None,
+                **client_kwargs
+            )
+        
+        self.pool = self.client
+        self.connection = self.client[self.config.get('database') or 'test']
+        return self.client
+    
+    def _collection(self, name: str, read_preference: Optional[str] = None,
+                    write_concern: Optional[Dict[str, Any]] = None):
+        """Get a collection handle, optionally overriding read preference / write concern"""
+        self._ensure_client()
+        overrides = {}
+        if read_preference:
+            overrides['read_preference'] = _read_preference(read_preference)
+        if write_concern:
+            overrides['write_concern'] = WriteConcern(**_write_concern_kwargs(write_concern))
+        return self.connection.get_collection(name, **overrides)
         
     async def connect(self) -> bool:
         """Establish MongoDB connection"""
         try:
             self._log_operation('connect', 'attempting')
-            
-            # Decrypt password if present
-            password = self.decrypt_credential(self.config.get('password', ''))
-            
-            # Simulate connection
-            self.connection = {
-                'host': self.config.get('host', 'localhost'),
-                'port': self.config.get('port', 27017),
-                'database': self.config.get('database'),
-                'connected': True
-            }
-            
+            self._ensure_client()
             self._log_operation('connect', 'success')
             return True
         except Exception as e:
@@ -40,8 +136,10 @@ class MongoDBConnector(DatabaseConnector):
     async def disconnect(self) -> bool:
         """Close MongoDB connection"""
         try:
-            if self.connection:
-                self.connection['connected'] = False
+            if self.client:
+                self.client.close()
+                self.client = None
+                self.pool = None
                 self.connection = None
                 self._log_operation('disconnect', 'success')
             return True
@@ -49,54 +147,104 @@ class MongoDBConnector(DatabaseConnector):
             self._log_operation('disconnect', 'failed', {'error': str(e)})
             return False
     
+    async def ping(self) -> bool:
+        """Ping the server through the shared client"""
+        result = await self._ensure_client().admin.command('ping')
+        return bool(result.get('ok'))
+    
     async def test_connection(self) -> Dict[str, Any]:
         """Test MongoDB connection"""
+        owns_client = self.client is None
         try:
-            await self.connect()
+            client = self._ensure_client()
+            await client.admin.command('ping')
+            server_info = await client.server_info()
             
-            result = {
+            return {
                 'success': True,
                 'message': 'Connection successful',
                 'database_type': 'MongoDB',
-                'version': '6.0 (simulated)',
+                'version': server_info.get('version'),
                 'host': self.config.get('host'),
                 'database': self.config.get('database')
             }
-            
-            await self.disconnect()
-            return result
         except Exception as e:
             return {
                 'success': False,
                 'message': f'Connection failed: {str(e)}',
                 'database_type': 'MongoDB'
             }
+        finally:
+            if owns_client:
+                await self.disconnect()
+    
+    def _parse_query(self, query: Any, params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Normalize a find/aggregate query
+        
+        Accepts `{"find": "<collection>", "filter": {...}, "projection", "sort", "limit"}`,
+        `{"aggregate": "<collection>", "pipeline": [...]}`, or a plain filter with the
+        collection (and find options) given in params.
+        """
+        query_obj = json.loads(query) if isinstance(query, str) else (query or {})
+        params = params or {}
+        
+        if 'aggregate' in query_obj:
+            return {
+                'collection': query_obj['aggregate'],
+                'pipeline': query_obj.get('pipeline', []),
+                'read_preference': query_obj.get('read_preference', params.get('read_preference'))
+            }
+        
+        if 'find' in query_obj:
+            spec = dict(query_obj)
+            spec['collection'] = spec.pop('find')
+        else:
+            spec = {**params, 'filter': query_obj}
+        
+        spec.setdefault('collection', params.get('collection'))
+        if not spec.get('collection'):
+            raise ValueError('No collection specified (use {"find": "<collection>", ...} or params.collection)')
+        return spec
+    
+    def _find_cursor(self, spec: Dict[str, Any], batch_size: Optional[int] = None):
+        collection = self._collection(spec['collection'], spec.get('read_preference'))
+        if 'pipeline' in spec:
+            kwargs = {'allowDiskUse': True}
+            if batch_size:
+                kwargs['batchSize'] = batch_size
+            return collection.aggregate(spec['pipeline'], **kwargs)
+        
+        cursor = collection.find(spec.get('filter') or {}, spec.get('projection'))
+        if spec.get('sort'):
+            cursor = cursor.sort(list(spec['sort'].items()) if isinstance(spec['sort'], dict) else spec['sort'])
+        if spec.get('skip'):
+            cursor = cursor.skip(int(spec['skip']))
+        if spec.get('limit'):
+            cursor = cursor.limit(int(spec['limit']))
+        if batch_size:
+            cursor = cursor.batch_size(batch_size)
+        return cursor
     
     async def execute_query(self, query: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Execute MongoDB query (find operation)"""
+        """Execute MongoDB query (find or aggregate)"""
         try:
-            if not self.connection or not self.connection.get('connected'):
-                await self.connect()
+            self._log_operation('execute_query', 'executing', {'query': str(query)[:100]})
             
-            self._log_operation('execute_query', 'executing', {'query': query[:100]})
-            
-            # Parse query as JSON (MongoDB query syntax)
-            try:
-                query_obj = json.loads(query) if isinstance(query, str) else query
-            except:
-                query_obj = {}
+            spec = self._parse_query(query, params)
+            started = time.perf_counter()
+            documents = await self._find_cursor(spec).to_list(length=None)
+            data = [_to_jsonable(doc) for doc in documents]
             
             result = {
                 'success': True,
-                'data': [
-                    {'_id': '507f1f77bcf86cd799439011', 'name': 'MongoDB Sample', 'value': 100},
-                    {'_id': '507f1f77bcf86cd799439012', 'name': 'Another Doc', 'value': 200}
-                ],
-                'count': 2,
-                'query': query_obj
+                'data': data,
+                'count': len(data),
+                'query': _to_jsonable({k: v for k, v in spec.items() if k != 'collection'}),
+                'collection': spec['collection'],
+                'execution_time_ms': round((time.perf_counter() - started) * 1000, 2)
             }
             
-            self._log_operation('execute_query', 'success')
+            self._log_operation('execute_query', 'success', {'rows': result['count']})
             return result
         except Exception as e:
             self._log_operation('execute_query', 'failed', {'error': str(e)})
@@ -106,130 +254,185 @@ class MongoDBConnector(DatabaseConnector):
                 'query': query
             }
     
-    async def insert(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    async def stream_query(self, query: str, params: Optional[Dict[str, Any]] = None,
+                           batch_size: int = DEFAULT_STREAM_BATCH_SIZE) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Stream find/aggregate results in batches straight from the server cursor"""
+        spec = self._parse_query(query, params)
+        self._log_operation('stream_query', 'executing', {'collection': spec['collection']})
+        
+        cursor = self._find_cursor(spec, batch_size)
+        try:
+            while True:
+                documents = await cursor.to_list(length=batch_size)
+                if not documents:
+                    break
+                yield [_to_jsonable(doc) for doc in documents]
+        finally:
+            await cursor.close()
+        
+        self._log_operation('stream_query', 'success')
+    
+    async def insert(self, table: str, data: Dict[str, Any],
+                     write_concern: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Insert document into MongoDB collection"""
         try:
-            if not self.connection or not self.connection.get('connected'):
-                await self.connect()
-            
             self._log_operation('insert', 'executing', {'collection': table})
             
-            # In real implementation: collection.insert_one(data)
-            result = {
+            result = await self._collection(table, write_concern=write_concern).insert_one(dict(data))
+            
+            self._log_operation('insert', 'success')
+            return {
                 'success': True,
-                'inserted_id': '507f1f77bcf86cd799439013',
+                'inserted_id': str(result.inserted_id),
                 'collection': table,
-                'acknowledged': True
+                'acknowledged': result.acknowledged
             }
-            
-            self._log_operation('insert', 'success')
-            return result
         except Exception as e:
+            self._log_operation('insert', 'failed', {'error': str(e)})
             return {
                 'success': False,
                 'error': str(e),
                 'operation': 'insert'
             }
     
-    async def update(self, table: str, data: Dict[str, Any], condition: Dict[str, Any]) -> Dict[str, Any]:
-        """Update document in MongoDB collection"""
+    async def update(self, table: str, data: Dict[str, Any], condition: Dict[str, Any],
+                     write_concern: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Update documents matching condition (plain fields are applied with $set)"""
         try:
-            if not self.connection or not self.connection.get('connected'):
-                await self.connect()
-            
             self._log_operation('update', 'executing', {'collection': table})
             
-            result = {
+            update_doc = data if any(key.startswith('$') for key in data) else {'$set': data}
+            result = await self._collection(table, write_concern=write_concern).update_many(condition, update_doc)
+            
+            self._log_operation('update', 'success')
+            return {
                 'success': True,
-                'matched_count': 1,
-                'modified_count': 1,
+                'matched_count': result.matched_count,
+                'modified_count': result.modified_count,
                 'collection': table,
-                'acknowledged': True
+                'acknowledged': result.acknowledged
             }
-            
-            self._log_operation('update', 'success')
-            return result
         except Exception as e:
+            self._log_operation('update', 'failed', {'error': str(e)})
             return {
                 'success': False,
                 'error': str(e),
                 'operation': 'update'
             }
     
-    async def delete(self, table: str, condition: Dict[str, Any]) -> Dict[str, Any]:
-        """Delete document from MongoDB collection"""
+    async def delete(self, table: str, condition: Dict[str, Any],
+                     write_concern: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Delete documents matching condition"""
         try:
-            if not self.connection or not self.connection.get('connected'):
-                await self.connect()
+            if not condition:
+                return {'success': False, 'error': 'Refusing to delete without a condition', 'operation': 'delete'}
             
             self._log_operation('delete', 'executing', {'collection': table})
             
-            result = {
+            result = await self._collection(table, write_concern=write_concern).delete_many(condition)
+            
+            self._log_operation('delete', 'success')
+            return {
                 'success': True,
-                'deleted_count': 1,
+                'deleted_count': result.deleted_count,
                 'collection': table,
-                'acknowledged': True
+                'acknowledged': result.acknowledged
             }
-            
-            self._log_operation('delete', 'success')
-            return result
         except Exception as e:
+            self._log_operation('delete', 'failed', {'error': str(e)})
             return {
                 'success': False,
                 'error': str(e),
                 'operation': 'delete'
             }
     
-    async def aggregate(self, collection: str, pipeline: List[Dict[str, Any]]) -> Dict[str, Any]:
+    async def aggregate_stream(self, collection: str, pipeline: List[Dict[str, Any]],
+                               batch_size: int = DEFAULT_STREAM_BATCH_SIZE,
+                               read_preference: Optional[str] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Stream aggregation results in batches (allowDiskUse, so large $group/$sort can spill)"""
+        query = {'aggregate': collection, 'pipeline': pipeline, 'read_preference': read_preference}
+        async for batch in self.stream_query(query, batch_size=batch_size):
+            yield batch
+    
+    async def aggregate(self, collection: str, pipeline: List[Dict[str, Any]],
+                        read_preference: Optional[str] = None) -> Dict[str, Any]:
         """Execute MongoDB aggregation pipeline"""
         try:
-            if not self.connection or not self.connection.get('connected'):
-                await self.connect()
-            
             self._log_operation('aggregate', 'executing', {'collection': collection, 'stages': len(pipeline)})
             
-            # Simulate aggregation results
-            result = {
+            data = []
+            async for batch in self.aggregate_stream(collection, pipeline, read_preference=read_preference):
+                data.extend(batch)
+            
+            self._log_operation('aggregate', 'success')
+            return {
                 'success': True,
-                'data': [
-                    {'_id': 'group1', 'count': 5, 'total': 500},
-                    {'_id': 'group2', 'count': 3, 'total': 300}
-                ],
+                'data': data,
                 'collection': collection,
                 'pipeline_stages': len(pipeline)
             }
-            
-            self._log_operation('aggregate', 'success')
-            return result
         except Exception as e:
+            self._log_operation('aggregate', 'failed', {'error': str(e)})
             return {
                 'success': False,
                 'error': str(e),
                 'operation': 'aggregate'
             }
     
-    async def bulk_insert(self, collection: str, documents: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Bulk insert documents into MongoDB collection"""
+    async def bulk_insert(self, collection: str, documents: List[Dict[str, Any]],
+                          chunk_size: int = DEFAULT_BULK_CHUNK_SIZE,
+                          write_concern: Optional[Dict[str, Any]] = None,
+                          max_reported_errors: Optional[int] = MAX_REPORTED_WRITE_ERRORS) -> Dict[str, Any]:
+        """Bulk insert documents with unordered insert_many, one chunk at a time
+        
+        A failing document does not stop the rest of its chunk or later chunks;
+        failures are reported per document index alongside the inserted count.
+        `errors` lists at most `max_reported_errors` failures (None for all).
+        """
         try:
-            if not self.connection or not self.connection.get('connected'):
-                await self.connect()
-            
             if not documents:
                 return {'success': False, 'error': 'No documents provided'}
             
             self._log_operation('bulk_insert', 'executing', {'collection': collection, 'count': len(documents)})
             
-            result = {
-                'success': True,
-                'inserted_count': len(documents),
-                'inserted_ids': [f'507f1f77bcf86cd79943{i:04d}' for i in range(len(documents))],
+            target = self._collection(collection, write_concern=write_concern)
+            inserted_ids = []
+            write_errors = []
+            chunk_count = 0
+            
+            for offset in range(0, len(documents), chunk_size):
+                # Copies keep the generated ObjectIds out of the caller's documents
+                chunk = [dict(doc) for doc in documents[offset:offset + chunk_size]]
+                failed_indexes = set()
+                try:
+                    await target.insert_many(chunk, ordered=False)
+                except BulkWriteError as e:
+                    for error in e.details.get('writeErrors', []):
+                        failed_indexes.add(error['index'])
+                        write_errors.append({
+                            'index': offset + error['index'],
+                            'code': error.get('code'),
+                            'message': error.get('errmsg')
+                        })
+                chunk_count += 1
+                inserted_ids.extend(
+                    str(doc['_id']) for i, doc in enumerate(chunk) if i not in failed_indexes
+                )
+            
+            status = 'success' if not write_errors else 'partial'
+            self._log_operation('bulk_insert', status, {'inserted': len(inserted_ids), 'failed': len(write_errors)})
+            return {
+                'success': not write_errors,
+                'inserted_count': len(inserted_ids),
+                'failed_count': len(write_errors),
+                'inserted_ids': inserted_ids,
+                'errors': write_errors[:max_reported_errors],
+                'chunks': chunk_count,
                 'collection': collection,
                 'acknowledged': True
             }
-            
-            self._log_operation('bulk_insert', 'success')
-            return result
         except Exception as e:
+            self._log_operation('bulk_insert', 'failed', {'error': str(e)})
             return {
                 'success': False,
                 'error': str(e),
@@ -237,28 +440,50 @@ class MongoDBConnector(DatabaseConnector):
             }
 
 
+    async def _bulk_insert_chunk(self, table: str, rows: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """bulk_write marks ops failed from `errors`, so every failure must be listed"""
+        return await self.bulk_insert(table, rows, chunk_size=max(1, len(rows)), max_reported_errors=None)
+
+
 class RedisConnector(DatabaseConnector):
-    """Redis key-value store connector"""
+    """Redis key-value store connector backed by a redis-py asyncio connection pool"""
+    
+    bulk_chunk_size = 500
     
     def __init__(self, connection_id: str, config: Dict[str, Any]):
         super().__init__(connection_id, config)
         self.db_type = 'redis'
+        self.client = None
+        self._scripts: Dict[str, Dict[str, str]] = {}
+        self.pipeline_latency = LatencyHistogram()
+        
+    def _ensure_client(self):
+        """Create the Redis client and its connection pool on first use"""
+        if self.client is not None:
+            return self.client
+        
+        self._check_open()
+        options = self.config.get('options') or {}
+        self.client = aioredis.Redis(
+            host=self.config.get('host') or 'localhost',
+            port=self.config.get('port') or 6379,
+            db=int(self.config.get('database') or 0),
+            username=self.config.get('username') or None,
+            password=self.decrypt_credential(self.config.get('password', '')) or None,
+            ssl=bool(self.config.get('ssl')),
+            max_connections=int(options.get('max_pool_size', 50)),
+            socket_timeout=options.get('socket_timeout'),
+            decode_responses=True
+        )
+        self.pool = self.client.connection_pool
+        self.connection = self.client
+        return self.client
         
     async def connect(self) -> bool:
         """Establish Redis connection"""
         try:
             self._log_operation('connect', 'attempting')
-            
-            # Decrypt password if present
-            password = self.decrypt_credential(self.config.get('password', ''))
-            
-            self.connection = {
-                'host': self.config.get('host', 'localhost'),
-                'port': self.config.get('port', 6379),
-                'db': self.config.get('database', 0),
-                'connected': True
-            }
-            
+            await self._ensure_client().ping()
             self._log_operation('connect', 'success')
             return True
         except Exception as e:
@@ -266,10 +491,12 @@ class RedisConnector(DatabaseConnector):
             return False
     
     async def disconnect(self) -> bool:
-        """Close Redis connection"""
+        """Close Redis connection pool"""
         try:
-            if self.connection:
-                self.connection['connected'] = False
+            if self.client:
+                await self.client.aclose(close_connection_pool=True)
+                self.client = None
+                self.pool = None
                 self.connection = None
                 self._log_operation('disconnect', 'success')
             return True
@@ -277,51 +504,77 @@ class RedisConnector(DatabaseConnector):
             self._log_operation('disconnect', 'failed', {'error': str(e)})
             return False
     
+    async def ping(self) -> bool:
+        """PING through the pool"""
+        return bool(await self._ensure_client().ping())
+    
+    def _driver_pool_stats(self) -> Dict[str, Any]:
+        available = len(getattr(self.pool, '_available_connections', []))
+        in_use = len(getattr(self.pool, '_in_use_connections', []))
+        return {
+            'size': available + in_use,
+            'idle': available,
+            'redis_in_use': in_use,
+            'max_size': self.pool.max_connections
+        }
+    
+    def pool_stats(self) -> Dict[str, Any]:
+        """Pool usage plus pipeline latency histogram"""
+        stats = super().pool_stats()
+        stats['pipeline_latency'] = self.pipeline_latency.snapshot()
+        return stats
+    
     async def test_connection(self) -> Dict[str, Any]:
         """Test Redis connection"""
+        owns_client = self.client is None
         try:
-            await self.connect()
+            client = self._ensure_client()
+            await client.ping()
+            server_info = await client.info('server')
             
-            result = {
+            return {
                 'success': True,
                 'message': 'Connection successful (PING OK)',
                 'database_type': 'Redis',
-                'version': '7.0 (simulated)',
+                'version': server_info.get('redis_version'),
                 'host': self.config.get('host'),
                 'db': self.config.get('database', 0)
             }
-            
-            await self.disconnect()
-            return result
         except Exception as e:
             return {
                 'success': False,
                 'message': f'Connection failed: {str(e)}',
                 'database_type': 'Redis'
             }
+        finally:
+            if owns_client:
+                await self.disconnect()
     
     async def execute_query(self, query: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Execute Redis command"""
+        """Execute a raw Redis command, e.g. "HGET user:1 name" (extra args in params.args)"""
         try:
-            if not self.connection or not self.connection.get('connected'):
-                await self.connect()
-            
-            # Parse Redis command
-            command_parts = query.strip().split()
-            command = command_parts[0].upper() if command_parts else 'GET'
+            command_parts = shlex.split(query.strip())
+            if not command_parts:
+                return {'success': False, 'error': 'Empty command', 'query': query}
+            command = command_parts[0].upper()
+            args = command_parts[1:] + list((params or {}).get('args', []))
             
             self._log_operation('execute_query', 'executing', {'command': command})
             
+            started = time.perf_counter()
+            value = await self._ensure_client().execute_command(command, *args)
+            
             result = {
                 'success': True,
                 'command': command,
-                'result': 'OK' if command in ['SET', 'DEL'] else 'sample_value',
-                'execution_time_ms': 2
+                'result': value,
+                'execution_time_ms': round((time.perf_counter() - started) * 1000, 2)
             }
             
             self._log_operation('execute_query', 'success')
             return result
         except Exception as e:
+            self._log_operation('execute_query', 'failed', {'error': str(e)})
             return {
                 'success': False,
                 'error': str(e),
@@ -331,17 +584,14 @@ class RedisConnector(DatabaseConnector):
     async def get(self, key: str) -> Dict[str, Any]:
         """Get value from Redis"""
         try:
-            if not self.connection or not self.connection.get('connected'):
-                await self.connect()
+            value = await self._ensure_client().get(key)
             
-            result = {
+            return {
                 'success': True,
                 'key': key,
-                'value': f'value_for_{key}',
-                'exists': True
+                'value': value,
+                'exists': value is not None
             }
-            
-            return result
         except Exception as e:
             return {
                 'success': False,
@@ -352,25 +602,180 @@ class RedisConnector(DatabaseConnector):
     async def set(self, key: str, value: Any, expire: Optional[int] = None) -> Dict[str, Any]:
         """Set value in Redis"""
         try:
-            if not self.connection or not self.connection.get('connected'):
-                await self.connect()
+            await self._ensure_client().set(key, _redis_value(value), ex=expire)
             
-            result = {
+            return {
                 'success': True,
                 'key': key,
                 'value': value,
                 'expire': expire,
                 'result': 'OK'
             }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e),
+                'operation': 'set'
+            }
+    
+    async def mget(self, keys: List[str]) -> Dict[str, Any]:
+        """Get many keys in one round trip"""
+        try:
+            values = await self._ensure_client().mget(keys) if keys else []
+            
+            return {
+                'success': True,
+                'values': dict(zip(keys, values)),
+                'found': sum(1 for value in values if value is not None),
+                'missing': [key for key, value in zip(keys, values) if value is None]
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e),
+                'operation': 'mget'
+            }
+    
+    async def mset(self, mapping: Dict[str, Any], expire: Optional[int] = None) -> Dict[str, Any]:
+        """Set many keys in one round trip (pipelined SET ... EX when an expiry is given)"""
+        try:
+            if not mapping:
+                return {'success': True, 'keys_set': 0}
+            
+            values = {key: _redis_value(value) for key, value in mapping.items()}
+            if expire is None:
+                await self._ensure_client().mset(values)
+            else:
+                commands = [['SET', key, value, 'EX', expire] for key, value in values.items()]
+                result = await self.pipeline(commands)
+                if not result['success']:
+                    return result
+            
+            return {
+                'success': True,
+                'keys_set': len(values),
+                'expire': expire
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e),
+                'operation': 'mset'
+            }
+    
+    async def pipeline(self, commands: List[Any], transaction: bool = False,
+                       chunk_size: int = DEFAULT_PIPELINE_CHUNK_SIZE) -> Dict[str, Any]:
+        """Run a batch of commands with one round trip per chunk
+        
+        Commands are argument lists (["INCRBY", "hits", 5]) or command strings.
+        A failing command does not abort the batch; its error is returned in place
+        of its result.
+        """
+        try:
+            client = self._ensure_client()
+            results = []
+            errors = 0
+            
+            for offset in range(0, len(commands), chunk_size):
+                pipe = client.pipeline(transaction=transaction)
+                for command in commands[offset:offset + chunk_size]:
+                    parts = shlex.split(command) if isinstance(command, str) else list(command)
+                    pipe.execute_command(*parts)
+                
+                started = time.perf_counter()
+                chunk_results = await pipe.execute(raise_on_error=False)
+                self.pipeline_latency.observe((time.perf_counter() - started) * 1000)
+                
+                for value in chunk_results:
+                    if isinstance(value, Exception):
+                        errors += 1
+                        results.append({'error': str(value)})
+                    else:
+                        results.append(value)
+            
+            return {
+                'success': errors == 0,
+                'results': results,
+                'commands': len(commands),
+                'errors': errors
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e),
+                'operation': 'pipeline'
+            }
+    
+    async def register_script(self, name: str, source: str) -> Dict[str, Any]:
+        """Load a Lua script into the server script cache so it can be run by SHA"""
+        try:
+            sha = await self._ensure_client().script_load(source)
+            self._scripts[name] = {'sha': sha, 'source': source}
+            return {'success': True, 'name': name, 'sha': sha}
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e),
+                'operation': 'register_script'
+            }
+    
+    def _script_sha(self, name: str) -> str:
+        if name not in self._scripts:
+            raise ValueError(f"Script '{name}' is not registered")
+        return self._scripts[name]['sha']
+    
+    async def eval_script(self, name: str, keys: Optional[List[str]] = None,
+                          args: Optional[List[Any]] = None) -> Dict[str, Any]:
+        """Run a registered script with EVALSHA (reloading it if the server lost it)"""
+        try:
+            keys = keys or []
+            args = args or []
+            client = self._ensure_client()
+            sha = self._script_sha(name)
+            try:
+                value = await client.evalsha(sha, len(keys), *keys, *args)
+            except NoScriptError:
+                # Server restarted or SCRIPT FLUSH ran; reload and retry once
+                await self.register_script(name, self._scripts[name]['source'])
+                value = await client.evalsha(self._scripts[name]['sha'], len(keys), *keys, *args)
             
+            return {'success': True, 'script': name, 'result': value}
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e),
+                'operation': 'eval_script'
+            }
+    
+    async def eval_script_batch(self, name: str, calls: List[Dict[str, Any]],
+                                chunk_size: int = DEFAULT_PIPELINE_CHUNK_SIZE) -> Dict[str, Any]:
+        """Pipeline many EVALSHA calls ({"keys": [...], "args": [...]} each) for one script"""
+        try:
+            sha = self._script_sha(name)
+            # Make sure the script is cached server-side before pipelining EVALSHA
+            if not (await self._ensure_client().script_exists(sha))[0]:
+                await self.register_script(name, self._scripts[name]['source'])
+                sha = self._scripts[name]['sha']
+            
+            commands = []
+            for call in calls:
+                keys = call.get('keys', [])
+                commands.append(['EVALSHA', sha, len(keys), *keys, *call.get('args', [])])
+            
+            result = await self.pipeline(commands, chunk_size=chunk_size)
+            result['script'] = name
             return result
         except Exception as e:
             return {
                 'success': False,
                 'error': str(e),
-                'operation': 'set'
+                'operation': 'eval_script_batch'
             }
     
+    async def _bulk_insert_chunk(self, table: str, rows: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """bulk_write inserts become a single MSET (same keys as insert())"""
+        return await self.mset({f"{table}:{row.get('id', 'default')}": json.dumps(row) for row in rows})
+    
     async def insert(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Insert (SET) in Redis - table is used as key prefix"""
         key = f"{table}:{data.get('id', 'default')}"
@@ -384,18 +789,14 @@ class RedisConnector(DatabaseConnector):
     async def delete(self, table: str, condition: Dict[str, Any]) -> Dict[str, Any]:
         """Delete (DEL) from Redis"""
         try:
-            if not self.connection or not self.connection.get('connected'):
-                await self.connect()
-            
             key = f"{table}:{condition.get('id', 'default')}"
+            deleted = await self._ensure_client().delete(key)
             
-            result = {
+            return {
                 'success': True,
                 'key': key,
-                'deleted': 1
+                'deleted': deleted
             }
-            
-            return result
         except Exception as e:
             return {
                 'success': False,
@@ -406,17 +807,14 @@ class RedisConnector(DatabaseConnector):
     async def increment(self, key: str, amount: int = 1) -> Dict[str, Any]:
         """Increment value in Redis"""
         try:
-            if not self.connection or not self.connection.get('connected'):
-                await self.connect()
+            new_value = await self._ensure_client().incrby(key, amount)
             
-            result = {
+            return {
                 'success': True,
                 'key': key,
-                'new_value': 100 + amount,  # Simulated
+                'new_value': new_value,
                 'incremented_by': amount
             }
-            
-            return result
         except Exception as e:
             return {
                 'success': False,
@@ -428,6 +826,8 @@ class RedisConnector(DatabaseConnector):
 class CassandraConnector(DatabaseConnector):
     """Apache Cassandra distributed database connector"""
     
+    bulk_chunk_size = 50
+    
     def __init__(self, connection_id: str, config: Dict[str, Any]):
         super().__init__(connection_id, config)
         self.db_type = 'cassandra'
@@ -3,38 +3,142 @@ SQL Database Connectors
 Supports PostgreSQL, MySQL, Microsoft SQL Server, and Oracle
 """
 
-from typing import Dict, Any, List, Optional
-from .base_connector import DatabaseConnector
+from typing import Dict, Any, AsyncIterator, Iterator, List, Optional, Tuple
+from .base_connector import DatabaseConnector, DEFAULT_STREAM_BATCH_SIZE
 import asyncio
 import json
+import re
+import ssl
+import time
+
+import aiomysql
+import asyncpg
+
+
+DEFAULT_MIN_POOL_SIZE = 1
+DEFAULT_MAX_POOL_SIZE = 10
+DEFAULT_STATEMENT_CACHE_SIZE = 256
+DEFAULT_BULK_CHUNK_SIZE = 1000
+
+# Statements that return a result set without modifying rows
+_READ_PREFIXES = ('SELECT', 'WITH', 'SHOW', 'VALUES', 'EXPLAIN', 'DESCRIBE', 'TABLE')
+_RETURNING = re.compile(r'\bRETURNING\b', re.IGNORECASE)
+
+
+def _pool_bounds(options: Dict[str, Any]) -> Tuple[int, int]:
+    """Read min/max pool size from connection options"""
+    min_size = int(options.get('min_pool_size', DEFAULT_MIN_POOL_SIZE))
+    max_size = int(options.get('max_pool_size', DEFAULT_MAX_POOL_SIZE))
+    return min_size, max(min_size, max_size)
+
+
+def _is_read_query(query: str) -> bool:
+    return query.lstrip().upper().startswith(_READ_PREFIXES)
+
+
+def _returns_rows(query: str) -> bool:
+    return _is_read_query(query) or _RETURNING.search(query) is not None
+
+
+def _positional_params(params: Optional[Any]) -> List[Any]:
+    """Positional arguments from a params dict (insertion order) or list"""
+    if not params:
+        return []
+    if isinstance(params, dict):
+        return list(params.values())
+    return list(params)
+
+
+def _mysql_params(query: str, params: Optional[Any]) -> Optional[Any]:
+    """Keep dicts for %(name)s placeholders, otherwise bind positionally"""
+    if not params:
+        return None
+    if isinstance(params, dict) and '%(' in query:
+        return params
+    return tuple(_positional_params(params))
+
+
+def _rows_from_status(status: str) -> int:
+    """Row count from a PostgreSQL command tag such as 'UPDATE 3' or 'INSERT 0 5'"""
+    tail = status.rsplit(' ', 1)[-1] if status else ''
+    return int(tail) if tail.isdigit() else 0
+
+
+def _bulk_columns(data_list: List[Dict[str, Any]]) -> List[str]:
+    """Union of row keys in first-seen order; missing values are inserted as NULL"""
+    columns: Dict[str, None] = {}
+    for row in data_list:
+        for key in row:
+            columns.setdefault(key, None)
+    return list(columns)
+
+
+def _chunks(items: List[Any], size: int) -> Iterator[List[Any]]:
+    size = max(1, int(size))
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
 
 
 class PostgreSQLConnector(DatabaseConnector):
-    """PostgreSQL database connector with connection pooling"""
+    """PostgreSQL database connector backed by an asyncpg connection pool"""
+    
+    bulk_chunk_size = DEFAULT_BULK_CHUNK_SIZE
     
     def __init__(self, connection_id: str, config: Dict[str, Any]):
         super().__init__(connection_id, config)
         self.db_type = 'postgresql'
+        self._pool_lock = asyncio.Lock()
+        
+    async def _ensure_pool(self):
+        """Create the connection pool on first use"""
+        if self.pool is not None:
+            return self.pool
+        
+        async with self._pool_lock:
+            if self.pool is None:
+                self._check_open()
+                options = self.config.get('options') or {}
+                min_size, max_size = _pool_bounds(options)
+                
+                self.pool = await asyncpg.create_pool(
+                    host=self.config.get('host') or 'localhost',
+                    port=self.config.get('port') or 5432,
+                    database=self.config.get('database'),
+                    user=self.config.get('username'),
+                    password=self.decrypt_credential(self.config.get('password', '')) or None,
+                    ssl='require' if self.config.get('ssl') else None,
+                    min_size=min_size,
+                    max_size=max_size,
+                    # asyncpg prepares every statement and caches it per connection
+                    statement_cache_size=int(options.get('statement_cache_size', DEFAULT_STATEMENT_CACHE_SIZE)),
+                    command_timeout=options.get('command_timeout'),
+                    init=self._on_connection_init
+                )
+                self.connection = self.pool
+        return self.pool
+        
+    async def _on_connection_init(self, conn):
+        self._record_connection_created()
+    
+    def _driver_pool_stats(self) -> Dict[str, Any]:
+        return {
+            'size': self.pool.get_size(),
+            'idle': self.pool.get_idle_size(),
+            'min_size': self.pool.get_min_size(),
+            'max_size': self.pool.get_max_size()
+        }
+    
+    async def ping(self) -> bool:
+        """Run a trivial query on a pooled connection"""
+        await self._ensure_pool()
+        async with self._acquire() as conn:
+            return await conn.fetchval('SELECT 1') == 1
         
     async def connect(self) -> bool:
-        """Establish PostgreSQL connection"""
+        """Establish PostgreSQL connection pool"""
         try:
-            # In a real implementation, use asyncpg or psycopg2
-            # For now, simulate connection
             self._log_operation('connect', 'attempting')
-            
-            # Decrypt password
-            password = self.decrypt_credential(self.config.get('password', ''))
-            
-            # Simulate connection establishment
-            self.connection = {
-                'host': self.config.get('host', 'localhost'),
-                'port': self.config.get('port', 5432),
-                'database': self.config.get('database'),
-                'user': self.config.get('username'),
-                'connected': True
-            }
-            
+            await self._ensure_pool()
             self._log_operation('connect', 'success')
             return True
         except Exception as e:
@@ -42,10 +146,11 @@ class PostgreSQLConnector(DatabaseConnector):
             return False
     
     async def disconnect(self) -> bool:
-        """Close PostgreSQL connection"""
+        """Close PostgreSQL connection pool"""
         try:
-            if self.connection:
-                self.connection['connected'] = False
+            if self.pool:
+                await self.pool.close()
+                self.pool = None
                 self.connection = None
                 self._log_operation('disconnect', 'success')
             return True
@@ -55,57 +160,59 @@ class PostgreSQLConnector(DatabaseConnector):
     
     async def test_connection(self) -> Dict[str, Any]:
         """Test PostgreSQL connection"""
+        owns_pool = self.pool is None
         try:
-            await self.connect()
+            await self._ensure_pool()
+            async with self._acquire() as conn:
+                version = await conn.fetchval('SELECT version()')
             
-            # In real implementation: SELECT version()
-            result = {
+            return {
                 'success': True,
                 'message': 'Connection successful',
                 'database_type': 'PostgreSQL',
-                'version': '14.0 (simulated)',
+                'version': version,
                 'host': self.config.get('host'),
                 'database': self.config.get('database')
             }
-            
-            await self.disconnect()
-            return result
         except Exception as e:
             return {
                 'success': False,
                 'message': f'Connection failed: {str(e)}',
                 'database_type': 'PostgreSQL'
             }
+        finally:
+            if owns_pool:
+                await self.disconnect()
     
     async def execute_query(self, query: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Execute PostgreSQL query"""
+        """Execute PostgreSQL query (positional $n placeholders, bound in params order)"""
         try:
-            if not self.connection or not self.connection.get('connected'):
-                await self.connect()
+            await self._ensure_pool()
             
             self._log_operation('execute_query', 'executing', {'query': query[:100]})
             
-            # In real implementation: Execute with asyncpg
-            # Simulate query execution
+            args = _positional_params(params)
+            started = time.perf_counter()
             result = {
                 'success': True,
                 'rows_affected': 0,
                 'data': [],
-                'query': query,
-                'execution_time_ms': 45
+                'query': query
             }
             
-            # Simulate SELECT results
-            if query.strip().upper().startswith('SELECT'):
-                result['data'] = [
-                    {'id': 1, 'name': 'Sample Data', 'created_at': '2024-01-01'},
-                    {'id': 2, 'name': 'Another Row', 'created_at': '2024-01-02'}
-                ]
-                result['row_count'] = len(result['data'])
-            else:
-                result['rows_affected'] = 1
+            async with self._acquire() as conn:
+                if _returns_rows(query):
+                    records = await conn.fetch(query, *args)
+                    result['data'] = [dict(record) for record in records]
+                    result['row_count'] = len(result['data'])
+                    if not _is_read_query(query):
+                        result['rows_affected'] = result['row_count']
+                else:
+                    status = await conn.execute(query, *args)
+                    result['rows_affected'] = _rows_from_status(status)
             
-            self._log_operation('execute_query', 'success')
+            result['execution_time_ms'] = round((time.perf_counter() - started) * 1000, 2)
+            self._log_operation('execute_query', 'success', {'rows': result.get('row_count', result['rows_affected'])})
             return result
         except Exception as e:
             self._log_operation('execute_query', 'failed', {'error': str(e)})
@@ -115,6 +222,24 @@ class PostgreSQLConnector(DatabaseConnector):
                 'query': query
             }
     
+    async def stream_query(self, query: str, params: Optional[Dict[str, Any]] = None,
+                           batch_size: int = DEFAULT_STREAM_BATCH_SIZE) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Stream PostgreSQL rows in batches through a server-side cursor"""
+        await self._ensure_pool()
+        self._log_operation('stream_query', 'executing', {'query': query[:100]})
+        
+        async with self._acquire() as conn:
+            # Server-side cursors only exist inside a transaction
+            async with conn.transaction():
+                cursor = await conn.cursor(query, *_positional_params(params))
+                while True:
+                    records = await cursor.fetch(batch_size)
+                    if not records:
+                        break
+                    yield [dict(record) for record in records]
+        
+        self._log_operation('stream_query', 'success')
+    
     async def insert(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Insert data into PostgreSQL table"""
         try:
@@ -138,7 +263,8 @@ class PostgreSQLConnector(DatabaseConnector):
             where_clause = ' AND '.join([f"{k} = ${len(data)+i+1}" for i, k in enumerate(condition.keys())])
             query = f"UPDATE {table} SET {set_clause} WHERE {where_clause}"
             
-            result = await self.execute_query(query, {**data, **condition})
+            # A column may be in both SET and WHERE, so bind the two value lists in order
+            result = await self.execute_query(query, list(data.values()) + list(condition.values()))
             return result
         except Exception as e:
             return {
@@ -162,23 +288,43 @@ class PostgreSQLConnector(DatabaseConnector):
                 'operation': 'delete'
             }
     
-    async def bulk_insert(self, table: str, data_list: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Bulk insert data into PostgreSQL table"""
+    async def bulk_insert(self, table: str, data_list: List[Dict[str, Any]],
+                          chunk_size: int = DEFAULT_BULK_CHUNK_SIZE) -> Dict[str, Any]:
+        """Bulk insert data into PostgreSQL table using COPY, one chunk at a time"""
         try:
             if not data_list:
                 return {'success': False, 'error': 'No data provided'}
             
+            await self._ensure_pool()
             self._log_operation('bulk_insert', 'executing', {'table': table, 'rows': len(data_list)})
             
-            # In real implementation: Use COPY or batch INSERT
-            inserted_count = len(data_list)
-            
+            columns = _bulk_columns(data_list)
+            schema_name, _, table_name = table.rpartition('.')
+            inserted_count = 0
+            chunk_count = 0
+            
+            # All chunks share one transaction so a failed chunk leaves no partial load
+            async with self._acquire() as conn:
+                async with conn.transaction():
+                    for chunk in _chunks(data_list, chunk_size):
+                        await conn.copy_records_to_table(
+                            table_name,
+                            records=[tuple(row.get(column) for column in columns) for row in chunk],
+                            columns=columns,
+                            schema_name=schema_name or None
+                        )
+                        inserted_count += len(chunk)
+                        chunk_count += 1
+            
+            self._log_operation('bulk_insert', 'success', {'table': table, 'rows': inserted_count})
             return {
                 'success': True,
                 'rows_inserted': inserted_count,
+                'chunks': chunk_count,
                 'table': table
             }
         except Exception as e:
+            self._log_operation('bulk_insert', 'failed', {'error': str(e)})
             return {
                 'success': False,
                 'error': str(e),
@@ -187,29 +333,61 @@ class PostgreSQLConnector(DatabaseConnector):
 
 
 class MySQLConnector(DatabaseConnector):
-    """MySQL/MariaDB database connector with connection pooling"""
+    """MySQL/MariaDB database connector backed by an aiomysql connection pool"""
+    
+    bulk_chunk_size = DEFAULT_BULK_CHUNK_SIZE
     
     def __init__(self, connection_id: str, config: Dict[str, Any]):
         super().__init__(connection_id, config)
         self.db_type = 'mysql'
+        self._pool_lock = asyncio.Lock()
+        
+    async def _ensure_pool(self):
+        """Create the connection pool on first use"""
+        if self.pool is not None:
+            return self.pool
+        
+        async with self._pool_lock:
+            if self.pool is None:
+                self._check_open()
+                options = self.config.get('options') or {}
+                min_size, max_size = _pool_bounds(options)
+                
+                self.pool = await aiomysql.create_pool(
+                    host=self.config.get('host') or 'localhost',
+                    port=self.config.get('port') or 3306,
+                    db=self.config.get('database'),
+                    user=self.config.get('username'),
+                    password=self.decrypt_credential(self.config.get('password', '')) or '',
+                    ssl=ssl.create_default_context() if self.config.get('ssl') else None,
+                    minsize=min_size,
+                    maxsize=max_size,
+                    charset='utf8mb4',
+                    autocommit=True
+                )
+                self.connection = self.pool
+        return self.pool
+        
+    def _driver_pool_stats(self) -> Dict[str, Any]:
+        return {
+            'size': self.pool.size,
+            'idle': self.pool.freesize,
+            'min_size': self.pool.minsize,
+            'max_size': self.pool.maxsize
+        }
+    
+    async def ping(self) -> bool:
+        """Ping a pooled connection (reconnecting it if the server closed it)"""
+        await self._ensure_pool()
+        async with self._acquire() as conn:
+            await conn.ping(reconnect=True)
+            return True
         
     async def connect(self) -> bool:
-        """Establish MySQL connection"""
+        """Establish MySQL connection pool"""
         try:
             self._log_operation('connect', 'attempting')
-            
-            # Decrypt password
-            password = self.decrypt_credential(self.config.get('password', ''))
-            
-            # Simulate connection establishment
-            self.connection = {
-                'host': self.config.get('host', 'localhost'),
-                'port': self.config.get('port', 3306),
-                'database': self.config.get('database'),
-                'user': self.config.get('username'),
-                'connected': True
-            }
-            
+            await self._ensure_pool()
             self._log_operation('connect', 'success')
             return True
         except Exception as e:
@@ -217,10 +395,12 @@ class MySQLConnector(DatabaseConnector):
             return False
     
     async def disconnect(self) -> bool:
-        """Close MySQL connection"""
+        """Close MySQL connection pool"""
         try:
-            if self.connection:
-                self.connection['connected'] = False
+            if self.pool:
+                self.pool.close()
+                await self.pool.wait_closed()
+                self.pool = None
                 self.connection = None
                 self._log_operation('disconnect', 'success')
             return True
@@ -230,53 +410,60 @@ class MySQLConnector(DatabaseConnector):
     
     async def test_connection(self) -> Dict[str, Any]:
         """Test MySQL connection"""
+        owns_pool = self.pool is None
         try:
-            await self.connect()
+            await self._ensure_pool()
+            async with self._acquire() as conn:
+                async with conn.cursor() as cursor:
+                    await cursor.execute('SELECT VERSION()')
+                    (version,) = await cursor.fetchone()
             
-            result = {
+            return {
                 'success': True,
                 'message': 'Connection successful',
                 'database_type': 'MySQL',
-                'version': '8.0 (simulated)',
+                'version': version,
                 'host': self.config.get('host'),
                 'database': self.config.get('database')
             }
-            
-            await self.disconnect()
-            return result
         except Exception as e:
             return {
                 'success': False,
                 'message': f'Connection failed: {str(e)}',
                 'database_type': 'MySQL'
             }
+        finally:
+            if owns_pool:
+                await self.disconnect()
     
     async def execute_query(self, query: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Execute MySQL query"""
+        """Execute MySQL query (%s placeholders bound in params order, or %(name)s)"""
         try:
-            if not self.connection or not self.connection.get('connected'):
-                await self.connect()
+            await self._ensure_pool()
             
             self._log_operation('execute_query', 'executing', {'query': query[:100]})
             
+            started = time.perf_counter()
             result = {
                 'success': True,
                 'rows_affected': 0,
                 'data': [],
-                'query': query,
-                'execution_time_ms': 38
+                'query': query
             }
             
-            if query.strip().upper().startswith('SELECT'):
-                result['data'] = [
-                    {'id': 1, 'name': 'MySQL Sample', 'created_at': '2024-01-01'},
-                    {'id': 2, 'name': 'MySQL Data', 'created_at': '2024-01-02'}
-                ]
-                result['row_count'] = len(result['data'])
-            else:
-                result['rows_affected'] = 1
+            async with self._acquire() as conn:
+                async with conn.cursor(aiomysql.DictCursor) as cursor:
+                    await cursor.execute(query, _mysql_params(query, params))
+                    if cursor.description:
+                        result['data'] = list(await cursor.fetchall())
+                        result['row_count'] = len(result['data'])
+                    else:
+                        result['rows_affected'] = cursor.rowcount
+                        if cursor.lastrowid:
+                            result['last_insert_id'] = cursor.lastrowid
             
-            self._log_operation('execute_query', 'success')
+            result['execution_time_ms'] = round((time.perf_counter() - started) * 1000, 2)
+            self._log_operation('execute_query', 'success', {'rows': result.get('row_count', result['rows_affected'])})
             return result
         except Exception as e:
             self._log_operation('execute_query', 'failed', {'error': str(e)})
@@ -286,6 +473,32 @@ class MySQLConnector(DatabaseConnector):
                 'query': query
             }
     
+    async def stream_query(self, query: str, params: Optional[Dict[str, Any]] = None,
+                           batch_size: int = DEFAULT_STREAM_BATCH_SIZE) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Stream MySQL rows in batches through an unbuffered (server-side) cursor"""
+        await self._ensure_pool()
+        self._log_operation('stream_query', 'executing', {'query': query[:100]})
+        
+        async with self._acquire() as conn:
+            cursor = await conn.cursor(aiomysql.SSDictCursor)
+            exhausted = False
+            try:
+                await cursor.execute(query, _mysql_params(query, params))
+                while True:
+                    rows = await cursor.fetchmany(batch_size)
+                    if not rows:
+                        exhausted = True
+                        break
+                    yield list(rows)
+            finally:
+                if exhausted:
+                    await cursor.close()
+                else:
+                    # Closing an unbuffered cursor would read the remaining rows; drop the connection instead
+                    conn.close()
+        
+        self._log_operation('stream_query', 'success')
+    
     async def insert(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Insert data into MySQL table"""
         try:
@@ -309,7 +522,8 @@ class MySQLConnector(DatabaseConnector):
             where_clause = ' AND '.join([f"{k} = %s" for k in condition.keys()])
             query = f"UPDATE {table} SET {set_clause} WHERE {where_clause}"
             
-            result = await self.execute_query(query, {**data, **condition})
+            # A column may be in both SET and WHERE, so bind the two value lists in order
+            result = await self.execute_query(query, list(data.values()) + list(condition.values()))
             return result
         except Exception as e:
             return {
@@ -333,22 +547,48 @@ class MySQLConnector(DatabaseConnector):
                 'operation': 'delete'
             }
     
-    async def bulk_insert(self, table: str, data_list: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Bulk insert data into MySQL table"""
+    async def bulk_insert(self, table: str, data_list: List[Dict[str, Any]],
+                          chunk_size: int = DEFAULT_BULK_CHUNK_SIZE) -> Dict[str, Any]:
+        """Bulk insert data into MySQL table using multi-row INSERT statements, in chunks"""
         try:
             if not data_list:
                 return {'success': False, 'error': 'No data provided'}
             
+            await self._ensure_pool()
             self._log_operation('bulk_insert', 'executing', {'table': table, 'rows': len(data_list)})
             
-            inserted_count = len(data_list)
-            
+            columns = _bulk_columns(data_list)
+            placeholders = ', '.join(['%s'] * len(columns))
+            query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+            inserted_count = 0
+            chunk_count = 0
+            
+            async with self._acquire() as conn:
+                await conn.begin()
+                try:
+                    async with conn.cursor() as cursor:
+                        for chunk in _chunks(data_list, chunk_size):
+                            # aiomysql rewrites executemany on INSERT ... VALUES into one multi-row INSERT
+                            await cursor.executemany(
+                                query,
+                                [tuple(row.get(column) for column in columns) for row in chunk]
+                            )
+                            inserted_count += cursor.rowcount
+                            chunk_count += 1
+                    await conn.commit()
+                except Exception:
+                    await conn.rollback()
+                    raise
+            
+            self._log_operation('bulk_insert', 'success', {'table': table, 'rows': inserted_count})
             return {
                 'success': True,
                 'rows_inserted': inserted_count,
+                'chunks': chunk_count,
                 'table': table
             }
         except Exception as e:
+            self._log_operation('bulk_insert', 'failed', {'error': str(e)})
             return {
                 'success': False,
                 'error': str(e),
@@ -0,0 +1,262 @@
+"""
+Connector Telemetry
+In-memory operation metrics and a sampled, batched audit writer for database connectors
+"""
+
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+import asyncio
+import functools
+import random
+import threading
+import time
+
+
+START_STATUSES = ('attempting', 'executing')
+
+# Operations started but never finished (e.g. abandoned streams) are forgotten past this
+MAX_PENDING_OPERATIONS = 10000
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (milliseconds)"""
+
+    BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, value_ms: float):
+        index = len(self.BUCKETS_MS)
+        for i, bound in enumerate(self.BUCKETS_MS):
+            if value_ms <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.total_ms += value_ms
+        self.max_ms = max(self.max_ms, value_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        # Cumulative counts, as in Prometheus "le" buckets
+        buckets = {}
+        running = 0
+        for bound, count in zip(self.BUCKETS_MS, self.counts):
+            running += count
+            buckets[f"le_{bound}"] = running
+        buckets["le_inf"] = self.count
+        return {
+            'count': self.count,
+            'avg_ms': round(self.total_ms / self.count, 3) if self.count else 0.0,
+            'max_ms': round(self.max_ms, 3),
+            'buckets': buckets
+        }
+
+
+class OperationStats:
+    """Counters for one operation name (execute_query, bulk_insert, ...)"""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.partial = 0
+        self.rows = 0
+        self.bytes = 0
+        self.latency = LatencyHistogram()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'partial': self.partial,
+            'rows': self.rows,
+            'bytes': self.bytes,
+            'latency': self.latency.snapshot()
+        }
+
+
+def _current_task_key() -> int:
+    """Identify the running task (or thread) so concurrent operations are timed separately"""
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return id(task) if task is not None else threading.get_ident()
+
+
+class ConnectorTelemetry:
+    """Per-connection operation metrics
+
+    A start status ('attempting' / 'executing') starts a timer for the operation in
+    the current task; the next terminal status for that operation records its latency.
+    """
+
+    def __init__(self, connection_id: str):
+        self.connection_id = connection_id
+        self.created_at = time.time()
+        self.operations: Dict[str, OperationStats] = {}
+        self.last_error: Optional[Dict[str, Any]] = None
+        self._started: "OrderedDict[tuple, List[float]]" = OrderedDict()
+
+    def _stats(self, operation: str) -> OperationStats:
+        stats = self.operations.get(operation)
+        if stats is None:
+            stats = self.operations[operation] = OperationStats()
+        return stats
+
+    def start(self, operation: str):
+        key = (operation, _current_task_key())
+        self._started.setdefault(key, []).append(time.perf_counter())
+        while len(self._started) > MAX_PENDING_OPERATIONS:
+            self._started.popitem(last=False)
+
+    def finish(self, operation: str, status: str, details: Optional[Dict[str, Any]] = None):
+        key = (operation, _current_task_key())
+        stack = self._started.get(key)
+        started = stack.pop() if stack else None
+        if stack is not None and not stack:
+            del self._started[key]
+
+        stats = self._stats(operation)
+        stats.count += 1
+        if started is not None:
+            stats.latency.observe((time.perf_counter() - started) * 1000)
+
+        if status == 'failed':
+            stats.errors += 1
+            self.last_error = {
+                'operation': operation,
+                'error': (details or {}).get('error'),
+                'timestamp': time.time()
+            }
+        elif status == 'partial':
+            stats.partial += 1
+
+        if details:
+            rows = details.get('rows', details.get('inserted'))
+            if isinstance(rows, int):
+                stats.rows += rows
+
+    def record_transfer(self, operation: str, rows: int = 0, bytes_moved: int = 0):
+        """Add rows/bytes moved by an operation whose volume is known outside the connector"""
+        stats = self._stats(operation)
+        stats.rows += rows
+        stats.bytes += bytes_moved
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'connection_id': self.connection_id,
+            'since': self.created_at,
+            'operations': {name: stats.snapshot() for name, stats in self.operations.items()},
+            'errors': sum(stats.errors for stats in self.operations.values()),
+            'last_error': self.last_error
+        }
+
+
+_telemetry: Dict[str, ConnectorTelemetry] = {}
+
+
+def get_connector_telemetry(connection_id: str) -> ConnectorTelemetry:
+    """Telemetry for a connection; survives connector eviction and pool rebuilds"""
+    telemetry = _telemetry.get(connection_id)
+    if telemetry is None:
+        telemetry = _telemetry[connection_id] = ConnectorTelemetry(connection_id)
+    return telemetry
+
+
+def discard_connector_telemetry(connection_id: str):
+    _telemetry.pop(connection_id, None)
+
+
+class AuditWriter:
+    """Buffers connector audit entries and writes them to MongoDB in batches
+
+    Failures are always recorded; other terminal events are sampled at
+    `sample_rate`. Writes happen off the event loop every `flush_interval`
+    seconds; when the buffer is full new entries are dropped and counted.
+    """
+
+    def __init__(self, batch_size: int = 500, flush_interval: float = 1.0,
+                 max_buffer: int = 20000, sample_rate: float = 0.1):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.sample_rate = sample_rate
+        self.collection = None
+        self._buffer: List[Dict[str, Any]] = []
+        self._task: Optional[asyncio.Task] = None
+        self.written = 0
+        self.dropped = 0
+        self.failed_writes = 0
+
+    def configure(self, collection, sample_rate: Optional[float] = None):
+        """Set the MongoDB collection audit entries are written to"""
+        self.collection = collection
+        if sample_rate is not None:
+            self.sample_rate = sample_rate
+
+    def should_record(self, status: str) -> bool:
+        if self.collection is None:
+            return False
+        return status == 'failed' or random.random() < self.sample_rate
+
+    def submit(self, entry: Dict[str, Any]):
+        if len(self._buffer) >= self.max_buffer:
+            self.dropped += 1
+            return
+        self._buffer.append(entry)
+        self._ensure_task()
+
+    def _ensure_task(self):
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # flushed once a loop submits or close() runs
+        self._task = loop.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def flush(self):
+        """Write everything buffered so far"""
+        if self.collection is None:
+            return
+        loop = asyncio.get_running_loop()
+        while self._buffer:
+            batch = self._buffer[:self.batch_size]
+            del self._buffer[:self.batch_size]
+            try:
+                await loop.run_in_executor(None, functools.partial(self.collection.insert_many, batch, ordered=False))
+                self.written += len(batch)
+            except Exception:
+                self.failed_writes += len(batch)
+
+    async def close(self):
+        """Stop the background flusher and write what is left"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'buffered': len(self._buffer),
+            'written': self.written,
+            'dropped': self.dropped,
+            'failed_writes': self.failed_writes,
+            'sample_rate': self.sample_rate
+        }
+
+
+connector_audit_writer = AuditWriter()
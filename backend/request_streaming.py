@@ -0,0 +1,61 @@
+"""Responses that stream while the request body is still being read"""
+import asyncio
+import io
+from typing import AsyncIterator
+
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+
+class BodyStreamingResponse(StreamingResponse):
+    """StreamingResponse whose content generator reads the request body
+
+    Starlette's StreamingResponse also calls receive() to watch for client
+    disconnects, which races the generator for body chunks and can leave it
+    waiting forever for the last one. Here the generator is the only reader;
+    a disconnect reaches it as ClientDisconnect from request.stream().
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+class BlockingBodyReader(io.RawIOBase):
+    """Blocking file object over an async chunk stream, for parsers running in a worker thread
+
+    Each read waits for the next chunk on the event loop, so stdlib and ijson
+    parsers can consume a request body incrementally. Must not be read from the
+    event loop thread itself.
+    """
+
+    def __init__(self, chunks: AsyncIterator[bytes], loop: asyncio.AbstractEventLoop):
+        self._chunks = chunks.__aiter__()
+        self._loop = loop
+        self._buffer = memoryview(b"")
+        self._eof = False
+
+    @classmethod
+    def open(cls, chunks: AsyncIterator[bytes], buffer_size: int = 64 * 1024) -> io.BufferedReader:
+        """Buffered reader over `chunks`; call from the event loop that produces them"""
+        return io.BufferedReader(cls(chunks, asyncio.get_running_loop()), buffer_size)
+
+    async def _next_chunk(self) -> bytes:
+        return await self._chunks.__anext__()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._buffer and not self._eof:
+            try:
+                chunk = asyncio.run_coroutine_threadsafe(self._next_chunk(), self._loop).result()
+            except StopAsyncIteration:
+                self._eof = True
+                break
+            self._buffer = memoryview(chunk)
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
@@ -1,18 +1,32 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends, Security
+from fastapi import FastAPI, HTTPException, Depends, Security, Request, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import StreamingResponse
 from pymongo import MongoClient
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.cron import CronTrigger
+import copy
 import os
+import time
 import uuid
 import json
 import requests
 from execution_engine import WorkflowExecutionEngine, ExpressionEvaluator
 from variable_manager import VariableManager, VariableType, VariableScope
+from version_store import VersionStore
+from connector_templates import get_compiled_request
+from connector_resilience import CircuitBreaker, RateLimiter, create_state_store
+from connector_cache import CacheEntry, ResponseCache
+from connector_http_pool import ConnectorHttpPool
+from webhook_ingestion import WebhookIngestor
+from trigger_registry import TriggerRegistry, parse_cron
+from bulk_execution import BulkExecutionRunner
+from request_streaming import BodyStreamingResponse, BlockingBodyReader
+from template_catalog import TemplateCatalog
+from workflow_archive import WorkflowArchiver
+from workflow_bulk_ops import WorkflowBulkOperations
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
 from passlib.context import CryptContext
@@ -117,6 +131,9 @@ app.add_middleware(
 app.mount("/templates", StaticFiles(directory="/app/templates"), name="templates")
 app.mount("/form-templates", StaticFiles(directory="/app/forms-templates"), name="form-templates")
 
+# Template files are loaded once and served from memory; changes are picked up in the background
+template_catalog = TemplateCatalog("/app/templates", "/app/forms-templates")
+
 # MongoDB Connection
 MONGO_URL = os.environ.get('MONGO_URL', 'mongodb://localhost:27017/')
 client = MongoClient(MONGO_URL)
@@ -140,23 +157,64 @@ database_connections_collection = db['database_connections']  # Phase 3: Databas
 
 # Initialize Execution Engine
 execution_engine = WorkflowExecutionEngine(db)
+execution_engine.ensure_indexes()
+
+# Worker pool for bulk-started workflow instances
+bulk_execution_runner = BulkExecutionRunner(execution_engine)
 
 # Initialize Variable Manager
 variable_manager = VariableManager(db)
 
+# Initialize content-addressed version storage
+version_store = VersionStore(db)
+version_store.ensure_indexes()
+
+# Streaming workflow archive export/import
+workflow_archiver = WorkflowArchiver(db, version_store)
+
 # Initialize Scheduler
 scheduler = BackgroundScheduler()
+
+# Workflow triggers: webhook token index and cron jobs in a persistent job store
+trigger_registry = TriggerRegistry(db, execution_engine, scheduler)
+trigger_registry.ensure_indexes()
+
+# Set-based bulk workflow operations (dependent data is cleaned up in the background)
+workflow_bulk_ops = WorkflowBulkOperations(db, trigger_registry)
+workflow_bulk_ops.ensure_indexes()
+
+# Cleanup jobs whose process went away are resumed at startup and then every 5 minutes
+scheduler.add_job(
+    workflow_bulk_ops.resume_jobs,
+    'interval',
+    minutes=5,
+    id='bulk_cleanup_resume',
+    name='Bulk Cleanup Resume'
+)
+
 scheduler.start()
 
+# Startup event handler
+@app.on_event("startup")
+async def startup_event():
+    """Start background workers"""
+    trigger_registry.load()
+    workflow_bulk_ops.resume_jobs()
+    await webhook_ingestor.start()
+    await bulk_execution_runner.start()
+
 # Shutdown event handler
 @app.on_event("shutdown")
 async def shutdown_event():
     """Clean up resources on shutdown"""
+    await webhook_ingestor.close()
     await close_http_clients()
+    await _active_db_connections.close_all()
+    await connector_audit_writer.close()
+    await resilience_store.close()
     scheduler.shutdown()
-
-# Webhook registry for workflow triggers
-webhook_registry = {}  # workflow_id -> webhook_token
+    bulk_execution_runner.close()
+    workflow_bulk_ops.close()
 
 # Pydantic Models
 class WorkflowNode(BaseModel):
@@ -748,7 +806,7 @@ async def get_workflow_versions(workflow_id: str):
     return {
         "workflow_id": workflow_id,
         "current_version": workflow.get("version", 1),
-        "versions": version_history,
+        "versions": [_summarize_version_entry(v) for v in version_history],
         "version_count": len(version_history)
     }
 
@@ -767,6 +825,10 @@ async def get_workflow_version(workflow_id: str, version: int):
     if not version_data:
         raise HTTPException(status_code=404, detail=f"Version {version} not found")
     
+    snapshot = version_store.resolve_snapshot(version_data)
+    version_data = _summarize_version_entry(version_data)
+    version_data["snapshot"] = snapshot
+    
     return {
         "workflow_id": workflow_id,
         "version": version,
@@ -838,23 +900,33 @@ async def compare_workflow_versions(workflow_id: str, data: Dict[str, Any]):
             detail=f"One or both versions not found. Available versions: {available_versions}"
         )
     
-    snapshot_a = v_a_data.get("snapshot", {})
-    snapshot_b = v_b_data.get("snapshot", {})
-    
-    # Calculate diff
-    diff = _calculate_workflow_diff(snapshot_a, snapshot_b)
+    # Manifest-based versions diff by node/edge hash without loading unchanged content
+    if v_a_data.get("manifest") and v_b_data.get("manifest"):
+        diff = version_store.diff_manifests(v_a_data["manifest"], v_b_data["manifest"])
+    else:
+        diff = _calculate_workflow_diff(
+            version_store.resolve_snapshot(v_a_data),
+            version_store.resolve_snapshot(v_b_data)
+        )
     
     return {
         "workflow_id": workflow_id,
         "version_a": version_a,
         "version_b": version_b,
         "diff": diff,
-        "version_a_data": v_a_data,
-        "version_b_data": v_b_data
+        "version_a_data": _summarize_version_entry(v_a_data),
+        "version_b_data": _summarize_version_entry(v_b_data)
     }
 
+def _summarize_version_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Replace a version's manifest with node/edge counts for listings"""
+    summary = {k: v for k, v in entry.items() if k != "manifest"}
+    if entry.get("manifest"):
+        summary.update(VersionStore.manifest_summary(entry["manifest"]))
+    return summary
+
 def _calculate_workflow_diff(snapshot_a: Dict[str, Any], snapshot_b: Dict[str, Any]) -> Dict[str, Any]:
-    """Calculate differences between two workflow snapshots"""
+    """Calculate differences between two full (legacy) workflow snapshots"""
     diff = {
         "metadata_changes": {},
         "nodes_added": [],
@@ -933,7 +1005,7 @@ async def rollback_to_version(workflow_id: str, version: int, data: LifecycleTra
     if not target_version:
         raise HTTPException(status_code=404, detail=f"Version {version} not found")
     
-    snapshot = target_version.get("snapshot", {})
+    snapshot = version_store.resolve_snapshot(target_version)
     now = datetime.utcnow().isoformat()
     current_version = workflow.get("version", 1)
     
@@ -947,13 +1019,13 @@ async def rollback_to_version(workflow_id: str, version: int, data: LifecycleTra
         "is_rollback": True,
         "rolled_back_from_version": current_version,
         "rolled_back_to_version": version,
-        "snapshot": {
+        "manifest": version_store.store_snapshot({
             "nodes": workflow.get("nodes", []),
             "edges": workflow.get("edges", []),
             "name": workflow.get("name"),
             "description": workflow.get("description"),
             "tags": workflow.get("tags", [])
-        }
+        })
     })
     
     # Apply the snapshot
@@ -1021,13 +1093,13 @@ async def create_draft_version(workflow_id: str, data: LifecycleTransition):
         "created_at": workflow.get("updated_at", now),
         "created_by": workflow.get("updated_by", "system"),
         "change_notes": f"Published version {current_version}",
-        "snapshot": {
+        "manifest": version_store.store_snapshot({
             "nodes": workflow.get("nodes", []),
             "edges": workflow.get("edges", []),
             "name": workflow.get("name"),
             "description": workflow.get("description"),
             "tags": workflow.get("tags", [])
-        }
+        })
     })
     
     # Update to draft state with new version
@@ -1468,84 +1540,27 @@ async def get_workflow_health(workflow_id: str):
 # ========== WORKFLOW TEMPLATES ENDPOINTS ==========
 
 @app.get("/api/templates")
-async def get_workflow_templates():
-    """Get all available workflow templates"""
-    import glob
-    template_files = glob.glob("/app/templates/*.json")
-    
-    templates = []
-    for template_file in template_files:
-        if "index.json" in template_file:
-            # Load index file
-            try:
-                with open(template_file, 'r') as f:
-                    index_data = json.load(f)
-                    templates = index_data.get("templates", [])
-            except Exception as e:
-                print(f"Error loading template index: {e}")
-        
-    # If no index, scan files directly
-    if not templates:
-        for template_file in template_files:
-            if "index.json" in template_file:
-                continue
-            try:
-                with open(template_file, 'r') as f:
-                    template_data = json.load(f)
-                    templates.append({
-                        "id": template_data.get("id", os.path.basename(template_file).replace(".json", "")),
-                        "name": template_data.get("name", "Untitled Template"),
-                        "description": template_data.get("description", ""),
-                        "category": template_data.get("category", "general"),
-                        "icon": template_data.get("icon", "Workflow"),
-                        "difficulty": template_data.get("difficulty", "intermediate"),
-                        "estimated_time": template_data.get("estimated_time", "10-15 mins")
-                    })
-            except Exception as e:
-                print(f"Error loading template {template_file}: {e}")
-    
-    return {"templates": templates, "count": len(templates)}
+async def get_workflow_templates(request: Request, category: Optional[str] = None):
+    """Get all available workflow templates, optionally filtered by category"""
+    return template_catalog.workflow_list(category).response(request)
 
 
 @app.get("/api/templates/{template_id}")
-async def get_workflow_template(template_id: str):
+async def get_workflow_template(template_id: str, request: Request):
     """Get a specific workflow template"""
-    template_file = f"/app/templates/{template_id}.json"
-    
-    if not os.path.exists(template_file):
+    template = template_catalog.workflow_template(template_id)
+    if template is None:
         raise HTTPException(status_code=404, detail="Template not found")
-    
-    try:
-        with open(template_file, 'r') as f:
-            template_data = json.load(f)
-            return template_data
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error loading template: {str(e)}")
+    return template.response(request)
 
 
 # ========== FORM TEMPLATE LIBRARY ENDPOINTS ==========
 
 @app.get("/api/form-templates")
-async def get_form_templates(category: Optional[str] = None):
+async def get_form_templates(request: Request, category: Optional[str] = None):
     """Get all available form templates, optionally filtered by category"""
-    index_file = "/app/forms-templates/index.json"
-    
     try:
-        with open(index_file, 'r') as f:
-            index_data = json.load(f)
-            templates = index_data.get("templates", [])
-            categories = index_data.get("categories", [])
-            
-            # Filter by category if specified
-            if category:
-                templates = [t for t in templates if t.get("category") == category]
-            
-            return {
-                "templates": templates,
-                "categories": categories,
-                "count": len(templates),
-                "total_count": index_data.get("total_templates", len(templates))
-            }
+        return template_catalog.form_list(category).response(request)
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Form templates index not found")
     except Exception as e:
@@ -1553,35 +1568,22 @@ async def get_form_templates(category: Optional[str] = None):
 
 
 @app.get("/api/form-templates/{category}/{template_id}")
-async def get_form_template(category: str, template_id: str):
+async def get_form_template(category: str, template_id: str, request: Request):
     """Get a specific form template by category and ID"""
-    template_file = f"/app/forms-templates/{category}/{template_id}.json"
-    
-    if not os.path.exists(template_file):
+    template = template_catalog.form_template(category, template_id)
+    if template is None:
         raise HTTPException(status_code=404, detail="Form template not found")
-    
-    try:
-        with open(template_file, 'r') as f:
-            template_data = json.load(f)
-            return template_data
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error loading form template: {str(e)}")
+    return template.response(request)
 
 
 @app.post("/api/templates/{template_id}/create-workflow")
 async def create_workflow_from_template(template_id: str, data: Dict[str, Any]):
     """Create a new workflow from a template"""
-    # Load template
-    template_file = f"/app/templates/{template_id}.json"
-    
-    if not os.path.exists(template_file):
+    # Load template (copied, the catalog's parsed template is shared)
+    template = template_catalog.workflow_template(template_id)
+    if template is None:
         raise HTTPException(status_code=404, detail="Template not found")
-    
-    try:
-        with open(template_file, 'r') as f:
-            template_data = json.load(f)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error loading template: {str(e)}")
+    template_data = copy.deepcopy(template.data)
     
     # Create new workflow from template
     workflow_id = str(uuid.uuid4())
@@ -2806,6 +2808,28 @@ async def execute_workflow(workflow_id: str, input_data: Optional[Dict[str, Any]
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@app.post("/api/workflows/{workflow_id}/execute/bulk")
+async def execute_workflow_bulk(workflow_id: str, request: Request, chunk_size: int = 1000):
+    """Start one instance per line of an NDJSON body of input variables
+    
+    Instances are inserted in chunks of `chunk_size` and queued for execution;
+    one result row per input line is streamed back, followed by a summary row
+    with the achieved instances per second.
+    """
+    workflow = workflows_collection.find_one({"id": workflow_id}, {"_id": 0})
+    if not workflow:
+        raise HTTPException(status_code=404, detail="Workflow not found")
+    
+    return BodyStreamingResponse(
+        bulk_execution_runner.run(workflow, request.stream(), chunk_size=chunk_size),
+        media_type="application/x-ndjson"
+    )
+
+@app.get("/api/bulk-executions/stats")
+async def get_bulk_execution_stats():
+    """Queued, running and finished bulk-started instances and execution throughput"""
+    return bulk_execution_runner.stats()
+
 @app.post("/api/workflow-instances/{instance_id}/pause")
 async def pause_execution(instance_id: str):
     """Pause workflow execution"""
@@ -4212,26 +4236,15 @@ async def create_trigger(trigger: TriggerConfig):
     trigger_id = str(uuid.uuid4())
     
     if trigger.trigger_type == "scheduled":
-        # Setup cron schedule
-        cron_expression = trigger.config.get("cron", "0 0 * * *")  # Default: daily at midnight
-        
-        def scheduled_execution():
-            execution_engine.start_execution(trigger.workflow_id, triggered_by="scheduled")
-        
+        # Validate cron schedule (default: daily at midnight)
         try:
-            scheduler.add_job(
-                scheduled_execution,
-                CronTrigger.from_crontab(cron_expression),
-                id=trigger_id,
-                name=f"trigger_{trigger.workflow_id}"
-            )
-        except Exception as e:
+            parse_cron({"config": trigger.config})
+        except ValueError as e:
             raise HTTPException(status_code=400, detail=f"Invalid cron expression: {str(e)}")
     
     elif trigger.trigger_type == "webhook":
         # Generate webhook token
         webhook_token = str(uuid.uuid4())
-        webhook_registry[webhook_token] = trigger.workflow_id
         trigger.config["webhook_token"] = webhook_token
         trigger.config["webhook_url"] = f"/api/webhooks/{webhook_token}"
     
@@ -4246,6 +4259,8 @@ async def create_trigger(trigger: TriggerConfig):
     }
     
     db['triggers'].insert_one(trigger_data)
+    trigger_data.pop("_id", None)
+    trigger_registry.register(trigger_data)
     
     return {"message": "Trigger created", "trigger_id": trigger_id, "config": trigger.config}
 
@@ -4259,6 +4274,11 @@ async def get_triggers(workflow_id: Optional[str] = None):
     triggers = list(db['triggers'].find(query, {"_id": 0}))
     return {"triggers": triggers, "count": len(triggers)}
 
+@app.get("/api/triggers/metrics")
+async def get_trigger_metrics():
+    """Trigger fire counts and latency (scheduled: delay after the cron slot; webhook: time to start)"""
+    return trigger_registry.metrics()
+
 @app.delete("/api/triggers/{trigger_id}")
 async def delete_trigger(trigger_id: str):
     """Delete a trigger"""
@@ -4266,36 +4286,22 @@ async def delete_trigger(trigger_id: str):
     if not trigger:
         raise HTTPException(status_code=404, detail="Trigger not found")
     
-    # Remove scheduled job if exists
-    if trigger["trigger_type"] == "scheduled":
-        try:
-            scheduler.remove_job(trigger_id)
-        except:
-            pass
-    
-    # Remove webhook if exists
-    if trigger["trigger_type"] == "webhook":
-        webhook_token = trigger["config"].get("webhook_token")
-        if webhook_token and webhook_token in webhook_registry:
-            del webhook_registry[webhook_token]
-    
     db['triggers'].delete_one({"id": trigger_id})
+    
+    # Remove scheduled job / webhook token
+    trigger_registry.unregister(trigger)
     return {"message": "Trigger deleted"}
 
 # Webhook Endpoint
 @app.post("/api/webhooks/{webhook_token}")
 async def webhook_trigger(webhook_token: str, payload: Dict[str, Any] = None):
     """Receive webhook and trigger workflow"""
-    workflow_id = webhook_registry.get(webhook_token)
-    if not workflow_id:
+    trigger = trigger_registry.resolve_token(webhook_token)
+    if not trigger:
         raise HTTPException(status_code=404, detail="Invalid webhook token")
     
     try:
-        instance_id = execution_engine.start_execution(
-            workflow_id,
-            triggered_by="webhook",
-            input_data={"webhook_payload": payload or {}}
-        )
+        instance_id = trigger_registry.fire_webhook(trigger, payload or {})
         return {"message": "Workflow triggered", "instance_id": instance_id}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -4904,42 +4910,68 @@ async def export_workflows(workflow_ids: Optional[List[str]] = None):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/workflows/export/stream")
+async def export_workflows_stream(
+    workflow_ids: Optional[List[str]] = Query(None),
+    include_related: bool = True,
+    compress: bool = False
+):
+    """Stream workflows as an NDJSON archive (optionally gzip-compressed)
+    
+    With `include_related`, the archive also carries the workflows' versions
+    (with full snapshots) and the forms and components their nodes reference.
+    """
+    filename = f"logiccanvas-workflows-{datetime.utcnow().strftime('%Y-%m-%d')}.ndjson"
+    if compress:
+        filename += ".gz"
+    return StreamingResponse(
+        workflow_archiver.export(workflow_ids, include_related=include_related, compress=compress),
+        media_type="application/gzip" if compress else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@app.post("/api/workflows/import/stream")
+async def import_workflows_stream(request: Request, batch_size: int = 1000):
+    """Import an NDJSON workflow archive (plain or gzip) from the request body
+    
+    Records are validated and written in insert_many batches; the response
+    streams per-record errors, progress per batch and a final summary.
+    """
+    return BodyStreamingResponse(
+        workflow_archiver.import_stream(request.stream(), batch_size=batch_size),
+        media_type="application/x-ndjson"
+    )
+
+
 @app.post("/api/workflows/import")
 async def import_workflows(workflows_data: Dict[str, Any]):
     """Import workflows from JSON"""
     try:
         workflows = workflows_data.get("workflows", [])
+        import_id = str(uuid.uuid4())
         imported = []
         errors = []
         
-        for workflow in workflows:
-            try:
-                # Generate new ID
-                workflow_id = str(uuid.uuid4())
-                workflow['id'] = workflow_id
-                workflow['created_at'] = datetime.utcnow().isoformat()
-                workflow['updated_at'] = datetime.utcnow().isoformat()
-                workflow['status'] = 'draft'  # Imported workflows start as draft
-                
-                # Insert to database
-                workflows_collection.insert_one(workflow)
-                imported.append(workflow_id)
-                
-                # Audit log
-                audit_logs_collection.insert_one({
-                    "id": str(uuid.uuid4()),
-                    "entity_type": "workflow",
-                    "entity_id": workflow_id,
-                    "action": "imported",
-                    "user": "system",
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "details": {"name": workflow.get("name", "Untitled")}
-                })
-            except Exception as e:
-                errors.append({
-                    "workflow": workflow.get("name", "Unknown"),
-                    "error": str(e)
-                })
+        for offset in range(0, len(workflows), 1000):
+            batch = []
+            for index, workflow in enumerate(workflows[offset:offset + 1000], start=offset):
+                if isinstance(workflow, dict):
+                    # Ids derive from the position, not the original id: this endpoint gives
+                    # every workflow a new id, even when several share an original id
+                    batch.append((index, {**workflow, "id": index}))
+                else:
+                    errors.append({"workflow": "Unknown", "error": "Workflow must be an object"})
+            _, failures = workflow_archiver.write_batch("workflow", batch, import_id)
+            failed = {index for index, _ in failures}
+            imported.extend(
+                workflow_archiver.imported_workflow_id(import_id, index)
+                for index, _ in batch if index not in failed
+            )
+            errors.extend(
+                {"workflow": workflows[index].get("name", "Unknown"), "error": error}
+                for index, error in failures
+            )
         
         return {
             "imported_count": len(imported),
@@ -4971,8 +5003,10 @@ async def create_workflow_version(workflow_id: str):
             "version_number": workflow.get("version", 1),
             "name": workflow.get("name"),
             "description": workflow.get("description"),
-            "nodes": workflow.get("nodes", []),
-            "edges": workflow.get("edges", []),
+            "manifest": version_store.store_snapshot({
+                "nodes": workflow.get("nodes", []),
+                "edges": workflow.get("edges", []),
+            }),
             "status": workflow.get("status"),
             "tags": workflow.get("tags", []),
             "created_at": datetime.utcnow().isoformat(),
@@ -5014,12 +5048,10 @@ async def get_workflow_versions(workflow_id: str):
     """Get all versions of a workflow"""
     try:
         versions_collection = db['workflow_versions']
-        versions = list(versions_collection.find({"workflow_id": workflow_id}))
-        
-        # Remove MongoDB _id
-        for version in versions:
-            if '_id' in version:
-                del version['_id']
+        versions = [
+            _summarize_version_entry(v)
+            for v in versions_collection.find({"workflow_id": workflow_id}, {"_id": 0})
+        ]
         
         # Sort by version number descending
         versions.sort(key=lambda x: x.get("version_number", 0), reverse=True)
@@ -5039,10 +5071,11 @@ async def rollback_workflow(workflow_id: str, version_id: str):
         if not version:
             raise HTTPException(status_code=404, detail="Version not found")
         
-        # Update workflow with version data
+        # Update workflow with version data (manifest-based or legacy inline copy)
+        snapshot = version_store.load_snapshot(version["manifest"]) if version.get("manifest") else version
         update_data = {
-            "nodes": version.get("nodes", []),
-            "edges": version.get("edges", []),
+            "nodes": snapshot.get("nodes", []),
+            "edges": snapshot.get("edges", []),
             "description": version.get("description", ""),
             "tags": version.get("tags", []),
             "updated_at": datetime.utcnow().isoformat()
@@ -5074,65 +5107,37 @@ async def rollback_workflow(workflow_id: str, version_id: str):
 # -------------------------------
 
 @app.post("/api/workflows/bulk-delete")
-async def bulk_delete_workflows(workflow_ids: List[str]):
-    """Delete multiple workflows at once"""
+async def bulk_delete_workflows(workflow_ids: List[str], dry_run: bool = False):
+    """Delete multiple workflows at once
+    
+    Their instances, tasks, approvals, triggers and versions are removed by a
+    background job (see `cleanup_job_id`). With `dry_run`, nothing is deleted
+    and the number of affected documents is returned instead.
+    """
     try:
-        deleted = []
-        errors = []
-        
-        for workflow_id in workflow_ids:
-            try:
-                result = workflows_collection.delete_one({"id": workflow_id})
-                if result.deleted_count > 0:
-                    deleted.append(workflow_id)
-                    
-                    # Audit log
-                    audit_logs_collection.insert_one({
-                        "id": str(uuid.uuid4()),
-                        "entity_type": "workflow",
-                        "entity_id": workflow_id,
-                        "action": "deleted",
-                        "user": "system",
-                        "timestamp": datetime.utcnow().isoformat(),
-                        "details": {}
-                    })
-                else:
-                    errors.append({"id": workflow_id, "error": "Not found"})
-            except Exception as e:
-                errors.append({"id": workflow_id, "error": str(e)})
-        
-        return {
-            "deleted_count": len(deleted),
-            "deleted_ids": deleted,
-            "errors": errors
-        }
+        return workflow_bulk_ops.delete(workflow_ids, dry_run=dry_run)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/api/workflows/bulk-update-status")
-async def bulk_update_status(workflow_ids: List[str], status: str):
+async def bulk_update_status(workflow_ids: List[str], status: str, dry_run: bool = False):
     """Update status of multiple workflows"""
     try:
-        updated = []
-        
-        for workflow_id in workflow_ids:
-            result = workflows_collection.update_one(
-                {"id": workflow_id},
-                {"$set": {"status": status, "updated_at": datetime.utcnow().isoformat()}}
-            )
-            if result.modified_count > 0:
-                updated.append(workflow_id)
-        
-        return {
-            "updated_count": len(updated),
-            "updated_ids": updated,
-            "status": status
-        }
+        return workflow_bulk_ops.update_status(workflow_ids, status, dry_run=dry_run)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/bulk-operations/{job_id}")
+async def get_bulk_operation(job_id: str):
+    """Progress of a bulk operation's background cleanup"""
+    job = workflow_bulk_ops.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Bulk operation not found")
+    return job
+
+
 @app.post("/api/workflows/{workflow_id}/duplicate")
 async def duplicate_workflow(workflow_id: str):
     """Duplicate a workflow"""
@@ -5501,9 +5506,8 @@ async def get_api_connectors(category: Optional[str] = None, is_template: Option
     return {"connectors": connectors, "count": len(connectors)}
 
 
-@app.get("/api/connectors/templates")
-async def get_connector_templates():
-    """Get pre-built connector templates"""
+def _build_connector_templates() -> List[Dict[str, Any]]:
+    """Pre-built connector templates"""
     templates = [
         {
             "id": "stripe-payment",
@@ -7232,7 +7236,12 @@ async def get_connector_templates():
             ]
         }
     ]
-    return {"templates": templates, "count": len(templates)}
+    return templates
+
+@app.get("/api/connectors/templates")
+async def get_connector_templates(request: Request, category: Optional[str] = None):
+    """Get pre-built connector templates, optionally filtered by category"""
+    return template_catalog.static_list("connector_templates", _build_connector_templates, category).response(request)
 
 @app.get("/api/connectors/{connector_id}")
 async def get_api_connector(connector_id: str):
@@ -7254,6 +7263,7 @@ async def create_api_connector(connector: APIConnectorConfig):
     connector_dict["updated_at"] = now
     
     api_connectors_collection.insert_one(connector_dict)
+    get_compiled_request(connector_dict)  # compile templates and response extractors up front
     
     # Audit log
     audit_logs_collection.insert_one({
@@ -7280,6 +7290,10 @@ async def update_api_connector(connector_id: str, connector: APIConnectorConfig)
     connector_dict["updated_at"] = now
     
     api_connectors_collection.replace_one({"id": connector_id}, connector_dict)
+    get_compiled_request(connector_dict)  # compile templates and response extractors up front
+    invalidate_rate_limiter(connector_id)
+    connector_response_cache.purge(connector_id)
+    await connector_http_pool.reset(connector_id)  # rebuilt with the new timeout / pool limits
     
     # Audit log
     audit_logs_collection.insert_one({
@@ -7299,6 +7313,9 @@ async def delete_api_connector(connector_id: str):
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="API connector not found")
     
+    invalidate_rate_limiter(connector_id)
+    connector_response_cache.purge(connector_id)
+    
     # Audit log
     audit_logs_collection.insert_one({
         "id": str(uuid.uuid4()),
@@ -7374,9 +7391,8 @@ async def test_api_connector(request: APITestRequest):
             "status_code": 0
         }
 
-@app.get("/api/connectors/templates/library")
-async def get_connector_templates_library():
-    """Get pre-built API connector templates (legacy format)"""
+def _build_connector_templates_library() -> List[Dict[str, Any]]:
+    """Pre-built API connector templates (legacy format)"""
     templates = [
         {
             "id": "template-rest-api",
@@ -7437,8 +7453,12 @@ async def get_connector_templates_library():
             "tags": ["template", "graphql"]
         },
     ]
-    
-    return {"templates": templates, "count": len(templates)}
+    return templates
+
+@app.get("/api/connectors/templates/library")
+async def get_connector_templates_library(request: Request):
+    """Get pre-built API connector templates (legacy format)"""
+    return template_catalog.static_list("connector_templates_library", _build_connector_templates_library).response(request)
 
 
 
@@ -7458,11 +7478,22 @@ from integrations import (
     # Cloud Databases
     DynamoDBConnector,
     FirestoreConnector,
-    CosmosDBConnector
+    CosmosDBConnector,
+    ConnectorManager,
+    connector_audit_writer,
+    get_connector_telemetry,
+    discard_connector_telemetry
 )
 
-# Store active database connections in memory
-_active_db_connections: Dict[str, Any] = {}
+# Live connectors (and their pools) per connection_id, with idle eviction,
+# health checks and max lifetime
+_active_db_connections = ConnectorManager()
+
+# Connector operation events: failures always, other events sampled, written in batches
+connector_audit_writer.configure(
+    db['connector_audit_logs'],
+    sample_rate=float(os.environ.get('CONNECTOR_AUDIT_SAMPLE_RATE', '0.1'))
+)
 
 class DatabaseConnectionConfig(BaseModel):
     """Database connection configuration model"""
@@ -7491,6 +7522,14 @@ class DatabaseQueryRequest(BaseModel):
     params: Optional[Dict[str, Any]] = None
     table: Optional[str] = None
 
+class DatabaseStreamRequest(BaseModel):
+    """Streaming query request; the stream stops once either cap is reached"""
+    query: str
+    params: Optional[Dict[str, Any]] = None
+    batch_size: int = 500
+    max_rows: Optional[int] = 100000
+    max_bytes: Optional[int] = 64 * 1024 * 1024
+
 class DatabaseOperationRequest(BaseModel):
     """Database CRUD operation request"""
     table: str
@@ -7715,9 +7754,8 @@ async def update_database_connection(connection_id: str, config: DatabaseConnect
     
     database_connections_collection.replace_one({"id": connection_id}, connection_dict)
     
-    # Clear cached connection if exists
-    if connection_id in _active_db_connections:
-        del _active_db_connections[connection_id]
+    # Close the cached connector so its pool is rebuilt with the new settings
+    await _active_db_connections.close(connection_id)
     
     # Audit log
     audit_logs_collection.insert_one({
@@ -7738,12 +7776,8 @@ async def delete_database_connection(connection_id: str):
         raise HTTPException(status_code=404, detail="Database connection not found")
     
     # Clear cached connection if exists
-    if connection_id in _active_db_connections:
-        try:
-            await _active_db_connections[connection_id].disconnect()
-        except:
-            pass
-        del _active_db_connections[connection_id]
+    await _active_db_connections.close(connection_id)
+    discard_connector_telemetry(connection_id)
     
     # Audit log
     audit_logs_collection.insert_one({
@@ -7768,8 +7802,9 @@ async def test_database_connection(connection_id: str):
         raise HTTPException(status_code=400, detail="Unsupported database type")
     
     try:
-        connector = connector_class(connection_id, connection)
-        result = await connector.test_connection()
+        # Reuse the managed connector so a test does not open a throwaway pool
+        async with _active_db_connections.lease(connection_id, connection, connector_class) as connector:
+            result = await connector.test_connection()
         
         # Update connection status in database
         database_connections_collection.update_one(
@@ -7802,11 +7837,8 @@ async def execute_database_query(connection_id: str, request: DatabaseQueryReque
     
     try:
         # Get or create connector
-        if connection_id not in _active_db_connections:
-            _active_db_connections[connection_id] = connector_class(connection_id, connection)
-        
-        connector = _active_db_connections[connection_id]
-        result = await connector.execute_query(request.query, request.params)
+        async with _active_db_connections.lease(connection_id, connection, connector_class) as connector:
+            result = await connector.execute_query(request.query, request.params)
         
         # Audit log
         audit_logs_collection.insert_one({
@@ -7826,6 +7858,174 @@ async def execute_database_query(connection_id: str, request: DatabaseQueryReque
             "query": request.query
         }
 
+async def _ndjson_query_stream(connection_id: str, connection: Dict[str, Any], connector_class,
+                               request: DatabaseStreamRequest):
+    """Encode connector row batches as NDJSON, enforcing the row and byte caps
+    
+    Batches are pulled from the connector only after the previous one has been
+    sent, so a slow client slows down the database cursor instead of buffering.
+    The connector is leased here rather than in the endpoint so the lease is held
+    for exactly as long as the response body is being produced.
+    """
+    rows_sent = 0
+    bytes_sent = 0
+    truncated = None
+    async with _active_db_connections.lease(connection_id, connection, connector_class) as connector:
+        batches = connector.stream_query(request.query, request.params, max(1, request.batch_size))
+        try:
+            async for batch in batches:
+                lines = []
+                for row in batch:
+                    if request.max_rows is not None and rows_sent >= request.max_rows:
+                        truncated = "max_rows"
+                        break
+                    line = (json.dumps({"type": "row", "data": row}, default=str) + "\n").encode()
+                    if request.max_bytes is not None and bytes_sent + len(line) > request.max_bytes:
+                        truncated = "max_bytes"
+                        break
+                    lines.append(line)
+                    rows_sent += 1
+                    bytes_sent += len(line)
+                if lines:
+                    yield b"".join(lines)
+                if truncated:
+                    break
+            summary = {"type": "end", "rows": rows_sent, "bytes": bytes_sent,
+                       "truncated": truncated is not None, "truncated_by": truncated}
+        except Exception as e:
+            summary = {"type": "error", "error": str(e), "rows": rows_sent, "bytes": bytes_sent}
+        finally:
+            # Releases the cursor/connection when the stream ends early
+            await batches.aclose()
+            connector.telemetry.record_transfer("stream_query", rows=rows_sent, bytes_moved=bytes_sent)
+    yield (json.dumps(summary) + "\n").encode()
+
+@app.post("/api/integrations/databases/{connection_id}/query/stream")
+async def stream_database_query(connection_id: str, request: DatabaseStreamRequest):
+    """Execute a query and stream its rows as NDJSON (one row per line, then an end line)"""
+    connection = database_connections_collection.find_one({"id": connection_id}, {"_id": 0})
+    if not connection:
+        raise HTTPException(status_code=404, detail="Database connection not found")
+    
+    connector_class = _get_connector_class(connection.get('db_type'))
+    if not connector_class:
+        raise HTTPException(status_code=400, detail="Unsupported database type")
+    
+    # Audit log
+    audit_logs_collection.insert_one({
+        "id": str(uuid.uuid4()),
+        "entity_type": "database_query",
+        "entity_id": connection_id,
+        "action": "streamed",
+        "details": {"query": request.query[:100]},  # First 100 chars only
+        "timestamp": datetime.utcnow().isoformat()
+    })
+    
+    return StreamingResponse(_ndjson_query_stream(connection_id, connection, connector_class, request),
+                             media_type="application/x-ndjson")
+
+@app.post("/api/integrations/databases/{connection_id}/bulk")
+async def database_bulk_write(
+    connection_id: str,
+    request: Request,
+    table: Optional[str] = None,
+    chunk_size: Optional[int] = None,
+    concurrency: Optional[int] = None,
+    max_retries: int = 3,
+    include_results: bool = False
+):
+    """Apply bulk write operations sent as NDJSON
+    
+    Each line is `{"op": "insert" | "update" | "delete", "table": ..., "data": ..., "condition": ...}`;
+    `table` in the query string is used for lines without one. Failed items are
+    always reported; pass include_results=true for the full per-item report.
+    """
+    connection = database_connections_collection.find_one({"id": connection_id}, {"_id": 0})
+    if not connection:
+        raise HTTPException(status_code=404, detail="Database connection not found")
+    
+    connector_class = _get_connector_class(connection.get('db_type'))
+    if not connector_class:
+        raise HTTPException(status_code=400, detail="Unsupported database type")
+    
+    ops = []
+    parse_errors = {}
+    buffer = b""
+    body_bytes = 0
+    
+    def parse_line(line: bytes):
+        if not line.strip():
+            return
+        try:
+            op = json.loads(line)
+            if not isinstance(op, dict):
+                raise ValueError("line is not a JSON object")
+            if table and not op.get("table"):
+                op["table"] = table
+            ops.append(op)
+        except ValueError as e:
+            parse_errors[len(ops)] = f"Invalid JSON line: {str(e)}"
+            ops.append({})
+    
+    async for chunk in request.stream():
+        body_bytes += len(chunk)
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            parse_line(line)
+    parse_line(buffer)
+    
+    if not ops:
+        raise HTTPException(status_code=400, detail="No operations provided")
+    
+    async with _active_db_connections.lease(connection_id, connection, connector_class) as connector:
+        report = await connector.bulk_write(ops, chunk_size=chunk_size, concurrency=concurrency, max_retries=max_retries)
+    connector.telemetry.record_transfer("bulk_write", rows=report["succeeded"], bytes_moved=body_bytes)
+    
+    for index, message in parse_errors.items():
+        report["results"][index]["error"] = message
+    
+    # Audit log
+    audit_logs_collection.insert_one({
+        "id": str(uuid.uuid4()),
+        "entity_type": "database_bulk_write",
+        "entity_id": connection_id,
+        "action": "executed",
+        "details": {"total": report["total"], "failed": report["failed"]},
+        "timestamp": datetime.utcnow().isoformat()
+    })
+    
+    results = report.pop("results")
+    report["failures"] = [r for r in results if r["status"] != "ok"]
+    if include_results:
+        report["results"] = results
+    return report
+
+@app.get("/api/integrations/databases/pools/metrics")
+async def get_database_pool_metrics():
+    """Pool metrics (in use, idle, wait time, creates per second) for every live connector"""
+    return _active_db_connections.metrics()
+
+@app.get("/api/integrations/databases/{connection_id}/pool")
+async def get_database_connection_pool(connection_id: str):
+    """Pool metrics for one database connection"""
+    if connection_id not in _active_db_connections:
+        return {"connection_id": connection_id, "active": False}
+    
+    return {"connection_id": connection_id, "active": True, **_active_db_connections.metrics(connection_id)}
+
+@app.get("/api/integrations/databases/{connection_id}/metrics")
+async def get_database_connection_metrics(connection_id: str):
+    """Connector telemetry: per-operation latency histograms, rows/bytes moved and errors"""
+    if not database_connections_collection.find_one({"id": connection_id}, {"_id": 1}):
+        raise HTTPException(status_code=404, detail="Database connection not found")
+    
+    metrics = get_connector_telemetry(connection_id).snapshot()
+    metrics["pool"] = (_active_db_connections.metrics(connection_id).get("pool")
+                       if connection_id in _active_db_connections else None)
+    metrics["audit"] = connector_audit_writer.stats()
+    return metrics
+
 @app.post("/api/integrations/databases/{connection_id}/insert")
 async def database_insert(connection_id: str, request: DatabaseOperationRequest):
     """Insert data into database"""
@@ -7838,11 +8038,8 @@ async def database_insert(connection_id: str, request: DatabaseOperationRequest)
         raise HTTPException(status_code=400, detail="Unsupported database type")
     
     try:
-        if connection_id not in _active_db_connections:
-            _active_db_connections[connection_id] = connector_class(connection_id, connection)
-        
-        connector = _active_db_connections[connection_id]
-        result = await connector.insert(request.table, request.data)
+        async with _active_db_connections.lease(connection_id, connection, connector_class) as connector:
+            result = await connector.insert(request.table, request.data)
         
         return result
     except Exception as e:
@@ -7864,11 +8061,8 @@ async def database_update(connection_id: str, request: DatabaseOperationRequest)
         raise HTTPException(status_code=400, detail="Unsupported database type")
     
     try:
-        if connection_id not in _active_db_connections:
-            _active_db_connections[connection_id] = connector_class(connection_id, connection)
-        
-        connector = _active_db_connections[connection_id]
-        result = await connector.update(request.table, request.data, request.condition or {})
+        async with _active_db_connections.lease(connection_id, connection, connector_class) as connector:
+            result = await connector.update(request.table, request.data, request.condition or {})
         
         return result
     except Exception as e:
@@ -7890,11 +8084,8 @@ async def database_delete(connection_id: str, request: DatabaseOperationRequest)
         raise HTTPException(status_code=400, detail="Unsupported database type")
     
     try:
-        if connection_id not in _active_db_connections:
-            _active_db_connections[connection_id] = connector_class(connection_id, connection)
-        
-        connector = _active_db_connections[connection_id]
-        result = await connector.delete(request.table, request.condition or {})
+        async with _active_db_connections.lease(connection_id, connection, connector_class) as connector:
+            result = await connector.delete(request.table, request.condition or {})
         
         return result
     except Exception as e:
@@ -8287,42 +8478,12 @@ async def test_connector(connector_id: str, variables: Dict[str, Any]):
         raise HTTPException(status_code=404, detail="Connector not found")
     
     try:
-        config = connector.get("config", {})
-        
-        # Substitute variables in URL
-        url = config.get("url", "")
-        for key, value in variables.items():
-            url = url.replace(f"${{{key}}}", str(value))
-        
-        # Substitute variables in headers
-        headers = {}
-        for key, value in config.get("headers", {}).items():
-            header_value = value
-            for var_key, var_value in variables.items():
-                header_value = header_value.replace(f"${{{var_key}}}", str(var_value))
-            headers[key] = header_value
-        
-        # Substitute variables in body
-        body = config.get("body")
-        if isinstance(body, str):
-            for key, value in variables.items():
-                body = body.replace(f"${{{key}}}", str(value))
-        elif isinstance(body, dict):
-            body = json.loads(json.dumps(body))  # Deep copy
-            def replace_vars(obj):
-                if isinstance(obj, str):
-                    for key, value in variables.items():
-                        obj = obj.replace(f"${{{key}}}", str(value))
-                    return obj
-                elif isinstance(obj, dict):
-                    return {k: replace_vars(v) for k, v in obj.items()}
-                elif isinstance(obj, list):
-                    return [replace_vars(item) for item in obj]
-                return obj
-            body = replace_vars(body)
+        # Substitute variables in URL, headers and body
+        compiled = get_compiled_request(connector)
+        url, headers, body = compiled.render(variables)
         
         # Make request
-        method = config.get("method", "GET").upper()
+        method = compiled.method
         timeout = connector.get("error_handling", {}).get("timeout", 30000) / 1000
         
         if method == "GET":
@@ -8371,7 +8532,7 @@ async def execute_connector(connector_id: str, variables: Dict[str, Any]):
     
     # Check circuit breaker
     circuit_breaker = get_circuit_breaker(connector_id)
-    if not circuit_breaker.can_attempt():
+    if not await circuit_breaker.can_attempt():
         return {
             "success": False,
             "error": "Circuit breaker is open. Too many recent failures.",
@@ -8379,9 +8540,11 @@ async def execute_connector(connector_id: str, variables: Dict[str, Any]):
         }
     
     # Check rate limiting
-    rate_limiter = get_rate_limiter(connector_id)
+    rate_limiter = get_rate_limiter(connector_id, connector)
     if rate_limiter:
-        can_proceed, wait_time = rate_limiter.can_proceed()
+        # Calls may queue for a slot for up to rate_limit.max_wait seconds
+        max_wait = (connector.get("rate_limit") or {}).get("max_wait", 0)
+        can_proceed, wait_time = await rate_limiter.acquire(timeout=max_wait)
         if not can_proceed:
             return {
                 "success": False,
@@ -8392,9 +8555,8 @@ async def execute_connector(connector_id: str, variables: Dict[str, Any]):
     # Execute with retry logic and connection pooling
     try:
         async def execute_request():
-            # Use connection pool semaphore to limit concurrent requests
-            async with client_semaphores[connector_id]:
-                return await _execute_connector_request(connector, variables)
+            # Concurrency per connector is limited by its pooled client (see connector_http_pool)
+            return await _execute_connector_request(connector, variables)
         
         # Execute with retry and exponential backoff
         result = await execute_with_retry(
@@ -8404,13 +8566,13 @@ async def execute_connector(connector_id: str, variables: Dict[str, Any]):
         )
         
         # Record success in circuit breaker
-        circuit_breaker.record_success()
+        await circuit_breaker.record_success()
         
         return result
         
     except Exception as e:
         # Record failure in circuit breaker
-        circuit_breaker.record_failure()
+        await circuit_breaker.record_failure()
         
         return {
             "success": False,
@@ -8419,104 +8581,80 @@ async def execute_connector(connector_id: str, variables: Dict[str, Any]):
 
 async def _execute_connector_request(connector: Dict[str, Any], variables: Dict[str, Any]) -> Dict[str, Any]:
     """Internal function to execute connector request with connection pooling"""
-    config = connector.get("config", {})
-    
-    # Replace variables in URL
-    url = config.get("url", "")
-    for var_name, var_value in variables.items():
-        url = url.replace(f"${{{var_name}}}", str(var_value))
-    
-    # Replace variables in headers
-    headers = {}
-    for key, value in config.get("headers", {}).items():
-        for var_name, var_value in variables.items():
-            value = value.replace(f"${{{var_name}}}", str(var_value))
-        headers[key] = value
-    
-    # Replace variables in body
-    body = config.get("body")
-    if body:
-        if isinstance(body, str):
-            for var_name, var_value in variables.items():
-                body = body.replace(f"${{{var_name}}}", str(var_value))
-        elif isinstance(body, dict):
-            body = json.loads(json.dumps(body))
-            body_str = json.dumps(body)
-            for var_name, var_value in variables.items():
-                body_str = body_str.replace(f"${{{var_name}}}", str(var_value))
-            body = json.loads(body_str)
-    
-    # Get HTTP client with connection pooling
-    client = get_http_client(connector["id"], timeout=config.get("timeout", 30))
+    # Render URL, headers and body from the compiled template (placeholders are
+    # located once per connector version, body values substituted structurally)
+    compiled = get_compiled_request(connector)
+    url, headers, body = compiled.render(variables)
     
     # Execute request
-    method = config.get("method", "GET").upper()
-    
-    if method == "GET":
-        response = await client.get(url, headers=headers)
-    elif method == "POST":
-        response = await client.post(url, headers=headers, json=body if isinstance(body, dict) else None, content=body if isinstance(body, str) else None)
-    elif method == "PUT":
-        response = await client.put(url, headers=headers, json=body if isinstance(body, dict) else None, content=body if isinstance(body, str) else None)
-    elif method == "PATCH":
-        response = await client.patch(url, headers=headers, json=body if isinstance(body, dict) else None)
-    elif method == "DELETE":
-        response = await client.delete(url, headers=headers)
-    else:
+    method = compiled.method
+    if method not in ("GET", "POST", "PUT", "PATCH", "DELETE"):
         raise ValueError(f"Unsupported HTTP method: {method}")
     
-    # Parse response
-    try:
-        response_data = response.json()
-    except:
-        response_data = {"text": response.text}
-    
-    if not response.is_success:
-        raise HTTPException(status_code=response.status_code, detail=f"API request failed: {response.text}")
-    
-    # Map response to variables
-    mapped_variables = {}
-    for mapping in connector.get("response_mapping", []):
-        source_path = mapping.get("source_path", "")
-        target_variable = mapping.get("target_variable", "")
-        
-        # Simple JSON path extraction ($.field.subfield)
-        value = response_data
-        if source_path.startswith("$."):
-            path_parts = source_path[2:].split(".")
-            for part in path_parts:
-                # Handle array indexing like $.items[0]
-                if '[' in part and ']' in part:
-                    field_name = part[:part.index('[')]
-                    index = int(part[part.index('[')+1:part.index(']')])
-                    if isinstance(value, dict) and field_name in value:
-                        value = value[field_name]
-                        if isinstance(value, list) and len(value) > index:
-                            value = value[index]
-                        else:
-                            value = None
-                            break
-                elif isinstance(value, dict):
-                    value = value.get(part)
-                else:
-                    value = None
-                    break
-        
-        # Apply transformation
-        transform = mapping.get("transform", "none")
-        if transform == "uppercase" and isinstance(value, str):
-            value = value.upper()
-        elif transform == "lowercase" and isinstance(value, str):
-            value = value.lower()
-        
-        mapped_variables[target_variable] = value
+    request_kwargs = {}
+    if method in ("POST", "PUT"):
+        request_kwargs = {"json": body if isinstance(body, dict) else None, "content": body if isinstance(body, str) else None}
+    elif method == "PATCH":
+        request_kwargs = {"json": body if isinstance(body, dict) else None}
+    
+    async def send(cached: Optional[CacheEntry] = None) -> Dict[str, Any]:
+        request_headers = {**headers, **cached.conditional_headers()} if cached else headers
+        # Pooled client with an adaptive concurrency limit; looked up right before taking a
+        # slot so a reset in between cannot hand out a client that is being closed
+        pooled = connector_http_pool.get(connector)
+        async with pooled.slot() as client, client.stream(method, url, headers=request_headers, **request_kwargs) as response:
+            response_headers = {key.lower(): value for key, value in response.headers.items()}
+            if response.status_code == 304 and cached is not None:
+                return {"status_code": 304, "headers": response_headers}
+            
+            if response.is_success and compiled.should_stream_response(response):
+                # Large JSON response: read only the mapped paths, never the whole document
+                return {
+                    "status_code": response.status_code,
+                    "headers": response_headers,
+                    "data": None,
+                    "mapped_variables": await compiled.extractor.extract_stream(response.aiter_bytes()),
+                    "streamed": True,
+                    "size": None
+                }
+            
+            await response.aread()
+            
+            # Parse response
+            try:
+                response_data = response.json()
+            except:
+                response_data = {"text": response.text}
+            
+            if not response.is_success:
+                raise HTTPException(status_code=response.status_code, detail=f"API request failed: {response.text}")
+            
+            # Map response to variables
+            return {
+                "status_code": response.status_code,
+                "headers": response_headers,
+                "data": response_data,
+                "mapped_variables": compiled.extractor.extract(response_data),
+                "streamed": False,
+                "size": len(response.content)
+            }
+    
+    started = time.perf_counter()
+    cache_policy = connector.get("cache") or {}
+    if cache_policy.get("enabled") and method in cache_policy.get("methods", ["GET"]):
+        # Identical rendered requests share one upstream call and the cached response
+        cache_key = ResponseCache.make_key(connector["id"], method, url, headers, body)
+        result = await connector_response_cache.get_or_fetch(connector["id"], cache_key, send, cache_policy.get("ttl", 60))
+    else:
+        result = await send()
     
     return {
         "success": True,
-        "status_code": response.status_code,
-        "mapped_variables": mapped_variables,
-        "raw_response": response_data,
-        "elapsed_ms": response.elapsed.total_seconds() * 1000
+        "status_code": result["status_code"],
+        "mapped_variables": result["mapped_variables"],
+        "raw_response": result["data"],
+        "response_streamed": result["streamed"],
+        "elapsed_ms": (time.perf_counter() - started) * 1000
     }
 
 
@@ -8530,130 +8668,79 @@ oauth_tokens_collection = db['oauth_tokens']
 webhook_endpoints_collection = db['webhook_endpoints']
 webhook_logs_collection = db['webhook_logs']
 
-# Rate limiting storage (in-memory for simplicity, use Redis in production)
-rate_limit_cache = {}
-circuit_breaker_states = {}
+# Webhook calls are persisted in batches and forwarded by async workers
+webhook_ingestor = WebhookIngestor(db)
+webhook_ingestor.ensure_indexes()
+
+# Rate limit and circuit breaker state: shared through Redis when RESILIENCE_REDIS_URL
+# is set (with a local stand-in while Redis is unreachable), otherwise in-process
+resilience_store = create_state_store(os.environ.get("RESILIENCE_REDIS_URL"))
+rate_limit_cache = {}  # connector_id -> (updated_at, RateLimiter or None when not configured, cached_at)
+RATE_LIMIT_CACHE_TTL = 30  # seconds before a lookup without the connector re-reads its config
+circuit_breakers = {}  # connector_id -> CircuitBreaker
+
+# Opt-in response cache for connector calls (connector["cache"])
+connector_response_cache = ResponseCache()
 
 # Connection pooling for HTTP requests
 import httpx
 import asyncio
-from collections import defaultdict
-
-# HTTP client pool with connection pooling
-http_clients = {}  # connector_id -> httpx.AsyncClient
-client_semaphores = defaultdict(lambda: asyncio.Semaphore(10))  # Max 10 concurrent requests per connector
-
-def get_http_client(connector_id: str, timeout: int = 30) -> httpx.AsyncClient:
-    """Get or create HTTP client with connection pooling for a connector"""
-    if connector_id not in http_clients:
-        http_clients[connector_id] = httpx.AsyncClient(
-            timeout=httpx.Timeout(timeout),
-            limits=httpx.Limits(
-                max_keepalive_connections=5,
-                max_connections=10,
-                keepalive_expiry=30.0
-            ),
-            follow_redirects=True
-        )
-    return http_clients[connector_id]
+
+# HTTP client pool per connector (limits from connector config.pool, HTTP/2,
+# adaptive concurrency, idle clients evicted)
+connector_http_pool = ConnectorHttpPool()
 
 async def close_http_clients():
     """Close all HTTP clients on shutdown"""
-    for client in http_clients.values():
-        await client.aclose()
-    http_clients.clear()
-
-# Circuit Breaker implementation
-class CircuitBreaker:
-    def __init__(self, failure_threshold: int = 5, timeout: int = 60):
-        self.failure_threshold = failure_threshold
-        self.timeout = timeout  # seconds to wait before trying again
-        self.failure_count = 0
-        self.last_failure_time = None
-        self.state = "closed"  # closed, open, half-open
-    
-    def record_success(self):
-        """Record successful call"""
-        self.failure_count = 0
-        self.state = "closed"
-    
-    def record_failure(self):
-        """Record failed call"""
-        self.failure_count += 1
-        self.last_failure_time = datetime.utcnow()
-        
-        if self.failure_count >= self.failure_threshold:
-            self.state = "open"
-    
-    def can_attempt(self) -> bool:
-        """Check if request can be attempted"""
-        if self.state == "closed":
-            return True
-        
-        if self.state == "open":
-            # Check if timeout has passed
-            if self.last_failure_time:
-                elapsed = (datetime.utcnow() - self.last_failure_time).total_seconds()
-                if elapsed >= self.timeout:
-                    self.state = "half-open"
-                    return True
-            return False
-        
-        # half-open state: try one request
-        return True
+    await connector_http_pool.close_all()
 
 def get_circuit_breaker(connector_id: str) -> CircuitBreaker:
-    """Get or create circuit breaker for connector"""
-    if connector_id not in circuit_breaker_states:
-        circuit_breaker_states[connector_id] = CircuitBreaker()
-    return circuit_breaker_states[connector_id]
-
-# Rate limiting implementation
-class RateLimiter:
-    def __init__(self, max_requests: int, time_window: int):
-        self.max_requests = max_requests
-        self.time_window = time_window  # in seconds
-        self.requests = []  # list of timestamps
-    
-    def can_proceed(self) -> tuple[bool, float]:
-        """Check if request can proceed. Returns (can_proceed, wait_time)"""
-        now = datetime.utcnow()
-        
-        # Clean old requests outside time window
-        cutoff = now - timedelta(seconds=self.time_window)
-        self.requests = [ts for ts in self.requests if ts > cutoff]
-        
-        if len(self.requests) < self.max_requests:
-            self.requests.append(now)
-            return True, 0.0
-        
-        # Calculate wait time
-        oldest_request = min(self.requests)
-        wait_time = (oldest_request + timedelta(seconds=self.time_window) - now).total_seconds()
-        return False, max(0, wait_time)
-    
-    def record_request(self):
-        """Record a new request"""
-        self.requests.append(datetime.utcnow())
-
-def get_rate_limiter(connector_id: str) -> Optional[RateLimiter]:
-    """Get rate limiter for connector if configured"""
-    connector = api_connectors_collection.find_one({"id": connector_id})
-    if not connector:
-        return None
-    
-    rate_limit_config = connector.get("rate_limit")
-    if not rate_limit_config:
-        return None
-    
-    cache_key = f"rate_limiter:{connector_id}"
-    if cache_key not in rate_limit_cache:
-        rate_limit_cache[cache_key] = RateLimiter(
-            max_requests=rate_limit_config.get("max_requests", 100),
-            time_window=rate_limit_config.get("time_window", 60)
+    """Get or create circuit breaker for connector (state lives in resilience_store)"""
+    if connector_id not in circuit_breakers:
+        circuit_breakers[connector_id] = CircuitBreaker(connector_id, resilience_store)
+    return circuit_breakers[connector_id]
+
+def get_rate_limiter(connector_id: str, connector: Optional[Dict[str, Any]] = None) -> Optional[RateLimiter]:
+    """Get rate limiter for connector if configured
+    
+    The configuration is cached (including "not configured") per connector
+    `updated_at`, which every connector write bumps, so a change made through
+    another worker is picked up on the next call that passes the connector.
+    Lookups without the connector re-read it after RATE_LIMIT_CACHE_TTL.
+    """
+    cached = rate_limit_cache.get(connector_id)
+    if cached is not None:
+        updated_at, rate_limiter, cached_at = cached
+        if connector is not None:
+            if connector.get("updated_at") == updated_at:
+                return rate_limiter
+        elif time.monotonic() - cached_at < RATE_LIMIT_CACHE_TTL:
+            return rate_limiter
+    
+    if connector is None:
+        connector = api_connectors_collection.find_one(
+            {"id": connector_id}, {"_id": 0, "rate_limit": 1, "updated_at": 1}
         )
+    connector = connector or {}
     
-    return rate_limit_cache[cache_key]
+    if cached is not None and connector.get("updated_at") == cached[0]:
+        rate_limiter = cached[1]
+    else:
+        rate_limit_config = connector.get("rate_limit")
+        rate_limiter = None
+        if rate_limit_config:
+            rate_limiter = RateLimiter(
+                connector_id,
+                max_requests=rate_limit_config.get("max_requests", 100),
+                time_window=rate_limit_config.get("time_window", 60),
+                store=resilience_store
+            )
+    rate_limit_cache[connector_id] = (connector.get("updated_at"), rate_limiter, time.monotonic())
+    return rate_limiter
+
+def invalidate_rate_limiter(connector_id: str):
+    """Drop the cached rate limit configuration of a connector"""
+    rate_limit_cache.pop(connector_id, None)
 
 # Retry logic with exponential backoff
 async def execute_with_retry(
@@ -8905,6 +8992,7 @@ class RateLimitConfig(BaseModel):
     max_requests: int = 100
     time_window: int = 60  # seconds
     retry_after: int = 60  # seconds to wait after limit exceeded
+    max_wait: float = 0  # seconds a call may wait for a free slot before being rejected
 
 @app.post("/api/connectors/{connector_id}/rate-limit")
 async def configure_rate_limit(connector_id: str, config: RateLimitConfig):
@@ -8921,10 +9009,8 @@ async def configure_rate_limit(connector_id: str, config: RateLimitConfig):
         }}
     )
     
-    # Clear existing rate limiter to force recreation with new config
-    cache_key = f"rate_limiter:{connector_id}"
-    if cache_key in rate_limit_cache:
-        del rate_limit_cache[cache_key]
+    # Clear cached rate limit config to force recreation with new config
+    invalidate_rate_limiter(connector_id)
     
     return {"message": "Rate limit configured successfully"}
 
@@ -8935,9 +9021,9 @@ async def get_circuit_breaker_status(connector_id: str):
     if not connector:
         raise HTTPException(status_code=404, detail="Connector not found")
     
-    circuit_breaker = circuit_breaker_states.get(connector_id)
+    status = await get_circuit_breaker(connector_id).status()
     
-    if not circuit_breaker:
+    if not status:
         return {
             "connector_id": connector_id,
             "circuit_breaker": {
@@ -8951,15 +9037,7 @@ async def get_circuit_breaker_status(connector_id: str):
     return {
         "connector_id": connector_id,
         "connector_name": connector.get("name", connector_id),
-        "circuit_breaker": {
-            "state": circuit_breaker.state,
-            "failure_count": circuit_breaker.failure_count,
-            "failure_threshold": circuit_breaker.failure_threshold,
-            "last_failure_time": circuit_breaker.last_failure_time.isoformat() if circuit_breaker.last_failure_time else None,
-            "timeout_seconds": circuit_breaker.timeout,
-            "can_attempt": circuit_breaker.can_attempt(),
-            "time_until_retry": None if circuit_breaker.state != "open" else max(0, circuit_breaker.timeout - (datetime.utcnow() - circuit_breaker.last_failure_time).total_seconds()) if circuit_breaker.last_failure_time else 0
-        }
+        "circuit_breaker": status
     }
 
 @app.post("/api/connectors/{connector_id}/circuit-breaker/reset")
@@ -8969,8 +9047,7 @@ async def reset_circuit_breaker(connector_id: str):
     if not connector:
         raise HTTPException(status_code=404, detail="Connector not found")
     
-    if connector_id in circuit_breaker_states:
-        del circuit_breaker_states[connector_id]
+    await resilience_store.breaker_reset(connector_id)
     
     return {
         "message": f"Circuit breaker reset successfully for connector {connector_id}",
@@ -8983,17 +9060,25 @@ async def get_all_circuit_breakers_status():
     """Get status of all circuit breakers"""
     breakers = {}
     
-    for connector_id, circuit_breaker in circuit_breaker_states.items():
-        connector = api_connectors_collection.find_one({"id": connector_id})
+    breaker_ids = await resilience_store.breaker_keys()
+    names = {
+        c["id"]: c.get("name", c["id"])
+        for c in api_connectors_collection.find({"id": {"$in": breaker_ids}}, {"_id": 0, "id": 1, "name": 1})
+    }
+    
+    for connector_id in breaker_ids:
+        status = await get_circuit_breaker(connector_id).status()
+        if not status:
+            continue
         
         breakers[connector_id] = {
             "connector_id": connector_id,
-            "connector_name": connector.get("name", connector_id) if connector else connector_id,
-            "state": circuit_breaker.state,
-            "failure_count": circuit_breaker.failure_count,
-            "failure_threshold": circuit_breaker.failure_threshold,
-            "last_failure_time": circuit_breaker.last_failure_time.isoformat() if circuit_breaker.last_failure_time else None,
-            "can_attempt": circuit_breaker.can_attempt()
+            "connector_name": names.get(connector_id, connector_id),
+            "state": status["state"],
+            "failure_count": status["failure_count"],
+            "failure_threshold": status["failure_threshold"],
+            "last_failure_time": status["last_failure_time"],
+            "can_attempt": status["can_attempt"]
         }
     
     # Summary statistics
@@ -9021,36 +9106,75 @@ async def get_rate_limit_status(connector_id: str):
     if not connector:
         raise HTTPException(status_code=404, detail="Connector not found")
     
-    rate_limit_config = connector.get("rate_limit", {})
-    
-    # Get rate limiter
-    cache_key = f"rate_limiter:{connector_id}"
-    rate_limiter = rate_limit_cache.get(cache_key)
+    rate_limit_config = connector.get("rate_limit") or {}
     
     current_usage = {
         "configured": bool(rate_limit_config),
         "max_requests": rate_limit_config.get("max_requests", 0),
         "time_window": rate_limit_config.get("time_window", 0),
-        "current_requests": len(rate_limiter.requests) if rate_limiter else 0,
-        "available_requests": rate_limit_config.get("max_requests", 0) - (len(rate_limiter.requests) if rate_limiter else 0),
+        "current_requests": 0,
+        "available_requests": rate_limit_config.get("max_requests", 0),
         "can_proceed": True,
         "wait_time": 0
     }
     
+    # Peek at the limiter state without consuming a request slot
+    rate_limiter = get_rate_limiter(connector_id, connector)
     if rate_limiter:
-        can_proceed, wait_time = rate_limiter.can_proceed()
-        current_usage["can_proceed"] = can_proceed
-        current_usage["wait_time"] = wait_time
+        current_usage.update(await rate_limiter.status())
     
     return {
         "connector_id": connector_id,
         "rate_limit": rate_limit_config,
-        "current_usage": current_usage.get("count", 0),
-        "max_requests": rate_limit.get("max_requests", 100),
-        "reset_at": current_usage.get("reset_at"),
-        "available": rate_limit.get("max_requests", 100) - current_usage.get("count", 0)
+        "current_usage": current_usage,
+        "backend": resilience_store.name
+    }
+
+# Response Cache
+class ResponseCacheConfig(BaseModel):
+    enabled: bool = True
+    ttl: float = 60  # seconds, when the response has no Cache-Control max-age
+    methods: List[str] = ["GET"]
+
+@app.post("/api/connectors/{connector_id}/cache")
+async def configure_response_cache(connector_id: str, config: ResponseCacheConfig):
+    """Configure the response cache for a connector"""
+    connector = api_connectors_collection.find_one({"id": connector_id})
+    if not connector:
+        raise HTTPException(status_code=404, detail="Connector not found")
+    
+    cache_config = config.dict()
+    cache_config["methods"] = [method.upper() for method in config.methods]
+    api_connectors_collection.update_one(
+        {"id": connector_id},
+        {"$set": {
+            "cache": cache_config,
+            "updated_at": datetime.utcnow().isoformat()
+        }}
+    )
+    connector_response_cache.purge(connector_id)
+    
+    return {"message": "Response cache configured successfully"}
+
+@app.get("/api/connectors/{connector_id}/cache/stats")
+async def get_response_cache_stats(connector_id: str):
+    """Hit rate and size of a connector's response cache"""
+    connector = api_connectors_collection.find_one({"id": connector_id}, {"_id": 0, "cache": 1})
+    if not connector:
+        raise HTTPException(status_code=404, detail="Connector not found")
+    
+    return {
+        "connector_id": connector_id,
+        "cache": connector.get("cache") or {"enabled": False},
+        "stats": connector_response_cache.stats(connector_id),
+        "global": connector_response_cache.summary()
     }
 
+@app.delete("/api/connectors/{connector_id}/cache")
+async def purge_response_cache(connector_id: str):
+    """Drop all cached responses of a connector"""
+    return {"connector_id": connector_id, "purged": connector_response_cache.purge(connector_id)}
+
 # Webhook Management
 @app.post("/api/webhooks")
 async def create_webhook(webhook: WebhookConfig):
@@ -9106,6 +9230,7 @@ async def update_webhook(webhook_id: str, webhook: WebhookConfig):
     webhook_dict["last_called_at"] = existing.get("last_called_at")
     
     webhook_endpoints_collection.replace_one({"id": webhook_id}, webhook_dict)
+    webhook_ingestor.invalidate_endpoint(webhook_id)
     
     return {"message": "Webhook updated successfully"}
 
@@ -9115,61 +9240,41 @@ async def delete_webhook(webhook_id: str):
     result = webhook_endpoints_collection.delete_one({"id": webhook_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Webhook not found")
+    webhook_ingestor.invalidate_endpoint(webhook_id)
     return {"message": "Webhook deleted successfully"}
 
 @app.post("/api/webhooks/{webhook_id}/receive")
-async def receive_webhook(webhook_id: str, data: Dict[str, Any], background_tasks: BackgroundTasks):
-    """Receive webhook payload"""
-    webhook = webhook_endpoints_collection.find_one({"id": webhook_id})
+async def receive_webhook(webhook_id: str, data: Dict[str, Any]):
+    """Receive webhook payload
+    
+    The call is acknowledged once it is durably logged; forwarding to the
+    configured URL happens asynchronously with retries (see WebhookIngestor).
+    """
+    webhook = webhook_ingestor.get_endpoint(webhook_id)
     if not webhook:
         raise HTTPException(status_code=404, detail="Webhook not found")
     
     if not webhook.get("active", True):
         raise HTTPException(status_code=403, detail="Webhook is inactive")
     
-    # Log webhook call
-    log_id = str(uuid.uuid4())
-    now = datetime.utcnow().isoformat()
-    
-    webhook_logs_collection.insert_one({
-        "id": log_id,
-        "webhook_id": webhook_id,
-        "payload": data,
-        "received_at": now,
-        "status": "received"
-    })
-    
-    # Update webhook stats
-    webhook_endpoints_collection.update_one(
-        {"id": webhook_id},
-        {
-            "$inc": {"total_calls": 1},
-            "$set": {"last_called_at": now}
-        }
-    )
-    
-    # Process webhook in background
-    def process_webhook():
-        try:
-            # Forward to configured URL
-            if webhook.get("url"):
-                headers = webhook.get("headers", {})
-                requests.post(webhook["url"], json=data, headers=headers, timeout=30)
-            
-            webhook_logs_collection.update_one(
-                {"id": log_id},
-                {"$set": {"status": "processed", "processed_at": datetime.utcnow().isoformat()}}
-            )
-        except Exception as e:
-            webhook_logs_collection.update_one(
-                {"id": log_id},
-                {"$set": {"status": "failed", "error": str(e), "processed_at": datetime.utcnow().isoformat()}}
-            )
-    
-    background_tasks.add_task(process_webhook)
+    log_id = await webhook_ingestor.ingest(webhook, data)
     
     return {"message": "Webhook received", "log_id": log_id}
 
+@app.post("/api/webhooks/{webhook_id}/dead-letters/replay")
+async def replay_webhook_dead_letters(webhook_id: str, limit: int = 1000):
+    """Re-queue webhook calls whose forwarding was given up"""
+    if not webhook_ingestor.get_endpoint(webhook_id):
+        raise HTTPException(status_code=404, detail="Webhook not found")
+    
+    replayed = await webhook_ingestor.replay_dead_letters(webhook_id, limit)
+    return {"message": f"Re-queued {replayed} dead-lettered calls", "replayed": replayed}
+
+@app.get("/api/webhook-ingestion/stats")
+async def get_webhook_ingestion_stats():
+    """Webhook ingestion pipeline counters (received, forwarded, retried, dead-lettered, queued)"""
+    return webhook_ingestor.stats()
+
 @app.get("/api/webhooks/{webhook_id}/logs")
 async def get_webhook_logs(webhook_id: str, limit: int = 50):
     """Get webhook call logs"""
@@ -9227,36 +9332,21 @@ async def get_connection_pool_health():
     """Get health status of all connection pools"""
     pool_health = {}
     
-    for connector_id, client in http_clients.items():
-        try:
-            # Get connection pool statistics
-            pool_info = {
-                "connector_id": connector_id,
-                "is_closed": client.is_closed,
-                "active_connections": len(client._transport._pool._connections) if hasattr(client, '_transport') and hasattr(client._transport, '_pool') else 0,
-                "status": "healthy" if not client.is_closed else "closed"
-            }
-            
-            # Check semaphore availability
-            semaphore = client_semaphores.get(connector_id)
-            if semaphore:
-                pool_info["available_slots"] = semaphore._value
-                pool_info["max_concurrent"] = semaphore._initial_value
-                pool_info["in_use"] = semaphore._initial_value - semaphore._value
-            
-            pool_health[connector_id] = pool_info
-            
-        except Exception as e:
-            pool_health[connector_id] = {
-                "connector_id": connector_id,
-                "status": "error",
-                "error": str(e)
-            }
+    for connector_id, pooled in list(connector_http_pool.clients.items()):
+        stats = pooled.stats()
+        pool_health[connector_id] = {
+            "connector_id": connector_id,
+            "is_closed": pooled.client.is_closed,
+            "active_requests": stats["active_requests"],
+            "queued_requests": stats["queued_requests"],
+            "available_slots": stats["available_slots"],
+            "max_concurrent": stats["concurrency_limit"],
+            "in_use": stats["active_requests"],
+            "status": "healthy" if not pooled.client.is_closed else "closed"
+        }
     
     overall_status = "healthy"
-    if any(pool.get("status") == "error" for pool in pool_health.values()):
-        overall_status = "degraded"
-    elif any(pool.get("status") == "closed" for pool in pool_health.values()):
+    if any(pool.get("status") == "closed" for pool in pool_health.values()):
         overall_status = "partial"
     
     return {
@@ -9268,72 +9358,32 @@ async def get_connection_pool_health():
 
 @app.get("/api/connectors/pool/statistics")
 async def get_connection_pool_statistics():
-    """Get detailed statistics for all connection pools"""
-    statistics = {}
+    """Get detailed statistics for all connection pools (queue wait, latency, utilization)"""
+    pools = list(connector_http_pool.clients.items())
+    names = {
+        c["id"]: c.get("name", c["id"])
+        for c in api_connectors_collection.find({"id": {"$in": [cid for cid, _ in pools]}}, {"_id": 0, "id": 1, "name": 1})
+    }
     
-    for connector_id, client in http_clients.items():
-        try:
-            connector = api_connectors_collection.find_one({"id": connector_id})
-            connector_name = connector.get("name", connector_id) if connector else connector_id
-            
-            stats = {
-                "connector_id": connector_id,
-                "connector_name": connector_name,
-                "client_status": "active" if not client.is_closed else "closed",
-                "created_at": getattr(client, '_created_at', None),
-            }
-            
-            # Connection pool stats
-            if hasattr(client, '_transport') and hasattr(client._transport, '_pool'):
-                pool = client._transport._pool
-                stats.update({
-                    "pool_connections": len(pool._connections),
-                    "max_keepalive": getattr(pool, '_max_keepalive_connections', 'unknown'),
-                    "max_connections": getattr(pool, '_max_connections', 'unknown')
-                })
-            
-            # Semaphore stats
-            semaphore = client_semaphores.get(connector_id)
-            if semaphore:
-                stats.update({
-                    "max_concurrent_requests": semaphore._initial_value,
-                    "available_slots": semaphore._value,
-                    "active_requests": semaphore._initial_value - semaphore._value,
-                    "utilization_percent": round(((semaphore._initial_value - semaphore._value) / semaphore._initial_value) * 100, 2)
-                })
-            
-            statistics[connector_id] = stats
-            
-        except Exception as e:
-            statistics[connector_id] = {
-                "connector_id": connector_id,
-                "error": str(e),
-                "status": "error"
-            }
+    statistics = {}
+    for connector_id, pooled in pools:
+        statistics[connector_id] = {"connector_name": names.get(connector_id, connector_id), **pooled.stats()}
     
     return {
         "statistics": statistics,
         "total_connectors": len(statistics),
+        "evicted_idle_clients": connector_http_pool.evicted,
         "timestamp": datetime.utcnow().isoformat()
     }
 
 @app.post("/api/connectors/{connector_id}/pool/reset")
 async def reset_connection_pool(connector_id: str):
     """Reset connection pool for a specific connector"""
-    if connector_id not in http_clients:
+    if connector_id not in connector_http_pool.clients:
         raise HTTPException(status_code=404, detail="Connection pool not found for connector")
     
     try:
-        # Close existing client
-        old_client = http_clients[connector_id]
-        await old_client.aclose()
-        
-        # Remove from pool
-        del http_clients[connector_id]
-        
-        # Reset semaphore
-        if connector_id in client_semaphores:
-            del client_semaphores[connector_id]
+        await connector_http_pool.reset(connector_id)
         
         return {
             "message": f"Connection pool reset successfully for connector {connector_id}",
@@ -9346,22 +9396,14 @@ async def reset_connection_pool(connector_id: str):
 
 @app.post("/api/connectors/pool/cleanup")
 async def cleanup_connection_pools():
-    """Clean up all inactive connection pools"""
+    """Clean up idle and closed connection pools"""
     cleaned_pools = []
     errors = []
     
-    for connector_id, client in list(http_clients.items()):
-        try:
-            if client.is_closed:
-                del http_clients[connector_id]
-                if connector_id in client_semaphores:
-                    del client_semaphores[connector_id]
-                cleaned_pools.append(connector_id)
-        except Exception as e:
-            errors.append({
-                "connector_id": connector_id,
-                "error": str(e)
-            })
+    try:
+        cleaned_pools = await connector_http_pool.cleanup()
+    except Exception as e:
+        errors.append({"error": str(e)})
     
     return {
         "message": f"Cleaned up {len(cleaned_pools)} inactive connection pools",
@@ -10243,10 +10285,10 @@ async def delete_workflow_component(component_id: str):
 @app.get("/api/workflows/{workflow_id}/versions")
 async def get_workflow_versions(workflow_id: str):
     """Get all versions of a workflow for subprocess version management (Phase 3.1)"""
-    versions = list(workflow_versions_collection.find(
-        {"workflow_id": workflow_id},
-        {"_id": 0}
-    ).sort("version_number", -1))
+    versions = [
+        _summarize_version_entry(v)
+        for v in workflow_versions_collection.find({"workflow_id": workflow_id}, {"_id": 0}).sort("version_number", -1)
+    ]
     
     return {"workflow_id": workflow_id, "versions": versions, "count": len(versions)}
 
@@ -10371,10 +10413,10 @@ async def create_version_snapshot(workflow_id: str, data: Dict[str, Any]):
 @app.get("/api/workflows/{workflow_id}/versions/list")
 async def list_workflow_versions(workflow_id: str):
     """List all version snapshots for a workflow (Phase 3.1)"""
-    versions = list(workflow_versions_collection.find(
-        {"workflow_id": workflow_id},
-        {"_id": 0}
-    ).sort("created_at", -1))
+    versions = [
+        _summarize_version_entry(v)
+        for v in workflow_versions_collection.find({"workflow_id": workflow_id}, {"_id": 0}).sort("created_at", -1)
+    ]
     
     return {
         "workflow_id": workflow_id,
@@ -10484,6 +10526,14 @@ async def search_workflow_components(
 from transformation_engine import (
     apply_transformation, 
     get_function_metadata,
+    compile_pipeline,
+    pipeline_result_cache,
+    iter_csv_batches,
+    iter_csv_chunks,
+    iter_json_items,
+    iter_xml_records,
+    transform_jsonpath,
+    TransformationStepError,
     TRANSFORMATION_FUNCTIONS
 )
 
@@ -10541,54 +10591,49 @@ async def apply_transformations(request: Dict[str, Any]):
         "transformations": [
             {"function": "split", "args": ["value", ","]},
             {"function": "filter", "args": ["{previous_result}", "> 5"]}
-        ]
+        ],
+        "step_report": "full" | "summary" | "none"
     }
+    
+    "full" (default) returns every intermediate result; "summary" returns the
+    type and size of each step's output and lets consecutive array steps run
+    fused in one pass; "none" returns only the final result.
     """
     try:
         data = request.get("data")
         transformations = request.get("transformations", [])
+        step_report = request.get("step_report", "full")
         
         if not transformations:
             return {"success": True, "result": data, "steps": []}
         
-        result = data
-        steps = []
+        try:
+            pipeline = compile_pipeline(transformations)
+        except ValueError as e:
+            return {
+                "success": False,
+                "error": f"Invalid transformation pipeline: {str(e)}",
+                "steps": [],
+                "partial_result": data
+            }
         
-        for i, transform in enumerate(transformations):
-            function_name = transform.get("function")
-            args = transform.get("args", [])
-            kwargs = transform.get("kwargs", {})
-            
-            # Replace {previous_result} placeholder with actual result
-            args = [result if arg == "{previous_result}" else arg for arg in args]
-            
-            try:
-                result = apply_transformation(function_name, *args, **kwargs)
-                steps.append({
-                    "step": i + 1,
-                    "function": function_name,
-                    "success": True,
-                    "result": result
-                })
-            except Exception as e:
-                steps.append({
-                    "step": i + 1,
-                    "function": function_name,
-                    "success": False,
-                    "error": str(e)
-                })
-                return {
-                    "success": False,
-                    "error": f"Transformation failed at step {i + 1}: {str(e)}",
-                    "steps": steps,
-                    "partial_result": result
-                }
+        try:
+            run = pipeline.run(data, step_report=None if step_report == "none" else step_report)
+        except TransformationStepError as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "steps": e.steps,
+                "partial_result": e.partial_result
+            }
         
         return {
             "success": True,
-            "result": result,
-            "steps": steps,
-            "transformation_count": len(transformations)
+            "result": run["result"],
+            "steps": run["steps"],
+            "transformation_count": len(pipeline),
+            "fused_stages": sum(1 for stage in pipeline.stages if len(stage) > 1),
+            "cached": run["cached"]
         }
         
     except Exception as e:
@@ -10598,6 +10643,12 @@ async def apply_transformations(request: Dict[str, Any]):
         }
 
 
+@app.get("/api/transformations/cache/stats")
+async def get_transformation_cache_stats():
+    """Hit rate and size of the transformation pipeline result cache"""
+    return pipeline_result_cache.stats()
+
+
 @app.get("/api/transformations/functions")
 async def get_transformation_functions():
     """
@@ -10756,6 +10807,91 @@ async def convert_to_csv(request: Dict[str, Any]):
         }
 
 
+# Streaming variants: the request body is the raw file (CSV, XML, JSON or NDJSON)
+# and is parsed in a worker thread while it uploads, so memory stays bounded.
+
+def _ndjson_batches(batches, label: str = "row"):
+    """Encode batches of parsed values as NDJSON rows followed by an end row"""
+    count = 0
+    try:
+        for batch in batches:
+            count += len(batch)
+            yield "".join(json.dumps({"type": label, "data": item}, default=str) + "\n" for item in batch)
+        yield json.dumps({"type": "end", f"{label}s": count}) + "\n"
+    except Exception as e:
+        yield json.dumps({"type": "error", "error": str(e), f"{label}s": count}) + "\n"
+
+
+def _batched(items, size: int):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+@app.post("/api/transformations/parse-csv/stream")
+async def parse_csv_stream(request: Request, delimiter: str = ",", has_header: bool = True,
+                           batch_size: int = 1000, encoding: str = "utf-8-sig"):
+    """Parse a CSV request body; streams one NDJSON row per record"""
+    body = BlockingBodyReader.open(request.stream())
+    batches = iter_csv_batches(body, delimiter, has_header, max(1, batch_size), encoding)
+    return BodyStreamingResponse(_ndjson_batches(batches), media_type="application/x-ndjson")
+
+
+@app.post("/api/transformations/parse-xml/stream")
+async def parse_xml_stream(request: Request, record_tag: Optional[str] = None, batch_size: int = 1000):
+    """Parse an XML request body; streams each record element (children of the root by default)"""
+    body = BlockingBodyReader.open(request.stream())
+    records = iter_xml_records(body, record_tag)
+    return BodyStreamingResponse(_ndjson_batches(_batched(records, max(1, batch_size)), "record"),
+                                 media_type="application/x-ndjson")
+
+
+@app.post("/api/transformations/parse-json/stream")
+async def parse_json_stream(request: Request, prefix: str = "item", path: Optional[str] = None,
+                            batch_size: int = 1000):
+    """Stream the values at an ijson `prefix` of a JSON request body
+
+    The default prefix "item" yields each element of a top-level array;
+    use e.g. "data.item" for an array under a key. With `path`, each value is
+    reduced with that JSONPath expression.
+    """
+    body = BlockingBodyReader.open(request.stream())
+    items = iter_json_items(body, prefix)
+    if path:
+        items = (transform_jsonpath(item, path) for item in items)
+    return BodyStreamingResponse(_ndjson_batches(_batched(items, max(1, batch_size)), "item"),
+                                 media_type="application/x-ndjson")
+
+
+def _csv_stream(rows, delimiter: str, batch_size: int):
+    try:
+        for chunk in iter_csv_chunks(rows, delimiter, batch_size):
+            yield chunk
+    except Exception as e:
+        # Headers are already sent; ending early is the only way to signal failure
+        print(f"[Transformations] CSV stream failed: {e}")
+        raise
+
+
+@app.post("/api/transformations/to-csv/stream")
+async def convert_to_csv_stream(request: Request, input_format: str = Query("ndjson", alias="format"),
+                                delimiter: str = ",", batch_size: int = 1000):
+    """Convert an NDJSON (or JSON array, with format=json) request body to streamed CSV"""
+    if input_format not in ("ndjson", "json"):
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'json'")
+    body = BlockingBodyReader.open(request.stream())
+    if input_format == "json":
+        rows = iter_json_items(body, "item")
+    else:
+        rows = (json.loads(line) for line in body if line.strip())
+    return BodyStreamingResponse(_csv_stream(rows, delimiter, max(1, batch_size)), media_type="text/csv")
+
+
 # ========== PHASE 3.1: ENHANCED SUB-WORKFLOW SUPPORT ENDPOINTS ==========
 
 @app.get("/api/workflows/subprocess-compatible")
@@ -10802,10 +10938,10 @@ async def list_workflow_versions(workflow_id: str):
         subprocess_manager = SubprocessManager(db)
         
         # Get versions from workflow_versions collection
-        versions = list(workflow_versions_collection.find(
-            {"workflow_id": workflow_id},
-            {"_id": 0}
-        ).sort("created_at", -1))
+        versions = [
+            _summarize_version_entry(v)
+            for v in workflow_versions_collection.find({"workflow_id": workflow_id}, {"_id": 0}).sort("created_at", -1)
+        ]
         
         return {
             "workflow_id": workflow_id,
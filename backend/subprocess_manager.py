@@ -3,6 +3,43 @@ import uuid
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 from pymongo.database import Database
+from version_store import VersionStore
+
+
+def _reduce_collect(values: List[Any]) -> List[Any]:
+    return list(values)
+
+
+def _reduce_sum(values: List[Any]) -> float:
+    total = 0
+    for value in values:
+        try:
+            total += float(value)
+        except (ValueError, TypeError):
+            continue
+    return total
+
+
+def _reduce_merge(values: List[Any]) -> Any:
+    if values and all(isinstance(v, list) for v in values):
+        merged_list = []
+        for value in values:
+            merged_list.extend(value)
+        return merged_list
+    
+    merged = {}
+    for value in values:
+        if isinstance(value, dict):
+            merged.update(value)
+    return merged
+
+
+# Reducers available to multi-instance (fan-out) subprocess nodes
+FAN_OUT_REDUCERS = {
+    "collect": _reduce_collect,
+    "sum": _reduce_sum,
+    "merge": _reduce_merge,
+}
 
 
 class SubprocessManager:
@@ -42,7 +79,10 @@ class SubprocessManager:
             
             if version_doc:
                 # Reconstruct workflow from version snapshot
-                return version_doc.get("snapshot")
+                snapshot = VersionStore(self.db).resolve_snapshot(version_doc)
+                if snapshot:
+                    snapshot.setdefault("id", workflow_id)
+                    return snapshot
         
         # Get latest version from workflows collection
         workflow = self.workflows_collection.find_one({"id": workflow_id}, {"_id": 0})
@@ -161,7 +201,6 @@ class SubprocessManager:
         if not subprocess_instance:
             return {"error": "Subprocess instance not found"}
         
-        subprocess_variables = subprocess_instance.get("variables", {})
         subprocess_status = subprocess_instance.get("status")
         
         result_data = {
@@ -172,18 +211,7 @@ class SubprocessManager:
         }
         
         # Map subprocess outputs to parent variables
-        mapped_outputs = {}
-        for parent_var, subprocess_var in output_mapping.items():
-            if subprocess_var in subprocess_variables:
-                mapped_outputs[parent_var] = subprocess_variables[subprocess_var]
-            else:
-                # Try to get from execution history outputs
-                for history_entry in subprocess_instance.get("execution_history", []):
-                    if subprocess_var in history_entry.get("result", {}).get("output", {}):
-                        mapped_outputs[parent_var] = history_entry["result"]["output"][subprocess_var]
-                        break
-        
-        result_data["mapped_outputs"] = mapped_outputs
+        result_data["mapped_outputs"] = self.map_subprocess_outputs(subprocess_instance, output_mapping)
         
         # Update parent instance child tracking
         self.workflow_instances_collection.update_one(
@@ -202,6 +230,72 @@ class SubprocessManager:
         
         return result_data
     
+    def map_subprocess_outputs(self,
+                               subprocess_instance: Dict[str, Any],
+                               output_mapping: Dict[str, str]) -> Dict[str, Any]:
+        """Resolve an output mapping against a finished subprocess instance
+        
+        Args:
+            subprocess_instance: Subprocess instance document
+            output_mapping: Mapping of parent variables to subprocess outputs
+        
+        Returns:
+            Dictionary of parent variable names to resolved values
+        """
+        subprocess_variables = subprocess_instance.get("variables", {})
+        
+        mapped_outputs = {}
+        for parent_var, subprocess_var in output_mapping.items():
+            if subprocess_var in subprocess_variables:
+                mapped_outputs[parent_var] = subprocess_variables[subprocess_var]
+            else:
+                # Try to get from execution history outputs
+                for history_entry in subprocess_instance.get("execution_history", []):
+                    if subprocess_var in history_entry.get("result", {}).get("output", {}):
+                        mapped_outputs[parent_var] = history_entry["result"]["output"][subprocess_var]
+                        break
+        
+        return mapped_outputs
+    
+    def build_fan_out_work_items(self, collection: List[Any], chunk_size: int = 1) -> List[Any]:
+        """Split a collection into the work items of a multi-instance subprocess
+        
+        Args:
+            collection: Items to fan out over
+            chunk_size: Number of elements handed to each child (1 = one child per element)
+        
+        Returns:
+            List of work items, one per child instance
+        """
+        if chunk_size <= 1:
+            return list(collection)
+        return [collection[i:i + chunk_size] for i in range(0, len(collection), chunk_size)]
+    
+    def reduce_fan_out_outputs(self,
+                               child_outputs: List[Dict[str, Any]],
+                               output_mapping: Dict[str, str],
+                               reducer: str = "collect") -> Dict[str, Any]:
+        """Reduce the mapped outputs of all fan-out children into parent variables
+        
+        Args:
+            child_outputs: Mapped outputs of each child, in work item order
+            output_mapping: Mapping of parent variables to subprocess outputs
+            reducer: 'collect' (list per variable), 'sum' (numeric total) or
+                'merge' (dict union / list concatenation)
+        
+        Returns:
+            Dictionary of parent variable names to reduced values
+        """
+        reduce_fn = FAN_OUT_REDUCERS.get(reducer)
+        if not reduce_fn:
+            raise ValueError(f"Unknown fan-out reducer: {reducer}")
+        
+        reduced = {}
+        for parent_var in output_mapping.keys():
+            values = [outputs[parent_var] for outputs in child_outputs if parent_var in outputs]
+            reduced[parent_var] = reduce_fn(values)
+        return reduced
+    
     def get_subprocess_tree(self, instance_id: str, max_depth: int = 10) -> Dict[str, Any]:
         """Build complete subprocess execution tree
         
@@ -297,14 +391,13 @@ class SubprocessManager:
             "id": version_id,
             "workflow_id": workflow_id,
             "version": version_number,
-            "snapshot": {
-                "id": workflow_id,
+            "manifest": VersionStore(self.db).store_snapshot({
                 "name": workflow.get("name"),
                 "description": workflow.get("description"),
                 "nodes": workflow.get("nodes", []),
                 "edges": workflow.get("edges", []),
                 "subprocess_metadata": workflow.get("subprocess_metadata", {})
-            },
+            }),
             "status": workflow.get("lifecycle_state", "draft"),
             "comment": comment,
             "created_at": now,
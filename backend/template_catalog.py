@@ -0,0 +1,228 @@
+"""In-memory catalog of workflow, form and connector templates served as pre-serialized JSON"""
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+from fastapi import Request, Response
+
+
+# Template directories are checked for changed mtimes at most this often
+CHECK_INTERVAL_SECONDS = 2.0
+
+FileSignature = Tuple[Tuple[str, int, int], ...]
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return str(value)
+
+
+class SerializedJSON:
+    """A JSON document kept both parsed and as response bytes with an ETag"""
+
+    __slots__ = ("data", "body", "etag")
+
+    def __init__(self, data: Any):
+        self.data = data
+        self.body = json.dumps(data, separators=(",", ":"), default=_json_default).encode()
+        self.etag = '"' + hashlib.blake2b(self.body, digest_size=16).hexdigest() + '"'
+
+    def response(self, request: Request) -> Response:
+        """200 with the body, or 304 when the client already has this version"""
+        headers = {"ETag": self.etag, "Cache-Control": "no-cache"}
+        if_none_match = request.headers.get("if-none-match", "")
+        if self.etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+            return Response(status_code=304, headers=headers)
+        return Response(content=self.body, media_type="application/json", headers=headers)
+
+
+def _listing(templates: List[Dict[str, Any]], **extra) -> SerializedJSON:
+    return SerializedJSON({"templates": templates, **extra, "count": len(templates)})
+
+
+def _by_category(templates: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    index: Dict[str, List[Dict[str, Any]]] = {}
+    for template in templates:
+        index.setdefault(template.get("category"), []).append(template)
+    return index
+
+
+def _read_json(path: str) -> Any:
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def _signature(directory: str, depth: int) -> FileSignature:
+    entries = []
+    pending = [(directory, 0)]
+    while pending:
+        path, level = pending.pop()
+        try:
+            with os.scandir(path) as scan:
+                for entry in scan:
+                    if entry.is_dir() and level < depth:
+                        pending.append((entry.path, level + 1))
+                    elif entry.name.endswith(".json"):
+                        stat = entry.stat()
+                        entries.append((entry.path, stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            continue
+    return tuple(sorted(entries))
+
+
+class _Snapshot:
+    """Everything derived from one state of the template directories"""
+
+    def __init__(self, workflow_dir: str, form_dir: str):
+        self.signature = (_signature(workflow_dir, 0), _signature(form_dir, 1))
+        self.workflow_templates: Dict[str, SerializedJSON] = {}
+        self.form_templates: Dict[Tuple[str, str], SerializedJSON] = {}
+        self.form_index: Optional[Dict[str, Any]] = None
+        self.form_index_error: Optional[str] = None
+
+        summaries = []
+        index_templates = None
+        for path, _, _ in self.signature[0]:
+            name = os.path.basename(path)
+            try:
+                data = _read_json(path)
+            except Exception as e:
+                print(f"[TemplateCatalog] Error loading template {path}: {e}")
+                continue
+            if name == "index.json":
+                index_templates = data.get("templates", [])
+                continue
+            template_id = name[:-len(".json")]
+            self.workflow_templates[template_id] = SerializedJSON(data)
+            summaries.append({
+                "id": data.get("id", template_id),
+                "name": data.get("name", "Untitled Template"),
+                "description": data.get("description", ""),
+                "category": data.get("category", "general"),
+                "icon": data.get("icon", "Workflow"),
+                "difficulty": data.get("difficulty", "intermediate"),
+                "estimated_time": data.get("estimated_time", "10-15 mins")
+            })
+        # The index wins; without one, summaries are built from the template files
+        workflow_list = index_templates or summaries
+        self.workflow_list = _listing(workflow_list)
+        self.workflow_by_category = {
+            category: _listing(templates) for category, templates in _by_category(workflow_list).items()
+        }
+
+        index_path = os.path.join(form_dir, "index.json")
+        for path, _, _ in self.signature[1]:
+            if path == index_path:
+                try:
+                    self.form_index = _read_json(path)
+                except Exception as e:
+                    self.form_index_error = str(e)
+                continue
+            category = os.path.basename(os.path.dirname(path))
+            try:
+                self.form_templates[(category, os.path.basename(path)[:-len(".json")])] = SerializedJSON(_read_json(path))
+            except Exception as e:
+                print(f"[TemplateCatalog] Error loading form template {path}: {e}")
+
+        self.form_list = None
+        self.form_by_category: Dict[str, SerializedJSON] = {}
+        if self.form_index is not None:
+            templates = self.form_index.get("templates", [])
+            self.form_list = self.form_listing(templates)
+            self.form_by_category = {
+                category: self.form_listing(items) for category, items in _by_category(templates).items()
+            }
+
+    def form_listing(self, templates: List[Dict[str, Any]]) -> SerializedJSON:
+        return SerializedJSON({
+            "templates": templates,
+            "categories": self.form_index.get("categories", []),
+            "count": len(templates),
+            "total_count": self.form_index.get("total_templates", len(templates))
+        })
+
+
+class TemplateCatalog:
+    """Template catalog loaded once and refreshed in the background when files change
+
+    Requests are always served from the current snapshot (stale-while-revalidate):
+    at most every CHECK_INTERVAL_SECONDS a request triggers a background mtime
+    scan, and a changed directory is re-read into a new snapshot that replaces
+    the old one atomically.
+    """
+
+    def __init__(self, workflow_dir: str, form_dir: str):
+        self.workflow_dir = workflow_dir
+        self.form_dir = form_dir
+        self._snapshot = _Snapshot(workflow_dir, form_dir)
+        self._static: Dict[str, Tuple[SerializedJSON, Dict[str, SerializedJSON]]] = {}
+        self._last_check = time.monotonic()
+        self._refreshing = threading.Lock()
+        self.reloads = 0
+
+    def _current(self) -> _Snapshot:
+        if time.monotonic() - self._last_check >= CHECK_INTERVAL_SECONDS and self._refreshing.acquire(blocking=False):
+            self._last_check = time.monotonic()
+            threading.Thread(target=self._revalidate, daemon=True).start()
+        return self._snapshot
+
+    def _revalidate(self):
+        try:
+            signature = (_signature(self.workflow_dir, 0), _signature(self.form_dir, 1))
+            if signature != self._snapshot.signature:
+                self._snapshot = _Snapshot(self.workflow_dir, self.form_dir)
+                self.reloads += 1
+        except Exception as e:
+            print(f"[TemplateCatalog] Reload failed: {e}")
+        finally:
+            self._refreshing.release()
+
+    def workflow_list(self, category: Optional[str] = None) -> SerializedJSON:
+        snapshot = self._current()
+        if category is None:
+            return snapshot.workflow_list
+        return snapshot.workflow_by_category.get(category) or _listing([])
+
+    def workflow_template(self, template_id: str) -> Optional[SerializedJSON]:
+        return self._current().workflow_templates.get(template_id)
+
+    def form_list(self, category: Optional[str] = None) -> SerializedJSON:
+        """Form template listing; raises FileNotFoundError / ValueError if the index is missing or invalid"""
+        snapshot = self._current()
+        if snapshot.form_index is None:
+            if snapshot.form_index_error:
+                raise ValueError(snapshot.form_index_error)
+            raise FileNotFoundError(os.path.join(self.form_dir, "index.json"))
+        if category is None:
+            return snapshot.form_list
+        return snapshot.form_by_category.get(category) or snapshot.form_listing([])
+
+    def form_template(self, category: str, template_id: str) -> Optional[SerializedJSON]:
+        return self._current().form_templates.get((category, template_id))
+
+    def static_list(self, name: str, build: Callable[[], List[Dict[str, Any]]],
+                    category: Optional[str] = None) -> SerializedJSON:
+        """Listing of a template list defined in code, built and serialized on first use"""
+        cached = self._static.get(name)
+        if cached is None:
+            templates = build()
+            cached = (_listing(templates), {
+                key: _listing(items) for key, items in _by_category(templates).items()
+            })
+            self._static[name] = cached
+        if category is None:
+            return cached[0]
+        return cached[1].get(category) or _listing([])
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            "workflow_templates": len(snapshot.workflow_templates),
+            "form_templates": len(snapshot.form_templates),
+            "static_lists": sorted(self._static),
+            "reloads": self.reloads
+        }
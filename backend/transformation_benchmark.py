@@ -0,0 +1,75 @@
+"""Benchmark of the NumPy transformation kernels against the pure-Python paths
+
+Usage: python transformation_benchmark.py [--max-exponent 7] [--repeat 3]
+
+Each function runs on random data of 10**3 .. 10**max-exponent elements with
+the kernels disabled and enabled; the results of both paths are compared
+before timings are reported.
+"""
+import argparse
+import math
+import random
+import time
+
+import transformation_kernels as kernels
+from transformation_engine import apply_transformation
+
+
+def _numbers(size: int):
+    return [random.uniform(-1000, 1000) for _ in range(size)]
+
+
+def _integers(size: int):
+    return [random.randint(0, size // 10 + 1) for _ in range(size)]
+
+
+CASES = [
+    ("sum", _numbers, ()),
+    ("average", _numbers, ()),
+    ("min", _numbers, ()),
+    ("max", _numbers, ()),
+    ("sort", _numbers, ()),
+    ("sort", _integers, ("desc",)),
+    ("filter", _numbers, ("> 0",)),
+    ("filter", _integers, ("< 100",)),
+]
+
+
+def _same(a, b) -> bool:
+    if isinstance(a, float) and isinstance(b, float):
+        return a == b or (math.isnan(a) and math.isnan(b))
+    return a == b
+
+
+def _time(function: str, data, args, repeat: int):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = apply_transformation(function, data, *args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def run(max_exponent: int, repeat: int):
+    print(f"{'function':<10}{'data':<10}{'size':>10}{'python ms':>12}{'kernel ms':>12}{'speedup':>9}")
+    for exponent in range(3, max_exponent + 1):
+        size = 10 ** exponent
+        for function, make, args in CASES:
+            data = make(size)
+            kernels.ENABLED = False
+            python_time, expected = _time(function, data, args, repeat)
+            kernels.ENABLED = True
+            kernel_time, actual = _time(function, data, args, repeat)
+            if not _same(expected, actual):
+                raise AssertionError(f"{function} on {make.__name__[1:]} ({size}): kernel result differs")
+            print(f"{function:<10}{make.__name__[1:]:<10}{size:>10}{python_time * 1000:>12.2f}"
+                  f"{kernel_time * 1000:>12.2f}{python_time / kernel_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-exponent", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=3)
+    options = parser.parse_args()
+    run(max_exponent=options.max_exponent, repeat=options.repeat)
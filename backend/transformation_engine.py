@@ -7,12 +7,24 @@ import re
 import json
 import math
 import csv
-from io import StringIO
+import calendar
+import copy
+import hashlib
+import inspect
+import pickle
+import threading
+from collections import OrderedDict
+from io import StringIO, TextIOWrapper
+from itertools import islice
 from datetime import datetime, timedelta
-from typing import Any, List, Dict, Union, Callable
+from functools import lru_cache
+from typing import Any, List, Dict, Union, Callable, Iterator, Iterable, Optional, Tuple, BinaryIO
 import xml.etree.ElementTree as ET
+import ijson
 from jsonpath_ng import parse as jsonpath_parse
 
+import transformation_kernels as kernels
+
 
 # ========== STRING OPERATIONS ==========
 
@@ -91,6 +103,9 @@ def transform_regex_extract(value: str, pattern: str, group: int = 0) -> str:
 
 def transform_sum(value: List[Union[int, float]]) -> Union[int, float]:
     """Sum of array elements"""
+    values = kernels.float_array(value)
+    if values is not None:
+        return kernels.float_sum(values)
     try:
         return sum(float(x) for x in value)
     except (ValueError, TypeError):
@@ -99,6 +114,9 @@ def transform_sum(value: List[Union[int, float]]) -> Union[int, float]:
 
 def transform_average(value: List[Union[int, float]]) -> float:
     """Average of array elements"""
+    values = kernels.float_array(value)
+    if values is not None:
+        return kernels.float_sum(values) / len(values)
     try:
         numbers = [float(x) for x in value]
         return sum(numbers) / len(numbers) if numbers else 0
@@ -116,6 +134,9 @@ def transform_round(value: float, decimals: int = 0) -> float:
 
 def transform_min(value: List[Union[int, float]]) -> Union[int, float]:
     """Minimum value in array"""
+    values = kernels.float_array(value)
+    if values is not None and not kernels.has_nan(values):
+        return kernels.float_min(values)
     try:
         return min(float(x) for x in value)
     except (ValueError, TypeError):
@@ -124,6 +145,9 @@ def transform_min(value: List[Union[int, float]]) -> Union[int, float]:
 
 def transform_max(value: List[Union[int, float]]) -> Union[int, float]:
     """Maximum value in array"""
+    values = kernels.float_array(value)
+    if values is not None and not kernels.has_nan(values):
+        return kernels.float_max(values)
     try:
         return max(float(x) for x in value)
     except (ValueError, TypeError):
@@ -171,60 +195,133 @@ def transform_sqrt(value: float) -> float:
 
 
 # ========== DATE OPERATIONS ==========
+# Every date function also accepts a list and applies itself to each element;
+# lists of naive ISO 8601 strings go through the NumPy kernels.
+
+DATE_PARSE_CACHE_SIZE = 8192
+
+
+@lru_cache(maxsize=DATE_PARSE_CACHE_SIZE)
+def parse_iso_datetime(value: str) -> datetime:
+    """datetime.fromisoformat, also accepting a 'Z' suffix; repeated timestamps are parsed once"""
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+@lru_cache(maxsize=DATE_PARSE_CACHE_SIZE)
+def _strptime(value: str, format_str: str) -> datetime:
+    return datetime.strptime(value, format_str)
+
+
+def _whole_months(months: Union[int, float]) -> int:
+    if isinstance(months, float) and not months.is_integer():
+        raise ValueError(f"months must be a whole number, got {months}")
+    return int(months)
+
+
+def add_calendar_months(value: datetime, months: int) -> datetime:
+    """`value` moved by whole calendar months; the day is clamped to the target month's length (Jan 31 + 1 -> Feb 28/29)"""
+    month_index = value.month - 1 + months
+    year = value.year + month_index // 12
+    month = month_index % 12 + 1
+    return value.replace(year=year, month=month, day=min(value.day, calendar.monthrange(year, month)[1]))
 
-def transform_format_date(value: Union[str, datetime], format_str: str = "%Y-%m-%d") -> str:
+
+def transform_format_date(value: Union[str, datetime, List], format_str: str = "%Y-%m-%d") -> Union[str, List[str]]:
     """Format date to string"""
+    if isinstance(value, list):
+        if format_str == "%Y-%m-%d":
+            formatted = kernels.format_iso_dates(value)
+            if formatted is not None:
+                return formatted
+        return [transform_format_date(item, format_str) for item in value]
     try:
         if isinstance(value, str):
-            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+            value = parse_iso_datetime(value)
         return value.strftime(format_str)
     except (ValueError, AttributeError):
         return str(value)
 
 
-def transform_add_days(value: Union[str, datetime], days: int) -> str:
+def transform_add_days(value: Union[str, datetime, List], days: int) -> Union[str, List[str]]:
     """Add days to date"""
+    if isinstance(value, list):
+        shifted = kernels.shift_days(value, days)
+        if shifted is not None:
+            return shifted
+        return [transform_add_days(item, days) for item in value]
     try:
         if isinstance(value, str):
-            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+            value = parse_iso_datetime(value)
         result = value + timedelta(days=days)
         return result.isoformat()
     except (ValueError, AttributeError):
         return str(value)
 
 
-def transform_subtract_days(value: Union[str, datetime], days: int) -> str:
+def transform_subtract_days(value: Union[str, datetime, List], days: int) -> Union[str, List[str]]:
     """Subtract days from date"""
+    if isinstance(value, list):
+        shifted = kernels.shift_days(value, -days) if type(days) is int else None
+        if shifted is not None:
+            return shifted
+        return [transform_subtract_days(item, days) for item in value]
     try:
         if isinstance(value, str):
-            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+            value = parse_iso_datetime(value)
         result = value - timedelta(days=days)
         return result.isoformat()
     except (ValueError, AttributeError):
         return str(value)
 
 
-def transform_add_months(value: Union[str, datetime], months: int) -> str:
-    """Add months to date (approximate - 30 days per month)"""
-    return transform_add_days(value, months * 30)
+def transform_add_months(value: Union[str, datetime, List], months: int) -> Union[str, List[str]]:
+    """Add calendar months to date, clamping to the last day of shorter months"""
+    if isinstance(value, list):
+        shifted = None
+        if type(months) is int:
+            shifted = kernels.add_months(value, months)
+        if shifted is not None:
+            return shifted
+        return [transform_add_months(item, months) for item in value]
+    try:
+        date = parse_iso_datetime(value) if isinstance(value, str) else value
+        return add_calendar_months(date, _whole_months(months)).isoformat()
+    except (ValueError, AttributeError):
+        return str(value)
 
 
-def transform_parse_date(value: str, format_str: str = "%Y-%m-%d") -> str:
+def transform_parse_date(value: Union[str, List[str]], format_str: str = "%Y-%m-%d") -> Union[str, List[str]]:
     """Parse date string"""
+    if isinstance(value, list):
+        if format_str == "%Y-%m-%d":
+            parsed = kernels.parse_iso_dates(value)
+            if parsed is not None:
+                return parsed
+        return [transform_parse_date(item, format_str) for item in value]
     try:
-        dt = datetime.strptime(value, format_str)
+        dt = _strptime(value, format_str)
         return dt.isoformat()
     except ValueError:
         return value
 
 
-def transform_date_diff(date1: Union[str, datetime], date2: Union[str, datetime]) -> int:
+def transform_date_diff(date1: Union[str, datetime, List], date2: Union[str, datetime, List]) -> Union[int, List[int]]:
     """Calculate difference in days between two dates"""
+    if isinstance(date1, list) or isinstance(date2, list):
+        if isinstance(date1, list) and isinstance(date2, list) and len(date1) != len(date2):
+            raise ValueError(f"date_diff needs lists of equal length, got {len(date1)} and {len(date2)}")
+        differences = kernels.day_differences(date1, date2)
+        if differences is not None:
+            return differences
+        size = len(date1) if isinstance(date1, list) else len(date2)
+        firsts = date1 if isinstance(date1, list) else [date1] * size
+        seconds = date2 if isinstance(date2, list) else [date2] * size
+        return [transform_date_diff(first, second) for first, second in zip(firsts, seconds)]
     try:
         if isinstance(date1, str):
-            date1 = datetime.fromisoformat(date1.replace('Z', '+00:00'))
+            date1 = parse_iso_datetime(date1)
         if isinstance(date2, str):
-            date2 = datetime.fromisoformat(date2.replace('Z', '+00:00'))
+            date2 = parse_iso_datetime(date2)
         diff = date1 - date2
         return diff.days
     except (ValueError, AttributeError):
@@ -255,9 +352,15 @@ def transform_filter(value: List[Any], condition: str) -> List[Any]:
         condition = condition.strip()
         if condition.startswith('>'):
             threshold = float(condition[1:].strip())
+            values = kernels.typed_array(value)
+            if values is not None and kernels.comparable_with_floats(values):
+                return kernels.compare_values(values, '>', threshold)
             return [x for x in value if isinstance(x, (int, float)) and x > threshold]
         elif condition.startswith('<'):
             threshold = float(condition[1:].strip())
+            values = kernels.typed_array(value)
+            if values is not None and kernels.comparable_with_floats(values):
+                return kernels.compare_values(values, '<', threshold)
             return [x for x in value if isinstance(x, (int, float)) and x < threshold]
         elif '==' in condition:
             target = condition.split('==')[1].strip().strip('"\'')
@@ -308,29 +411,66 @@ def transform_sort(value: List[Any], order: str = "asc") -> List[Any]:
         if not isinstance(value, list):
             return value
         
-        sorted_list = sorted(value)
+        values = kernels.typed_array(value, min_size=kernels.SORT_KERNEL_MIN_SIZE)
+        if values is not None and not kernels.has_nan(values):
+            sorted_list = kernels.sorted_values(values)
+        else:
+            sorted_list = sorted(value)
         return sorted_list if order == "asc" else sorted_list[::-1]
     except:
         return value
 
 
+_DICT_KEY, _LIST_KEY, _TUPLE_KEY = object(), object(), object()
+
+
+def dedup_key(item: Any) -> Any:
+    """Hashable stand-in for `item` that is equal for equal items (dicts and lists included)
+
+    Raises TypeError for unhashable values other than dicts, lists, tuples and sets.
+    """
+    try:
+        hash(item)
+        return item
+    except TypeError:
+        pass
+    if isinstance(item, dict):
+        try:
+            return (_DICT_KEY, frozenset(item.items()))
+        except TypeError:
+            return (_DICT_KEY, frozenset((key, dedup_key(nested)) for key, nested in item.items()))
+    if isinstance(item, list):
+        return (_LIST_KEY, tuple(dedup_key(nested) for nested in item))
+    if isinstance(item, tuple):
+        return (_TUPLE_KEY, tuple(dedup_key(nested) for nested in item))
+    if isinstance(item, (set, frozenset)):
+        return frozenset(item)
+    raise TypeError(f"unhashable type: '{type(item).__name__}'")
+
+
 def transform_unique(value: List[Any]) -> List[Any]:
     """Get unique values from array"""
     try:
         if not isinstance(value, list):
             return value
         
-        # Preserve order while removing duplicates
+        # Preserve order while removing duplicates; dicts keep the first of equal keys
+        try:
+            return list(dict.fromkeys(value))
+        except TypeError:
+            pass
+        
+        # Unhashable items: dict and list records are compared by content
         seen = set()
         result = []
         for item in value:
-            # Handle unhashable types
             try:
-                if item not in seen:
-                    seen.add(item)
+                key = dedup_key(item)
+                if key not in seen:
+                    seen.add(key)
                     result.append(item)
             except TypeError:
-                # For unhashable types, just append
+                # Other unhashable types are kept as they are
                 result.append(item)
         return result
     except:
@@ -494,10 +634,19 @@ def transform_from_json(value: str) -> Any:
 
 # ========== JSONPATH SUPPORT ==========
 
+JSONPATH_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=JSONPATH_CACHE_SIZE)
+def compile_jsonpath(path: str):
+    """Parse a JSONPath expression once; parsed expressions are immutable and shared"""
+    return jsonpath_parse(path)
+
+
 def transform_jsonpath(data: Any, path: str) -> Any:
     """Extract data using JSONPath expression"""
     try:
-        jsonpath_expr = jsonpath_parse(path)
+        jsonpath_expr = compile_jsonpath(path)
         matches = jsonpath_expr.find(data)
         
         if len(matches) == 0:
@@ -587,6 +736,102 @@ def transform_to_csv(data: List[Dict[str, Any]], delimiter: str = ",") -> str:
         return f"CSV Generation Error: {str(e)}"
 
 
+# ========== STREAMING PARSERS ==========
+# Incremental counterparts of parse_csv / parse_xml / to_csv for payloads too large
+# to hold in memory. They read from binary file objects and hold one batch or
+# record at a time.
+
+STREAM_BATCH_SIZE = 1000
+
+
+def iter_csv_batches(stream: BinaryIO, delimiter: str = ",", has_header: bool = True,
+                     batch_size: int = STREAM_BATCH_SIZE, encoding: str = "utf-8-sig") -> Iterator[List[Dict[str, Any]]]:
+    """Rows of a CSV stream in lists of `batch_size`, shaped like transform_parse_csv rows"""
+    text = TextIOWrapper(stream, encoding=encoding, newline="")
+    try:
+        if has_header:
+            rows = csv.DictReader(text, delimiter=delimiter)
+        else:
+            rows = ({f"column_{i}": value for i, value in enumerate(row)}
+                    for row in csv.reader(text, delimiter=delimiter))
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    finally:
+        text.detach()
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def iter_xml_records(stream: BinaryIO, record_tag: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """`{tag: xml_to_dict(element)}` for each record element of an XML stream
+
+    Records are the outermost elements named `record_tag` (with or without
+    namespace), or the children of the root element when no tag is given.
+    Each record is detached from the tree once yielded.
+    """
+    path: List[ET.Element] = []
+    record_depth = None
+    for event, element in ET.iterparse(stream, events=("start", "end")):
+        if event == "start":
+            path.append(element)
+            if record_depth is None and (
+                len(path) == 2 if record_tag is None
+                else record_tag in (element.tag, _local_name(element.tag))
+            ):
+                record_depth = len(path)
+            continue
+
+        if len(path) == record_depth:
+            yield {element.tag: xml_to_dict(element)}
+            record_depth = None
+            element.clear()
+            if len(path) > 1:
+                path[-2].remove(element)
+        path.pop()
+
+
+def iter_json_items(stream: BinaryIO, prefix: str = "item") -> Iterator[Any]:
+    """Values at an ijson `prefix` of a JSON stream; "item" is each element of a top-level array"""
+    return ijson.items(stream, prefix, use_float=True)
+
+
+def iter_csv_chunks(rows: Iterable[Any], delimiter: str = ",",
+                    batch_size: int = STREAM_BATCH_SIZE) -> Iterator[str]:
+    """CSV text for a stream of rows, `batch_size` rows per chunk
+
+    Like transform_to_csv the header comes from the first row's keys; since
+    output has already been sent, keys missing from later rows are written
+    empty and extra keys are dropped instead of failing.
+    """
+    output = StringIO()
+    writer = None
+    count = 0
+    for row in rows:
+        if writer is None:
+            if isinstance(row, dict):
+                writer = csv.DictWriter(output, fieldnames=list(row.keys()), delimiter=delimiter,
+                                        extrasaction="ignore")
+                writer.writeheader()
+            else:
+                writer = csv.writer(output, delimiter=delimiter)
+        writer.writerow(row)
+        count += 1
+        if count % batch_size == 0:
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate()
+    if output.tell():
+        yield output.getvalue()
+
+
 # ========== TRANSFORMATION REGISTRY ==========
 
 TRANSFORMATION_FUNCTIONS = {
@@ -705,7 +950,7 @@ def get_function_metadata() -> Dict[str, Dict[str, Any]]:
             "format_date": {"params": ["date", "format?"], "description": "Format date"},
             "add_days": {"params": ["date", "days"], "description": "Add days to date"},
             "subtract_days": {"params": ["date", "days"], "description": "Subtract days"},
-            "add_months": {"params": ["date", "months"], "description": "Add months"},
+            "add_months": {"params": ["date", "months"], "description": "Add calendar months"},
             "parse_date": {"params": ["value", "format?"], "description": "Parse date string"},
             "date_diff": {"params": ["date1", "date2"], "description": "Days between dates"},
             "now": {"params": [], "description": "Current date and time"},
@@ -747,3 +992,322 @@ def get_function_metadata() -> Dict[str, Dict[str, Any]]:
             "to_csv": {"params": ["data", "delimiter?"], "description": "Convert to CSV"},
         }
     }
+
+
+# ========== PIPELINES ==========
+
+PREVIOUS_RESULT = "{previous_result}"
+PIPELINE_CACHE_SIZE = 512
+RESULT_CACHE_SIZE = 256
+# Inputs whose pickled form is larger than this are not result-cached
+RESULT_CACHE_MAX_INPUT_BYTES = 1024 * 1024
+STEP_REPORT_MODES = ("full", "summary")
+# Functions whose result does not depend only on their arguments
+NONDETERMINISTIC_FUNCTIONS = {"now", "today"}
+
+Items = Iterator[Any]
+
+
+class TransformationStepError(Exception):
+    """A pipeline step raised; carries the steps reported so far and the last good value"""
+
+    def __init__(self, step: int, function: str, error: Exception, steps: List[Dict[str, Any]], partial_result: Any):
+        super().__init__(f"Transformation failed at step {step}: {error}")
+        self.step = step
+        self.function = function
+        self.error = error
+        self.steps = steps
+        self.partial_result = partial_result
+
+
+def content_hash(value: Any) -> Optional[Tuple[str, int]]:
+    """(sha256, size) of a value's pickled content, or None if it cannot be pickled
+
+    Pickle keeps key order and distinguishes types JSON would merge (tuple/list,
+    datetime/str), so equal hashes mean the functions see equal inputs.
+    """
+    try:
+        encoded = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return None
+    return hashlib.sha256(encoded).hexdigest(), len(encoded)
+
+
+def summarize_value(value: Any) -> Dict[str, Any]:
+    """Type and size of a value, used instead of the value in summary step reports"""
+    summary = {"type": type(value).__name__}
+    if isinstance(value, (list, tuple, dict, str)):
+        summary["length"] = len(value)
+    elif value is None or isinstance(value, (bool, int, float)):
+        summary["value"] = value
+    return summary
+
+
+# Fusible array operations: each builds an items -> items transformer for a list input
+# that matches the original function's result on that list.
+
+def _filter_op(condition: str = None) -> Callable[[Items], Items]:
+    try:
+        condition = condition.strip()
+        if condition.startswith('>'):
+            threshold = float(condition[1:].strip())
+            return lambda items: (x for x in items if isinstance(x, (int, float)) and x > threshold)
+        if condition.startswith('<'):
+            threshold = float(condition[1:].strip())
+            return lambda items: (x for x in items if isinstance(x, (int, float)) and x < threshold)
+        if '==' in condition:
+            target = condition.split('==')[1].strip().strip('"\'')
+            return lambda items: (x for x in items if str(x) == target)
+    except (AttributeError, ValueError):
+        pass
+    return lambda items: items
+
+
+def _map_op(field: str = None) -> Callable[[Items], Items]:
+    try:
+        hash(field)
+    except TypeError:
+        return lambda items: items
+    if not field:
+        return lambda items: items
+    return lambda items: (item.get(field) if isinstance(item, dict) else item for item in items)
+
+
+def _slice_op(start: int, end: int = None) -> Callable[[Items], Items]:
+    def is_position(bound):
+        return bound is None or (isinstance(bound, int) and bound >= 0)
+
+    if is_position(start) and is_position(end):
+        return lambda items: islice(items, start, end)
+    # Negative or unusual bounds need the whole list
+    return lambda items: iter(transform_slice(list(items), start, end))
+
+
+def _unique_op() -> Callable[[Items], Items]:
+    def unique(items: Items) -> Items:
+        seen = set()
+        for item in items:
+            try:
+                key = dedup_key(item)
+                if key in seen:
+                    continue
+                seen.add(key)
+            except TypeError:
+                pass
+            yield item
+    return unique
+
+
+FUSIBLE_OPERATIONS = {
+    "filter": _filter_op,
+    "map": _map_op,
+    "slice": _slice_op,
+    "unique": _unique_op,
+}
+
+
+class _PipelineStep:
+    __slots__ = ("number", "function", "func", "args", "kwargs", "op")
+
+    def __init__(self, number: int, transform: Any):
+        if not isinstance(transform, dict):
+            raise ValueError(f"Step {number}: each transformation must be an object")
+        self.number = number
+        self.function = transform.get("function")
+        self.args = transform.get("args", [])
+        self.kwargs = transform.get("kwargs", {})
+        if self.function not in TRANSFORMATION_FUNCTIONS:
+            raise ValueError(f"Step {number}: unknown transformation function: {self.function}")
+        if not isinstance(self.args, list) or not isinstance(self.kwargs, dict):
+            raise ValueError(f"Step {number}: 'args' must be a list and 'kwargs' an object")
+        self.func = TRANSFORMATION_FUNCTIONS[self.function]
+        try:
+            bound = inspect.signature(self.func).bind(*self.args, **self.kwargs)
+        except TypeError as e:
+            raise ValueError(f"Step {number}: invalid arguments for {self.function}: {e}")
+
+        # Only array steps that take the previous result as their input can be fused
+        self.op = None
+        if (self.function in FUSIBLE_OPERATIONS and self.args and self.args[0] == PREVIOUS_RESULT
+                and PREVIOUS_RESULT not in self.args[1:]):
+            options = dict(list(bound.arguments.items())[1:])
+            self.op = FUSIBLE_OPERATIONS[self.function](**options)
+
+    def apply(self, previous: Any) -> Any:
+        args = [previous if arg == PREVIOUS_RESULT else arg for arg in self.args]
+        return self.func(*args, **self.kwargs)
+
+
+class TransformationPipeline:
+    """A transformation chain validated once and run as fused stages
+
+    Runs of two or more consecutive filter/map/slice/unique steps that consume
+    the previous result are fused into one pass over the list, without building
+    the intermediate lists. Results of deterministic pipelines are cached by a
+    content hash of the input.
+    """
+
+    def __init__(self, transformations: List[Dict[str, Any]], fingerprint: Optional[str] = None):
+        if not isinstance(transformations, list):
+            raise ValueError("'transformations' must be a list")
+        self.steps = [_PipelineStep(number, transform) for number, transform in enumerate(transformations, 1)]
+        self.fingerprint = fingerprint
+        self.cacheable = fingerprint is not None and not any(
+            step.function in NONDETERMINISTIC_FUNCTIONS for step in self.steps
+        )
+
+        self.stages: List[List[_PipelineStep]] = []
+        for step in self.steps:
+            previous = self.stages[-1] if self.stages else None
+            if step.op is not None and previous and previous[-1].op is not None:
+                previous.append(step)
+            else:
+                self.stages.append([step])
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def _run_stage(self, stage: List[_PipelineStep], value: Any) -> Any:
+        if len(stage) == 1 or not isinstance(value, list):
+            # Non-list inputs are rare and each function handles them differently
+            for step in stage:
+                value = step.apply(value)
+            return value
+        items = iter(value)
+        for step in stage:
+            items = step.op(items)
+        return list(items)
+
+    def _execute(self, data: Any, step_report: Optional[str]) -> Tuple[Any, List[Dict[str, Any]]]:
+        result = data
+        steps: List[Dict[str, Any]] = []
+
+        if step_report == "full":
+            # Every intermediate value is reported, so steps run one at a time
+            for step in self.steps:
+                try:
+                    result = step.apply(result)
+                except Exception as e:
+                    steps.append({"step": step.number, "function": step.function, "success": False, "error": str(e)})
+                    raise TransformationStepError(step.number, step.function, e, steps, result)
+                steps.append({"step": step.number, "function": step.function, "success": True, "result": result})
+            return result, steps
+
+        for stage in self.stages:
+            try:
+                result = self._run_stage(stage, result)
+            except Exception as e:
+                failed = stage[0]
+                if step_report:
+                    steps.append({"step": failed.number, "function": failed.function, "success": False,
+                                  "error": str(e)})
+                raise TransformationStepError(failed.number, failed.function, e, steps, result)
+            if step_report:
+                last = stage[-1]
+                for step in stage[:-1]:
+                    steps.append({"step": step.number, "function": step.function, "success": True,
+                                  "fused_into": last.number})
+                steps.append({"step": last.number, "function": last.function, "success": True,
+                              **({"fused_steps": len(stage)} if len(stage) > 1 else {}),
+                              **summarize_value(result)})
+        return result, steps
+
+    def run(self, data: Any, step_report: Optional[str] = None) -> Dict[str, Any]:
+        """Run the pipeline on `data`
+
+        `step_report` is None (final result only), "summary" (type and size of
+        each step's output) or "full" (every intermediate value, unfused).
+        Raises TransformationStepError when a step fails.
+        """
+        if step_report is not None and step_report not in STEP_REPORT_MODES:
+            raise ValueError(f"step_report must be one of {', '.join(STEP_REPORT_MODES)}")
+
+        key = None
+        if self.cacheable:
+            digest = content_hash(data)
+            if digest is not None and digest[1] <= RESULT_CACHE_MAX_INPUT_BYTES:
+                key = (self.fingerprint, step_report, digest[0])
+                cached = pipeline_result_cache.get(key)
+                if cached is not None:
+                    result, steps = cached
+                    return {"result": result, "steps": steps, "cached": True}
+
+        result, steps = self._execute(data, step_report)
+        if key is not None:
+            pipeline_result_cache.put(key, (result, steps))
+        return {"result": result, "steps": steps, "cached": False}
+
+
+class PipelineResultCache:
+    """Thread-safe LRU of pipeline results; values are copied in and out so callers may mutate them"""
+
+    def __init__(self, maxsize: int = RESULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[str, ...], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[str, ...]) -> Any:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(value)
+
+    def put(self, key: Tuple[str, ...], value: Any):
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "compiled_pipelines": len(_compiled_pipelines)
+            }
+
+
+pipeline_result_cache = PipelineResultCache()
+
+_compiled_pipelines: "OrderedDict[str, TransformationPipeline]" = OrderedDict()
+_compiled_pipelines_lock = threading.Lock()
+
+
+def compile_pipeline(transformations: List[Dict[str, Any]]) -> TransformationPipeline:
+    """Validate a transformation chain once; identical chains share one compiled pipeline
+
+    Raises ValueError naming the first invalid step.
+    """
+    digest = content_hash(transformations)
+    if digest is None:
+        # Arguments that cannot be hashed by content: compile without caching
+        return TransformationPipeline(transformations)
+    fingerprint = digest[0]
+    with _compiled_pipelines_lock:
+        pipeline = _compiled_pipelines.get(fingerprint)
+        if pipeline is not None:
+            _compiled_pipelines.move_to_end(fingerprint)
+            return pipeline
+    # Compiled from a private copy so later changes to the caller's list cannot leak in
+    pipeline = TransformationPipeline(copy.deepcopy(transformations), fingerprint=fingerprint)
+    with _compiled_pipelines_lock:
+        _compiled_pipelines[fingerprint] = pipeline
+        while len(_compiled_pipelines) > PIPELINE_CACHE_SIZE:
+            _compiled_pipelines.popitem(last=False)
+    return pipeline
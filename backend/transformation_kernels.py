@@ -0,0 +1,242 @@
+"""NumPy kernels behind the array, math and date transformation functions"""
+import re
+import sys
+from array import array
+from datetime import datetime
+from typing import Any, List, Optional
+
+import numpy as np
+
+
+# Lists shorter than this are cheaper to handle in pure Python than to convert
+KERNEL_MIN_SIZE = 1000
+# Python's sort is hard to beat on short lists (see transformation_benchmark)
+SORT_KERNEL_MIN_SIZE = 20000
+# Set to False to force the pure-Python paths (used by transformation_benchmark)
+ENABLED = True
+
+# Integers below this magnitude compare against floats exactly after conversion
+_EXACT_FLOAT_INT = 2 ** 53
+# Python 3.12+ sums floats with compensated summation; before that sum() adds left to right
+_SEQUENTIAL_FLOAT_SUM = sys.version_info < (3, 12)
+
+
+def _eligible(value: Any, min_size: int) -> bool:
+    return ENABLED and type(value) is list and len(value) >= max(min_size, 1)
+
+
+def float_array(value: Any) -> Optional[np.ndarray]:
+    """float64 array of float(x) for every element, or None when the pure-Python path should run
+
+    array('d') converts with the same protocol as float(), but rejects
+    strings, which float() would parse; those lists stay in Python.
+    """
+    if not _eligible(value, KERNEL_MIN_SIZE):
+        return None
+    try:
+        return np.frombuffer(array('d', value), dtype=np.float64)
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def typed_array(value: Any, min_size: Optional[int] = None) -> Optional[np.ndarray]:
+    """int64 array for a list of only ints, float64 for a list of only floats, else None
+
+    Results built from these arrays with tolist() have the same values and
+    element types as the input, so they can stand in for the original objects.
+    """
+    if not _eligible(value, KERNEL_MIN_SIZE if min_size is None else min_size):
+        return None
+    types = set(map(type, value))
+    try:
+        if types == {float}:
+            return np.frombuffer(array('d', value), dtype=np.float64)
+        if types == {int}:
+            return np.frombuffer(array('q', value), dtype=np.int64)
+    except OverflowError:
+        pass
+    return None
+
+
+def has_nan(values: np.ndarray) -> bool:
+    return values.dtype.kind == "f" and bool(np.isnan(values).any())
+
+
+def comparable_with_floats(values: np.ndarray) -> bool:
+    """Whether comparing with a float threshold gives the same answers as Python's exact int/float comparison"""
+    if values.dtype.kind == "f":
+        return True
+    return bool(values.max() < _EXACT_FLOAT_INT and values.min() > -_EXACT_FLOAT_INT)
+
+
+def float_sum(values: np.ndarray) -> float:
+    """sum(float(x) for x in values), bit for bit"""
+    if _SEQUENTIAL_FLOAT_SUM:
+        # cumsum adds strictly left to right, unlike np.sum's pairwise summation;
+        # + 0.0 mirrors sum()'s integer 0 start, which turns a -0.0 total into 0.0
+        with np.errstate(over="ignore", invalid="ignore"):
+            return float(np.cumsum(values)[-1]) + 0.0
+    return sum(values.tolist())
+
+
+def float_min(values: np.ndarray) -> float:
+    """min(values) for NaN-free arrays; the first of equal minima wins, as in min()"""
+    return float(values[np.argmin(values)])
+
+
+def float_max(values: np.ndarray) -> float:
+    return float(values[np.argmax(values)])
+
+
+def sorted_values(values: np.ndarray) -> List[Any]:
+    """sorted() of a NaN-free typed array; stable, so 0.0 and -0.0 keep their input order"""
+    return np.sort(values, kind="stable").tolist()
+
+
+def compare_values(values: np.ndarray, operator: str, threshold: float) -> List[Any]:
+    """Elements `> threshold` or `< threshold`, in input order"""
+    mask = values > threshold if operator == ">" else values < threshold
+    return values[mask].tolist()
+
+
+# ========== DATES ==========
+
+# Naive ISO 8601 forms that datetime.fromisoformat and numpy.datetime64 read identically
+_NAIVE_ISO = re.compile(r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d{1,6})?)?)?")
+# datetime's range; numpy happily goes beyond it, where Python raises
+_MIN_DATETIME = np.datetime64("0001-01-01T00:00:00", "us")
+_MAX_DATETIME = np.datetime64("9999-12-31T23:59:59.999999", "us")
+# strftime("%Y") is not zero-padded for years below 1000 on every platform
+_MIN_FORMATTED_YEAR = np.datetime64("1000-01-01", "us")
+_US_PER_DAY = 86400 * 10 ** 6
+# Shifts beyond datetime's whole range always fail; also keeps int64 microseconds from overflowing
+_MAX_DAY_SHIFT = 4_000_000
+
+
+# Lengths of YYYY-MM-DD, ...THH:MM, ...THH:MM:SS and ...THH:MM:SS.f to .ffffff
+_ISO_LENGTHS = (10, 16, 19, 21, 22, 23, 24, 25, 26)
+_ISO_WIDTH = 26
+_ISO_SEPARATORS = {4: b"-", 7: b"-", 10: b"T ", 13: b":", 16: b":", 19: b"."}
+_ISO_DIGIT_POSITIONS = np.array([position not in _ISO_SEPARATORS for position in range(_ISO_WIDTH)])
+
+
+def iso_datetime_array(values: Any, date_only: bool = False) -> Optional[np.ndarray]:
+    """datetime64[us] array for a list of naive ISO 8601 strings, or None when Python should parse them
+
+    The shape of every string (the _NAIVE_ISO forms) is checked on a byte
+    matrix instead of with one regex match per element.
+    """
+    if not _eligible(values, KERNEL_MIN_SIZE) or set(map(type, values)) != {str}:
+        return None
+    lengths = np.fromiter(map(len, values), dtype=np.int64, count=len(values))
+    if date_only:
+        if not (lengths == 10).all():
+            return None
+    elif not np.isin(lengths, _ISO_LENGTHS).all():
+        return None
+    try:
+        raw = np.array(values, dtype=f"S{_ISO_WIDTH}")
+    except UnicodeEncodeError:
+        return None
+
+    chars = raw.view(np.uint8).reshape(len(values), _ISO_WIDTH)
+    present = np.arange(_ISO_WIDTH) < lengths[:, None]
+    digits = (chars >= ord("0")) & (chars <= ord("9"))
+    if not (digits | ~(present & _ISO_DIGIT_POSITIONS)).all():
+        return None
+    for position, allowed in _ISO_SEPARATORS.items():
+        matches = np.isin(chars[:, position], np.frombuffer(allowed, dtype=np.uint8))
+        if not (matches | ~present[:, position]).all():
+            return None
+
+    try:
+        return raw.astype("datetime64[us]")
+    except ValueError:
+        # An impossible date such as 2024-02-30; the Python path handles it per element
+        return None
+
+
+def _in_datetime_range(datetimes: np.ndarray) -> bool:
+    return bool(datetimes.min() >= _MIN_DATETIME and datetimes.max() <= _MAX_DATETIME)
+
+
+def isoformat_strings(datetimes: np.ndarray) -> Optional[List[str]]:
+    """datetime.isoformat() of each value (microseconds only when non-zero), or None if out of range"""
+    if not _in_datetime_range(datetimes):
+        return None
+    seconds = datetimes.astype("datetime64[s]")
+    whole = seconds == datetimes
+    if whole.all():
+        return np.datetime_as_string(seconds, unit="s").tolist()
+    text = np.datetime_as_string(datetimes, unit="us")
+    if whole.any():
+        text = np.where(whole, np.datetime_as_string(seconds, unit="s"), text)
+    return text.tolist()
+
+
+def shift_days(values: Any, days: Any) -> Optional[List[str]]:
+    """isoformat() of each date plus `days` whole days"""
+    if type(days) is not int or abs(days) > _MAX_DAY_SHIFT:
+        return None
+    datetimes = iso_datetime_array(values)
+    if datetimes is None:
+        return None
+    return isoformat_strings(datetimes + np.timedelta64(days, "D"))
+
+
+def add_months(values: Any, months: int) -> Optional[List[str]]:
+    """isoformat() of each date `months` calendar months later, clamped to the target month's last day"""
+    if abs(months) > _MAX_DAY_SHIFT // 28:
+        return None
+    datetimes = iso_datetime_array(values)
+    if datetimes is None:
+        return None
+    days = datetimes.astype("datetime64[D]")
+    month_start = datetimes.astype("datetime64[M]")
+    target = month_start + np.timedelta64(months, "M")
+    target_start = target.astype("datetime64[D]")
+    target_length = (target + np.timedelta64(1, "M")).astype("datetime64[D]") - target_start
+    day_of_month = np.minimum(days - month_start.astype("datetime64[D]"), target_length - np.timedelta64(1, "D"))
+    return isoformat_strings(target_start + day_of_month + (datetimes - days))
+
+
+def _datetime_operand(value: Any) -> Optional[np.ndarray]:
+    if isinstance(value, list):
+        return iso_datetime_array(value)
+    if isinstance(value, str) and _NAIVE_ISO.fullmatch(value):
+        try:
+            return np.array([value], dtype="datetime64[us]")
+        except ValueError:
+            return None
+    if isinstance(value, datetime) and value.tzinfo is None:
+        return np.array([value], dtype="datetime64[us]")
+    return None
+
+
+def day_differences(first: Any, second: Any) -> Optional[List[int]]:
+    """(first - second).days for each pair; either side may be a single date"""
+    left = _datetime_operand(first)
+    right = _datetime_operand(second) if left is not None else None
+    if right is None:
+        return None
+    # Python's datetime rejects values numpy accepts (e.g. year 0 or 10000)
+    if any(operand.size and not _in_datetime_range(operand) for operand in (left, right)):
+        return None
+    difference = (left - right).astype(np.int64)
+    return np.floor_divide(difference, _US_PER_DAY).tolist()
+
+
+def format_iso_dates(values: Any) -> Optional[List[str]]:
+    """strftime("%Y-%m-%d") of each date"""
+    datetimes = iso_datetime_array(values)
+    if datetimes is None or not _in_datetime_range(datetimes) or datetimes.min() < _MIN_FORMATTED_YEAR:
+        return None
+    return np.datetime_as_string(datetimes, unit="D").tolist()
+
+
+def parse_iso_dates(values: Any) -> Optional[List[str]]:
+    """strptime(value, "%Y-%m-%d").isoformat() of each value"""
+    datetimes = iso_datetime_array(values, date_only=True)
+    if datetimes is None:
+        return None
+    return isoformat_strings(datetimes)
@@ -0,0 +1,230 @@
+"""Persistent registry of workflow triggers (webhook tokens and cron schedules)"""
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, Optional, Tuple
+
+from apscheduler.jobstores.base import JobLookupError
+from apscheduler.jobstores.mongodb import MongoDBJobStore
+from apscheduler.triggers.cron import CronTrigger
+from pymongo.database import Database
+
+from integrations.telemetry import LatencyHistogram
+
+
+TRIGGER_JOBSTORE = "triggers"
+TRIGGER_JOBS_COLLECTION = "scheduler_jobs"
+DEFAULT_CRON = "0 0 * * *"  # daily at midnight
+
+# Tokens resolved from the index are re-read after this long, so a trigger
+# deleted through another worker stops resolving here too
+TOKEN_CACHE_TTL_SECONDS = 30.0
+# A slot missed while no worker was running is still fired (once) within this window
+MISFIRE_GRACE_SECONDS = 3600
+# Tolerated clock difference between workers when claiming a cron slot
+CLOCK_SKEW_SECONDS = 5.0
+
+_active_registry: Optional["TriggerRegistry"] = None
+
+
+def fire_scheduled_trigger(trigger_id: str):
+    """Job function kept in the persistent job store (stored by reference, not pickled)"""
+    if _active_registry is not None:
+        _active_registry.fire_scheduled(trigger_id)
+
+
+def parse_cron(trigger: Dict[str, Any]) -> CronTrigger:
+    """Cron trigger of a scheduled trigger document; raises ValueError if invalid"""
+    return CronTrigger.from_crontab((trigger.get("config") or {}).get("cron", DEFAULT_CRON))
+
+
+def _next_fire_at(cron: CronTrigger, after: float) -> Optional[float]:
+    next_time = cron.get_next_fire_time(None, datetime.fromtimestamp(after, cron.timezone))
+    return next_time.timestamp() if next_time else None
+
+
+class TriggerRegistry:
+    """Webhook token index and cron jobs for the documents in `db['triggers']`
+
+    - webhook tokens resolve through an in-memory index built on startup;
+      tokens created by another worker are found in MongoDB on first use
+    - cron triggers live in a MongoDB-backed APScheduler job store, so they
+      survive restarts and every worker's scheduler sees them
+    - each trigger document carries `next_fire_at`; a worker fires a slot only
+      after atomically advancing it, so a slot runs once across all workers
+    """
+
+    def __init__(self, db: Database, execution_engine, scheduler):
+        self.collection = db['triggers']
+        self.execution_engine = execution_engine
+        self.scheduler = scheduler
+        scheduler.add_jobstore(
+            MongoDBJobStore(database=db.name, collection=TRIGGER_JOBS_COLLECTION, client=db.client),
+            TRIGGER_JOBSTORE
+        )
+
+        self._tokens: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self.fire_latency = {"scheduled": LatencyHistogram(), "webhook": LatencyHistogram()}
+        self.counters = {"scheduled_fired": 0, "scheduled_skipped": 0, "webhook_fired": 0, "failed": 0,
+                         "token_hits": 0, "token_misses": 0}
+
+    def ensure_indexes(self) -> None:
+        self.collection.create_index("id")
+        self.collection.create_index("config.webhook_token", sparse=True)
+
+    def load(self) -> Dict[str, int]:
+        """Index all active triggers and make sure every cron trigger has a job"""
+        global _active_registry
+        _active_registry = self
+
+        tokens = {}
+        scheduled = set()
+        loaded_at = time.monotonic()
+        for trigger in self.collection.find({"active": {"$ne": False}}, {"_id": 0}):
+            if trigger.get("trigger_type") == "webhook":
+                token = (trigger.get("config") or {}).get("webhook_token")
+                if token:
+                    tokens[token] = (loaded_at, trigger)
+            elif trigger.get("trigger_type") == "scheduled":
+                try:
+                    self.schedule(trigger)
+                    scheduled.add(trigger["id"])
+                except ValueError as e:
+                    print(f"[TriggerRegistry] Skipping trigger {trigger['id']}: {e}")
+
+        with self._lock:
+            self._tokens = tokens
+
+        for job in self.scheduler.get_jobs(jobstore=TRIGGER_JOBSTORE):
+            if job.id not in scheduled and not self.collection.find_one({"id": job.id, "active": {"$ne": False}}):
+                job.remove()
+
+        return {"webhook": len(tokens), "scheduled": len(scheduled)}
+
+    # ========== REGISTRATION ==========
+
+    def register(self, trigger: Dict[str, Any]):
+        """Activate a newly stored trigger"""
+        if trigger["trigger_type"] == "scheduled":
+            self.schedule(trigger)
+        elif trigger["trigger_type"] == "webhook":
+            token = trigger["config"].get("webhook_token")
+            if token:
+                with self._lock:
+                    self._tokens[token] = (time.monotonic(), trigger)
+
+    def unregister(self, trigger: Dict[str, Any]):
+        if trigger["trigger_type"] == "scheduled":
+            try:
+                self.scheduler.remove_job(trigger["id"], jobstore=TRIGGER_JOBSTORE)
+            except JobLookupError:
+                pass
+        elif trigger["trigger_type"] == "webhook":
+            token = (trigger.get("config") or {}).get("webhook_token")
+            with self._lock:
+                self._tokens.pop(token, None)
+
+    def schedule(self, trigger: Dict[str, Any]):
+        """Add the trigger's cron job unless the job store already has it"""
+        cron = parse_cron(trigger)
+        if trigger.get("next_fire_at") is None:
+            self.collection.update_one(
+                {"id": trigger["id"], "next_fire_at": None},
+                {"$set": {"next_fire_at": _next_fire_at(cron, time.time())}}
+            )
+        # An existing job keeps its next run time, so slots missed while down are caught up
+        if self.scheduler.get_job(trigger["id"], jobstore=TRIGGER_JOBSTORE):
+            return
+        self.scheduler.add_job(
+            fire_scheduled_trigger,
+            cron,
+            args=[trigger["id"]],
+            id=trigger["id"],
+            name=f"trigger_{trigger['workflow_id']}",
+            jobstore=TRIGGER_JOBSTORE,
+            coalesce=True,
+            misfire_grace_time=MISFIRE_GRACE_SECONDS,
+            replace_existing=True
+        )
+
+    # ========== FIRING ==========
+
+    def resolve_token(self, token: str) -> Optional[Dict[str, Any]]:
+        """Active webhook trigger for a token"""
+        with self._lock:
+            cached = self._tokens.get(token)
+        if cached and time.monotonic() - cached[0] < TOKEN_CACHE_TTL_SECONDS:
+            self.counters["token_hits"] += 1
+            return cached[1]
+
+        self.counters["token_misses"] += 1
+        trigger = self.collection.find_one(
+            {"trigger_type": "webhook", "config.webhook_token": token, "active": {"$ne": False}}, {"_id": 0}
+        )
+        with self._lock:
+            if trigger:
+                self._tokens[token] = (time.monotonic(), trigger)
+            else:
+                self._tokens.pop(token, None)
+        return trigger
+
+    def fire_webhook(self, trigger: Dict[str, Any], payload: Dict[str, Any]) -> str:
+        started = time.perf_counter()
+        instance_id = self.execution_engine.start_execution(
+            trigger["workflow_id"],
+            triggered_by="webhook",
+            input_data={"webhook_payload": payload}
+        )
+        with self._lock:
+            self.counters["webhook_fired"] += 1
+            self.fire_latency["webhook"].observe((time.perf_counter() - started) * 1000)
+        return instance_id
+
+    def fire_scheduled(self, trigger_id: str):
+        """Run one cron slot, unless another worker already claimed it"""
+        trigger = self.collection.find_one({"id": trigger_id, "active": {"$ne": False}}, {"_id": 0})
+        if not trigger:
+            return
+
+        now = time.time()
+        claimed = self.collection.find_one_and_update(
+            {"id": trigger_id, "$or": [
+                {"next_fire_at": {"$lte": now + CLOCK_SKEW_SECONDS}},
+                {"next_fire_at": None}
+            ]},
+            {
+                "$set": {"next_fire_at": _next_fire_at(parse_cron(trigger), now + CLOCK_SKEW_SECONDS),
+                         "last_fired_at": datetime.utcnow().isoformat()},
+                "$inc": {"fire_count": 1}
+            },
+            projection={"_id": 0, "next_fire_at": 1}
+        )
+        if not claimed:
+            with self._lock:
+                self.counters["scheduled_skipped"] += 1
+            return
+
+        slot = claimed.get("next_fire_at")
+        try:
+            self.execution_engine.start_execution(trigger["workflow_id"], triggered_by="scheduled")
+        except Exception as e:
+            print(f"[TriggerRegistry] Scheduled trigger {trigger_id} failed: {e}")
+            with self._lock:
+                self.counters["failed"] += 1
+            return
+
+        with self._lock:
+            self.counters["scheduled_fired"] += 1
+            if slot is not None:
+                # Delay between the slot's scheduled time and the workflow being started
+                self.fire_latency["scheduled"].observe(max(0.0, time.time() - slot) * 1000)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.counters,
+                "indexed_tokens": len(self._tokens),
+                "scheduled_jobs": len(self.scheduler.get_jobs(jobstore=TRIGGER_JOBSTORE)),
+                "fire_latency": {kind: histogram.snapshot() for kind, histogram in self.fire_latency.items()}
+            }
@@ -0,0 +1,240 @@
+"""Content-addressed Workflow Version Storage for LogicCanvas"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+import zstandard
+from pymongo.database import Database
+from pymongo.errors import BulkWriteError
+
+
+# Snapshot fields kept inline in the manifest (small, rarely shared)
+MANIFEST_METADATA_FIELDS = ["name", "description", "tags", "subprocess_metadata"]
+
+ZSTD_LEVEL = 3
+
+
+class VersionStore:
+    """Stores workflow snapshots as manifests of individually hashed nodes and edges.
+
+    Every node and edge is serialized canonically, hashed with SHA-256 and
+    written once to `workflow_version_blobs` as a zstd-compressed blob. A
+    version only records `{id, hash}` references, so nodes that do not change
+    between versions are shared, and diffs are computed by comparing hashes
+    without decompressing unchanged content.
+    """
+
+    # Decompressed blob cache shared by all instances (blobs are immutable)
+    _blob_cache: "OrderedDict[str, bytes]" = OrderedDict()
+    _blob_cache_lock = threading.Lock()
+    blob_cache_size = 4096
+
+    def __init__(self, db: Database):
+        self.db = db
+        self.blobs_collection = db['workflow_version_blobs']
+
+    def ensure_indexes(self) -> None:
+        """Create the unique hash index used for blob deduplication"""
+        self.blobs_collection.create_index("hash", unique=True)
+
+    # ========== WRITE PATH ==========
+
+    @staticmethod
+    def _canonical_bytes(item: Dict[str, Any]) -> bytes:
+        return json.dumps(item, sort_keys=True, separators=(",", ":"), default=str).encode()
+
+    def store_snapshot(self, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        """Persist a snapshot's nodes and edges and return its manifest
+
+        Args:
+            snapshot: Dictionary with `nodes`, `edges` and optional metadata fields
+
+        Returns:
+            Manifest with `node_refs`, `edge_refs` and inline `metadata`
+        """
+        pending: Dict[str, Dict[str, Any]] = {}
+
+        def build_refs(items: List[Dict[str, Any]], kind: str) -> List[Dict[str, str]]:
+            refs = []
+            for item in items:
+                raw = self._canonical_bytes(item)
+                item_hash = hashlib.sha256(raw).hexdigest()
+                refs.append({"id": item.get("id"), "hash": item_hash})
+                if item_hash not in pending:
+                    pending[item_hash] = {"kind": kind, "raw": raw}
+            return refs
+
+        manifest = {
+            "node_refs": build_refs(snapshot.get("nodes", []), "node"),
+            "edge_refs": build_refs(snapshot.get("edges", []), "edge"),
+            "metadata": {
+                field: snapshot.get(field)
+                for field in MANIFEST_METADATA_FIELDS
+                if field in snapshot
+            },
+        }
+
+        self._write_missing_blobs(pending)
+        return manifest
+
+    def _write_missing_blobs(self, pending: Dict[str, Dict[str, Any]]) -> None:
+        """Insert only the blobs whose hash is not stored yet"""
+        if not pending:
+            return
+
+        existing = {
+            doc["hash"]
+            for doc in self.blobs_collection.find(
+                {"hash": {"$in": list(pending.keys())}},
+                {"_id": 0, "hash": 1}
+            )
+        }
+
+        now = datetime.utcnow().isoformat()
+        new_blobs = []
+        for item_hash, blob in pending.items():
+            if item_hash in existing:
+                continue
+            compressed = zstandard.compress(blob["raw"], ZSTD_LEVEL)
+            new_blobs.append({
+                "hash": item_hash,
+                "kind": blob["kind"],
+                "codec": "zstd",
+                "data": compressed,
+                "raw_size": len(blob["raw"]),
+                "stored_size": len(compressed),
+                "created_at": now,
+            })
+            self._cache_put(item_hash, blob["raw"])
+
+        if not new_blobs:
+            return
+
+        try:
+            self.blobs_collection.insert_many(new_blobs, ordered=False)
+        except BulkWriteError as e:
+            # Duplicate keys mean a concurrent writer stored the same content
+            non_duplicate = [err for err in e.details.get("writeErrors", []) if err.get("code") != 11000]
+            if non_duplicate:
+                raise
+
+    # ========== READ PATH ==========
+
+    def load_items(self, hashes: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Load and decode blobs by hash, fetching cache misses in one query"""
+        raw_by_hash: Dict[str, bytes] = {}
+        missing = []
+        for item_hash in set(hashes):
+            raw = self._cache_get(item_hash)
+            if raw is None:
+                missing.append(item_hash)
+            else:
+                raw_by_hash[item_hash] = raw
+
+        if missing:
+            for doc in self.blobs_collection.find({"hash": {"$in": missing}}, {"_id": 0}):
+                raw = zstandard.decompress(doc["data"]) if doc.get("codec") == "zstd" else doc["data"]
+                raw_by_hash[doc["hash"]] = raw
+                self._cache_put(doc["hash"], raw)
+
+        # Decode per call so callers can mutate the result freely
+        return {item_hash: json.loads(raw) for item_hash, raw in raw_by_hash.items()}
+
+    def load_snapshot(self, manifest: Dict[str, Any]) -> Dict[str, Any]:
+        """Materialize the full snapshot described by a manifest"""
+        node_refs = manifest.get("node_refs", [])
+        edge_refs = manifest.get("edge_refs", [])
+        items = self.load_items([r["hash"] for r in node_refs] + [r["hash"] for r in edge_refs])
+
+        snapshot = dict(manifest.get("metadata", {}))
+        snapshot["nodes"] = [items[r["hash"]] for r in node_refs if r["hash"] in items]
+        snapshot["edges"] = [items[r["hash"]] for r in edge_refs if r["hash"] in items]
+        return snapshot
+
+    def resolve_snapshot(self, version_entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the snapshot of a version entry (manifest-based or legacy full copy)"""
+        if version_entry.get("manifest"):
+            return self.load_snapshot(version_entry["manifest"])
+        return version_entry.get("snapshot", {})
+
+    # ========== DIFF ==========
+
+    def diff_manifests(self, manifest_a: Dict[str, Any], manifest_b: Dict[str, Any]) -> Dict[str, Any]:
+        """Diff two manifests by hash, loading only the nodes and edges that changed
+
+        Returns the same structure as a full snapshot diff: metadata_changes,
+        nodes_added / nodes_removed / nodes_modified, edges_added / edges_removed.
+        """
+        diff = {
+            "metadata_changes": {},
+            "nodes_added": [],
+            "nodes_removed": [],
+            "nodes_modified": [],
+            "edges_added": [],
+            "edges_removed": []
+        }
+
+        metadata_a = manifest_a.get("metadata", {})
+        metadata_b = manifest_b.get("metadata", {})
+        for key in ["name", "description", "tags"]:
+            if metadata_a.get(key) != metadata_b.get(key):
+                diff["metadata_changes"][key] = {"from": metadata_a.get(key), "to": metadata_b.get(key)}
+
+        nodes_a = {r["id"]: r["hash"] for r in manifest_a.get("node_refs", [])}
+        nodes_b = {r["id"]: r["hash"] for r in manifest_b.get("node_refs", [])}
+        edges_a = {r["id"]: r["hash"] for r in manifest_a.get("edge_refs", [])}
+        edges_b = {r["id"]: r["hash"] for r in manifest_b.get("edge_refs", [])}
+
+        # Only ids whose hash differs (or that exist on one side) are loaded
+        added_ids = [i for i in nodes_b if i not in nodes_a]
+        removed_ids = [i for i in nodes_a if i not in nodes_b]
+        modified_ids = [i for i, h in nodes_b.items() if i in nodes_a and nodes_a[i] != h]
+        added_edge_ids = [i for i in edges_b if i not in edges_a]
+        removed_edge_ids = [i for i in edges_a if i not in edges_b]
+
+        needed = (
+            [nodes_b[i] for i in added_ids + modified_ids]
+            + [nodes_a[i] for i in removed_ids + modified_ids]
+            + [edges_b[i] for i in added_edge_ids]
+            + [edges_a[i] for i in removed_edge_ids]
+        )
+        items = self.load_items(needed) if needed else {}
+
+        diff["nodes_added"] = [items[nodes_b[i]] for i in added_ids]
+        diff["nodes_removed"] = [items[nodes_a[i]] for i in removed_ids]
+        diff["nodes_modified"] = [
+            {"id": i, "before": items[nodes_a[i]], "after": items[nodes_b[i]]}
+            for i in modified_ids
+        ]
+        diff["edges_added"] = [items[edges_b[i]] for i in added_edge_ids]
+        diff["edges_removed"] = [items[edges_a[i]] for i in removed_edge_ids]
+        return diff
+
+    @staticmethod
+    def manifest_summary(manifest: Dict[str, Any]) -> Dict[str, Any]:
+        """Lightweight counts for version listings (no blob access)"""
+        return {
+            "node_count": len(manifest.get("node_refs", [])),
+            "edge_count": len(manifest.get("edge_refs", [])),
+        }
+
+    # ========== BLOB CACHE ==========
+
+    @classmethod
+    def _cache_get(cls, item_hash: str) -> Optional[bytes]:
+        with cls._blob_cache_lock:
+            raw = cls._blob_cache.get(item_hash)
+            if raw is not None:
+                cls._blob_cache.move_to_end(item_hash)
+            return raw
+
+    @classmethod
+    def _cache_put(cls, item_hash: str, raw: bytes) -> None:
+        with cls._blob_cache_lock:
+            cls._blob_cache[item_hash] = raw
+            cls._blob_cache.move_to_end(item_hash)
+            while len(cls._blob_cache) > cls.blob_cache_size:
+                cls._blob_cache.popitem(last=False)
@@ -0,0 +1,310 @@
+"""Durable, batched ingestion and forwarding of webhook calls"""
+import asyncio
+import functools
+import os
+import random
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+import httpx
+from pymongo import UpdateOne
+from pymongo.database import Database
+
+
+ENDPOINT_CACHE_TTL_SECONDS = 30.0
+COMMIT_INTERVAL_SECONDS = 0.005
+MAX_COMMIT_BATCH = 1000
+FLUSH_INTERVAL_SECONDS = 1.0
+FORWARD_QUEUE_SIZE = 10000
+FORWARD_WORKERS = 16
+FORWARD_TIMEOUT_SECONDS = 30.0
+MAX_FORWARD_ATTEMPTS = 5
+RETRY_BASE_DELAY_SECONDS = 1.0
+RETRY_MAX_DELAY_SECONDS = 60.0
+# Queued entries are owned by the process that claimed them until the lease expires
+LEASE_SECONDS = 600.0
+RECOVERY_INTERVAL_SECONDS = 30.0
+
+
+class WebhookIngestor:
+    """Accepts webhook calls, persists them durably and forwards them asynchronously
+
+    - endpoints are cached in memory (short TTL, invalidated on changes)
+    - each call becomes a `webhook_logs` entry (status "received"); entries are
+      group-committed with insert_many and the call is acknowledged once its
+      batch is written
+    - stats are aggregated per webhook and flushed as one `$inc` per webhook
+    - forwarding runs on a pool of async workers with retries and exponential
+      backoff; entries that keep failing are parked with status "dead_letter"
+    - entries whose lease expired (e.g. after a restart) are re-claimed and forwarded;
+      a worker renews the lease when it dequeues an entry and before every retry,
+      so entries waiting in a long queue or a slow retry loop are not claimed twice
+    """
+
+    def __init__(self, db: Database, workers: int = FORWARD_WORKERS):
+        self.endpoints_collection = db['webhook_endpoints']
+        self.logs_collection = db['webhook_logs']
+        self.workers = workers
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+        self._endpoints: Dict[str, Tuple[float, Optional[Dict[str, Any]]]] = {}
+        self._pending: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._commit_task: Optional[asyncio.Task] = None
+        self._stat_increments: Dict[str, Dict[str, Any]] = {}
+        self._status_updates: List[UpdateOne] = []
+        self._queue: Optional[asyncio.Queue] = None
+        # Ids queued or being forwarded by this process
+        self._in_flight: set = set()
+        self._tasks: List[asyncio.Task] = []
+        self._client: Optional[httpx.AsyncClient] = None
+        self.metrics = {"received": 0, "forwarded": 0, "retried": 0, "dead_lettered": 0, "recovered": 0}
+
+    def ensure_indexes(self) -> None:
+        """Indexes for status updates by id and for lease recovery"""
+        self.logs_collection.create_index("id")
+        self.logs_collection.create_index([("status", 1), ("lease_until", 1)])
+
+    # ========== ENDPOINT CACHE ==========
+
+    def get_endpoint(self, webhook_id: str) -> Optional[Dict[str, Any]]:
+        cached = self._endpoints.get(webhook_id)
+        if cached and time.monotonic() - cached[0] < ENDPOINT_CACHE_TTL_SECONDS:
+            return cached[1]
+        webhook = self.endpoints_collection.find_one({"id": webhook_id}, {"_id": 0})
+        self._endpoints[webhook_id] = (time.monotonic(), webhook)
+        return webhook
+
+    def invalidate_endpoint(self, webhook_id: str):
+        self._endpoints.pop(webhook_id, None)
+
+    # ========== LIFECYCLE ==========
+
+    async def start(self):
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=FORWARD_QUEUE_SIZE)
+        self._client = httpx.AsyncClient(timeout=httpx.Timeout(FORWARD_TIMEOUT_SECONDS))
+        loop = asyncio.get_running_loop()
+        self._tasks = [loop.create_task(self._forward_worker()) for _ in range(self.workers)]
+        self._tasks.append(loop.create_task(self._flush_loop()))
+        self._tasks.append(loop.create_task(self._recovery_loop()))
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._commit_task:
+            await asyncio.gather(self._commit_task, return_exceptions=True)
+        await self._commit()
+        await self.flush()
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+    # ========== INGESTION ==========
+
+    async def ingest(self, webhook: Dict[str, Any], payload: Any) -> str:
+        """Durably record a webhook call and queue it for forwarding; returns the log id"""
+        await self.start()
+        entry = {
+            "id": str(uuid.uuid4()),
+            "webhook_id": webhook["id"],
+            "payload": payload,
+            "received_at": datetime.utcnow().isoformat(),
+            "status": "received",
+            "attempts": 0,
+            "owner": self.owner,
+            "lease_until": time.time() + LEASE_SECONDS
+        }
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((entry, future))
+        if self._commit_task is None or self._commit_task.done():
+            self._commit_task = asyncio.get_running_loop().create_task(self._commit_soon())
+        await future  # acknowledged only once the entry is written
+
+        self.metrics["received"] += 1
+        stats = self._stat_increments.setdefault(webhook["id"], {"count": 0, "last_called_at": None})
+        stats["count"] += 1
+        stats["last_called_at"] = entry["received_at"]
+
+        self._dispatch(webhook, entry)
+        return entry["id"]
+
+    async def _commit_soon(self):
+        await asyncio.sleep(COMMIT_INTERVAL_SECONDS)
+        while self._pending:
+            await self._commit()
+
+    async def _commit(self):
+        if not self._pending:
+            return
+        batch = self._pending[:MAX_COMMIT_BATCH]
+        del self._pending[:MAX_COMMIT_BATCH]
+        documents = [dict(entry) for entry, _ in batch]  # insert_many adds _id to the documents
+        try:
+            await self._run(self.logs_collection.insert_many, documents, ordered=False)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for _, future in batch:
+            if not future.done():
+                future.set_result(None)
+
+    def _dispatch(self, webhook: Dict[str, Any], entry: Dict[str, Any]):
+        if not webhook.get("url"):
+            self._set_status(entry["id"], "processed")
+            return
+        if entry["id"] in self._in_flight:
+            return
+        try:
+            self._queue.put_nowait((webhook["id"], entry))
+        except asyncio.QueueFull:
+            # Stays "received" in MongoDB; picked up by recovery once the lease expires
+            return
+        self._in_flight.add(entry["id"])
+
+    # ========== FORWARDING ==========
+
+    async def _forward_worker(self):
+        while True:
+            webhook_id, entry = await self._queue.get()
+            try:
+                await self._forward(webhook_id, entry)
+            except Exception as e:
+                print(f"[WebhookIngestor] Forwarding {entry.get('id')} failed: {e}")
+            finally:
+                self._in_flight.discard(entry["id"])
+                self._queue.task_done()
+
+    async def _forward(self, webhook_id: str, entry: Dict[str, Any]):
+        attempts = entry.get("attempts", 0)
+        error = None
+        while attempts < MAX_FORWARD_ATTEMPTS:
+            if not await self._renew_lease(entry["id"]):
+                return  # processed meanwhile, or re-claimed by another process after our lease expired
+            webhook = self.get_endpoint(webhook_id)
+            if not webhook or not webhook.get("url"):
+                self._set_status(entry["id"], "processed", attempts=attempts)
+                return
+            attempts += 1
+            try:
+                response = await self._client.post(webhook["url"], json=entry["payload"], headers=webhook.get("headers", {}))
+                if response.status_code < 500 and response.status_code != 429:
+                    self.metrics["forwarded"] += 1
+                    self._set_status(entry["id"], "processed", attempts=attempts, response_status=response.status_code)
+                    return
+                error = f"HTTP {response.status_code}"
+            except httpx.HTTPError as e:
+                error = str(e) or e.__class__.__name__
+
+            if attempts < MAX_FORWARD_ATTEMPTS:
+                self.metrics["retried"] += 1
+                delay = min(RETRY_BASE_DELAY_SECONDS * (2 ** (attempts - 1)), RETRY_MAX_DELAY_SECONDS)
+                await asyncio.sleep(delay * (0.5 + random.random()))
+
+        self.metrics["dead_lettered"] += 1
+        self._set_status(entry["id"], "dead_letter", attempts=attempts, error=error)
+
+    async def _renew_lease(self, log_id: str) -> bool:
+        """Extend this process's lease on a received entry; False if it no longer holds it"""
+        result = await self._run(
+            self.logs_collection.update_one,
+            {"id": log_id, "status": "received", "owner": self.owner},
+            {"$set": {"lease_until": time.time() + LEASE_SECONDS}}
+        )
+        return result.matched_count == 1
+
+    def _set_status(self, log_id: str, status: str, **fields):
+        update = {"status": status, "processed_at": datetime.utcnow().isoformat(), **fields}
+        self._status_updates.append(UpdateOne({"id": log_id}, {"$set": update, "$unset": {"owner": "", "lease_until": ""}}))
+
+    async def replay_dead_letters(self, webhook_id: str, limit: int = 1000) -> int:
+        """Re-queue dead-lettered calls of a webhook with a fresh attempt budget"""
+        await self.start()
+        webhook = self.get_endpoint(webhook_id)
+        entries = list(self.logs_collection.find(
+            {"webhook_id": webhook_id, "status": "dead_letter"}, {"_id": 0}
+        ).sort("received_at", 1).limit(limit))
+        for entry in entries:
+            entry["attempts"] = 0
+            self.logs_collection.update_one(
+                {"id": entry["id"], "status": "dead_letter"},
+                {"$set": {"status": "received", "attempts": 0, "owner": self.owner,
+                          "lease_until": time.time() + LEASE_SECONDS}}
+            )
+            self._dispatch(webhook or {"id": webhook_id}, entry)
+        return len(entries)
+
+    # ========== BATCHED WRITES ==========
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL_SECONDS)
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"[WebhookIngestor] Flush failed: {e}")
+
+    async def flush(self):
+        """Write aggregated stats and pending status updates"""
+        increments, self._stat_increments = self._stat_increments, {}
+        if increments:
+            await self._run(self.endpoints_collection.bulk_write, [
+                UpdateOne(
+                    {"id": webhook_id},
+                    {"$inc": {"total_calls": stats["count"]}, "$max": {"last_called_at": stats["last_called_at"]}}
+                )
+                for webhook_id, stats in increments.items()
+            ], ordered=False)
+
+        updates, self._status_updates = self._status_updates, []
+        if updates:
+            await self._run(self.logs_collection.bulk_write, updates, ordered=False)
+
+    # ========== RECOVERY ==========
+
+    async def _recovery_loop(self):
+        while True:
+            try:
+                await self.recover()
+            except Exception as e:
+                print(f"[WebhookIngestor] Recovery failed: {e}")
+            await asyncio.sleep(RECOVERY_INTERVAL_SECONDS)
+
+    async def recover(self) -> int:
+        """Claim entries whose lease expired (owner gone or queue overflow) and forward them"""
+        recovered = 0
+        while self._queue.qsize() < FORWARD_QUEUE_SIZE // 2:
+            entry = await self._run(
+                self.logs_collection.find_one_and_update,
+                {"status": "received", "$or": [{"lease_until": {"$lt": time.time()}}, {"lease_until": {"$exists": False}}]},
+                {"$set": {"owner": self.owner, "lease_until": time.time() + LEASE_SECONDS}},
+                projection={"_id": 0}
+            )
+            if not entry:
+                break
+            if entry["id"] in self._in_flight:
+                continue  # our own lease lapsed while it waited in the queue; it is still queued here
+            webhook = self.get_endpoint(entry["webhook_id"]) or {"id": entry["webhook_id"]}
+            self._dispatch(webhook, entry)
+            recovered += 1
+        self.metrics["recovered"] += recovered
+        return recovered
+
+    async def _run(self, func, *args, **kwargs):
+        return await asyncio.get_running_loop().run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.metrics,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "pending_commit": len(self._pending),
+            "pending_status_updates": len(self._status_updates),
+            "workers": self.workers
+        }
@@ -0,0 +1,388 @@
+"""Streaming export and import of workflow archives (NDJSON, optionally gzip-compressed)"""
+import asyncio
+import functools
+import itertools
+import json
+import uuid
+import zlib
+from datetime import datetime
+from typing import Dict, Any, AsyncIterator, Iterable, List, Optional, Set, Tuple
+
+from pymongo import UpdateOne
+from pymongo.database import Database
+from pymongo.errors import BulkWriteError
+
+from bulk_execution import iter_ndjson
+from version_store import VersionStore
+
+
+ARCHIVE_FORMAT = "logiccanvas-archive"
+ARCHIVE_VERSION = 1
+EXPORT_BATCH_SIZE = 500
+DEFAULT_IMPORT_BATCH_SIZE = 1000
+MAX_IMPORT_BATCH_SIZE = 5000
+
+RECORD_TYPES = ("workflow", "version", "form", "component")
+
+Batch = List[Tuple[int, Dict[str, Any]]]
+
+
+def referenced_ids(workflow: Dict[str, Any]) -> Tuple[Set[str], Set[str]]:
+    """Ids of the forms and reusable components a workflow's nodes point to"""
+    form_ids, component_ids = set(), set()
+    for node in workflow.get("nodes") or []:
+        data = node.get("data") or {}
+        if data.get("formId"):
+            form_ids.add(data["formId"])
+        component_id = data.get("componentId") or data.get("component_id")
+        if component_id:
+            component_ids.add(component_id)
+    return form_ids, component_ids
+
+
+def _record(record_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    return {"type": record_type, "data": data}
+
+
+def _chunks(values: Iterable[Any], size: int) -> Iterable[List[Any]]:
+    iterator = iter(values)
+    while True:
+        chunk = _next_batch(iterator, size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _next_batch(cursor, size: int) -> List[Dict[str, Any]]:
+    return list(itertools.islice(cursor, size))
+
+
+def _failed_indexes(error: BulkWriteError) -> Dict[int, str]:
+    return {err["index"]: err.get("errmsg", "write failed") for err in error.details.get("writeErrors", [])}
+
+
+async def _decompressed(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Pass plain bytes through, gunzip gzip input (detected from the magic bytes)"""
+    decompressor = None
+    first = True
+    async for chunk in chunks:
+        if not chunk:
+            continue
+        if first:
+            first = False
+            if chunk[:2] == b"\x1f\x8b":
+                decompressor = zlib.decompressobj(wbits=31)
+        if decompressor is None:
+            yield chunk
+        else:
+            # Bounded output per call keeps memory flat even for highly compressible archives
+            data = decompressor.decompress(chunk, 1024 * 1024)
+            while data:
+                yield data
+                data = decompressor.decompress(decompressor.unconsumed_tail, 1024 * 1024)
+    if decompressor is not None:
+        tail = decompressor.flush()
+        if tail:
+            yield tail
+
+
+class WorkflowArchiver:
+    """Exports workflows with their versions, forms and components, and imports such archives
+
+    An archive is NDJSON: a header record, `{"type": ..., "data": ...}` records
+    and a footer with counts. Export reads MongoDB in batches and import writes
+    in `insert_many` batches, so memory use does not grow with archive size.
+
+    Imported workflows get new ids derived from the import id and their
+    original id (uuid5), so versions can be re-linked without keeping a
+    mapping in memory; a repeated original id within one import is rejected,
+    and so is a version whose workflow was not imported.
+    Forms and components keep their ids and are only inserted when no
+    document with that id exists. Version snapshots (`workflow_versions` and
+    each workflow's `version_history`) travel as full snapshots and are
+    stored as manifests again on import.
+    """
+
+    def __init__(self, db: Database, version_store: VersionStore):
+        self.workflows_collection = db['workflows']
+        self.versions_collection = db['workflow_versions']
+        self.forms_collection = db['forms']
+        self.components_collection = db['workflow_components']
+        self.audit_logs_collection = db['audit_logs']
+        self.version_store = version_store
+
+    # ========== EXPORT ==========
+
+    async def export(self, workflow_ids: Optional[List[str]] = None, include_related: bool = True,
+                     compress: bool = False) -> AsyncIterator[bytes]:
+        loop = asyncio.get_running_loop()
+        compressor = zlib.compressobj(wbits=31) if compress else None
+
+        def encode(records: List[Dict[str, Any]]) -> bytes:
+            data = "".join(json.dumps(record, default=str) + "\n" for record in records).encode()
+            return compressor.compress(data) if compressor else data
+
+        counts = {record_type: 0 for record_type in RECORD_TYPES}
+        form_ids: Set[str] = set()
+        component_ids: Set[str] = set()
+
+        yield encode([{"type": "header", "format": ARCHIVE_FORMAT, "version": ARCHIVE_VERSION,
+                       "exported_at": datetime.utcnow().isoformat()}])
+
+        query = {"id": {"$in": workflow_ids}} if workflow_ids else {}
+        cursor = self.workflows_collection.find(query, {"_id": 0}, batch_size=EXPORT_BATCH_SIZE)
+        next_batch = functools.partial(_next_batch, cursor, EXPORT_BATCH_SIZE)
+        try:
+            while True:
+                workflows = await loop.run_in_executor(None, next_batch)
+                if not workflows:
+                    break
+                await loop.run_in_executor(None, self._resolve_version_history, workflows)
+                records = [_record("workflow", workflow) for workflow in workflows]
+                counts["workflow"] += len(workflows)
+                if include_related:
+                    for workflow in workflows:
+                        forms, components = referenced_ids(workflow)
+                        form_ids |= forms
+                        component_ids |= components
+                    versions = await loop.run_in_executor(
+                        None, self._export_versions, [workflow["id"] for workflow in workflows]
+                    )
+                    records.extend(versions)
+                    counts["version"] += len(versions)
+                chunk = encode(records)
+                if chunk:
+                    yield chunk
+        finally:
+            cursor.close()
+
+        if include_related:
+            for record_type, collection, ids in (("form", self.forms_collection, form_ids),
+                                                 ("component", self.components_collection, component_ids)):
+                for id_chunk in _chunks(sorted(ids), EXPORT_BATCH_SIZE):
+                    documents = await loop.run_in_executor(
+                        None, _next_batch, collection.find({"id": {"$in": id_chunk}}, {"_id": 0}), len(id_chunk)
+                    )
+                    counts[record_type] += len(documents)
+                    chunk = encode([_record(record_type, document) for document in documents])
+                    if chunk:
+                        yield chunk
+
+        yield encode([{"type": "footer", "counts": counts}])
+        if compressor:
+            yield compressor.flush()
+
+    def _resolve_version_history(self, workflows: List[Dict[str, Any]]) -> None:
+        """Replace manifest references in each workflow's version_history with full snapshots"""
+        for workflow in workflows:
+            history = workflow.get("version_history")
+            if not isinstance(history, list):
+                continue
+            resolved = []
+            for entry in history:
+                if isinstance(entry, dict) and entry.get("manifest"):
+                    snapshot = self.version_store.resolve_snapshot(entry)
+                    entry = {key: value for key, value in entry.items() if key != "manifest"}
+                    entry["snapshot"] = snapshot
+                resolved.append(entry)
+            workflow["version_history"] = resolved
+
+    def _export_versions(self, workflow_ids: List[str]) -> List[Dict[str, Any]]:
+        records = []
+        for version in self.versions_collection.find({"workflow_id": {"$in": workflow_ids}}, {"_id": 0}):
+            # Archives carry the full snapshot; blobs are content-addressed per database
+            version["snapshot"] = self.version_store.resolve_snapshot(version)
+            version.pop("manifest", None)
+            records.append(_record("version", version))
+        return records
+
+    # ========== IMPORT ==========
+
+    @staticmethod
+    def imported_workflow_id(import_id: str, original_id: Any) -> str:
+        return str(uuid.uuid5(uuid.UUID(import_id), str(original_id)))
+
+    async def import_stream(self, chunks: AsyncIterator[bytes],
+                            batch_size: int = DEFAULT_IMPORT_BATCH_SIZE) -> AsyncIterator[str]:
+        """Import an archive stream; yields NDJSON rows for errors and batches, then a summary"""
+        loop = asyncio.get_running_loop()
+        batch_size = max(1, min(batch_size, MAX_IMPORT_BATCH_SIZE))
+        import_id = str(uuid.uuid4())
+        pending: Dict[str, Batch] = {record_type: [] for record_type in RECORD_TYPES}
+        imported = {record_type: 0 for record_type in RECORD_TYPES}
+        errors = 0
+
+        def row(data: Dict[str, Any]) -> str:
+            return json.dumps(data, default=str) + "\n"
+
+        async def flush(record_type: str) -> str:
+            nonlocal errors
+            batch = pending[record_type]
+            pending[record_type] = []
+            count, failures = await loop.run_in_executor(None, self.write_batch, record_type, batch, import_id)
+            imported[record_type] += count
+            errors += len(failures)
+            rows = [row({"line": line, "type": record_type, "error": error}) for line, error in failures]
+            rows.append(row({"type": "progress", "record_type": record_type, "imported": imported[record_type]}))
+            return "".join(rows)
+
+        async for line, value in iter_ndjson(_decompressed(chunks)):
+            if isinstance(value, Exception):
+                errors += 1
+                yield row({"line": line, "error": f"Invalid JSON: {value}"})
+                continue
+            record_type = value.get("type") if isinstance(value, dict) else None
+            if record_type in ("header", "footer"):
+                continue
+            if record_type not in RECORD_TYPES or not isinstance(value.get("data"), dict):
+                errors += 1
+                yield row({"line": line, "error": "Expected a {\"type\": ..., \"data\": {...}} archive record"})
+                continue
+            pending[record_type].append((line, value["data"]))
+            if len(pending[record_type]) >= batch_size:
+                if record_type == "version" and pending["workflow"]:
+                    # Versions are checked against the imported workflows, so those go first
+                    yield await flush("workflow")
+                yield await flush(record_type)
+
+        for record_type in RECORD_TYPES:
+            if pending[record_type]:
+                yield await flush(record_type)
+
+        yield row({"type": "summary", "import_id": import_id, "imported": imported, "errors": errors})
+
+    def write_batch(self, record_type: str, batch: Batch, import_id: str) -> Tuple[int, List[Tuple[int, str]]]:
+        """Write one batch of records; returns (written count, [(line, error)])"""
+        if record_type == "workflow":
+            return self._write_workflows(batch, import_id)
+        if record_type == "version":
+            return self._write_versions(batch, import_id)
+        collection = self.forms_collection if record_type == "form" else self.components_collection
+        return self._write_missing(collection, batch)
+
+    def _insert(self, collection, prepared: List[Tuple[int, Dict[str, Any]]],
+                failures: List[Tuple[int, str]]) -> List[Dict[str, Any]]:
+        """insert_many(ordered=False); returns the inserted documents"""
+        if not prepared:
+            return []
+        documents = [document for _, document in prepared]
+        try:
+            collection.insert_many(documents, ordered=False)
+            return documents
+        except BulkWriteError as e:
+            failed = _failed_indexes(e)
+            failures.extend((prepared[index][0], message) for index, message in failed.items())
+            return [document for index, document in enumerate(documents) if index not in failed]
+
+    def _write_workflows(self, batch: Batch, import_id: str) -> Tuple[int, List[Tuple[int, str]]]:
+        failures: List[Tuple[int, str]] = []
+        prepared = []
+        now = datetime.utcnow().isoformat()
+        for line, workflow in batch:
+            if not isinstance(workflow.get("nodes", []), list) or not isinstance(workflow.get("edges", []), list):
+                failures.append((line, "nodes and edges must be lists"))
+                continue
+            document = {key: value for key, value in workflow.items() if key != "_id"}
+            document["id"] = self.imported_workflow_id(import_id, workflow.get("id") or line)
+            document["created_at"] = now
+            document["updated_at"] = now
+            document["status"] = "draft"  # Imported workflows start as draft
+            prepared.append((line, document))
+
+        prepared = self._drop_repeated_ids(prepared, failures)
+        for _, document in prepared:
+            if isinstance(document.get("version_history"), list):
+                document["version_history"] = [self._store_history_entry(entry) for entry in document["version_history"]]
+
+        inserted = self._insert(self.workflows_collection, prepared, failures)
+        if inserted:
+            self.audit_logs_collection.insert_many([{
+                "id": str(uuid.uuid4()),
+                "entity_type": "workflow",
+                "entity_id": document["id"],
+                "action": "imported",
+                "user": "system",
+                "timestamp": now,
+                "details": {"name": document.get("name", "Untitled"), "import_id": import_id}
+            } for document in inserted], ordered=False)
+        return len(inserted), failures
+
+    def _drop_repeated_ids(self, prepared: List[Tuple[int, Dict[str, Any]]],
+                           failures: List[Tuple[int, str]]) -> List[Tuple[int, Dict[str, Any]]]:
+        """Reject workflows whose original id already occurred in this import
+
+        Their derived ids collide, either within the batch or with a workflow
+        written by an earlier batch of the same import.
+        """
+        written = {
+            document["id"] for document in self.workflows_collection.find(
+                {"id": {"$in": [document["id"] for _, document in prepared]}}, {"_id": 0, "id": 1}
+            )
+        }
+        unique = []
+        for line, document in prepared:
+            if document["id"] in written:
+                failures.append((line, "duplicate workflow id in this import"))
+                continue
+            written.add(document["id"])
+            unique.append((line, document))
+        return unique
+
+    def _store_history_entry(self, entry: Any) -> Any:
+        """Store a version_history snapshot in the version store and keep its manifest"""
+        if not isinstance(entry, dict) or not isinstance(entry.get("snapshot"), dict):
+            return entry
+        stored = {key: value for key, value in entry.items() if key != "snapshot"}
+        stored["manifest"] = self.version_store.store_snapshot(entry["snapshot"])
+        return stored
+
+    def _write_versions(self, batch: Batch, import_id: str) -> Tuple[int, List[Tuple[int, str]]]:
+        failures: List[Tuple[int, str]] = []
+        prepared = []
+        for line, version in batch:
+            if not version.get("workflow_id"):
+                failures.append((line, "version has no workflow_id"))
+                continue
+            snapshot = version.get("snapshot")
+            if not isinstance(snapshot, dict):
+                failures.append((line, "version has no snapshot"))
+                continue
+            document = {key: value for key, value in version.items() if key not in ("_id", "snapshot")}
+            document["id"] = str(uuid.uuid4())
+            document["workflow_id"] = self.imported_workflow_id(import_id, version["workflow_id"])
+            prepared.append((line, document, snapshot))
+
+        # Versions of workflows rejected by (or missing from) this import would point at nothing
+        imported = {
+            document["id"] for document in self.workflows_collection.find(
+                {"id": {"$in": list({document["workflow_id"] for _, document, _ in prepared})}}, {"_id": 0, "id": 1}
+            )
+        }
+        linked = []
+        for line, document, snapshot in prepared:
+            if document["workflow_id"] not in imported:
+                failures.append((line, "workflow of this version was not imported"))
+                continue
+            document["manifest"] = self.version_store.store_snapshot(snapshot)
+            linked.append((line, document))
+        return len(self._insert(self.versions_collection, linked, failures)), failures
+
+    def _write_missing(self, collection, batch: Batch) -> Tuple[int, List[Tuple[int, str]]]:
+        failures: List[Tuple[int, str]] = []
+        operations = []
+        lines = []
+        for line, document in batch:
+            if not document.get("id"):
+                failures.append((line, "record has no id"))
+                continue
+            document = {key: value for key, value in document.items() if key != "_id"}
+            operations.append(UpdateOne({"id": document["id"]}, {"$setOnInsert": document}, upsert=True))
+            lines.append(line)
+        if not operations:
+            return 0, failures
+        try:
+            result = collection.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            failures.extend((lines[index], message) for index, message in _failed_indexes(e).items())
+            return e.details.get("nUpserted", 0), failures
+        return result.upserted_count, failures
@@ -0,0 +1,279 @@
+"""Set-based bulk workflow operations with background cascading cleanup"""
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, Iterable, List, Optional, Set
+
+from pymongo.database import Database
+
+
+# Instance ids handled per cleanup round (each round is a few delete_many calls)
+CLEANUP_BATCH_SIZE = 1000
+# Maximum number of ids per `$in` query when reading workflows
+ID_QUERY_CHUNK = 10000
+# Cleanup jobs are owned by the process running them until the lease expires (renewed per round)
+CLEANUP_LEASE_SECONDS = 300.0
+
+
+def _chunks(values: List[Any], size: int) -> Iterable[List[Any]]:
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+class WorkflowBulkOperations:
+    """Bulk delete and status updates as `$in` set operations
+
+    Deleting workflows first records a cleanup job in `bulk_operations`, with
+    the workflow ids stored in `ID_QUERY_CHUNK`-sized documents in
+    `bulk_operation_items` (a single document would hit the 16MB BSON limit),
+    then removes the workflow documents and writes one insert_many of audit
+    records. Their instances (with tasks and approvals), triggers and versions
+    are removed by the background job in batches. Job progress is kept in
+    `bulk_operations`, so any worker can report it. Cleanup is idempotent and
+    deletes the job's workflows again before their dependents, so a job whose
+    process went away (lease expired), even before the workflows were
+    deleted, is finished by `resume_jobs`.
+    """
+
+    def __init__(self, db: Database, trigger_registry=None):
+        self.workflows_collection = db['workflows']
+        self.instances_collection = db['workflow_instances']
+        self.tasks_collection = db['tasks']
+        self.approvals_collection = db['approvals']
+        self.triggers_collection = db['triggers']
+        self.versions_collection = db['workflow_versions']
+        self.audit_logs_collection = db['audit_logs']
+        self.jobs_collection = db['bulk_operations']
+        self.job_items_collection = db['bulk_operation_items']
+        self.trigger_registry = trigger_registry
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bulk-cleanup")
+
+    def ensure_indexes(self) -> None:
+        self.instances_collection.create_index("workflow_id")
+        self.tasks_collection.create_index("workflow_instance_id")
+        self.approvals_collection.create_index("workflow_instance_id")
+        self.triggers_collection.create_index("workflow_id")
+        self.versions_collection.create_index("workflow_id")
+        self.job_items_collection.create_index([("job_id", 1), ("seq", 1)])
+
+    def _existing_ids(self, workflow_ids: List[str], extra_filter: Optional[Dict[str, Any]] = None) -> Set[str]:
+        found = set()
+        for chunk in _chunks(list(dict.fromkeys(workflow_ids)), ID_QUERY_CHUNK):
+            query = {"id": {"$in": chunk}, **(extra_filter or {})}
+            found.update(doc["id"] for doc in self.workflows_collection.find(query, {"_id": 0, "id": 1}))
+        return found
+
+    def _audit(self, workflow_ids: Iterable[str], action: str, details: Dict[str, Any]):
+        now = datetime.utcnow().isoformat()
+        records = [{
+            "id": str(uuid.uuid4()),
+            "entity_type": "workflow",
+            "entity_id": workflow_id,
+            "action": action,
+            "user": "system",
+            "timestamp": now,
+            "details": details
+        } for workflow_id in workflow_ids]
+        if records:
+            self.audit_logs_collection.insert_many(records, ordered=False)
+
+    # ========== DELETE ==========
+
+    def delete_impact(self, workflow_ids: List[str]) -> Dict[str, int]:
+        """Documents a bulk delete of these workflows would remove"""
+        ids = list(workflow_ids)
+        impact = {
+            "workflows": len(ids),
+            "instances": 0,
+            "tasks": 0,
+            "approvals": 0,
+            "triggers": self.triggers_collection.count_documents({"workflow_id": {"$in": ids}}),
+            "versions": self.versions_collection.count_documents({"workflow_id": {"$in": ids}})
+        }
+        cursor = self.instances_collection.find({"workflow_id": {"$in": ids}}, {"_id": 0, "id": 1})
+        batch = []
+        for instance in cursor:
+            batch.append(instance["id"])
+            if len(batch) >= CLEANUP_BATCH_SIZE:
+                self._count_instance_dependents(batch, impact)
+                batch = []
+        if batch:
+            self._count_instance_dependents(batch, impact)
+        return impact
+
+    def _count_instance_dependents(self, instance_ids: List[str], impact: Dict[str, int]):
+        impact["instances"] += len(instance_ids)
+        impact["tasks"] += self.tasks_collection.count_documents({"workflow_instance_id": {"$in": instance_ids}})
+        impact["approvals"] += self.approvals_collection.count_documents({"workflow_instance_id": {"$in": instance_ids}})
+
+    def delete(self, workflow_ids: List[str], dry_run: bool = False) -> Dict[str, Any]:
+        found = self._existing_ids(workflow_ids)
+        ordered = [workflow_id for workflow_id in dict.fromkeys(workflow_ids) if workflow_id in found]
+        errors = [{"id": workflow_id, "error": "Not found"} for workflow_id in dict.fromkeys(workflow_ids)
+                  if workflow_id not in found]
+
+        if dry_run:
+            return {"dry_run": True, "impact": self.delete_impact(ordered), "errors": errors}
+
+        job_id = None
+        if ordered:
+            # Recorded before anything is deleted, so an interrupted delete can be finished
+            job_id = str(uuid.uuid4())
+            chunks = list(_chunks(ordered, ID_QUERY_CHUNK))
+            self.job_items_collection.insert_many([
+                {"job_id": job_id, "seq": seq, "workflow_ids": chunk} for seq, chunk in enumerate(chunks)
+            ])
+            self.jobs_collection.insert_one({
+                "id": job_id,
+                "operation": "workflow_delete_cleanup",
+                "status": "queued",
+                "workflow_count": len(ordered),
+                "chunks": len(chunks),
+                "owner": self.owner,
+                "lease_until": time.time() + CLEANUP_LEASE_SECONDS,
+                "removed": {"workflows": 0, "instances": 0, "tasks": 0, "approvals": 0, "triggers": 0, "versions": 0},
+                "created_at": datetime.utcnow().isoformat()
+            })
+
+        deleted_count = 0
+        for chunk in _chunks(ordered, ID_QUERY_CHUNK):
+            deleted_count += self.workflows_collection.delete_many({"id": {"$in": chunk}}).deleted_count
+        self._audit(ordered, "deleted", {"bulk": True})
+
+        if job_id:
+            self._executor.submit(self._cleanup, job_id, chunks)
+
+        return {
+            "deleted_count": deleted_count,
+            "deleted_ids": ordered,
+            "errors": errors,
+            "cleanup_job_id": job_id
+        }
+
+    def _progress(self, job_id: str, **removed):
+        self.jobs_collection.update_one(
+            {"id": job_id},
+            {"$inc": {f"removed.{kind}": count for kind, count in removed.items()},
+             "$set": {"status": "running", "updated_at": datetime.utcnow().isoformat(),
+                      "lease_until": time.time() + CLEANUP_LEASE_SECONDS}}
+        )
+
+    def resume_jobs(self) -> int:
+        """Restart cleanup jobs left unfinished by a process that went away; returns how many"""
+        resumed = 0
+        while True:
+            now = time.time()
+            job = self.jobs_collection.find_one_and_update(
+                {
+                    "operation": "workflow_delete_cleanup",
+                    "status": {"$in": ["queued", "running"]},
+                    "$or": [{"lease_until": {"$lt": now}}, {"lease_until": {"$exists": False}}]
+                },
+                {"$set": {"owner": self.owner, "lease_until": now + CLEANUP_LEASE_SECONDS}},
+                projection={"_id": 0, "id": 1, "workflow_ids": 1, "chunks": 1}
+            )
+            if not job:
+                return resumed
+            if not job.get("workflow_ids") and not job.get("chunks"):
+                # Jobs queued before workflow ids were recorded cannot be resumed
+                self.jobs_collection.update_one(
+                    {"id": job["id"]},
+                    {"$set": {"status": "failed", "error": "Cleanup interrupted before completion",
+                              "completed_at": datetime.utcnow().isoformat()}}
+                )
+                continue
+            print(f"[WorkflowBulkOperations] Resuming cleanup {job['id']}")
+            self._executor.submit(self._cleanup, job["id"], self._job_chunks(job))
+            resumed += 1
+
+    def _job_chunks(self, job: Dict[str, Any]) -> Iterable[List[str]]:
+        """A job's workflow ids, chunk by chunk"""
+        if job.get("workflow_ids"):
+            # Jobs recorded before the ids moved to bulk_operation_items
+            yield from _chunks(job["workflow_ids"], ID_QUERY_CHUNK)
+            return
+        for seq in range(job["chunks"]):
+            item = self.job_items_collection.find_one({"job_id": job["id"], "seq": seq}, {"_id": 0, "workflow_ids": 1})
+            if item is None:
+                raise ValueError(f"Workflow id chunk {seq} of cleanup {job['id']} is missing")
+            yield item["workflow_ids"]
+
+    def _cleanup(self, job_id: str, chunks: Iterable[List[str]]):
+        """Remove the job's workflows and everything that belonged to them, in batches"""
+        try:
+            for chunk in chunks:
+                # No-op unless the process stopped between recording the job and deleting
+                self._progress(
+                    job_id, workflows=self.workflows_collection.delete_many({"id": {"$in": chunk}}).deleted_count
+                )
+                if self.trigger_registry is not None:
+                    for trigger in self.triggers_collection.find({"workflow_id": {"$in": chunk}}, {"_id": 0}):
+                        self.trigger_registry.unregister(trigger)
+                self._progress(
+                    job_id,
+                    triggers=self.triggers_collection.delete_many({"workflow_id": {"$in": chunk}}).deleted_count,
+                    versions=self.versions_collection.delete_many({"workflow_id": {"$in": chunk}}).deleted_count
+                )
+
+                while True:
+                    instance_ids = [
+                        doc["id"] for doc in self.instances_collection.find(
+                            {"workflow_id": {"$in": chunk}}, {"_id": 0, "id": 1}
+                        ).limit(CLEANUP_BATCH_SIZE)
+                    ]
+                    if not instance_ids:
+                        break
+                    self._progress(
+                        job_id,
+                        tasks=self.tasks_collection.delete_many(
+                            {"workflow_instance_id": {"$in": instance_ids}}).deleted_count,
+                        approvals=self.approvals_collection.delete_many(
+                            {"workflow_instance_id": {"$in": instance_ids}}).deleted_count,
+                        instances=self.instances_collection.delete_many(
+                            {"id": {"$in": instance_ids}}).deleted_count
+                    )
+
+            self.jobs_collection.update_one(
+                {"id": job_id},
+                {"$set": {"status": "completed", "completed_at": datetime.utcnow().isoformat()}}
+            )
+            self.job_items_collection.delete_many({"job_id": job_id})
+        except Exception as e:
+            print(f"[WorkflowBulkOperations] Cleanup {job_id} failed: {e}")
+            self.jobs_collection.update_one(
+                {"id": job_id},
+                {"$set": {"status": "failed", "error": str(e), "completed_at": datetime.utcnow().isoformat()}}
+            )
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.jobs_collection.find_one({"id": job_id}, {"_id": 0, "workflow_ids": 0})
+
+    # ========== STATUS ==========
+
+    def update_status(self, workflow_ids: List[str], status: str, dry_run: bool = False) -> Dict[str, Any]:
+        """Set `status` on every listed workflow that does not already have it"""
+        changing = self._existing_ids(workflow_ids, {"status": {"$ne": status}})
+        ordered = [workflow_id for workflow_id in dict.fromkeys(workflow_ids) if workflow_id in changing]
+
+        if dry_run:
+            return {"dry_run": True, "would_update_count": len(ordered), "would_update_ids": ordered, "status": status}
+
+        now = datetime.utcnow().isoformat()
+        for chunk in _chunks(ordered, ID_QUERY_CHUNK):
+            self.workflows_collection.update_many(
+                {"id": {"$in": chunk}, "status": {"$ne": status}},
+                {"$set": {"status": status, "updated_at": now}}
+            )
+        self._audit(ordered, "status_changed", {"status": status, "bulk": True})
+
+        return {
+            "updated_count": len(ordered),
+            "updated_ids": ordered,
+            "status": status
+        }
+
+    def close(self):
+        self._executor.shutdown(wait=False)
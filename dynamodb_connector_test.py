@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+DynamoDB Connector Testing for LogicCanvas Database Integrations
+Tests the boto3-backed DynamoDBConnector: BatchWriteItem/BatchGetItem chunking
+with retries of unprocessed items, parallel scans and item operations.
+
+Runs in-process against moto by default:
+    pip install "moto[dynamodb]"
+The dynamodb extra includes py_partiql_parser, which moto needs for the PartiQL
+(execute_statement) check; a plain `pip install moto` fails that test. Or run
+against DynamoDB Local when DYNAMODB_ENDPOINT_URL is set, e.g.
+    docker run -d -p 8000:8000 amazon/dynamodb-local
+    DYNAMODB_ENDPOINT_URL=http://localhost:8000 python dynamodb_connector_test.py
+Unprocessed items are produced by making the client hand back part of each batch.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import uuid
+from typing import Dict, Any, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from integrations.cloud_db_connectors import DynamoDBConnector
+
+
+class Throttle:
+    """Wraps a batch client method so the first `rejections` calls leave work unprocessed"""
+
+    def __init__(self, method, unprocessed_key: str, requests_key: str, rejections: int, keep: int = 5):
+        self.method = method
+        self.unprocessed_key = unprocessed_key
+        self.requests_key = requests_key
+        self.rejections = rejections
+        self.keep = keep
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, RequestItems: Dict[str, Any], **kwargs):
+        # Chunks are sent from the connector's worker threads
+        with self._lock:
+            self.calls += 1
+            rejected = self.calls <= self.rejections
+        if not rejected:
+            return self.method(RequestItems=RequestItems, **kwargs)
+
+        accepted, unprocessed = {}, {}
+        for table, request in RequestItems.items():
+            entries = request[self.requests_key] if self.requests_key else request
+            held_back = entries[-self.keep:]
+            sent = entries[:-self.keep]
+            if self.requests_key:
+                accepted[table] = {**request, self.requests_key: sent}
+                unprocessed[table] = {**request, self.requests_key: held_back}
+            else:
+                accepted[table] = sent
+                unprocessed[table] = held_back
+        accepted = {table: request for table, request in accepted.items()
+                    if (request[self.requests_key] if self.requests_key else request)}
+        response = self.method(RequestItems=accepted, **kwargs) if accepted else {}
+        response[self.unprocessed_key] = unprocessed
+        return response
+
+
+class DynamoDBConnectorTester:
+    def __init__(self):
+        self.endpoint_url = os.environ.get('DYNAMODB_ENDPOINT_URL')
+        self.table = f"lc_test_{uuid.uuid4().hex[:12]}"
+        self.connector = DynamoDBConnector('test-dynamodb', {
+            'region': 'us-east-1',
+            'access_key': os.environ.get('AWS_ACCESS_KEY_ID', 'testing'),
+            'secret_key': os.environ.get('AWS_SECRET_ACCESS_KEY', 'testing'),
+            'options': {'endpoint_url': self.endpoint_url, 'max_pool_size': 8}
+        })
+        self.tests_run = 0
+        self.tests_passed = 0
+        self.test_results = []
+
+    def log_test(self, name: str, success: bool, details: str = "", expected: Any = None, actual: Any = None):
+        """Log test result"""
+        self.tests_run += 1
+        if success:
+            self.tests_passed += 1
+            print(f"✅ {name}")
+        else:
+            print(f"❌ {name}")
+            if details:
+                print(f"   Details: {details}")
+            if expected is not None and actual is not None:
+                print(f"   Expected: {expected}")
+                print(f"   Actual: {actual}")
+
+        self.test_results.append({
+            "name": name,
+            "success": success,
+            "details": details,
+            "expected": expected,
+            "actual": actual
+        })
+
+    def throttle(self, method: str, unprocessed_key: str, requests_key: str, rejections: int) -> Throttle:
+        client = self.connector._ensure_client()
+        wrapper = Throttle(getattr(client, method), unprocessed_key, requests_key, rejections)
+        setattr(client, method, wrapper)
+        return wrapper
+
+    def unthrottle(self, method: str, wrapper: Throttle):
+        setattr(self.connector.client, method, wrapper.method)
+
+    async def create_table(self):
+        await self.connector._call(
+            'create_table',
+            TableName=self.table,
+            KeySchema=[{'AttributeName': 'pk', 'KeyType': 'HASH'}, {'AttributeName': 'sk', 'KeyType': 'RANGE'}],
+            AttributeDefinitions=[{'AttributeName': 'pk', 'AttributeType': 'S'},
+                                  {'AttributeName': 'sk', 'AttributeType': 'N'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+
+    def items(self, count: int, start: int = 0) -> List[Dict[str, Any]]:
+        return [{'pk': f"customer-{i % 4}", 'sk': i, 'amount': i * 1.5, 'tags': ['a', 'b']}
+                for i in range(start, start + count)]
+
+    async def test_batch_write(self):
+        """BatchWriteItem chunks of 25, with unprocessed items retried"""
+        print("\n🔍 Testing batch_write...")
+        result = await self.connector.batch_write(self.table, self.items(120))
+        self.log_test("120 items written in chunks of 25", result.get('processed_count') == 120
+                      and result.get('unprocessed_count') == 0, str(result.get('error')), actual=result)
+
+        # Every chunk has 5 items sent back once; the retry writes them
+        wrapper = self.throttle('batch_write_item', 'UnprocessedItems', None, rejections=5)
+        try:
+            result = await self.connector.batch_write(self.table, self.items(125, start=1000))
+        finally:
+            self.unthrottle('batch_write_item', wrapper)
+        self.log_test("Unprocessed items are retried until written",
+                      result.get('success') and result.get('processed_count') == 125,
+                      str(result.get('error')), actual=result)
+        self.log_test("One retry per throttled chunk", wrapper.calls == 10, expected=10, actual=wrapper.calls)
+
+        # Throttling that outlasts the retries is reported per input position
+        wrapper = self.throttle('batch_write_item', 'UnprocessedItems', None, rejections=100)
+        try:
+            result = await self.connector.batch_write(self.table, self.items(30, start=2000), max_retries=1)
+        finally:
+            self.unthrottle('batch_write_item', wrapper)
+        expected = [20, 21, 22, 23, 24, 25, 26, 27, 28, 29]
+        self.log_test("Items still unprocessed after retries are reported by index",
+                      result.get('success') is False and result.get('unprocessed_indexes') == expected,
+                      expected=expected, actual=result.get('unprocessed_indexes'))
+
+    async def test_batch_get(self):
+        """BatchGetItem chunks of 100, with unprocessed keys retried"""
+        print("\n🔍 Testing batch_get...")
+        keys = [{'pk': f"customer-{i % 4}", 'sk': i} for i in range(120)] + [{'pk': 'nobody', 'sk': 0}]
+        wrapper = self.throttle('batch_get_item', 'UnprocessedKeys', 'Keys', rejections=2)
+        try:
+            result = await self.connector.batch_get(self.table, keys)
+        finally:
+            self.unthrottle('batch_get_item', wrapper)
+        self.log_test("121 keys read in 2 chunks, unprocessed keys retried",
+                      result.get('success') and result.get('Count') == 120 and wrapper.calls == 4,
+                      str(result.get('error')), actual={'count': result.get('Count'), 'calls': wrapper.calls})
+        amounts = {item['sk']: item['amount'] for item in result.get('Items', [])}
+        self.log_test("Items come back as plain values", amounts.get(3) == 4.5 and amounts.get(10) == 15,
+                      actual={3: amounts.get(3), 10: amounts.get(10)})
+
+    async def test_scans(self):
+        """Parallel scans, streamed pages and queries"""
+        print("\n🔍 Testing scans and queries...")
+        result = await self.connector.parallel_scan(self.table, segments=4)
+        keys = sorted(item['sk'] for item in result.get('Items', []))
+        self.log_test("Parallel scan over 4 segments returns every item once",
+                      keys == list(range(120)) + list(range(1000, 1125)) + list(range(2000, 2020)),
+                      str(result.get('error')), expected=265, actual=len(keys))
+
+        pages = []
+        async for page in self.connector.stream_query(
+            {'operation': 'scan', 'TableName': self.table, 'segments': 3}, batch_size=20
+        ):
+            pages.append(len(page))
+        self.log_test("Streamed parallel scan yields bounded pages",
+                      sum(pages) == 265 and max(pages) <= 20, actual=pages)
+
+        result = await self.connector.execute_query(
+            f'{{"TableName": "{self.table}", "KeyConditionExpression": "pk = :pk AND sk < :sk",'
+            f' "ExpressionAttributeValues": {{":pk": "customer-1", ":sk": 20}}, "Limit": 2}}'
+        )
+        self.log_test("Query follows pagination", [item['sk'] for item in result.get('Items', [])] == [1, 5, 9, 13, 17],
+                      str(result.get('error')), actual=[item['sk'] for item in result.get('Items', [])])
+
+        result = await self.connector.execute_query(
+            f'SELECT * FROM "{self.table}" WHERE pk = ?', {'parameters': ['customer-2'], 'max_items': 3}
+        )
+        self.log_test("PartiQL with parameters and max_items", result.get('Count') == 3,
+                      str(result.get('error')), expected=3, actual=result.get('Count'))
+
+    async def test_items(self):
+        """Single-item operations"""
+        print("\n🔍 Testing item operations...")
+        key = {'pk': 'single', 'sk': 1}
+        result = await self.connector.put_item(self.table, {**key, 'status': 'new', 'meta': {'n': 1}})
+        self.log_test("put_item", result.get('success'), str(result.get('error')))
+
+        result = await self.connector.update(self.table, {'status': 'done', 'score': 0.25}, key)
+        self.log_test("update returns the new attributes",
+                      result.get('Attributes', {}).get('status') == 'done'
+                      and result['Attributes'].get('score') == 0.25, str(result.get('error')), actual=result)
+
+        result = await self.connector.get_item(self.table, key)
+        self.log_test("get_item", result.get('found') and result['Item']['meta'] == {'n': 1}, actual=result)
+
+        await self.connector.delete(self.table, key)
+        result = await self.connector.get_item(self.table, key)
+        self.log_test("delete removes the item", result.get('success') and result.get('found') is False,
+                      actual=result)
+
+    async def run_all_tests(self):
+        """Run all DynamoDB connector tests"""
+        print("🚀 Starting DynamoDB Connector Tests")
+        print(f"Testing against: {self.endpoint_url or 'moto'} (table {self.table})")
+        print("=" * 60)
+
+        try:
+            await self.create_table()
+            self.log_test("Ping (ListTables)", await self.connector.ping())
+            await self.test_batch_write()
+            await self.test_batch_get()
+            await self.test_scans()
+            await self.test_items()
+        finally:
+            # Always cleanup
+            try:
+                await self.connector._call('delete_table', TableName=self.table)
+            except Exception as e:
+                print(f"Cleanup failed: {e}")
+            await self.connector.disconnect()
+
+        # Print summary
+        print("\n" + "=" * 60)
+        print(f"📊 Test Summary: {self.tests_passed}/{self.tests_run} tests passed")
+
+        if self.tests_passed == self.tests_run:
+            print("🎉 All DynamoDB connector tests passed!")
+            return 0
+        else:
+            print(f"❌ {self.tests_run - self.tests_passed} tests failed")
+            return 1
+
+def main():
+    """Main test runner"""
+    if os.environ.get('DYNAMODB_ENDPOINT_URL'):
+        return asyncio.run(DynamoDBConnectorTester().run_all_tests())
+
+    from moto import mock_aws
+    with mock_aws():
+        return asyncio.run(DynamoDBConnectorTester().run_all_tests())
+
+if __name__ == "__main__":
+    sys.exit(main())
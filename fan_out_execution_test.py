@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Fan-out Execution Testing for LogicCanvas Workflow Engine
+Drives WorkflowExecutionEngine.start_fan_out directly against a real mongod:
+bounded concurrency, and children that are cancelled instead of finishing.
+
+Start a local server (e.g. `docker run -d -p 27017:27017 mongo:7`) and run:
+    MONGO_URL=mongodb://localhost:27017 python fan_out_execution_test.py
+Every run uses a throwaway database that is dropped afterwards.
+"""
+
+import os
+import sys
+import uuid
+from typing import Dict, Any, List
+
+from pymongo import MongoClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from execution_engine import WorkflowExecutionEngine
+
+
+# Children wait on their task node until the test settles them
+WAITING_CHILD_WORKFLOW = {
+    "id": "fan-out-child",
+    "name": "Fan-out child",
+    "nodes": [
+        {"id": "start", "type": "start", "data": {"label": "Start"}},
+        {"id": "task", "type": "task", "data": {"label": "Review item"}},
+    ],
+    "edges": [{"id": "e1", "source": "start", "target": "task"}],
+}
+
+
+class FanOutExecutionTester:
+    def __init__(self, mongo_url: str = os.environ.get('MONGO_URL', 'mongodb://localhost:27017/')):
+        self.mongo_url = mongo_url
+        self.database = f"lc_fan_out_test_{uuid.uuid4().hex[:12]}"
+        self.client = MongoClient(mongo_url)
+        self.db = self.client[self.database]
+        self.engine = WorkflowExecutionEngine(self.db)
+        self.tests_run = 0
+        self.tests_passed = 0
+        self.test_results = []
+
+    def log_test(self, name: str, success: bool, details: str = "", expected: Any = None, actual: Any = None):
+        """Log test result"""
+        self.tests_run += 1
+        if success:
+            self.tests_passed += 1
+            print(f"✅ {name}")
+        else:
+            print(f"❌ {name}")
+            if details:
+                print(f"   Details: {details}")
+            if expected is not None and actual is not None:
+                print(f"   Expected: {expected}")
+                print(f"   Actual: {actual}")
+
+        self.test_results.append({
+            "name": name,
+            "success": success,
+            "details": details,
+            "expected": expected,
+            "actual": actual
+        })
+
+    def start_parent(self, items: List[Any], **options) -> str:
+        parent_id = str(uuid.uuid4())
+        self.db.workflow_instances.insert_one({"id": parent_id, "status": "running", "variables": {}})
+        self.engine.start_fan_out(parent_id, "fan", WAITING_CHILD_WORKFLOW["id"], items, {}, **options)
+        return parent_id
+
+    def fan_out_state(self, parent_id: str) -> Dict[str, Any]:
+        parent = self.db.workflow_instances.find_one({"id": parent_id}, {"_id": 0})
+        return parent.get("fan_out_state", {}).get("fan", {})
+
+    def running_children(self, parent_id: str) -> List[Dict[str, Any]]:
+        return list(self.db.workflow_instances.find(
+            {"parent_instance_id": parent_id, "status": {"$nin": ["completed", "failed", "cancelled"]}},
+            {"_id": 0}
+        ).sort("fan_out_index", 1))
+
+    def test_cancelled_child_releases_slot(self):
+        """Cancelling a child frees its slot so the next item is launched"""
+        print("\n🔍 Testing cancelled fan-out child...")
+        parent_id = self.start_parent([1, 2, 3], max_concurrency=1)
+
+        children = self.running_children(parent_id)
+        self.log_test("One child runs at a time", len(children) == 1, expected=1, actual=len(children))
+        if not children:
+            return
+
+        self.engine.cancel_execution(children[0]["id"])
+        state = self.fan_out_state(parent_id)
+        children = self.running_children(parent_id)
+        self.log_test("Cancelled child settles and the next item starts",
+                      state.get("settled") == 1 and state.get("in_flight") == 1
+                      and [c["fan_out_index"] for c in children] == [1],
+                      expected={"settled": 1, "in_flight": 1, "running": [1]},
+                      actual={"settled": state.get("settled"), "in_flight": state.get("in_flight"),
+                              "running": [c["fan_out_index"] for c in children]})
+
+        while children:
+            self.engine._update_instance_status(children[0]["id"], "completed")
+            children = self.running_children(parent_id)
+
+        state = self.fan_out_state(parent_id)
+        parent = self.db.workflow_instances.find_one({"id": parent_id}, {"_id": 0})
+        self.log_test("Fan-out finalizes with the cancelled child counted as failed",
+                      state.get("status") == "reduced" and state.get("completed") == 2 and state.get("failed") == 1,
+                      expected=("reduced", 2, 1),
+                      actual=(state.get("status"), state.get("completed"), state.get("failed")))
+        self.log_test("Parent fails with the cancellation as the child error",
+                      parent.get("status") == "failed" and "cancelled" in (parent.get("error") or ""),
+                      expected="failed", actual=(parent.get("status"), parent.get("error")))
+
+    def test_cancelled_child_recorded_once(self):
+        """A cancelled child that is cancelled again is not counted twice"""
+        print("\n🔍 Testing repeated cancellation...")
+        parent_id = self.start_parent([1, 2], max_concurrency=2)
+
+        child = self.running_children(parent_id)[0]
+        self.engine.cancel_execution(child["id"])
+        self.engine.cancel_execution(child["id"])
+        state = self.fan_out_state(parent_id)
+        self.log_test("Repeated cancellation settles the child once",
+                      state.get("settled") == 1 and state.get("in_flight") == 1,
+                      expected=(1, 1), actual=(state.get("settled"), state.get("in_flight")))
+
+    def run_all_tests(self):
+        """Run all fan-out execution tests"""
+        print("🚀 Starting Fan-out Execution Tests")
+        print(f"Testing against: {self.mongo_url} (database {self.database})")
+        print("=" * 60)
+
+        try:
+            self.db.workflows.insert_one(dict(WAITING_CHILD_WORKFLOW))
+            self.test_cancelled_child_releases_slot()
+            self.test_cancelled_child_recorded_once()
+        finally:
+            # Always cleanup
+            self.client.drop_database(self.database)
+            self.client.close()
+
+        # Print summary
+        print("\n" + "=" * 60)
+        print(f"📊 Test Summary: {self.tests_passed}/{self.tests_run} tests passed")
+
+        if self.tests_passed == self.tests_run:
+            print("🎉 All fan-out execution tests passed!")
+            return 0
+        else:
+            print(f"❌ {self.tests_run - self.tests_passed} tests failed")
+            return 1
+
+def main():
+    """Main test runner"""
+    return FanOutExecutionTester().run_all_tests()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -179,9 +179,9 @@ const VersionHistory = ({ workflowId, onClose, onRollback, onNotify }) => {
                           {formatDate(version.created_at)}
                         </span>
                         <span>•</span>
-                        <span>{version.nodes?.length || 0} nodes</span>
+                        <span>{version.node_count ?? version.nodes?.length ?? 0} nodes</span>
                         <span>•</span>
-                        <span>{version.edges?.length || 0} edges</span>
+                        <span>{version.edge_count ?? version.edges?.length ?? 0} edges</span>
                       </div>
 
                       {version.description && (
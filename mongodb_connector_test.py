@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+MongoDB Connector Testing for LogicCanvas Database Integrations
+Tests the Motor-backed MongoDBConnector against a real mongod: chunked unordered
+bulk inserts with per-document error reporting, find/aggregate streaming and
+update/delete results.
+
+Start a local server (e.g. `docker run -d -p 27017:27017 mongo:7`) and run:
+    MONGO_URL=mongodb://localhost:27017 python mongodb_connector_test.py
+Every run uses a throwaway database that is dropped afterwards.
+"""
+
+import asyncio
+import os
+import sys
+import uuid
+from typing import Dict, Any, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from integrations.nosql_connectors import MongoDBConnector
+
+
+class MongoDBConnectorTester:
+    def __init__(self, mongo_url: str = os.environ.get('MONGO_URL', 'mongodb://localhost:27017/')):
+        self.mongo_url = mongo_url
+        self.database = f"lc_connector_test_{uuid.uuid4().hex[:12]}"
+        self.connector = MongoDBConnector('test-mongodb', {
+            'database': self.database,
+            'options': {'uri': mongo_url, 'max_pool_size': 10}
+        })
+        self.tests_run = 0
+        self.tests_passed = 0
+        self.test_results = []
+
+    def log_test(self, name: str, success: bool, details: str = "", expected: Any = None, actual: Any = None):
+        """Log test result"""
+        self.tests_run += 1
+        if success:
+            self.tests_passed += 1
+            print(f"✅ {name}")
+        else:
+            print(f"❌ {name}")
+            if details:
+                print(f"   Details: {details}")
+            if expected is not None and actual is not None:
+                print(f"   Expected: {expected}")
+                print(f"   Actual: {actual}")
+
+        self.test_results.append({
+            "name": name,
+            "success": success,
+            "details": details,
+            "expected": expected,
+            "actual": actual
+        })
+
+    async def test_connection(self):
+        """Test ping through the shared client"""
+        print("\n🔍 Testing MongoDB Connection...")
+        try:
+            self.log_test("Ping through the Motor client", await self.connector.ping())
+            return True
+        except Exception as e:
+            self.log_test("Ping through the Motor client", False, str(e))
+            return False
+
+    async def test_bulk_insert_chunks(self):
+        """bulk_insert splits documents into insert_many chunks"""
+        print("\n🔍 Testing chunked bulk insert...")
+        documents = [{'n': i, 'group': i % 3} for i in range(2500)]
+        result = await self.connector.bulk_insert('orders', documents, chunk_size=1000)
+        self.log_test("2500 documents inserted in 3 chunks",
+                      result.get('inserted_count') == 2500 and result.get('chunks') == 3,
+                      str(result.get('error')), expected=(2500, 3),
+                      actual=(result.get('inserted_count'), result.get('chunks')))
+        self.log_test("Caller's documents are not modified", '_id' not in documents[0])
+
+        count = await self.connector._collection('orders').count_documents({})
+        self.log_test("Every document is stored", count == 2500, expected=2500, actual=count)
+
+    async def test_bulk_insert_errors(self):
+        """Failed documents are reported by input index and do not stop the rest"""
+        print("\n🔍 Testing bulk insert error reporting...")
+        await self.connector._collection('skus').create_index('sku', unique=True)
+        documents = [{'sku': f"sku-{i}"} for i in range(2500)]
+        # Duplicates in the first and second chunk
+        documents[10] = {'sku': 'sku-0'}
+        documents[1510] = {'sku': 'sku-1'}
+
+        result = await self.connector.bulk_insert('skus', documents, chunk_size=1000)
+        indexes = [error['index'] for error in result.get('errors', [])]
+        self.log_test("Bulk insert reports partial failure", result.get('success') is False and 'error' not in result,
+                      str(result.get('error')))
+        self.log_test("Failed documents reported by their input index", indexes == [10, 1510],
+                      expected=[10, 1510], actual=indexes)
+        self.log_test("Duplicate key error codes are reported",
+                      all(error['code'] == 11000 for error in result.get('errors', [])),
+                      actual=result.get('errors'))
+        self.log_test("Unordered insert keeps going after a failure",
+                      result.get('inserted_count') == 2498 and len(result.get('inserted_ids', [])) == 2498,
+                      expected=2498, actual=result.get('inserted_count'))
+
+        count = await self.connector._collection('skus').count_documents({})
+        self.log_test("Only the failed documents are missing", count == 2498, expected=2498, actual=count)
+
+        # More failures in one chunk than the response lists
+        documents = [{'sku': f"sku-{100 + i}"} if i < 150 else {'sku': f"new-{i}"} for i in range(1000)]
+        result = await self.connector.bulk_insert('skus', documents, chunk_size=1000)
+        self.log_test("Reported errors are capped, the failed count is not",
+                      result.get('failed_count') == 150 and len(result.get('errors', [])) == 100,
+                      expected=(150, 100), actual=(result.get('failed_count'), len(result.get('errors', []))))
+
+        documents = [{'sku': f"sku-{300 + i}"} if i < 150 else {'sku': f"bulk-{i}"} for i in range(1000)]
+        result = await self.connector.bulk_write([{'op': 'insert', 'table': 'skus', 'data': doc} for doc in documents])
+        failed = [r['index'] for r in result.get('results', []) if r['status'] == 'failed']
+        self.log_test("bulk_write reports every one of 150 duplicate keys in a chunk",
+                      failed == list(range(150)) and result.get('succeeded') == 850,
+                      expected=150, actual=len(failed))
+
+    async def test_queries(self):
+        """execute_query, stream_query and aggregate_stream"""
+        print("\n🔍 Testing find and aggregate queries...")
+        result = await self.connector.execute_query(
+            '{"find": "orders", "filter": {"group": 1}, "sort": {"n": -1}, "limit": 2, "projection": {"_id": 0}}'
+        )
+        self.log_test("Find with filter, sort and limit", result.get('data') == [
+            {'n': 2497, 'group': 1}, {'n': 2494, 'group': 1}
+        ], str(result.get('error')), actual=result.get('data'))
+
+        result = await self.connector.execute_query('{"group": 2}', {'collection': 'orders', 'limit': 1})
+        self.log_test("Plain filter with the collection in params",
+                      result.get('count') == 1 and isinstance(result['data'][0]['_id'], str),
+                      str(result.get('error')), actual=result.get('data'))
+
+        batches = []
+        async for batch in self.connector.stream_query('{"find": "orders", "sort": {"n": 1}}', batch_size=1000):
+            batches.append(len(batch))
+        self.log_test("stream_query yields cursor batches", batches == [1000, 1000, 500],
+                      expected=[1000, 1000, 500], actual=batches)
+
+        groups = []
+        async for batch in self.connector.aggregate_stream('orders', [
+            {'$group': {'_id': '$group', 'count': {'$sum': 1}}},
+            {'$sort': {'_id': 1}}
+        ], batch_size=2):
+            groups.extend(batch)
+        self.log_test("aggregate_stream returns grouped results",
+                      groups == [{'_id': 0, 'count': 834}, {'_id': 1, 'count': 833}, {'_id': 2, 'count': 833}],
+                      actual=groups)
+
+    async def test_writes(self):
+        """update and delete report matched/modified/deleted counts"""
+        print("\n🔍 Testing update and delete...")
+        result = await self.connector.update('orders', {'flagged': True}, {'group': 0})
+        self.log_test("Update applies plain fields with $set",
+                      result.get('matched_count') == 834 and result.get('modified_count') == 834,
+                      str(result.get('error')), expected=834, actual=result.get('modified_count'))
+
+        result = await self.connector.update('orders', {'$inc': {'n': 1}}, {'n': 0})
+        self.log_test("Update passes operator documents through", result.get('modified_count') == 1,
+                      str(result.get('error')), expected=1, actual=result.get('modified_count'))
+
+        result = await self.connector.delete('orders', {})
+        self.log_test("Delete without a condition is refused", result.get('success') is False)
+
+        result = await self.connector.delete('orders', {'flagged': True})
+        self.log_test("Delete reports deleted count", result.get('deleted_count') == 834,
+                      str(result.get('error')), expected=834, actual=result.get('deleted_count'))
+
+    async def run_all_tests(self):
+        """Run all MongoDB connector tests"""
+        print("🚀 Starting MongoDB Connector Tests")
+        print(f"Testing against: {self.mongo_url} (database {self.database})")
+        print("=" * 60)
+
+        try:
+            if await self.test_connection():
+                await self.test_bulk_insert_chunks()
+                await self.test_bulk_insert_errors()
+                await self.test_queries()
+                await self.test_writes()
+        finally:
+            # Always cleanup
+            if self.connector.client is not None:
+                await self.connector.client.drop_database(self.database)
+            await self.connector.disconnect()
+
+        # Print summary
+        print("\n" + "=" * 60)
+        print(f"📊 Test Summary: {self.tests_passed}/{self.tests_run} tests passed")
+
+        if self.tests_passed == self.tests_run:
+            print("🎉 All MongoDB connector tests passed!")
+            return 0
+        else:
+            print(f"❌ {self.tests_run - self.tests_passed} tests failed")
+            return 1
+
+def main():
+    """Main test runner"""
+    tester = MongoDBConnectorTester()
+    return asyncio.run(tester.run_all_tests())
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Redis Connector Testing for LogicCanvas Database Integrations
+Tests the redis-py backed RedisConnector: chunked pipelines with per-command
+errors, MSET/MGET, and Lua scripts run by SHA (including reload after SCRIPT FLUSH).
+
+Runs against a redis-server when REDIS_HOST is set, e.g.
+    docker run -d -p 6379:6379 redis:7
+    REDIS_HOST=localhost python redis_connector_test.py
+and otherwise against fakeredis (pip install fakeredis lupa).
+Keys are prefixed with a random namespace and removed afterwards.
+"""
+
+import asyncio
+import os
+import sys
+import uuid
+from typing import Any
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from integrations.nosql_connectors import RedisConnector
+
+
+# Adds ARGV[1] to KEYS[1] and returns the new value, refusing to go above ARGV[2]
+CAPPED_INCR = """
+local value = tonumber(redis.call('GET', KEYS[1]) or '0') + tonumber(ARGV[1])
+if value > tonumber(ARGV[2]) then
+    return redis.error_reply('cap exceeded')
+end
+redis.call('SET', KEYS[1], value)
+return value
+"""
+
+
+def build_connector() -> RedisConnector:
+    """Connector for REDIS_HOST, or one whose client is a fakeredis server"""
+    host = os.environ.get('REDIS_HOST')
+    connector = RedisConnector('test-redis', {
+        'host': host or 'localhost',
+        'port': int(os.environ.get('REDIS_PORT', 6379)),
+        'password': os.environ.get('REDIS_PASSWORD', ''),
+        'database': os.environ.get('REDIS_DB', 0),
+        'options': {'max_pool_size': 10}
+    })
+    if not host:
+        import fakeredis
+        connector.client = fakeredis.FakeAsyncRedis(decode_responses=True)
+        connector.pool = connector.client.connection_pool
+        connector.connection = connector.client
+    return connector
+
+
+class RedisConnectorTester:
+    def __init__(self):
+        self.connector = build_connector()
+        self.prefix = f"lc_test:{uuid.uuid4().hex[:12]}"
+        self.tests_run = 0
+        self.tests_passed = 0
+        self.test_results = []
+
+    def log_test(self, name: str, success: bool, details: str = "", expected: Any = None, actual: Any = None):
+        """Log test result"""
+        self.tests_run += 1
+        if success:
+            self.tests_passed += 1
+            print(f"✅ {name}")
+        else:
+            print(f"❌ {name}")
+            if details:
+                print(f"   Details: {details}")
+            if expected is not None and actual is not None:
+                print(f"   Expected: {expected}")
+                print(f"   Actual: {actual}")
+
+        self.test_results.append({
+            "name": name,
+            "success": success,
+            "details": details,
+            "expected": expected,
+            "actual": actual
+        })
+
+    def key(self, name: str) -> str:
+        return f"{self.prefix}:{name}"
+
+    async def test_pipeline(self):
+        """Commands are sent in chunks; a failing command does not abort the batch"""
+        print("\n🔍 Testing pipelines...")
+        observed = self.connector.pipeline_latency.snapshot()['count']
+        commands = [['INCRBY', self.key('hits'), 1] for _ in range(12000)]
+        result = await self.connector.pipeline(commands, chunk_size=5000)
+        self.log_test("12000 pipelined commands succeed",
+                      result.get('success') and result.get('commands') == 12000 and result['results'][-1] == 12000,
+                      str(result.get('error')), actual=result.get('results', [None])[-1])
+        round_trips = self.connector.pipeline_latency.snapshot()['count'] - observed
+        self.log_test("One round trip per 5000-command chunk", round_trips == 3, expected=3, actual=round_trips)
+
+        await self.connector.set(self.key('text'), 'not a number')
+        result = await self.connector.pipeline([
+            f"INCR {self.key('counter')}",
+            ['INCR', self.key('text')],
+            ['INCR', self.key('counter')]
+        ])
+        self.log_test("Failed command reported in place, others still run",
+                      result.get('errors') == 1 and result['results'][0] == 1
+                      and 'error' in result['results'][1] and result['results'][2] == 2,
+                      actual=result.get('results'))
+
+        result = await self.connector.pipeline([
+            ['SET', self.key('tx'), 'a'],
+            ['APPEND', self.key('tx'), 'b'],
+            ['GET', self.key('tx')]
+        ], transaction=True)
+        self.log_test("MULTI/EXEC pipeline", result.get('results', [None])[-1] == 'ab', actual=result.get('results'))
+
+    async def test_multi_key(self):
+        """MSET/MGET in single round trips, with optional expiry"""
+        print("\n🔍 Testing MSET/MGET...")
+        mapping = {self.key(f"user:{i}"): {'id': i} for i in range(100)}
+        result = await self.connector.mset(mapping)
+        self.log_test("MSET of 100 keys", result.get('keys_set') == 100, str(result.get('error')))
+
+        keys = list(mapping) + [self.key('missing')]
+        result = await self.connector.mget(keys)
+        self.log_test("MGET reports found and missing keys",
+                      result.get('found') == 100 and result.get('missing') == [self.key('missing')]
+                      and result['values'][self.key('user:7')] == '{"id": 7}',
+                      actual={k: result.get(k) for k in ('found', 'missing')})
+
+        result = await self.connector.mset({self.key('session'): 'abc'}, expire=60)
+        ttl = await self.connector.client.ttl(self.key('session'))
+        self.log_test("MSET with expiry sets a TTL", result.get('success') and 0 < ttl <= 60, actual=ttl)
+
+    async def test_scripts(self):
+        """Lua scripts are registered once and run by SHA"""
+        print("\n🔍 Testing Lua scripts...")
+        result = await self.connector.register_script('capped_incr', CAPPED_INCR)
+        self.log_test("Script registered and cached by SHA", result.get('success') and len(result.get('sha', '')) == 40,
+                      str(result.get('error')))
+
+        result = await self.connector.eval_script('capped_incr', [self.key('quota')], [3, 10])
+        self.log_test("EVALSHA runs the script", result.get('result') == 3, str(result.get('error')),
+                      expected=3, actual=result.get('result'))
+
+        result = await self.connector.eval_script('capped_incr', [self.key('quota')], [100, 10])
+        self.log_test("Script errors are returned, not raised", result.get('success') is False
+                      and 'cap exceeded' in result.get('error', ''), actual=result)
+
+        await self.connector.client.script_flush()
+        result = await self.connector.eval_script('capped_incr', [self.key('quota')], [2, 10])
+        self.log_test("Script reloaded after SCRIPT FLUSH", result.get('result') == 5, str(result.get('error')),
+                      expected=5, actual=result.get('result'))
+
+        await self.connector.client.script_flush()
+        calls = [{'keys': [self.key(f"batch:{i % 10}")], 'args': [1, 1000]} for i in range(1000)]
+        result = await self.connector.eval_script_batch('capped_incr', calls, chunk_size=300)
+        values = await self.connector.mget([self.key(f"batch:{i}") for i in range(10)])
+        self.log_test("Pipelined EVALSHA batch after SCRIPT FLUSH",
+                      result.get('success') and result.get('commands') == 1000
+                      and set(values['values'].values()) == {'100'},
+                      str(result.get('error')), actual=values.get('values'))
+
+        result = await self.connector.eval_script('unknown', [], [])
+        self.log_test("Unregistered script is rejected", result.get('success') is False)
+
+    async def test_commands(self):
+        """Raw commands and pool stats"""
+        print("\n🔍 Testing raw commands...")
+        await self.connector.execute_query(f"HSET {self.key('user')} name \"Ada Lovelace\"")
+        result = await self.connector.execute_query(f"HGET {self.key('user')} name")
+        self.log_test("Raw command with a quoted argument", result.get('result') == 'Ada Lovelace',
+                      str(result.get('error')), actual=result.get('result'))
+
+        stats = self.connector.pool_stats()
+        self.log_test("Pool stats include pipeline latency", stats['pipeline_latency']['count'] >= 3, actual=stats)
+
+    async def cleanup(self):
+        keys = [key async for key in self.connector.client.scan_iter(match=f"{self.prefix}:*")]
+        if keys:
+            await self.connector.client.delete(*keys)
+
+    async def run_all_tests(self):
+        """Run all Redis connector tests"""
+        print("🚀 Starting Redis Connector Tests")
+        print(f"Testing against: {os.environ.get('REDIS_HOST') or 'fakeredis'}")
+        print("=" * 60)
+
+        try:
+            self.log_test("PING through the pool", await self.connector.ping())
+            await self.test_pipeline()
+            await self.test_multi_key()
+            await self.test_scripts()
+            await self.test_commands()
+        finally:
+            # Always cleanup
+            await self.cleanup()
+            await self.connector.disconnect()
+
+        # Print summary
+        print("\n" + "=" * 60)
+        print(f"📊 Test Summary: {self.tests_passed}/{self.tests_run} tests passed")
+
+        if self.tests_passed == self.tests_run:
+            print("🎉 All Redis connector tests passed!")
+            return 0
+        else:
+            print(f"❌ {self.tests_run - self.tests_passed} tests failed")
+            return 1
+
+def main():
+    """Main test runner"""
+    tester = RedisConnectorTester()
+    return asyncio.run(tester.run_all_tests())
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+SQL Connector Testing for LogicCanvas Database Integrations
+Tests the pooled PostgreSQL and MySQL connectors against real databases:
+connection pools, execute_query, chunked bulk_insert and stream_query.
+
+Point the script at containerized databases, for example:
+    docker run -d -p 5432:5432 -e POSTGRES_PASSWORD=test postgres:16
+    docker run -d -p 3306:3306 -e MYSQL_ROOT_PASSWORD=test -e MYSQL_DATABASE=test mysql:8
+    POSTGRES_HOST=localhost POSTGRES_PASSWORD=test \
+    MYSQL_HOST=127.0.0.1 MYSQL_USER=root MYSQL_PASSWORD=test MYSQL_DATABASE=test \
+    python sql_connectors_test.py
+A database whose *_HOST variable is unset is skipped.
+"""
+
+import asyncio
+import os
+import sys
+import uuid
+from typing import Dict, Any, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from integrations.sql_connectors import PostgreSQLConnector, MySQLConnector
+
+
+def database_config(prefix: str, default_port: int, default_user: str, default_database: str) -> Optional[Dict[str, Any]]:
+    """Connector config from <PREFIX>_HOST/_PORT/_USER/_PASSWORD/_DATABASE, or None if no host is set"""
+    host = os.environ.get(f'{prefix}_HOST')
+    if not host:
+        return None
+    return {
+        'host': host,
+        'port': int(os.environ.get(f'{prefix}_PORT', default_port)),
+        'username': os.environ.get(f'{prefix}_USER', default_user),
+        'password': os.environ.get(f'{prefix}_PASSWORD', ''),
+        'database': os.environ.get(f'{prefix}_DATABASE', default_database),
+        'options': {'min_pool_size': 1, 'max_pool_size': 3}
+    }
+
+
+class SQLConnectorTester:
+    def __init__(self):
+        self.tests_run = 0
+        self.tests_passed = 0
+        self.test_results = []
+
+    def log_test(self, name: str, success: bool, details: str = "", expected: Any = None, actual: Any = None):
+        """Log test result"""
+        self.tests_run += 1
+        if success:
+            self.tests_passed += 1
+            print(f"✅ {name}")
+        else:
+            print(f"❌ {name}")
+            if details:
+                print(f"   Details: {details}")
+            if expected is not None and actual is not None:
+                print(f"   Expected: {expected}")
+                print(f"   Actual: {actual}")
+
+        self.test_results.append({
+            "name": name,
+            "success": success,
+            "details": details,
+            "expected": expected,
+            "actual": actual
+        })
+
+    async def test_database(self, label: str, connector, placeholder, text_type: str, returning: bool = False):
+        """Run every connector test against one database"""
+        table = f"lc_test_{uuid.uuid4().hex[:12]}"
+        print(f"\n🔍 Testing {label} connector (table {table})...")
+        try:
+            result = await connector.execute_query(
+                f"CREATE TABLE {table} (id INTEGER PRIMARY KEY, status {text_type}, amount INTEGER)"
+            )
+            self.log_test(f"{label}: create test table", result.get('success'), str(result.get('error')))
+            if not result.get('success'):
+                return
+
+            await self.test_execute_query(label, connector, table, placeholder)
+            if returning:
+                await self.test_returning(label, connector, table)
+            await self.test_pool(label, connector, table)
+            await self.test_bulk_insert(label, connector, table)
+            await self.test_stream_query(label, connector, table)
+        finally:
+            await connector.execute_query(f"DROP TABLE IF EXISTS {table}")
+            await connector.disconnect()
+
+    async def test_execute_query(self, label: str, connector, table: str, placeholder):
+        """Inserts, parameterized reads and updates through execute_query"""
+        result = await connector.insert(table, {'id': 1, 'status': 'open', 'amount': 10})
+        self.log_test(f"{label}: insert a row", result.get('success'), str(result.get('error')))
+
+        result = await connector.execute_query(
+            f"SELECT id, status, amount FROM {table} WHERE id = {placeholder(1)}", {'id': 1}
+        )
+        self.log_test(f"{label}: select with positional params", result.get('data') == [
+            {'id': 1, 'status': 'open', 'amount': 10}
+        ], expected=[{'id': 1, 'status': 'open', 'amount': 10}], actual=result.get('data'))
+
+        # The same column in SET and WHERE needs both values bound
+        result = await connector.update(table, {'status': 'done'}, {'status': 'open'})
+        self.log_test(f"{label}: update with a column in SET and WHERE",
+                      result.get('success') and result.get('rows_affected') == 1,
+                      str(result.get('error')), expected=1, actual=result.get('rows_affected'))
+
+        result = await connector.execute_query(f"SELECT status FROM {table} WHERE id = {placeholder(1)}", [1])
+        self.log_test(f"{label}: updated value is stored", result.get('data') == [{'status': 'done'}],
+                      expected=[{'status': 'done'}], actual=result.get('data'))
+
+        result = await connector.delete(table, {'id': 1})
+        self.log_test(f"{label}: delete reports rows affected", result.get('rows_affected') == 1,
+                      expected=1, actual=result.get('rows_affected'))
+
+        result = await connector.execute_query(f"SELECT * FROM missing_{table}")
+        self.log_test(f"{label}: query errors are returned, not raised",
+                      result.get('success') is False and bool(result.get('error')))
+
+    async def test_returning(self, label: str, connector, table: str):
+        """Writes with a RETURNING clause return their rows, however the query is laid out"""
+        result = await connector.execute_query(
+            f"INSERT INTO {table} (id, status)\nVALUES ($1, $2)\nRETURNING id", [2, 'open']
+        )
+        self.log_test(f"{label}: RETURNING on its own line returns rows",
+                      result.get('data') == [{'id': 2}] and result.get('rows_affected') == 1,
+                      str(result.get('error')), expected=[{'id': 2}], actual=result.get('data'))
+        await connector.delete(table, {'id': 2})
+
+    async def test_pool(self, label: str, connector, table: str):
+        """Concurrent queries share a bounded pool"""
+        results = await asyncio.gather(*[
+            connector.execute_query(f"SELECT COUNT(*) AS n FROM {table}") for _ in range(20)
+        ])
+        stats = connector.pool_stats()
+        self.log_test(f"{label}: 20 concurrent queries succeed", all(r.get('success') for r in results))
+        self.log_test(f"{label}: pool stays within max_pool_size",
+                      stats.get('size', 0) <= 3 and stats['connections_created'] <= 3,
+                      expected="<= 3 connections", actual=stats)
+        self.log_test(f"{label}: every connection is returned to the pool", stats['in_use'] == 0,
+                      expected=0, actual=stats['in_use'])
+        self.log_test(f"{label}: ping on a pooled connection", await connector.ping())
+
+    async def test_bulk_insert(self, label: str, connector, table: str):
+        """bulk_insert splits rows into chunks inside one transaction"""
+        rows = [{'id': i, 'status': 'new', 'amount': i} for i in range(100, 2600)]
+        result = await connector.bulk_insert(table, rows, chunk_size=1000)
+        self.log_test(f"{label}: bulk insert of 2500 rows in 3 chunks",
+                      result.get('rows_inserted') == 2500 and result.get('chunks') == 3,
+                      str(result.get('error')), expected=(2500, 3),
+                      actual=(result.get('rows_inserted'), result.get('chunks')))
+
+        # A duplicate key in the last chunk rolls back the earlier chunks too
+        rows = [{'id': i, 'status': 'new'} for i in range(5000, 6500)] + [{'id': 100, 'status': 'dup'}]
+        result = await connector.bulk_insert(table, rows, chunk_size=500)
+        count = await connector.execute_query(f"SELECT COUNT(*) AS n FROM {table}")
+        self.log_test(f"{label}: failed chunk leaves no partial load",
+                      result.get('success') is False and count['data'][0]['n'] == 2500,
+                      expected=2500, actual=count['data'][0]['n'])
+
+    async def test_stream_query(self, label: str, connector, table: str):
+        """stream_query yields server-side cursor batches"""
+        batches = []
+        async for batch in connector.stream_query(f"SELECT id FROM {table} ORDER BY id", batch_size=1000):
+            batches.append(len(batch))
+        self.log_test(f"{label}: stream_query batches", batches == [1000, 1000, 500],
+                      expected=[1000, 1000, 500], actual=batches)
+
+        # Abandoning a stream early must not leak the connection
+        stream = connector.stream_query(f"SELECT id FROM {table} ORDER BY id", batch_size=100)
+        first = await stream.__anext__()
+        await stream.aclose()
+        result = await connector.execute_query(f"SELECT COUNT(*) AS n FROM {table}")
+        self.log_test(f"{label}: pool usable after an abandoned stream",
+                      len(first) == 100 and result.get('success') and connector.pool_stats()['in_use'] == 0)
+
+    async def run_all_tests(self):
+        """Run all SQL connector tests"""
+        print("🚀 Starting SQL Connector Tests")
+        print("=" * 60)
+
+        postgres = database_config('POSTGRES', 5432, 'postgres', 'postgres')
+        if postgres:
+            await self.test_database('PostgreSQL', PostgreSQLConnector('test-postgres', postgres),
+                                     lambda n: f"${n}", 'TEXT', returning=True)
+        else:
+            print("\n⏭️  Skipping PostgreSQL (POSTGRES_HOST not set)")
+
+        mysql = database_config('MYSQL', 3306, 'root', 'test')
+        if mysql:
+            await self.test_database('MySQL', MySQLConnector('test-mysql', mysql),
+                                     lambda n: "%s", 'VARCHAR(32)')
+        else:
+            print("\n⏭️  Skipping MySQL (MYSQL_HOST not set)")
+
+        # Print summary
+        print("\n" + "=" * 60)
+        print(f"📊 Test Summary: {self.tests_passed}/{self.tests_run} tests passed")
+
+        if self.tests_passed == self.tests_run:
+            print("🎉 All SQL connector tests passed!")
+            return 0
+        else:
+            print(f"❌ {self.tests_run - self.tests_passed} tests failed")
+            return 1
+
+def main():
+    """Main test runner"""
+    tester = SQLConnectorTester()
+    return asyncio.run(tester.run_all_tests())
+
+if __name__ == "__main__":
+    sys.exit(main())